@@ -1,4 +1,5 @@
 import base64
+import dataclasses
 import datetime
 import json
 import logging
@@ -44,6 +45,8 @@ from models.source import DataSourceApiKeyAuthBinding, DataSourceOauthBinding
 from models.tools import ToolOAuthSystemClient
 from services.account_service import AccountService, RegisterService, TenantService
 from services.clear_free_plan_tenant_expired_logs import ClearFreePlanTenantExpiredLogs
+from services.document_indexing_proxy import DocumentIndexingTaskProxy, DuplicateDocumentIndexingTaskProxy
+from services.embedding_cache_partition_service import EmbeddingCachePartitionService
 from services.plugin.data_migration import PluginDataMigration
 from services.plugin.plugin_migration import PluginMigration
 from services.plugin.plugin_service import PluginService
@@ -2656,3 +2659,61 @@ def clean_expired_messages(
         raise
 
     click.echo(click.style("messages cleanup completed.", fg="green"))
+
+
+@click.command("tenant-fair-scheduler-status", help="Show queue depth and concurrency of the tenant fair schedulers.")
+@click.option("--json", "output_json", is_flag=True, help="Output results in JSON format.")
+def tenant_fair_scheduler_status(output_json: bool):
+    """
+    Show per-tenant queued and running tasks of the document indexing fair schedulers.
+    """
+    snapshots = [
+        proxy.fair_scheduler(priority=priority).snapshot()
+        for proxy in (DocumentIndexingTaskProxy, DuplicateDocumentIndexingTaskProxy)
+        for priority in (False, True)
+    ]
+
+    if output_json:
+        click.echo(json.dumps([dataclasses.asdict(snapshot) for snapshot in snapshots], indent=2))
+        return
+
+    for snapshot in snapshots:
+        cap = snapshot.global_concurrency or "unlimited"
+        click.echo(
+            click.style(
+                f"{snapshot.name}: {snapshot.running} running (global cap {cap}, "
+                f"tenant cap {snapshot.tenant_concurrency}), {len(snapshot.tenants)} active tenants",
+                fg="green",
+            )
+        )
+        for tenant in snapshot.tenants:
+            virtual_time = f"{tenant.virtual_time:.2f}" if tenant.virtual_time is not None else "-"
+            click.echo(
+                f"  {tenant.tenant_id}: queued={tenant.queued} running={tenant.running} weight={tenant.weight:g} "
+                f"virtual_time={virtual_time} dispatched={tenant.dispatched}"
+            )
+
+
+@click.command(
+    "backfill-embedding-cache", help="Copy the legacy embeddings table into the partitioned embedding cache."
+)
+@click.option("--batch-size", default=1000, show_default=True, help="Number of rows copied per transaction.")
+@click.option(
+    "--retention-days",
+    type=int,
+    default=None,
+    help="Only copy rows cached within this many days, defaults to PLAN_SANDBOX_CLEAN_DAY_SETTING.",
+)
+def backfill_embedding_cache(batch_size: int, retention_days: int | None):
+    """
+    Copy the unexpired rows of the legacy embeddings table into their monthly embedding cache partitions.
+
+    Rows already copied are skipped, so the command can be run again after an interruption. Once it has
+    completed, set EMBEDDING_CACHE_LEGACY_LOOKUP_ENABLED=false.
+    """
+    retention_days = retention_days or dify_config.PLAN_SANDBOX_CLEAN_DAY_SETTING
+    click.echo(click.style(f"Backfilling embedding cache with the rows of the last {retention_days} days.", fg="green"))
+    start_at = time.perf_counter()
+    copied = EmbeddingCachePartitionService.backfill(retention_days=retention_days, batch_size=batch_size)
+    end_at = time.perf_counter()
+    click.echo(click.style(f"Backfilled {copied} embeddings, latency: {end_at - start_at:.2f}s", fg="green"))
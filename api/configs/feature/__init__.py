@@ -7,6 +7,7 @@ from pydantic import (
     Field,
     HttpUrl,
     NegativeInt,
+    NonNegativeFloat,
     NonNegativeInt,
     PositiveFloat,
     PositiveInt,
@@ -145,6 +146,26 @@ class CodeExecutionSandboxConfig(BaseSettings):
         default=5.0,
     )
 
+    CODE_EXECUTION_MAX_CONCURRENT_REQUESTS: NonNegativeInt = Field(
+        description="Maximum number of in-flight requests to the code execution service per process (0 for unlimited)",
+        default=0,
+    )
+
+    CODE_EXECUTION_BATCH_ENABLED: bool = Field(
+        description="Batch runs of the same code by code nodes in parallel iterations into one sandbox request",
+        default=False,
+    )
+
+    CODE_EXECUTION_BATCH_MAX_SIZE: PositiveInt = Field(
+        description="Maximum number of input sets sent to the code execution service in one batch",
+        default=16,
+    )
+
+    CODE_EXECUTION_BATCH_WINDOW: NonNegativeFloat = Field(
+        description="Seconds to wait for more executions of the same code before sending a batch",
+        default=0.01,
+    )
+
     CODE_MAX_NUMBER: PositiveInt = Field(
         description="Maximum allowed numeric value in code execution",
         default=9223372036854775807,
@@ -201,6 +222,48 @@ class TriggerConfig(BaseSettings):
         default=10485760,
     )
 
+    WEBHOOK_ROUTING_CACHE_ENABLED: bool = Field(
+        description="Cache the trigger, workflow and node configuration published webhooks are routed to",
+        default=True,
+    )
+
+    WEBHOOK_ROUTING_CACHE_TTL: PositiveInt = Field(
+        description="Time-to-live in seconds of cached webhook routes",
+        default=300,
+    )
+
+    WEBHOOK_ROUTING_CACHE_LOCAL_SIZE: PositiveInt = Field(
+        description="Maximum number of webhook routes cached in each process",
+        default=10000,
+    )
+
+    WEBHOOK_BUFFERED_INGESTION_ENABLED: bool = Field(
+        description="Buffer webhook calls in a Redis stream and dispatch their workflow runs in batches "
+        "instead of dispatching every call while handling it",
+        default=False,
+    )
+
+    WEBHOOK_INGESTION_STREAM_MAX_LEN: PositiveInt = Field(
+        description="Approximate maximum number of webhook calls buffered in the Redis stream, "
+        "the oldest calls are dropped beyond it",
+        default=100000,
+    )
+
+    WEBHOOK_INGESTION_BATCH_SIZE: PositiveInt = Field(
+        description="Maximum number of buffered webhook calls dispatched at once",
+        default=100,
+    )
+
+    WEBHOOK_INGESTION_FLUSH_INTERVAL: PositiveInt = Field(
+        description="Delay in seconds between buffering a webhook call and dispatching the batch it belongs to",
+        default=1,
+    )
+
+    WEBHOOK_INGESTION_APP_RATE_LIMIT: NonNegativeInt = Field(
+        description="Maximum number of buffered webhook calls dispatched per app and second, 0 for no limit",
+        default=20,
+    )
+
 
 class AsyncWorkflowConfig(BaseSettings):
     """
@@ -650,7 +713,7 @@ class LoggingConfig(BaseSettings):
 
 class ModelLoadBalanceConfig(BaseSettings):
     """
-    Configuration for model load balancing and token counting
+    Configuration for model load balancing, token counting and result caching
     """
 
     MODEL_LB_ENABLED: bool = Field(
@@ -663,6 +726,27 @@ class ModelLoadBalanceConfig(BaseSettings):
         default=False,
     )
 
+    LLM_RESULT_CACHE_ENABLED: bool = Field(
+        description="Enable caching of LLM results for deterministic calls that opt in, such as question"
+        " classifiers and parameter extractors with temperature 0",
+        default=False,
+    )
+
+    LLM_RESULT_CACHE_TTL: PositiveInt = Field(
+        description="Seconds a cached LLM result is reused",
+        default=3600,
+    )
+
+    LLM_RESULT_CACHE_LOCAL_SIZE: PositiveInt = Field(
+        description="Maximum number of LLM results cached in process memory in front of Redis",
+        default=1024,
+    )
+
+    LLM_RESULT_CACHE_MAX_ENTRY_SIZE: PositiveInt = Field(
+        description="Maximum size in bytes of a serialized LLM result to be cached",
+        default=65536,
+    )
+
 
 class BillingConfig(BaseSettings):
     """
@@ -700,6 +784,12 @@ class WorkflowVariableTruncationConfig(BaseSettings):
         1000,
         description="maximum length for array to trigger truncation.",
     )
+    WORKFLOW_DRAFT_VARIABLE_PAYLOAD_CACHE_SIZE: NonNegativeInt = Field(
+        # 64 MiB
+        64 * 1024 * 1024,
+        description="Maximum total size in bytes of offloaded draft variable payloads cached in process memory. "
+        "Set to 0 to disable the cache.",
+    )
 
 
 class WorkflowConfig(BaseSettings):
@@ -732,6 +822,22 @@ class WorkflowConfig(BaseSettings):
         default=400_000,
     )
 
+    WORKFLOW_COMPILED_CACHE_SIZE: NonNegativeInt = Field(
+        description="Maximum number of parsed and validated published workflows cached per process, 0 disables it",
+        default=256,
+    )
+
+    WORKFLOW_COMPILED_CACHE_ENV_TTL: PositiveFloat = Field(
+        description="Seconds for which decrypted environment variables of a cached published workflow are reused",
+        default=60.0,
+    )
+
+    WORKFLOW_PAUSE_BINARY_SNAPSHOT_ENABLED: bool = Field(
+        description="Store the runtime state of paused workflows as binary snapshots, which releases before"
+        " this setting can't resume; enable it once all workers run a release supporting it",
+        default=False,
+    )
+
     # GraphEngine Worker Pool Configuration
     GRAPH_ENGINE_MIN_WORKERS: PositiveInt = Field(
         description="Minimum number of workers per GraphEngine instance",
@@ -754,6 +860,75 @@ class WorkflowConfig(BaseSettings):
         ge=0.1,
     )
 
+    GRAPH_ENGINE_STREAM_CHUNK_COALESCE_WINDOW: NonNegativeFloat = Field(
+        description="Maximum seconds consecutive streamed text chunks are merged over before being published,"
+        " 0 disables coalescing",
+        default=0.02,
+    )
+
+    GRAPH_ENGINE_STREAM_CHUNK_COALESCE_MAX_BYTES: PositiveInt = Field(
+        description="Size in bytes at which merged streamed text chunks are published",
+        default=256,
+    )
+
+    GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED: bool = Field(
+        description="Execute the nodes of all the GraphEngine runs of a process on one shared pool of workers,"
+        " the per-instance worker settings then cap the nodes of a run executed at once",
+        default=True,
+    )
+
+    GRAPH_ENGINE_SHARED_MIN_WORKERS: NonNegativeInt = Field(
+        description="Minimum number of workers kept by the shared GraphEngine worker pool while idle",
+        default=1,
+    )
+
+    GRAPH_ENGINE_SHARED_MAX_WORKERS: PositiveInt = Field(
+        description="Maximum number of workers of the shared GraphEngine worker pool, not counting the workers"
+        " waiting on iteration and loop sub-graphs",
+        default=50,
+    )
+
+    GRAPH_ENGINE_REDIS_STREAM_COMMANDS_ENABLED: bool = Field(
+        description="Receive the commands of running workflows through Redis streams read by one subscriber per"
+        " process, instead of each workflow polling a Redis list",
+        default=True,
+    )
+
+    # Document Extractor Node Configuration
+    DOCUMENT_EXTRACTOR_EXECUTION_MODE: Literal["inline", "process"] = Field(
+        description="Where CPU-bound document extraction (PDF, DOCX, Excel) runs: 'inline' on the calling worker"
+        " or 'process' in a pool of worker processes",
+        default="inline",
+    )
+
+    DOCUMENT_EXTRACTOR_PROCESS_POOL_SIZE: PositiveInt = Field(
+        description="Number of worker processes used when DOCUMENT_EXTRACTOR_EXECUTION_MODE is 'process'",
+        default=2,
+    )
+
+    DOCUMENT_EXTRACTOR_TIMEOUT: PositiveFloat = Field(
+        description="Timeout in seconds for extracting a single file in 'process' execution mode",
+        default=120.0,
+    )
+
+    DOCUMENT_EXTRACTOR_TABLE_MAX_ROWS: NonNegativeInt = Field(
+        description="Maximum number of CSV/Excel data rows converted to text by the document extractor,"
+        " 0 means unlimited",
+        default=0,
+    )
+
+    DOCUMENT_EXTRACTOR_TABLE_MAX_BYTES: NonNegativeInt = Field(
+        description="Maximum size in bytes of the text produced from a CSV/Excel file by the document extractor,"
+        " 0 means unlimited",
+        default=0,
+    )
+
+    DOCUMENT_EXTRACTOR_RESULT_CACHE_SIZE: NonNegativeInt = Field(
+        description="Maximum total number of characters of extracted text cached in process memory,"
+        " 0 disables the cache",
+        default=32 * 1024 * 1024,
+    )
+
 
 class WorkflowNodeExecutionConfig(BaseSettings):
     """
@@ -891,6 +1066,31 @@ class ToolConfig(BaseSettings):
         default=3600,
     )
 
+    MCP_SESSION_POOL_ENABLED: bool = Field(
+        description="Keep initialized MCP client sessions alive and reuse them across tool calls",
+        default=True,
+    )
+
+    MCP_SESSION_POOL_MAX_IDLE_PER_KEY: PositiveInt = Field(
+        description="Maximum number of idle MCP sessions kept per server and credentials",
+        default=4,
+    )
+
+    MCP_SESSION_POOL_IDLE_TIMEOUT: PositiveFloat = Field(
+        description="Seconds after which an idle pooled MCP session is closed",
+        default=60.0,
+    )
+
+    MCP_SESSION_POOL_HEALTH_CHECK_INTERVAL: NonNegativeFloat = Field(
+        description="Idle seconds after which a pooled MCP session is pinged before it is reused",
+        default=15.0,
+    )
+
+    MCP_PROVIDER_CACHE_TTL: NonNegativeFloat = Field(
+        description="Seconds for which MCP provider entities and decrypted credentials are cached, 0 disables it",
+        default=30.0,
+    )
+
 
 class TemplateMode(StrEnum):
     # unsafe mode allows flexible operations in templates, but may cause security vulnerabilities
@@ -1103,6 +1303,105 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    INDEXING_PIPELINE_ENABLED: bool = Field(
+        description="Index batches of documents with extraction, splitting, embedding and loading"
+        " running concurrently, opt-in until the pipelined path is proven",
+        default=False,
+    )
+
+    INDEXING_PIPELINE_MIN_DOCUMENTS: PositiveInt = Field(
+        description="Minimum number of documents in a batch for it to be indexed by the concurrent pipeline",
+        default=4,
+    )
+
+    INDEXING_PIPELINE_QUEUE_SIZE: PositiveInt = Field(
+        description="Maximum number of documents waiting between two stages of the indexing pipeline",
+        default=8,
+    )
+
+    INDEXING_PIPELINE_EXTRACT_WORKERS: PositiveInt = Field(
+        description="Number of threads extracting documents in the indexing pipeline",
+        default=2,
+    )
+
+    INDEXING_PIPELINE_SPLIT_WORKERS: PositiveInt = Field(
+        description="Number of threads cleaning and splitting documents in the indexing pipeline",
+        default=2,
+    )
+
+    INDEXING_PIPELINE_LOAD_WORKERS: PositiveInt = Field(
+        description="Number of threads loading documents into the vector and keyword indexes in the indexing pipeline",
+        default=2,
+    )
+
+    SEGMENT_BULK_IMPORT_BLOCK_SIZE: PositiveInt = Field(
+        description="Number of CSV rows written and indexed together by the segment batch import",
+        default=500,
+    )
+
+    SEGMENT_HYDRATION_CACHE_ENABLED: bool = Field(
+        description="Cache the segments and child chunks retrieval results are hydrated from",
+        default=True,
+    )
+
+    SEGMENT_HYDRATION_CACHE_LOCAL_SIZE: PositiveInt = Field(
+        description="Maximum number of rows kept in the per-process segment hydration cache",
+        default=10000,
+    )
+
+    SEGMENT_HYDRATION_CACHE_TTL: PositiveInt = Field(
+        description="Time-to-live in seconds of the segment hydration cache entries",
+        default=300,
+    )
+
+    SEGMENT_HYDRATION_CACHE_REDIS_ENABLED: bool = Field(
+        description="Share the segment hydration cache entries between processes through Redis",
+        default=False,
+    )
+
+    QUERY_EMBEDDING_CACHE_TTL: PositiveInt = Field(
+        description="Time-to-live in seconds of the query embeddings cached in Redis",
+        default=600,
+    )
+
+    QUERY_EMBEDDING_CACHE_LOCAL_TTL: PositiveInt = Field(
+        description="Time-to-live in seconds of the query embeddings cached in each process",
+        default=60,
+    )
+
+    QUERY_EMBEDDING_CACHE_LOCAL_SIZE: PositiveInt = Field(
+        description="Maximum number of query embeddings cached in each process",
+        default=1000,
+    )
+
+    DATASET_RETRIEVAL_RERANK_CANDIDATES: NonNegativeInt = Field(
+        description="Maximum number of the highest scored documents of a multi-dataset retrieval passed to the "
+        "reranking, 0 to pass all of them",
+        default=0,
+    )
+
+    EMBEDDING_CACHE_HIT_TRACKING_ENABLED: bool = Field(
+        description="Record hits of cached document embeddings of previous months, so that the embeddings still "
+        "in use are kept when their month expires",
+        default=True,
+    )
+
+    EMBEDDING_CACHE_HIT_FLUSH_INTERVAL: PositiveInt = Field(
+        description="Interval in seconds at which each process writes the recorded embedding cache hits",
+        default=300,
+    )
+
+    EMBEDDING_CACHE_PARTITIONS_AHEAD: NonNegativeInt = Field(
+        description="Number of monthly embedding cache partitions created ahead of the current month",
+        default=2,
+    )
+
+    EMBEDDING_CACHE_LEGACY_LOOKUP_ENABLED: bool = Field(
+        description="Look up document embeddings missing from the partitioned embedding cache in the legacy "
+        "embeddings table, disable once it has been backfilled with the backfill-embedding-cache command",
+        default=True,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -1294,6 +1593,19 @@ class LoginConfig(BaseSettings):
         description="whether to enable create workspace",
         default=False,
     )
+    PRINCIPAL_CACHE_ENABLED: bool = Field(
+        description="Cache the accounts and end users authenticated requests are loaded as,"
+        " changes made outside the account services are seen once the cache expires",
+        default=False,
+    )
+    PRINCIPAL_CACHE_TTL: PositiveInt = Field(
+        description="Time-to-live in seconds of the cached accounts and end users",
+        default=60,
+    )
+    PRINCIPAL_CACHE_LOCAL_SIZE: PositiveInt = Field(
+        description="Maximum number of accounts and end users cached in each process",
+        default=10000,
+    )
 
 
 class AccountConfig(BaseSettings):
@@ -1334,6 +1646,46 @@ class TenantIsolatedTaskQueueConfig(BaseSettings):
         default=1,
     )
 
+    TENANT_FAIR_SCHEDULER_ENABLED: bool = Field(
+        description="Dispatch tenant isolated document indexing tasks through the weighted fair scheduler,"
+        " which serves tenants in proportion to their plan weight",
+        default=False,
+    )
+
+    TENANT_FAIR_SCHEDULER_GLOBAL_CONCURRENCY: NonNegativeInt = Field(
+        description="Maximum number of tasks dispatched concurrently by the fair scheduler across all tenants,"
+        " 0 for unlimited",
+        default=8,
+    )
+
+    TENANT_FAIR_SCHEDULER_LEASE_TTL: PositiveInt = Field(
+        description="Time in seconds after which a dispatched task whose lease is no longer renewed stops counting"
+        " towards the concurrency caps, covering tasks lost by crashed workers",
+        default=300,
+    )
+
+    TENANT_FAIR_SCHEDULER_DISPATCH_INTERVAL: PositiveInt = Field(
+        description="Interval in seconds at which the fair scheduler dispatches from the beat, handing out"
+        " the slots freed by expired leases",
+        default=60,
+    )
+
+    inner_TENANT_FAIR_SCHEDULER_PLAN_WEIGHTS: str = Field(
+        description="Comma-separated plan:weight pairs used by the fair scheduler, plans not listed get weight 1",
+        validation_alias=AliasChoices("TENANT_FAIR_SCHEDULER_PLAN_WEIGHTS"),
+        default="sandbox:1,professional:2,team:4",
+    )
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def TENANT_FAIR_SCHEDULER_PLAN_WEIGHTS(self) -> dict[str, float]:
+        weights: dict[str, float] = {}
+        for pair in self.inner_TENANT_FAIR_SCHEDULER_PLAN_WEIGHTS.split(","):
+            plan, _, weight = pair.partition(":")
+            if plan.strip() and weight.strip():
+                weights[plan.strip()] = float(weight)
+        return weights
+
 
 class SandboxExpiredRecordsCleanConfig(BaseSettings):
     SANDBOX_EXPIRED_RECORDS_CLEAN_GRACEFUL_PERIOD: NonNegativeInt = Field(
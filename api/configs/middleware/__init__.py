@@ -79,6 +79,32 @@ class StorageConfig(BaseSettings):
         deprecated=True,
     )
 
+    STORAGE_LOCAL_CACHE_ENABLED: bool = Field(
+        description="Enable a read-through cache of storage objects on the local disk.",
+        default=False,
+    )
+
+    STORAGE_LOCAL_CACHE_PATH: str = Field(
+        description="Directory used by the local storage cache.",
+        default="storage_cache",
+    )
+
+    STORAGE_LOCAL_CACHE_MAX_SIZE: PositiveInt = Field(
+        description="Maximum total size in bytes of the local storage cache, per process. Default is 1 GiB.",
+        default=1024 * 1024 * 1024,
+    )
+
+    STORAGE_LOCAL_CACHE_MAX_FILE_SIZE: PositiveInt = Field(
+        description="Maximum size in bytes of a single object kept in the local storage cache. Default is 50 MiB.",
+        default=50 * 1024 * 1024,
+    )
+
+    STORAGE_LOCAL_CACHE_KEY_PREFIXES: str = Field(
+        description="Comma-separated storage key prefixes eligible for the local cache."
+        " Only prefixes whose objects are never rewritten in place should be listed.",
+        default="upload_files/,tools/,datasources/,image_files/",
+    )
+
 
 class VectorStoreConfig(BaseSettings):
     VECTOR_STORE: str | None = Field(
@@ -97,6 +123,22 @@ class VectorStoreConfig(BaseSettings):
         default="Vector_index",
     )
 
+    VECTOR_STORE_CLIENT_REUSE_ENABLED: bool = Field(
+        description="Share vector store clients and connection pools across vector instances with the same config",
+        default=True,
+    )
+
+    VECTOR_STORE_CLIENT_IDLE_TIMEOUT: PositiveFloat = Field(
+        description="Seconds after which a shared vector store client that no vector instance uses is closed",
+        default=600.0,
+    )
+
+    VECTOR_STORE_CLIENT_HEALTH_CHECK_INTERVAL: NonNegativeFloat = Field(
+        description="Minimum seconds between health checks of a shared vector store client when it is reused"
+        " (0 to check on every reuse)",
+        default=30.0,
+    )
+
 
 class KeywordStoreConfig(BaseSettings):
     KEYWORD_STORE: str = Field(
@@ -156,13 +198,48 @@ class DatabaseConfig(BaseSettings):
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
+        return self._build_database_uri(self.DB_HOST, self.DB_PORT, self.DB_USERNAME, self.DB_PASSWORD)
+
+    DB_REPLICA_HOST: str | None = Field(
+        description="Hostname or IP address of a read replica of the database."
+        " When set, list, statistics and history queries are served by the replica.",
+        default=None,
+    )
+
+    DB_REPLICA_PORT: PositiveInt | None = Field(
+        description="Port number of the read replica, defaults to DB_PORT.",
+        default=None,
+    )
+
+    DB_REPLICA_USERNAME: str | None = Field(
+        description="Username for the read replica, defaults to DB_USERNAME.",
+        default=None,
+    )
+
+    DB_REPLICA_PASSWORD: str | None = Field(
+        description="Password for the read replica, defaults to DB_PASSWORD.",
+        default=None,
+    )
+
+    DB_REPLICA_MAX_LAG_SECONDS: NonNegativeFloat = Field(
+        description="Maximum replication lag in seconds of the read replica,"
+        " queries are sent to the primary while the replica lags further behind or can't be reached.",
+        default=1.0,
+    )
+
+    DB_REPLICA_LAG_CHECK_INTERVAL: PositiveFloat = Field(
+        description="Interval in seconds between checks of the replication lag of the read replica.",
+        default=5.0,
+    )
+
+    def _build_database_uri(self, host: str, port: int, username: str, password: str) -> str:
         db_extras = (
             f"{self.DB_EXTRAS}&client_encoding={self.DB_CHARSET}" if self.DB_CHARSET else self.DB_EXTRAS
         ).strip("&")
         db_extras = f"?{db_extras}" if db_extras else ""
         return (
             f"{self.SQLALCHEMY_DATABASE_URI_SCHEME}://"
-            f"{quote_plus(self.DB_USERNAME)}:{quote_plus(self.DB_PASSWORD)}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_DATABASE}"
+            f"{quote_plus(username)}:{quote_plus(password)}@{host}:{port}/{self.DB_DATABASE}"
             f"{db_extras}"
         )
 
@@ -201,8 +278,9 @@ class DatabaseConfig(BaseSettings):
         default=30,
     )
 
-    RETRIEVAL_SERVICE_EXECUTORS: NonNegativeInt = Field(
-        description="Number of processes for the retrieval service, default to CPU cores.",
+    RETRIEVAL_SERVICE_EXECUTORS: PositiveInt = Field(
+        description="Number of threads per process shared by the dataset and search tasks of retrievals,"
+        " default to CPU cores.",
         default=os.cpu_count() or 1,
     )
 
@@ -233,6 +311,19 @@ class DatabaseConfig(BaseSettings):
             "pool_timeout": self.SQLALCHEMY_POOL_TIMEOUT,
         }
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_BINDS(self) -> dict[str, Any]:
+        if not self.DB_REPLICA_HOST:
+            return {}
+        replica_uri = self._build_database_uri(
+            self.DB_REPLICA_HOST,
+            self.DB_REPLICA_PORT or self.DB_PORT,
+            self.DB_REPLICA_USERNAME or self.DB_USERNAME,
+            self.DB_REPLICA_PASSWORD or self.DB_PASSWORD,
+        )
+        return {"replica": {"url": replica_uri, **self.SQLALCHEMY_ENGINE_OPTIONS}}
+
 
 class CeleryConfig(DatabaseConfig):
     CELERY_BACKEND: str = Field(
@@ -12,6 +12,7 @@ from extensions.ext_database import db
 from fields.app_fields import app_server_fields
 from libs.login import current_account_with_tenant, login_required
 from models.model import AppMCPServer
+from services.principal_cache import principal_cache
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
 
@@ -147,6 +148,8 @@ class AppMCPServerRefreshController(Resource):
         )
         if not server:
             raise NotFound()
+        previous_server_code = server.server_code
         server.server_code = AppMCPServer.generate_server_code(16)
         db.session.commit()
+        principal_cache.invalidate_mcp_server(previous_server_code)
         return server
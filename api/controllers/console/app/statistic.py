@@ -9,7 +9,7 @@ from controllers.console import console_ns
 from controllers.console.app.wraps import get_app_model
 from controllers.console.wraps import account_initialization_required, setup_required
 from core.app.entities.app_invoke_entities import InvokeFrom
-from extensions.ext_database import db
+from core.db.session_factory import session_factory
 from libs.datetime_utils import parse_time_range
 from libs.helper import convert_datetime_to_date
 from libs.login import current_account_with_tenant, login_required
@@ -85,7 +85,7 @@ WHERE
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append({"date": str(i.date), "message_count": i.message_count})
@@ -141,7 +141,7 @@ WHERE
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append({"date": str(i.date), "conversation_count": i.conversation_count})
@@ -198,7 +198,7 @@ WHERE
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append({"date": str(i.date), "terminal_count": i.terminal_count})
@@ -256,7 +256,7 @@ WHERE
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append(
@@ -332,7 +332,7 @@ ORDER BY
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append(
@@ -395,7 +395,7 @@ WHERE
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append(
@@ -457,7 +457,7 @@ WHERE
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append({"date": str(i.date), "latency": round(i.latency * 1000, 4)})
@@ -516,7 +516,7 @@ WHERE
 
         response_data = []
 
-        with db.engine.begin() as conn:
+        with session_factory.get_read_only_engine().begin() as conn:
             rs = conn.execute(sa.text(sql_query), arg_dict)
             for i in rs:
                 response_data.append({"date": str(i.date), "tps": round(i.tokens_per_second, 4)})
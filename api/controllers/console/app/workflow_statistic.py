@@ -1,12 +1,11 @@
 from flask import abort, jsonify, request
 from flask_restx import Resource
 from pydantic import BaseModel, Field, field_validator
-from sqlalchemy.orm import sessionmaker
 
 from controllers.console import console_ns
 from controllers.console.app.wraps import get_app_model
 from controllers.console.wraps import account_initialization_required, setup_required
-from extensions.ext_database import db
+from core.db.session_factory import session_factory
 from libs.datetime_utils import parse_time_range
 from libs.login import current_account_with_tenant, login_required
 from models.enums import WorkflowRunTriggeredFrom
@@ -38,7 +37,7 @@ console_ns.schema_model(
 class WorkflowDailyRunsStatistic(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        session_maker = sessionmaker(bind=db.engine, expire_on_commit=False)
+        session_maker = session_factory.get_read_only_session_maker()
         self._workflow_run_repo = DifyAPIRepositoryFactory.create_api_workflow_run_repository(session_maker)
 
     @console_ns.doc("get_workflow_daily_runs_statistic")
@@ -78,7 +77,7 @@ class WorkflowDailyRunsStatistic(Resource):
 class WorkflowDailyTerminalsStatistic(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        session_maker = sessionmaker(bind=db.engine, expire_on_commit=False)
+        session_maker = session_factory.get_read_only_session_maker()
         self._workflow_run_repo = DifyAPIRepositoryFactory.create_api_workflow_run_repository(session_maker)
 
     @console_ns.doc("get_workflow_daily_terminals_statistic")
@@ -118,7 +117,7 @@ class WorkflowDailyTerminalsStatistic(Resource):
 class WorkflowDailyTokenCostStatistic(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        session_maker = sessionmaker(bind=db.engine, expire_on_commit=False)
+        session_maker = session_factory.get_read_only_session_maker()
         self._workflow_run_repo = DifyAPIRepositoryFactory.create_api_workflow_run_repository(session_maker)
 
     @console_ns.doc("get_workflow_daily_token_cost_statistic")
@@ -158,7 +157,7 @@ class WorkflowDailyTokenCostStatistic(Resource):
 class WorkflowAverageAppInteractionStatistic(Resource):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        session_maker = sessionmaker(bind=db.engine, expire_on_commit=False)
+        session_maker = session_factory.get_read_only_session_maker()
         self._workflow_run_repo = DifyAPIRepositoryFactory.create_api_workflow_run_repository(session_maker)
 
     @console_ns.doc("get_workflow_average_app_interaction_statistic")
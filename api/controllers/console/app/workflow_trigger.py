@@ -15,6 +15,7 @@ from libs.login import current_user, login_required
 from models.enums import AppTriggerStatus
 from models.model import Account, App, AppMode
 from models.trigger import AppTrigger, WorkflowWebhookTrigger
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 
 from .. import console_ns
 from ..app.wraps import get_app_model
@@ -155,6 +156,7 @@ class AppTriggerEnableApi(Resource):
 
             session.commit()
             session.refresh(trigger)
+        webhook_routing_cache.invalidate_app(app_model.id)
 
         # Add computed icon field
         url_prefix = dify_config.CONSOLE_API_URL + "/console/api/workspaces/current/tool-provider/builtin/"
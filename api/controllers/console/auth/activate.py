@@ -10,6 +10,7 @@ from libs.datetime_utils import naive_utc_now
 from libs.helper import EmailStr, timezone
 from models import AccountStatus
 from services.account_service import RegisterService
+from services.principal_cache import principal_cache
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
 
@@ -122,5 +123,6 @@ class ActivateApi(Resource):
         account.status = AccountStatus.ACTIVE
         account.initialized_at = naive_utc_now()
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
 
         return {"result": "success"}
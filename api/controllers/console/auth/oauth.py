@@ -24,6 +24,7 @@ from services.billing_service import BillingService
 from services.errors.account import AccountNotFoundError, AccountRegisterError
 from services.errors.workspace import WorkSpaceNotAllowedCreateError, WorkSpaceNotFoundError
 from services.feature_service import FeatureService
+from services.principal_cache import principal_cache
 
 from .. import console_ns
 
@@ -145,6 +146,7 @@ class OAuthCallback(Resource):
             account.status = AccountStatus.ACTIVE
             account.initialized_at = naive_utc_now()
             db.session.commit()
+            principal_cache.invalidate_accounts(account.id)
 
         try:
             TenantService.create_owner_tenant_if_not_exist(account)
@@ -46,6 +46,7 @@ from models import AccountIntegrate, InvitationCode
 from services.account_service import AccountService
 from services.billing_service import BillingService
 from services.errors.account import CurrentPasswordIncorrectError as ServiceCurrentPasswordIncorrectError
+from services.principal_cache import principal_cache
 
 DEFAULT_REF_TEMPLATE_SWAGGER_2_0 = "#/definitions/{model}"
 
@@ -234,6 +235,7 @@ class AccountInitApi(Resource):
         account.status = "active"
         account.initialized_at = naive_utc_now()
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
 
         return {"result": "success"}
 
@@ -32,6 +32,7 @@ from services.account_service import TenantService
 from services.enterprise.enterprise_service import EnterpriseService
 from services.feature_service import FeatureService
 from services.file_service import FileService
+from services.principal_cache import principal_cache
 from services.workspace_service import WorkspaceService
 
 logger = logging.getLogger(__name__)
@@ -227,6 +228,7 @@ class CustomConfigWorkspaceApi(Resource):
 
         tenant.custom_config_dict = custom_config_dict
         db.session.commit()
+        principal_cache.invalidate_tenant(tenant.id)
 
         return {"result": "success", "tenant": marshal(WorkspaceService.get_tenant_info(tenant), tenant_fields)}
 
@@ -288,6 +290,7 @@ class WorkspaceInfoApi(Resource):
         tenant = db.get_or_404(Tenant, current_tenant_id)
         tenant.name = args.name
         db.session.commit()
+        principal_cache.invalidate_tenant(tenant.id)
 
         return {"result": "success", "tenant": marshal(WorkspaceService.get_tenant_info(tenant), tenant_fields)}
 
@@ -4,9 +4,11 @@ import time
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, RequestEntityTooLarge
 
+from configs import dify_config
 from controllers.trigger import bp
 from core.trigger.debug.event_bus import TriggerDebugEventBus
 from core.trigger.debug.events import WebhookDebugEvent, build_webhook_pool_key
+from services.trigger.webhook_ingestion_service import WebhookIngestionService
 from services.trigger.webhook_service import WebhookService
 
 logger = logging.getLogger(__name__)
@@ -52,8 +54,14 @@ def handle_webhook(webhook_id: str):
         if error:
             return jsonify({"error": "Bad Request", "message": error}), 400
 
-        # Process webhook call (send to Celery)
-        WebhookService.trigger_workflow_execution(webhook_trigger, webhook_data, workflow)
+        if dify_config.WEBHOOK_BUFFERED_INGESTION_ENABLED:
+            # Buffer the call, its workflow run is dispatched with the next batch
+            WebhookIngestionService.enqueue(
+                webhook_trigger, workflow, WebhookService.build_workflow_inputs(webhook_data)
+            )
+        else:
+            # Process webhook call (send to Celery)
+            WebhookService.trigger_workflow_execution(webhook_trigger, webhook_data, workflow)
 
         # Return configured response
         response_data, status_code = WebhookService.generate_webhook_response(node_config)
@@ -6,6 +6,7 @@ from typing import Any, cast
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from configs import dify_config
 from core.app.apps.advanced_chat.app_config_manager import AdvancedChatAppConfig
 from core.app.apps.base_app_queue_manager import AppQueueManager
 from core.app.apps.workflow_app_runner import WorkflowBasedAppRunner
@@ -21,6 +22,7 @@ from core.app.entities.queue_entities import (
 )
 from core.app.features.annotation_reply.annotation_reply import AnnotationReplyFeature
 from core.app.layers.conversation_variable_persist_layer import ConversationVariablePersistenceLayer
+from core.app.workflow.compiled_workflow import compiled_workflow_cache
 from core.app.workflow.layers.persistence import PersistenceWorkflowInfo, WorkflowPersistenceLayer
 from core.db.session_factory import session_factory
 from core.moderation.base import ModerationError
@@ -28,7 +30,9 @@ from core.moderation.input_moderation import InputModeration
 from core.variables.variables import Variable
 from core.workflow.enums import WorkflowType
 from core.workflow.graph_engine.command_channels.redis_channel import RedisChannel
+from core.workflow.graph_engine.command_channels.redis_stream_channel import RedisStreamChannel
 from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_engine.protocols.command_channel import CommandChannel
 from core.workflow.repositories.workflow_execution_repository import WorkflowExecutionRepository
 from core.workflow.repositories.workflow_node_execution_repository import WorkflowNodeExecutionRepository
 from core.workflow.runtime import GraphRuntimeState, VariablePool
@@ -113,13 +117,15 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
         user_from = self._resolve_user_from(invoke_from)
 
         resume_state = self._resume_graph_runtime_state
+        compiled_workflow = compiled_workflow_cache.get(self._workflow)
 
         if resume_state is not None:
             graph_runtime_state = resume_state
             variable_pool = graph_runtime_state.variable_pool
             graph = self._init_graph(
-                graph_config=self._workflow.graph_dict,
+                graph_config=compiled_workflow.graph_dict,
                 graph_runtime_state=graph_runtime_state,
+                compiled_workflow=compiled_workflow,
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
@@ -164,7 +170,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
             variable_pool = VariablePool(
                 system_variables=system_inputs,
                 user_inputs=inputs,
-                environment_variables=self._workflow.environment_variables,
+                environment_variables=compiled_workflow.environment_variables,
                 # Based on the definition of `Variable`,
                 # `VariableBase` instances can be safely used as `Variable` since they are compatible.
                 conversation_variables=conversation_variables,
@@ -173,8 +179,9 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
             # init graph
             graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.time())
             graph = self._init_graph(
-                graph_config=self._workflow.graph_dict,
+                graph_config=compiled_workflow.graph_dict,
                 graph_runtime_state=graph_runtime_state,
+                compiled_workflow=compiled_workflow,
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
@@ -188,14 +195,18 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
         # Create Redis command channel for this workflow execution
         task_id = self.application_generate_entity.task_id
         channel_key = f"workflow:{task_id}:commands"
-        command_channel = RedisChannel(redis_client, channel_key)
+        command_channel: CommandChannel
+        if dify_config.GRAPH_ENGINE_REDIS_STREAM_COMMANDS_ENABLED:
+            command_channel = RedisStreamChannel(redis_client, channel_key)
+        else:
+            command_channel = RedisChannel(redis_client, channel_key)
 
         workflow_entry = WorkflowEntry(
             tenant_id=self._workflow.tenant_id,
             app_id=self._workflow.app_id,
             workflow_id=self._workflow.id,
             graph=graph,
-            graph_config=self._workflow.graph_dict,
+            graph_config=compiled_workflow.graph_dict,
             user_id=self.application_generate_entity.user_id,
             user_from=user_from,
             invoke_from=invoke_from,
@@ -213,7 +224,7 @@ class AdvancedChatAppRunner(WorkflowBasedAppRunner):
                 workflow_id=self._workflow.id,
                 workflow_type=WorkflowType(self._workflow.type),
                 version=self._workflow.version,
-                graph_data=self._workflow.graph_dict,
+                graph_data=compiled_workflow.graph_dict,
             ),
             workflow_execution_repository=self._workflow_execution_repository,
             workflow_node_execution_repository=self._workflow_node_execution_repository,
@@ -3,14 +3,18 @@ import time
 from collections.abc import Sequence
 from typing import cast
 
+from configs import dify_config
 from core.app.apps.base_app_queue_manager import AppQueueManager
 from core.app.apps.workflow.app_config_manager import WorkflowAppConfig
 from core.app.apps.workflow_app_runner import WorkflowBasedAppRunner
 from core.app.entities.app_invoke_entities import InvokeFrom, WorkflowAppGenerateEntity
+from core.app.workflow.compiled_workflow import compiled_workflow_cache
 from core.app.workflow.layers.persistence import PersistenceWorkflowInfo, WorkflowPersistenceLayer
 from core.workflow.enums import WorkflowType
 from core.workflow.graph_engine.command_channels.redis_channel import RedisChannel
+from core.workflow.graph_engine.command_channels.redis_stream_channel import RedisStreamChannel
 from core.workflow.graph_engine.layers.base import GraphEngineLayer
+from core.workflow.graph_engine.protocols.command_channel import CommandChannel
 from core.workflow.repositories.workflow_execution_repository import WorkflowExecutionRepository
 from core.workflow.repositories.workflow_node_execution_repository import WorkflowNodeExecutionRepository
 from core.workflow.runtime import GraphRuntimeState, VariablePool
@@ -72,13 +76,15 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
         user_from = self._resolve_user_from(invoke_from)
 
         resume_state = self._resume_graph_runtime_state
+        compiled_workflow = compiled_workflow_cache.get(self._workflow)
 
         if resume_state is not None:
             graph_runtime_state = resume_state
             variable_pool = graph_runtime_state.variable_pool
             graph = self._init_graph(
-                graph_config=self._workflow.graph_dict,
+                graph_config=compiled_workflow.graph_dict,
                 graph_runtime_state=graph_runtime_state,
+                compiled_workflow=compiled_workflow,
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
@@ -107,14 +113,15 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
             variable_pool = VariablePool(
                 system_variables=system_inputs,
                 user_inputs=inputs,
-                environment_variables=self._workflow.environment_variables,
+                environment_variables=compiled_workflow.environment_variables,
                 conversation_variables=[],
             )
 
             graph_runtime_state = GraphRuntimeState(variable_pool=variable_pool, start_at=time.perf_counter())
             graph = self._init_graph(
-                graph_config=self._workflow.graph_dict,
+                graph_config=compiled_workflow.graph_dict,
                 graph_runtime_state=graph_runtime_state,
+                compiled_workflow=compiled_workflow,
                 workflow_id=self._workflow.id,
                 tenant_id=self._workflow.tenant_id,
                 user_id=self.application_generate_entity.user_id,
@@ -127,7 +134,11 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
         # Create Redis command channel for this workflow execution
         task_id = self.application_generate_entity.task_id
         channel_key = f"workflow:{task_id}:commands"
-        command_channel = RedisChannel(redis_client, channel_key)
+        command_channel: CommandChannel
+        if dify_config.GRAPH_ENGINE_REDIS_STREAM_COMMANDS_ENABLED:
+            command_channel = RedisStreamChannel(redis_client, channel_key)
+        else:
+            command_channel = RedisChannel(redis_client, channel_key)
 
         self._queue_manager.graph_runtime_state = graph_runtime_state
 
@@ -136,7 +147,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
             app_id=self._workflow.app_id,
             workflow_id=self._workflow.id,
             graph=graph,
-            graph_config=self._workflow.graph_dict,
+            graph_config=compiled_workflow.graph_dict,
             user_id=self.application_generate_entity.user_id,
             user_from=user_from,
             invoke_from=invoke_from,
@@ -152,7 +163,7 @@ class WorkflowAppRunner(WorkflowBasedAppRunner):
                 workflow_id=self._workflow.id,
                 workflow_type=WorkflowType(self._workflow.type),
                 version=self._workflow.version,
-                graph_data=self._workflow.graph_dict,
+                graph_data=compiled_workflow.graph_dict,
             ),
             workflow_execution_repository=self._workflow_execution_repository,
             workflow_node_execution_repository=self._workflow_node_execution_repository,
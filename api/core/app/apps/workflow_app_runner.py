@@ -29,6 +29,7 @@ from core.app.entities.queue_entities import (
     QueueWorkflowStartedEvent,
     QueueWorkflowSucceededEvent,
 )
+from core.app.workflow.compiled_workflow import CompiledWorkflow
 from core.app.workflow.node_factory import DifyNodeFactory
 from core.workflow.entities import GraphInitParams
 from core.workflow.entities.pause_reason import HumanInputRequired
@@ -104,9 +105,13 @@ class WorkflowBasedAppRunner:
         tenant_id: str = "",
         user_id: str = "",
         root_node_id: str | None = None,
+        compiled_workflow: CompiledWorkflow | None = None,
     ) -> Graph:
         """
         Init graph
+
+        When the compiled workflow is given, topology validation only runs the first time the
+        workflow version is initialized with this root node in this process.
         """
         if "nodes" not in graph_config or "edges" not in graph_config:
             raise ValueError("nodes or edges not found in workflow graph")
@@ -137,11 +142,20 @@ class WorkflowBasedAppRunner:
         )
 
         # init graph
-        graph = Graph.init(graph_config=graph_config, node_factory=node_factory, root_node_id=root_node_id)
+        skip_validation = compiled_workflow is not None and compiled_workflow.is_validated(root_node_id)
+        graph = Graph.init(
+            graph_config=graph_config,
+            node_factory=node_factory,
+            root_node_id=root_node_id,
+            skip_validation=skip_validation,
+        )
 
         if not graph:
             raise ValueError("graph not found in workflow")
 
+        if compiled_workflow is not None and not skip_validation:
+            compiled_workflow.mark_validated(root_node_id)
+
         return graph
 
     def _prepare_single_node_execution(
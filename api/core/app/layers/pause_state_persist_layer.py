@@ -1,10 +1,13 @@
+import struct
 from dataclasses import dataclass
 from typing import Annotated, Literal, Self, TypeAlias
 
+import orjson
 from pydantic import BaseModel, Field
 from sqlalchemy import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from configs import dify_config
 from core.app.entities.app_invoke_entities import AdvancedChatAppGenerateEntity, WorkflowAppGenerateEntity
 from core.workflow.graph_engine.layers.base import GraphEngineLayer
 from core.workflow.graph_events.base import GraphEngineEvent
@@ -32,6 +35,11 @@ _GenerateEntityUnion: TypeAlias = Annotated[
     Field(discriminator="type"),
 ]
 
+# Contexts holding a binary runtime state snapshot are stored as the magic and the length of the JSON of the
+# other fields, followed by that JSON and the snapshot.
+_BINARY_CONTEXT_PREFIX = struct.Struct(">4sI")
+_BINARY_CONTEXT_MAGIC = b"WRC2"
+
 
 class WorkflowResumptionContext(BaseModel):
     """WorkflowResumptionContext captures all state necessary for resumption."""
@@ -40,14 +48,30 @@ class WorkflowResumptionContext(BaseModel):
 
     # Only workflow / chatflow could be paused.
     generate_entity: _GenerateEntityUnion
-    serialized_graph_runtime_state: str
-
-    def dumps(self) -> str:
-        return self.model_dump_json()
+    # Produced by `GraphRuntimeState.dumps` (str) or `GraphRuntimeState.dumps_binary` (bytes)
+    serialized_graph_runtime_state: str | bytes
+
+    def dumps(self) -> str | bytes:
+        if isinstance(self.serialized_graph_runtime_state, str):
+            return self.model_dump_json()
+        header = self.model_dump_json(exclude={"serialized_graph_runtime_state"}).encode()
+        return b"".join(
+            [
+                _BINARY_CONTEXT_PREFIX.pack(_BINARY_CONTEXT_MAGIC, len(header)),
+                header,
+                self.serialized_graph_runtime_state,
+            ]
+        )
 
     @classmethod
-    def loads(cls, value: str) -> Self:
-        return cls.model_validate_json(value)
+    def loads(cls, value: str | bytes) -> Self:
+        if isinstance(value, str) or not value.startswith(_BINARY_CONTEXT_MAGIC):
+            return cls.model_validate_json(value)
+        _, header_length = _BINARY_CONTEXT_PREFIX.unpack_from(value)
+        state_start = _BINARY_CONTEXT_PREFIX.size + header_length
+        fields = orjson.loads(memoryview(value)[_BINARY_CONTEXT_PREFIX.size : state_start])
+        fields["serialized_graph_runtime_state"] = value[state_start:]
+        return cls.model_validate(fields)
 
     def get_generate_entity(self) -> WorkflowAppGenerateEntity | AdvancedChatAppGenerateEntity:
         return self.generate_entity.entity
@@ -114,8 +138,13 @@ class PauseStatePersistenceLayer(GraphEngineLayer):
         else:
             entity_wrapper = _AdvancedChatAppGenerateEntityWrapper(entity=self._generate_entity)
 
+        serialized_state: str | bytes
+        if dify_config.WORKFLOW_PAUSE_BINARY_SNAPSHOT_ENABLED:
+            serialized_state = self.graph_runtime_state.dumps_binary()
+        else:
+            serialized_state = self.graph_runtime_state.dumps()
         state = WorkflowResumptionContext(
-            serialized_graph_runtime_state=self.graph_runtime_state.dumps(),
+            serialized_graph_runtime_state=serialized_state,
             generate_entity=entity_wrapper,
         )
 
@@ -0,0 +1,98 @@
+"""Process-local cache of parsed and validated published workflows."""
+
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from cachetools import LRUCache
+
+from configs import dify_config
+from core.variables.variables import FloatVariable, IntegerVariable, SecretVariable, StringVariable
+from models.workflow import Workflow
+
+EnvironmentVariable = StringVariable | IntegerVariable | FloatVariable | SecretVariable
+
+
+class CompiledWorkflow:
+    """
+    Parsed form of one published workflow version, shared by all runs in the process.
+
+    The graph mapping is shared between runs and must not be mutated. Decrypted
+    environment variables are refreshed from the workflow row once older than ``env_ttl`` seconds,
+    so that a cache entry does not keep reusing plaintext secrets for its whole lifetime.
+    """
+
+    def __init__(self, workflow: Workflow):
+        self.workflow_id = workflow.id
+        self.app_id = workflow.app_id
+        self.graph_dict: Mapping[str, Any] = workflow.graph_dict
+        self.environment_variables: Sequence[EnvironmentVariable] = workflow.environment_variables
+        self._environment_variables_loaded_at = time.monotonic()
+        self._validated_root_node_ids: set[str | None] = set()
+        self._lock = threading.Lock()
+
+    def refresh_environment_variables(self, workflow: Workflow, env_ttl: float):
+        with self._lock:
+            if time.monotonic() - self._environment_variables_loaded_at < env_ttl:
+                return
+        environment_variables = workflow.environment_variables
+        with self._lock:
+            self.environment_variables = environment_variables
+            self._environment_variables_loaded_at = time.monotonic()
+
+    def is_validated(self, root_node_id: str | None) -> bool:
+        """Whether the graph topology already passed validation for this root node."""
+        with self._lock:
+            return root_node_id in self._validated_root_node_ids
+
+    def mark_validated(self, root_node_id: str | None):
+        with self._lock:
+            self._validated_root_node_ids.add(root_node_id)
+
+
+class CompiledWorkflowCache:
+    """
+    LRU cache of compiled workflows keyed by workflow id and last update time.
+
+    Published workflow rows are not rewritten in place, and any update bumps ``updated_at``, so a
+    stale entry is never served. Entries of an app are also dropped when a new version is published.
+    """
+
+    def __init__(self, max_size: int, env_ttl: float):
+        self._enabled = max_size > 0
+        self._cache: LRUCache[tuple[str, str], CompiledWorkflow] = LRUCache(maxsize=max(max_size, 1))
+        self._env_ttl = env_ttl
+        self._lock = threading.Lock()
+
+    def get(self, workflow: Workflow) -> CompiledWorkflow:
+        if not self._enabled or workflow.version == Workflow.VERSION_DRAFT:
+            # Drafts change on every sync, they are compiled per run and never validated from cache.
+            return CompiledWorkflow(workflow)
+
+        key = (workflow.id, workflow.updated_at.isoformat() if workflow.updated_at else "")
+        with self._lock:
+            compiled = self._cache.get(key)
+        if compiled is not None:
+            compiled.refresh_environment_variables(workflow, self._env_ttl)
+            return compiled
+
+        compiled = CompiledWorkflow(workflow)
+        with self._lock:
+            # Keep the entry of a concurrent compilation so that its validation state is shared.
+            return self._cache.setdefault(key, compiled)
+
+    def invalidate_app(self, app_id: str):
+        with self._lock:
+            for key in [key for key, compiled in self._cache.items() if compiled.app_id == app_id]:
+                del self._cache[key]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+compiled_workflow_cache = CompiledWorkflowCache(
+    max_size=dify_config.WORKFLOW_COMPILED_CACHE_SIZE,
+    env_ttl=dify_config.WORKFLOW_COMPILED_CACHE_ENV_TTL,
+)
@@ -1,10 +1,11 @@
-from collections.abc import Callable, Sequence
-from typing import TYPE_CHECKING, final
+from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, final
 
 from typing_extensions import override
 
 from configs import dify_config
 from core.file.file_manager import file_manager
+from core.helper.code_executor.batch_executor import BatchingCodeExecutor
 from core.helper.code_executor.code_executor import CodeExecutor
 from core.helper.code_executor.code_node_provider import CodeNodeProvider
 from core.helper.ssrf_proxy import ssrf_proxy
@@ -117,7 +118,7 @@ class DifyNodeFactory(NodeFactory):
                 config=node_config,
                 graph_init_params=self.graph_init_params,
                 graph_runtime_state=self.graph_runtime_state,
-                code_executor=self._code_executor,
+                code_executor=self._resolve_code_executor(node_data),
                 code_providers=self._code_providers,
                 code_limits=self._code_limits,
             )
@@ -158,3 +159,21 @@ class DifyNodeFactory(NodeFactory):
             graph_init_params=self.graph_init_params,
             graph_runtime_state=self.graph_runtime_state,
         )
+
+    def _resolve_code_executor(self, node_data: Mapping[str, Any]) -> type[CodeExecutor]:
+        """
+        Batch sandbox requests of code nodes running in a parallel iteration, unless a custom executor was injected.
+        """
+        if not dify_config.CODE_EXECUTION_BATCH_ENABLED or self._code_executor is not CodeExecutor:
+            return self._code_executor
+
+        iteration_id = node_data.get("iteration_id")
+        if not iteration_id:
+            return self._code_executor
+
+        for node in self.graph_init_params.graph_config.get("nodes", []):
+            if node.get("id") == iteration_id:
+                if node.get("data", {}).get("is_parallel"):
+                    return BatchingCodeExecutor
+                break
+        return self._code_executor
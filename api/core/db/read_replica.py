@@ -0,0 +1,105 @@
+"""Routing of read-only sessions to a read replica of the database."""
+
+import logging
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+
+logger = logging.getLogger(__name__)
+
+# A standby that has replayed everything it received isn't behind, however old its last replayed transaction is
+_PG_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReadReplicaRouter:
+    """
+    Chooses the engine of read-only sessions: the replica while it can be reached and its replication lag
+    is within ``max_lag_seconds``, the primary otherwise.
+
+    The lag is measured by one caller at most every ``lag_check_interval`` seconds per process, the other
+    callers keep using the engine chosen by the last check. Until the first check has completed, the
+    primary is used.
+    """
+
+    def __init__(self, primary: Engine, replica: Engine, max_lag_seconds: float, lag_check_interval: float):
+        self._primary = primary
+        self._replica = replica
+        self._max_lag_seconds = max_lag_seconds
+        self._lag_check_interval = lag_check_interval
+        self._replica_usable = False
+        self._next_check_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self) -> Engine:
+        return self._primary
+
+    def get_engine(self) -> Engine:
+        now = time.monotonic()
+        with self._lock:
+            due = now >= self._next_check_at
+            if due:
+                self._next_check_at = now + self._lag_check_interval
+            replica_usable = self._replica_usable
+        if due:
+            replica_usable = self._check_replica()
+            with self._lock:
+                self._replica_usable = replica_usable
+        return self._replica if replica_usable else self._primary
+
+    def _check_replica(self) -> bool:
+        try:
+            with self._replica.connect() as conn:
+                lag = self._measure_lag(conn)
+        except Exception:
+            logger.warning("Failed to check the read replica, reading from the primary", exc_info=True)
+            return False
+        if lag is None or lag > self._max_lag_seconds:
+            logger.warning("Read replica lags behind by %s seconds, reading from the primary", lag)
+            return False
+        return True
+
+    @staticmethod
+    def _measure_lag(conn: Connection) -> float | None:
+        """The replication lag of the replica in seconds, None if replication is stopped."""
+        if dify_config.DB_TYPE == "postgresql":
+            return float(conn.scalar(_PG_LAG_QUERY) or 0)
+        if dify_config.DB_TYPE == "mysql":
+            status = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+            # Not replicating from a primary it knows about, e.g. a managed read endpoint
+            if status is None:
+                return 0.0
+            lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+            return None if lag is None else float(lag)
+        # Replication lag isn't exposed in a portable way by the other MySQL compatible databases
+        conn.execute(text("SELECT 1"))
+        return 0.0
+
+
+class ReadOnlySession(Session):
+    """
+    Session bound to the engine its router chooses when it first needs a connection, so all of its
+    queries see the same database. It's meant for queries only, changes aren't guaranteed to reach the
+    primary.
+    """
+
+    def __init__(self, router: ReadReplicaRouter, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._router = router
+        self._routed_engine: Engine | None = None
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Engine:
+        if self._routed_engine is None:
+            self._routed_engine = self._router.get_engine()
+        return self._routed_engine
@@ -1,7 +1,11 @@
 from sqlalchemy import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from core.db.read_replica import ReadOnlySession, ReadReplicaRouter
+
 _session_maker: sessionmaker[Session] | None = None
+_read_only_session_maker: sessionmaker[Session] | None = None
+_read_replica_router: ReadReplicaRouter | None = None
 
 
 def configure_session_factory(engine: Engine, expire_on_commit: bool = False):
@@ -10,16 +14,50 @@ def configure_session_factory(engine: Engine, expire_on_commit: bool = False):
     _session_maker = sessionmaker(bind=engine, expire_on_commit=expire_on_commit)
 
 
+def configure_read_only_session_factory(router: ReadReplicaRouter | None, expire_on_commit: bool = False):
+    """Configure the factory of read-only sessions, which use the primary when no read replica router is given"""
+    global _read_only_session_maker, _read_replica_router
+    _read_replica_router = router
+    if router is None:
+        _read_only_session_maker = None
+    else:
+        _read_only_session_maker = sessionmaker(
+            class_=ReadOnlySession, router=router, expire_on_commit=expire_on_commit
+        )
+
+
 def get_session_maker() -> sessionmaker[Session]:
     if _session_maker is None:
         raise RuntimeError("Session factory not configured. Call configure_session_factory() first.")
     return _session_maker
 
 
+def get_read_only_session_maker() -> sessionmaker[Session]:
+    """
+    Sessions for queries that tolerate the replication lag of the read replica, e.g. listings and statistics.
+
+    They read from the read replica while it's in sync and from the primary otherwise, or when there's no replica.
+    """
+    return _read_only_session_maker or get_session_maker()
+
+
+def get_read_only_engine() -> Engine:
+    """The engine read-only queries are currently routed to, for queries that don't use a session"""
+    if _read_replica_router is not None:
+        return _read_replica_router.get_engine()
+    engine = get_session_maker().kw["bind"]
+    assert isinstance(engine, Engine)
+    return engine
+
+
 def create_session() -> Session:
     return get_session_maker()()
 
 
+def create_read_only_session() -> Session:
+    return get_read_only_session_maker()()
+
+
 # Class wrapper for convenience
 class SessionFactory:
     @staticmethod
@@ -30,9 +68,21 @@ class SessionFactory:
     def get_session_maker() -> sessionmaker[Session]:
         return get_session_maker()
 
+    @staticmethod
+    def get_read_only_session_maker() -> sessionmaker[Session]:
+        return get_read_only_session_maker()
+
+    @staticmethod
+    def get_read_only_engine() -> Engine:
+        return get_read_only_engine()
+
     @staticmethod
     def create_session() -> Session:
         return create_session()
 
+    @staticmethod
+    def create_read_only_session() -> Session:
+        return create_read_only_session()
+
 
 session_factory = SessionFactory()
@@ -0,0 +1,117 @@
+"""Micro-batching of workflow code executions into single sandbox requests."""
+
+import logging
+import threading
+from collections.abc import Mapping
+from typing import Any
+
+from configs import dify_config
+from core.helper.code_executor.code_executor import CodeExecutionError, CodeExecutor, CodeLanguage
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.inputs_list: list[Mapping[str, Any]] = []
+        self.results: list[Mapping[str, Any] | CodeExecutionError] = []
+        self.error: CodeExecutionError | None = None
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class CodeExecutionBatcher:
+    """
+    Groups concurrent executions of the same code into batch requests.
+
+    The first caller of a batch becomes its leader: it waits up to ``window`` seconds, or until the
+    batch holds ``max_size`` input sets, then sends the batch and hands each follower its own result.
+    A batch request failing as a whole (e.g. the sandbox timing out on the combined run) is retried
+    item by item, so that each execution reports its own error.
+    """
+
+    def __init__(self, executor: type[CodeExecutor], max_size: int, window: float):
+        self._executor = executor
+        self._max_size = max_size
+        self._window = window
+        self._pending: dict[tuple[CodeLanguage, str], _PendingBatch] = {}
+        self._lock = threading.Lock()
+
+    def execute(self, language: CodeLanguage, code: str, inputs: Mapping[str, Any]) -> Mapping[str, Any]:
+        key = (language, code)
+        with self._lock:
+            batch = self._pending.get(key)
+            is_leader = batch is None
+            if batch is None:
+                batch = _PendingBatch()
+                self._pending[key] = batch
+            index = len(batch.inputs_list)
+            batch.inputs_list.append(inputs)
+            if len(batch.inputs_list) >= self._max_size:
+                del self._pending[key]
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self._window)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    del self._pending[key]
+            self._run(language, code, batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        result = batch.results[index]
+        if isinstance(result, CodeExecutionError):
+            raise result
+        return result
+
+    def _run(self, language: CodeLanguage, code: str, batch: _PendingBatch):
+        try:
+            try:
+                batch.results = self._executor.execute_workflow_code_template_batch(language, code, batch.inputs_list)
+            except CodeExecutionError:
+                if len(batch.inputs_list) == 1:
+                    raise
+                logger.warning(
+                    "Batch code execution of %s items failed, retrying them one by one",
+                    len(batch.inputs_list),
+                    exc_info=True,
+                )
+                batch.results = [
+                    self._executor.execute_workflow_code_template_batch(language, code, [inputs])[0]
+                    for inputs in batch.inputs_list
+                ]
+        except CodeExecutionError as e:
+            batch.error = e
+        except Exception as e:
+            batch.error = CodeExecutionError(str(e))
+        finally:
+            batch.done.set()
+
+
+class BatchingCodeExecutor(CodeExecutor):
+    """
+    Code executor sending concurrent executions of the same code as batches.
+
+    Used for code nodes inside parallel iterations, where many branches run the same code at once.
+    """
+
+    batcher: CodeExecutionBatcher | None = None
+    batcher_lock = threading.Lock()
+
+    @classmethod
+    def execute_workflow_code_template(cls, language: CodeLanguage, code: str, inputs: Mapping[str, Any]):
+        return cls._get_batcher().execute(language, code, inputs)
+
+    @classmethod
+    def _get_batcher(cls) -> CodeExecutionBatcher:
+        with cls.batcher_lock:
+            if cls.batcher is None:
+                cls.batcher = CodeExecutionBatcher(
+                    executor=CodeExecutor,
+                    max_size=dify_config.CODE_EXECUTION_BATCH_MAX_SIZE,
+                    window=dify_config.CODE_EXECUTION_BATCH_WINDOW,
+                )
+            return cls.batcher
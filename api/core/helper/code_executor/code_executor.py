@@ -1,7 +1,10 @@
 import logging
-from collections.abc import Mapping
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from enum import StrEnum
-from threading import Lock
+from threading import BoundedSemaphore, Lock
 from typing import Any
 
 import httpx
@@ -30,6 +33,59 @@ class CodeExecutionError(Exception):
     pass
 
 
+@dataclass
+class CodeExecutionMetrics:
+    requests: int = 0
+    failed_requests: int = 0
+    batch_requests: int = 0
+    batched_executions: int = 0
+    in_flight: int = 0
+    total_latency: float = 0.0
+
+
+class _CodeExecutionLimiter:
+    """
+    Bounds the number of in-flight sandbox requests of this process and records request metrics.
+    """
+
+    def __init__(self, max_concurrent_requests: int):
+        self._semaphore = BoundedSemaphore(max_concurrent_requests) if max_concurrent_requests > 0 else None
+        self._metrics = CodeExecutionMetrics()
+        self._lock = Lock()
+
+    @contextmanager
+    def request(self, batch_size: int | None = None) -> Iterator[None]:
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        with self._lock:
+            self._metrics.requests += 1
+            self._metrics.in_flight += 1
+            if batch_size is not None:
+                self._metrics.batch_requests += 1
+                self._metrics.batched_executions += batch_size
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._metrics.failed_requests += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._metrics.in_flight -= 1
+                self._metrics.total_latency += elapsed
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def metrics(self) -> CodeExecutionMetrics:
+        with self._lock:
+            return replace(self._metrics)
+
+
+_code_execution_limiter = _CodeExecutionLimiter(dify_config.CODE_EXECUTION_MAX_CONCURRENT_REQUESTS)
+
+
 class CodeExecutionResponse(BaseModel):
     class Data(BaseModel):
         stdout: str | None = None
@@ -72,14 +128,27 @@ class CodeExecutor:
     supported_dependencies_languages: set[CodeLanguage] = {CodeLanguage.PYTHON3}
 
     @classmethod
-    def execute_code(cls, language: CodeLanguage, preload: str, code: str) -> str:
+    def metrics(cls) -> CodeExecutionMetrics:
+        """
+        Snapshot of the sandbox request metrics of this process
+        """
+        return _code_execution_limiter.metrics()
+
+    @classmethod
+    def execute_code(cls, language: CodeLanguage, preload: str, code: str, batch_size: int | None = None) -> str:
         """
         Execute code
         :param language: code language
         :param preload: the preload script
         :param code: code
+        :param batch_size: number of input sets when the code is a batch runner, used for metrics
         :return:
         """
+        with _code_execution_limiter.request(batch_size):
+            return cls._execute_code(language, preload, code)
+
+    @classmethod
+    def _execute_code(cls, language: CodeLanguage, preload: str, code: str) -> str:
         url = code_execution_endpoint_url / "v1" / "sandbox" / "run"
 
         headers = {"X-Api-Key": dify_config.CODE_EXECUTION_API_KEY}
@@ -147,6 +216,10 @@ class CodeExecutor:
         :param inputs: inputs
         :return:
         """
+        return cls._execute_single_workflow_code_template(language, code, inputs)
+
+    @classmethod
+    def _execute_single_workflow_code_template(cls, language: CodeLanguage, code: str, inputs: Mapping[str, Any]):
         template_transformer = cls.code_template_transformers.get(language)
         if not template_transformer:
             raise CodeExecutionError(f"Unsupported language {language}")
@@ -154,3 +227,40 @@ class CodeExecutor:
         runner, preload = template_transformer.transform_caller(code, inputs)
         response = cls.execute_code(language, preload, runner)
         return template_transformer.transform_response(response)
+
+    @classmethod
+    def execute_workflow_code_template_batch(
+        cls, language: CodeLanguage, code: str, inputs_list: Sequence[Mapping[str, Any]]
+    ) -> list[Mapping[str, Any] | CodeExecutionError]:
+        """
+        Execute code once per input set, in a single sandbox request when the language supports it
+        :param language: code language
+        :param code: code
+        :param inputs_list: input sets
+        :return: the result, or the error of the execution, for each input set in order
+        """
+        template_transformer = cls.code_template_transformers.get(language)
+        if not template_transformer:
+            raise CodeExecutionError(f"Unsupported language {language}")
+
+        if len(inputs_list) == 1 or not template_transformer.supports_batch():
+            return [cls._execute_workflow_code_template_safely(language, code, inputs) for inputs in inputs_list]
+
+        runner, preload = template_transformer.transform_batch_caller(code, inputs_list)
+        response = cls.execute_code(language, preload, runner, batch_size=len(inputs_list))
+        try:
+            results = template_transformer.transform_batch_response(response, len(inputs_list))
+        except ValueError as e:
+            raise CodeExecutionError(str(e)) from e
+        return [CodeExecutionError(str(r)) if isinstance(r, ValueError) else r for r in results]
+
+    @classmethod
+    def _execute_workflow_code_template_safely(
+        cls, language: CodeLanguage, code: str, inputs: Mapping[str, Any]
+    ) -> Mapping[str, Any] | CodeExecutionError:
+        try:
+            return cls._execute_single_workflow_code_template(language, code, inputs)
+        except CodeExecutionError as e:
+            return e
+        except ValueError as e:
+            return CodeExecutionError(str(e))
@@ -20,3 +20,26 @@ class NodeJsTemplateTransformer(TemplateTransformer):
             console.log(result)
             """)
         return runner_script
+
+    @classmethod
+    def get_batch_runner_script(cls) -> str:
+        runner_script = dedent(f"""            {cls._code_placeholder}
+
+            // decode and prepare input objects
+            var inputs_list = JSON.parse(Buffer.from('{cls._inputs_placeholder}', 'base64').toString('utf-8'))
+
+            // execute main function once per input object, an error only fails its own item
+            var items = inputs_list.map(function (inputs_obj) {{
+                try {{
+                    var output_json = JSON.stringify(main(inputs_obj))
+                    return '{{"output": ' + (output_json === undefined ? 'null' : output_json) + '}}'
+                }} catch (e) {{
+                    return JSON.stringify({{ error: String(e) }})
+                }}
+            }})
+
+            // convert outputs to json and print
+            var result = `<<RESULT>>[${{items.join(',')}}]<<RESULT>>`
+            console.log(result)
+            """)
+        return runner_script
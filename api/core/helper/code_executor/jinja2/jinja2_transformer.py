@@ -1,6 +1,4 @@
-from collections.abc import Mapping
 from textwrap import dedent
-from typing import Any
 
 from core.helper.code_executor.template_transformer import TemplateTransformer
 
@@ -19,19 +17,15 @@ class Jinja2TemplateTransformer(TemplateTransformer):
         return {"result": cls.extract_result_str_from_response(response)}
 
     @classmethod
-    def assemble_runner_script(cls, code: str, inputs: Mapping[str, Any]) -> str:
+    def embed_code(cls, script: str, code: str) -> str:
         """
         Override base class to use base64 encoding for template code.
         This prevents issues with special characters (quotes, newlines) in templates
         breaking the generated Python script. Fixes #26818.
         """
-        script = cls.get_runner_script()
         # Encode template as base64 to safely embed any content including quotes
         code_b64 = cls.serialize_code(code)
-        script = script.replace(cls._template_b64_placeholder, code_b64)
-        inputs_str = cls.serialize_inputs(inputs)
-        script = script.replace(cls._inputs_placeholder, inputs_str)
-        return script
+        return script.replace(cls._template_b64_placeholder, code_b64)
 
     @classmethod
     def get_runner_script(cls) -> str:
@@ -23,3 +23,28 @@ class Python3TemplateTransformer(TemplateTransformer):
             print(result)
             """)
         return runner_script
+
+    @classmethod
+    def get_batch_runner_script(cls) -> str:
+        runner_script = dedent(f"""            {cls._code_placeholder}
+
+            import json
+            from base64 import b64decode
+
+            # decode and prepare input dicts
+            inputs_list = json.loads(b64decode('{cls._inputs_placeholder}').decode('utf-8'))
+
+            # execute main function once per input dict, an error only fails its own item
+            items = []
+            for inputs_obj in inputs_list:
+                try:
+                    items.append('{{"output": ' + json.dumps(main(**inputs_obj)) + '}}')
+                except Exception as e:
+                    items.append(json.dumps({{"error": f"{{type(e).__name__}}: {{e}}"}}))
+
+            # convert outputs to json and print
+            output_json = '[' + ','.join(items) + ']'
+            result = f'''<<RESULT>>{{output_json}}<<RESULT>>'''
+            print(result)
+            """)
+        return runner_script
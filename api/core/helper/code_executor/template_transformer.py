@@ -1,12 +1,21 @@
+import hashlib
 import json
 import re
+import threading
 from abc import ABC, abstractmethod
 from base64 import b64encode
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
+from cachetools import LRUCache
+
 from core.variables.utils import dumps_with_segments
 
+# Runner scripts with the user code already embedded, keyed by transformer, script kind and code hash.
+# Code nodes inside iterations execute the same code many times, only the inputs differ.
+_embedded_script_cache: LRUCache[tuple[str, bool, str], str] = LRUCache(maxsize=256)
+_embedded_script_cache_lock = threading.Lock()
+
 
 class TemplateTransformer(ABC):
     _code_placeholder: str = "{{code}}"
@@ -35,6 +44,25 @@ class TemplateTransformer(ABC):
 
         return runner_script, preload_script
 
+    @classmethod
+    def supports_batch(cls) -> bool:
+        return cls.get_batch_runner_script() is not None
+
+    @classmethod
+    def transform_batch_caller(cls, code: str, inputs_list: Sequence[Mapping[str, Any]]) -> tuple[str, str]:
+        """
+        Transform code to a runner executing the main function once per input set
+        :param code: code
+        :param inputs_list: input sets
+        :return: runner, preload
+        """
+        script = cls._get_embedded_script(code, batch=True)
+        inputs_str = cls.serialize_inputs_list(inputs_list)
+        runner_script = script.replace(cls._inputs_placeholder, inputs_str)
+        preload_script = cls.get_preload_script()
+
+        return runner_script, preload_script
+
     @classmethod
     def extract_result_str_from_response(cls, response: str):
         result = re.search(rf"{cls._result_tag}(.*){cls._result_tag}", response, re.DOTALL)
@@ -61,6 +89,40 @@ class TemplateTransformer(ABC):
         except Exception as e:
             raise ValueError(f"Unexpected error during response transformation: {str(e)}")
 
+        return cls._validate_result(result)
+
+    @classmethod
+    def transform_batch_response(cls, response: str, expected_count: int) -> list[Mapping[str, Any] | ValueError]:
+        """
+        Transform the response of a batch runner to one result per input set
+        :param response: response
+        :param expected_count: number of input sets sent to the runner
+        :return: the result dict, or the error raised by the main function, for each input set
+        """
+        try:
+            result_str = cls.extract_result_str_from_response(response)
+            items = json.loads(result_str)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON response: {str(e)}.")
+
+        if not isinstance(items, list) or len(items) != expected_count:
+            raise ValueError(f"Batch result must be a list of {expected_count} items")
+
+        results: list[Mapping[str, Any] | ValueError] = []
+        for item in items:
+            if not isinstance(item, dict):
+                results.append(ValueError(f"Batch item must be a dict, got {type(item).__name__}"))
+            elif "error" in item:
+                results.append(ValueError(str(item["error"])))
+            else:
+                try:
+                    results.append(cls._validate_result(item.get("output")))
+                except ValueError as e:
+                    results.append(e)
+        return results
+
+    @classmethod
+    def _validate_result(cls, result: Any) -> Mapping[str, Any]:
         if not isinstance(result, dict):
             raise ValueError(f"Result must be a dict, got {type(result).__name__}")
         if not all(isinstance(k, str) for k in result):
@@ -100,21 +162,58 @@ class TemplateTransformer(ABC):
         """
         pass
 
+    @classmethod
+    def get_batch_runner_script(cls) -> str | None:
+        """
+        Get runner script executing the main function once per input set, None if batching is not supported.
+
+        The script must print a JSON list wrapped in result tags, holding ``{"output": ...}``
+        or ``{"error": "..."}`` for each input set, in input order.
+        """
+        return None
+
     @classmethod
     def serialize_inputs(cls, inputs: Mapping[str, Any]) -> str:
         inputs_json_str = dumps_with_segments(inputs, ensure_ascii=False).encode()
         input_base64_encoded = b64encode(inputs_json_str).decode("utf-8")
         return input_base64_encoded
 
+    @classmethod
+    def serialize_inputs_list(cls, inputs_list: Sequence[Mapping[str, Any]]) -> str:
+        inputs_json_str = dumps_with_segments(list(inputs_list), ensure_ascii=False).encode()
+        return b64encode(inputs_json_str).decode("utf-8")
+
     @classmethod
     def assemble_runner_script(cls, code: str, inputs: Mapping[str, Any]) -> str:
         # assemble runner script
-        script = cls.get_runner_script()
-        script = script.replace(cls._code_placeholder, code)
+        script = cls._get_embedded_script(code, batch=False)
         inputs_str = cls.serialize_inputs(inputs)
         script = script.replace(cls._inputs_placeholder, inputs_str)
         return script
 
+    @classmethod
+    def embed_code(cls, script: str, code: str) -> str:
+        """
+        Embed the user code into a runner script
+        """
+        return script.replace(cls._code_placeholder, code)
+
+    @classmethod
+    def _get_embedded_script(cls, code: str, batch: bool) -> str:
+        key = (cls.__qualname__, batch, hashlib.sha256(code.encode("utf-8")).hexdigest())
+        with _embedded_script_cache_lock:
+            script = _embedded_script_cache.get(key)
+        if script is not None:
+            return script
+
+        template = cls.get_batch_runner_script() if batch else cls.get_runner_script()
+        if template is None:
+            raise ValueError(f"{cls.__name__} does not support batch execution")
+        script = cls.embed_code(template, code)
+        with _embedded_script_cache_lock:
+            _embedded_script_cache[key] = script
+        return script
+
     @classmethod
     def get_preload_script(cls) -> str:
         """
@@ -0,0 +1,215 @@
+"""Opt-in cache of LLM invocation results for repeated deterministic calls."""
+
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Generator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from cachetools import TTLCache
+from pydantic import ValidationError
+
+from configs import dify_config
+from core.model_runtime.entities.llm_entities import LLMResult, LLMResultChunk, LLMResultChunkDelta, LLMUsage
+from core.model_runtime.entities.message_entities import AssistantPromptMessage, PromptMessage, PromptMessageTool
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Size of the synthetic chunks a cached result is replayed in on the streaming path.
+_REPLAY_CHUNK_SIZE = 256
+
+
+@dataclass
+class LLMResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    saved_prompt_tokens: int = 0
+    saved_completion_tokens: int = 0
+
+
+class LLMResultCache:
+    """
+    Two-level cache of LLM results: a per-process TTL cache in front of Redis.
+
+    Callers opt in per invocation with a cache scope (e.g. the app and node id), which is part of
+    the key together with the provider, model, parameters, prompt messages, tools and stop words.
+    Cache hits report an empty usage so that they are neither billed nor deducted from quota, the
+    tokens they saved are counted in ``stats()`` instead.
+    """
+
+    def __init__(self, enabled: bool, ttl: int, local_max_size: int, max_entry_size: int):
+        self._enabled = enabled
+        self._ttl = ttl
+        self._max_entry_size = max_entry_size
+        self._local: TTLCache[str, LLMResult] = TTLCache(maxsize=local_max_size, ttl=ttl)
+        self._stats = LLMResultCacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @staticmethod
+    def build_key(
+        *,
+        scope: str,
+        provider: str,
+        model: str,
+        model_parameters: Mapping[str, Any] | None,
+        prompt_messages: Sequence[PromptMessage],
+        tools: Sequence[PromptMessageTool] | None,
+        stop: Sequence[str] | None,
+    ) -> str:
+        payload = {
+            "scope": scope,
+            "provider": provider,
+            "model": model,
+            "parameters": dict(model_parameters or {}),
+            "prompt_messages": [message.model_dump(mode="json") for message in prompt_messages],
+            "tools": [tool.model_dump(mode="json") for tool in tools or []],
+            "stop": list(stop or []),
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return f"llm_result_cache:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> LLMResult | None:
+        with self._lock:
+            result = self._local.get(key)
+        if result is None:
+            result = self._get_remote(key)
+            if result is not None:
+                with self._lock:
+                    self._local[key] = result
+
+        with self._lock:
+            if result is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                self._stats.saved_prompt_tokens += result.usage.prompt_tokens
+                self._stats.saved_completion_tokens += result.usage.completion_tokens
+        if result is None:
+            return None
+        return result.model_copy(update={"usage": LLMUsage.empty_usage()})
+
+    def set(self, key: str, result: LLMResult):
+        # The prompt messages are part of the key already, don't store them twice.
+        result = result.model_copy(update={"prompt_messages": []})
+        data = result.model_dump_json()
+        if len(data) > self._max_entry_size:
+            return
+
+        with self._lock:
+            self._local[key] = result
+            self._stats.stores += 1
+        try:
+            redis_client.setex(key, self._ttl, data)
+        except Exception:
+            logger.warning("Failed to store LLM result in cache", exc_info=True)
+
+    def cache_stream(
+        self, key: str, chunks: Generator[LLMResultChunk, None, None]
+    ) -> Generator[LLMResultChunk, None, None]:
+        """
+        Pass the chunks of a streamed invocation through, caching the result once the stream completed.
+
+        Streams with tool calls or non-text content are passed through without being cached.
+        """
+        model = ""
+        system_fingerprint = None
+        text_parts: list[str] = []
+        usage: LLMUsage | None = None
+        cacheable = True
+        for chunk in chunks:
+            yield chunk
+            model = chunk.model
+            system_fingerprint = chunk.system_fingerprint
+            message = chunk.delta.message
+            if message.tool_calls or not (message.content is None or isinstance(message.content, str)):
+                cacheable = False
+            elif message.content:
+                text_parts.append(message.content)
+            if chunk.delta.usage is not None:
+                usage = chunk.delta.usage
+
+        if cacheable:
+            self.set(
+                key,
+                LLMResult(
+                    model=model,
+                    message=AssistantPromptMessage(content="".join(text_parts)),
+                    usage=usage or LLMUsage.empty_usage(),
+                    system_fingerprint=system_fingerprint,
+                ),
+            )
+
+    @staticmethod
+    def replay(result: LLMResult, prompt_messages: Sequence[PromptMessage]) -> Generator[LLMResultChunk, None, None]:
+        """Replay a cached result as a stream of synthetic chunks."""
+        content = result.message.content
+        pieces: list[AssistantPromptMessage] = []
+        if isinstance(content, str):
+            pieces = [
+                AssistantPromptMessage(content=content[i : i + _REPLAY_CHUNK_SIZE])
+                for i in range(0, len(content), _REPLAY_CHUNK_SIZE)
+            ]
+        elif content:
+            pieces = [AssistantPromptMessage(content=content)]
+        if result.message.tool_calls:
+            pieces.append(AssistantPromptMessage(content="", tool_calls=result.message.tool_calls))
+        if not pieces:
+            pieces = [AssistantPromptMessage(content="")]
+
+        for index, message in enumerate(pieces):
+            is_last = index == len(pieces) - 1
+            yield LLMResultChunk(
+                model=result.model,
+                prompt_messages=prompt_messages,
+                system_fingerprint=result.system_fingerprint,
+                delta=LLMResultChunkDelta(
+                    index=index,
+                    message=message,
+                    usage=result.usage if is_last else None,
+                    finish_reason="stop" if is_last else None,
+                ),
+            )
+
+    def stats(self) -> LLMResultCacheStats:
+        with self._lock:
+            return LLMResultCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                stores=self._stats.stores,
+                saved_prompt_tokens=self._stats.saved_prompt_tokens,
+                saved_completion_tokens=self._stats.saved_completion_tokens,
+            )
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _get_remote(self, key: str) -> LLMResult | None:
+        try:
+            data = redis_client.get(key)
+        except Exception:
+            logger.warning("Failed to read LLM result from cache", exc_info=True)
+            return None
+        if not data:
+            return None
+        try:
+            return LLMResult.model_validate_json(data)
+        except ValidationError:
+            logger.warning("Ignoring invalid cached LLM result %s", key)
+            return None
+
+
+llm_result_cache = LLMResultCache(
+    enabled=dify_config.LLM_RESULT_CACHE_ENABLED,
+    ttl=dify_config.LLM_RESULT_CACHE_TTL,
+    local_max_size=dify_config.LLM_RESULT_CACHE_LOCAL_SIZE,
+    max_entry_size=dify_config.LLM_RESULT_CACHE_MAX_ENTRY_SIZE,
+)
@@ -5,7 +5,10 @@ import re
 import threading
 import time
 import uuid
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, cast
 
 from flask import Flask, current_app
 from sqlalchemy import select
@@ -15,16 +18,20 @@ from configs import dify_config
 from core.entities.knowledge_entities import IndexingEstimate, PreviewDetail, QAPreviewDetail
 from core.errors.error import ProviderTokenNotInitError
 from core.model_manager import ModelInstance, ModelManager
-from core.model_runtime.entities.model_entities import ModelType
+from core.model_runtime.entities.model_entities import ModelPropertyKey, ModelType
+from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.rag.cleaner.clean_processor import CleanProcessor
 from core.rag.datasource.keyword.keyword_factory import Keyword
 from core.rag.docstore.dataset_docstore import DatasetDocumentStore
+from core.rag.embedding.cached_embedding import CacheEmbedding
 from core.rag.extractor.entity.datasource_type import DatasourceType
 from core.rag.extractor.entity.extract_setting import ExtractSetting, NotionInfo, WebsiteInfo
+from core.rag.extractor.extract_processor import STREAMED_FILE_EXTENSIONS
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.index_processor.index_processor_base import BaseIndexProcessor
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.rag.models.document import ChildDocument, Document
+from core.rag.pipeline.staged_pipeline import PipelineStage, StagedPipeline, StageMetrics
 from core.rag.splitter.fixed_text_splitter import (
     EnhanceRecursiveCharacterTextSplitter,
     FixedRecursiveCharacterTextSplitter,
@@ -40,15 +47,36 @@ from models import Account
 from models.dataset import ChildChunk, Dataset, DatasetProcessRule, DocumentSegment
 from models.dataset import Document as DatasetDocument
 from models.model import UploadFile
+from services.entities.knowledge_entities.knowledge_entities import ParentMode
 from services.feature_service import FeatureService
 
 logger = logging.getLogger(__name__)
 
+# Number of lazily extracted rows split together
+_TRANSFORM_BATCH_SIZE = 1000
+
+
+@dataclass
+class _IndexingJob:
+    """A document moving through the stages of the indexing pipeline."""
+
+    document_id: str
+    dataset_id: str = ""
+    doc_form: str = ""
+    doc_language: str = ""
+    created_by: str = ""
+    process_rule: dict = field(default_factory=dict)
+    text_docs: list[Document] = field(default_factory=list)
+    documents: list[Document] = field(default_factory=list)
+    embedding_model_instance: ModelInstance | None = None
+    embedding_max_chunks: int = 1
+
 
 class IndexingRunner:
     def __init__(self):
         self.storage = storage
         self.model_manager = ModelManager()
+        self.pipeline_metrics: list[StageMetrics] = []
 
     def _handle_indexing_error(self, document_id: str, error: Exception) -> None:
         """Handle indexing errors by updating document status."""
@@ -63,6 +91,13 @@ class IndexingRunner:
 
     def run(self, dataset_documents: list[DatasetDocument]):
         """Run the indexing process."""
+        if (
+            dify_config.INDEXING_PIPELINE_ENABLED
+            and len(dataset_documents) >= dify_config.INDEXING_PIPELINE_MIN_DOCUMENTS
+        ):
+            self._run_pipelined(dataset_documents)
+            return
+
         for dataset_document in dataset_documents:
             document_id = dataset_document.id
             try:
@@ -87,7 +122,7 @@ class IndexingRunner:
                 index_type = requeried_document.doc_form
                 index_processor = IndexProcessorFactory(index_type).init_index_processor()
                 # extract
-                text_docs = self._extract(index_processor, requeried_document, processing_rule.to_dict())
+                text_docs = self._extract_lazily(index_processor, requeried_document, processing_rule.to_dict())
 
                 # transform
                 current_user = db.session.query(Account).filter_by(id=requeried_document.created_by).first()
@@ -121,6 +156,180 @@ class IndexingRunner:
             except Exception as e:
                 self._handle_indexing_error(document_id, e)
 
+    def _run_pipelined(self, dataset_documents: list[DatasetDocument]):
+        """
+        Run the indexing process for many documents with extraction, splitting, embedding and loading
+        running concurrently.
+
+        Documents flow through the stages independently, so extracting one document no longer waits
+        for another one to be embedded, and texts of several documents are embedded in shared
+        batches of up to the model's max chunks. Embeddings computed by the embedding stage are
+        stored in the embedding cache, from which the load stage picks them up.
+        """
+        flask_app: Flask = current_app._get_current_object()  # type: ignore
+        paused_document_ids: list[str] = []
+        pipeline: StagedPipeline
+
+        def run_step(job: _IndexingJob, step: Callable[[_IndexingJob], None]) -> list[_IndexingJob]:
+            try:
+                step(job)
+                return [job]
+            except DocumentIsPausedError:
+                # Like the sequential run, stop indexing the remaining documents.
+                paused_document_ids.append(job.document_id)
+                pipeline.abort()
+            except (ObjectDeletedError, DocumentIsDeletedPausedError):
+                logger.warning("Document deleted, document id: %s", job.document_id)
+            except Exception as e:
+                self._handle_indexing_error(job.document_id, e)
+            return []
+
+        pipeline = StagedPipeline(
+            stages=[
+                PipelineStage(
+                    name="extract",
+                    process=lambda jobs: run_step(jobs[0], self._pipeline_extract),
+                    workers=dify_config.INDEXING_PIPELINE_EXTRACT_WORKERS,
+                ),
+                PipelineStage(
+                    name="split",
+                    process=lambda jobs: run_step(jobs[0], self._pipeline_split),
+                    workers=dify_config.INDEXING_PIPELINE_SPLIT_WORKERS,
+                ),
+                PipelineStage(
+                    name="embed",
+                    process=self._pipeline_embed,
+                    batch_limit=lambda job: job.embedding_max_chunks,
+                    batch_weight=lambda job: len(self._texts_to_embed(job)),
+                ),
+                PipelineStage(
+                    name="load",
+                    process=lambda jobs: run_step(jobs[0], self._pipeline_load),
+                    workers=dify_config.INDEXING_PIPELINE_LOAD_WORKERS,
+                ),
+            ],
+            queue_size=dify_config.INDEXING_PIPELINE_QUEUE_SIZE,
+            worker_context=flask_app.app_context,
+        )
+        self.pipeline_metrics = pipeline.run(
+            _IndexingJob(document_id=dataset_document.id) for dataset_document in dataset_documents
+        )
+        for metric in self.pipeline_metrics:
+            logger.info(
+                "Indexing pipeline stage %s: %s documents in %s batches, %.2fs busy, %.2f documents/s, %s errors",
+                metric.name,
+                metric.items,
+                metric.batches,
+                metric.busy_seconds,
+                metric.throughput,
+                metric.errors,
+            )
+
+        if paused_document_ids:
+            raise DocumentIsPausedError(f"Document paused, document id: {paused_document_ids[0]}")
+
+    def _pipeline_extract(self, job: _IndexingJob):
+        dataset_document = db.session.get(DatasetDocument, job.document_id)
+        if not dataset_document:
+            raise DocumentIsDeletedPausedError()
+        dataset = db.session.query(Dataset).filter_by(id=dataset_document.dataset_id).first()
+        if not dataset:
+            raise ValueError("no dataset found")
+        stmt = select(DatasetProcessRule).where(DatasetProcessRule.id == dataset_document.dataset_process_rule_id)
+        processing_rule = db.session.scalar(stmt)
+        if not processing_rule:
+            raise ValueError("no process rule found")
+
+        job.dataset_id = dataset.id
+        job.doc_form = dataset_document.doc_form
+        job.doc_language = dataset_document.doc_language
+        job.created_by = dataset_document.created_by
+        job.process_rule = processing_rule.to_dict()
+        index_processor = IndexProcessorFactory(dataset_document.doc_form).init_index_processor()
+        job.text_docs = self._extract(index_processor, dataset_document, job.process_rule)
+
+    def _pipeline_split(self, job: _IndexingJob):
+        dataset, dataset_document = self._get_job_models(job)
+        current_user = db.session.query(Account).filter_by(id=job.created_by).first()
+        if not current_user:
+            raise ValueError("no current user found")
+        current_user.set_tenant_id(dataset.tenant_id)
+
+        job.documents = self._transform(
+            IndexProcessorFactory(job.doc_form).init_index_processor(),
+            dataset,
+            job.text_docs,
+            job.doc_language,
+            job.process_rule,
+            current_user=current_user,
+        )
+        job.text_docs = []
+        self._load_segments(dataset, dataset_document, job.documents)
+
+        if dataset.indexing_technique == "high_quality":
+            embedding_model_instance = self._get_embedding_model_instance(dataset)
+            model_type_instance = cast(TextEmbeddingModel, embedding_model_instance.model_type_instance)
+            model_schema = model_type_instance.get_model_schema(
+                embedding_model_instance.model, embedding_model_instance.credentials
+            )
+            if model_schema and ModelPropertyKey.MAX_CHUNKS in model_schema.model_properties:
+                job.embedding_max_chunks = model_schema.model_properties[ModelPropertyKey.MAX_CHUNKS]
+            job.embedding_model_instance = embedding_model_instance
+
+    def _pipeline_embed(self, jobs: list[_IndexingJob]) -> list[_IndexingJob]:
+        """Embed the texts of several documents together, warming the embedding cache for the load stage."""
+        groups: dict[tuple[str, str], list[_IndexingJob]] = {}
+        for job in jobs:
+            if job.embedding_model_instance is not None:
+                model_instance = job.embedding_model_instance
+                groups.setdefault((model_instance.provider, model_instance.model), []).append(job)
+
+        for group_jobs in groups.values():
+            texts = [text for job in group_jobs for text in self._texts_to_embed(job)]
+            if not texts:
+                continue
+            embedding_model_instance = group_jobs[0].embedding_model_instance
+            assert embedding_model_instance is not None
+            try:
+                CacheEmbedding(embedding_model_instance).embed_documents(texts)
+            except Exception:
+                # The load stage embeds whatever is missing from the cache and reports errors per document.
+                logger.warning("Failed to embed texts of %s documents in one batch", len(group_jobs), exc_info=True)
+        return jobs
+
+    def _pipeline_load(self, job: _IndexingJob):
+        dataset, dataset_document = self._get_job_models(job)
+        self._load(
+            index_processor=IndexProcessorFactory(job.doc_form).init_index_processor(),
+            dataset=dataset,
+            dataset_document=dataset_document,
+            documents=job.documents,
+        )
+
+    @staticmethod
+    def _get_job_models(job: _IndexingJob) -> tuple[Dataset, DatasetDocument]:
+        dataset_document = db.session.get(DatasetDocument, job.document_id)
+        if not dataset_document:
+            raise DocumentIsDeletedPausedError()
+        dataset = db.session.get(Dataset, job.dataset_id)
+        if not dataset:
+            raise ValueError("no dataset found")
+        return dataset, dataset_document
+
+    @staticmethod
+    def _texts_to_embed(job: _IndexingJob) -> list[str]:
+        if job.doc_form == IndexStructureType.PARENT_CHILD_INDEX:
+            return [child.page_content for document in job.documents for child in document.children or []]
+        return [document.page_content for document in job.documents]
+
+    def _get_embedding_model_instance(self, dataset: Dataset) -> ModelInstance:
+        return self.model_manager.get_model_instance(
+            tenant_id=dataset.tenant_id,
+            provider=dataset.embedding_model_provider,
+            model_type=ModelType.TEXT_EMBEDDING,
+            model=dataset.embedding_model,
+        )
+
     def run_in_splitting_status(self, dataset_document: DatasetDocument):
         """Run the indexing process when the index_status is splitting."""
         document_id = dataset_document.id
@@ -159,7 +368,7 @@ class IndexingRunner:
             index_type = requeried_document.doc_form
             index_processor = IndexProcessorFactory(index_type).init_index_processor()
             # extract
-            text_docs = self._extract(index_processor, requeried_document, processing_rule.to_dict())
+            text_docs = self._extract_lazily(index_processor, requeried_document, processing_rule.to_dict())
 
             # transform
             current_user = db.session.query(Account).filter_by(id=requeried_document.created_by).first()
@@ -458,6 +667,63 @@ class IndexingRunner:
 
         return text_docs
 
+    def _extract_lazily(
+        self, index_processor: BaseIndexProcessor, dataset_document: DatasetDocument, process_rule: dict
+    ) -> Iterable[Document]:
+        """
+        Extract the text documents of a dataset document. The rows of uploaded CSV and Excel files are
+        yielded while the file is parsed, so `_transform` splits them in batches instead of all at once.
+        """
+        upload_file = self._get_streamed_upload_file(dataset_document, process_rule)
+        if upload_file is None:
+            return self._extract(index_processor, dataset_document, process_rule)
+        return self._extract_rows(index_processor, dataset_document, process_rule, upload_file)
+
+    @staticmethod
+    def _get_streamed_upload_file(dataset_document: DatasetDocument, process_rule: dict) -> UploadFile | None:
+        # The full-doc parent-child index joins all the extracted documents into a single parent chunk
+        if (process_rule.get("rules") or {}).get("parent_mode") == ParentMode.FULL_DOC:
+            return None
+        data_source_info = dataset_document.data_source_info_dict
+        if (
+            dataset_document.data_source_type != "upload_file"
+            or not data_source_info
+            or "upload_file_id" not in data_source_info
+        ):
+            return None
+        stmt = select(UploadFile).where(UploadFile.id == data_source_info["upload_file_id"])
+        upload_file = db.session.scalars(stmt).one_or_none()
+        if upload_file is None or upload_file.extension.lower() not in STREAMED_FILE_EXTENSIONS:
+            return None
+        return upload_file
+
+    def _extract_rows(
+        self,
+        index_processor: BaseIndexProcessor,
+        dataset_document: DatasetDocument,
+        process_rule: dict,
+        upload_file: UploadFile,
+    ) -> Iterator[Document]:
+        extract_setting = ExtractSetting(
+            datasource_type=DatasourceType.FILE,
+            upload_file=upload_file,
+            document_model=dataset_document.doc_form,
+        )
+        for text_doc in index_processor.extract_iter(extract_setting, process_rule_mode=process_rule["mode"]):
+            if text_doc.metadata is not None:
+                text_doc.metadata["document_id"] = dataset_document.id
+                text_doc.metadata["dataset_id"] = dataset_document.dataset_id
+            yield text_doc
+
+        # update document status to splitting once the whole file is parsed
+        self._update_document_index_status(
+            document_id=dataset_document.id,
+            after_indexing_status="splitting",
+            extra_update_params={
+                DatasetDocument.parsing_completed_at: naive_utc_now(),
+            },
+        )
+
     @staticmethod
     def filter_string(text):
         text = re.sub(r"<\|", "<", text)
@@ -754,7 +1020,7 @@ class IndexingRunner:
         self,
         index_processor: BaseIndexProcessor,
         dataset: Dataset,
-        text_docs: list[Document],
+        text_docs: Iterable[Document],
         doc_language: str,
         process_rule: dict,
         current_user: Account | None = None,
@@ -775,15 +1041,20 @@ class IndexingRunner:
                     model_type=ModelType.TEXT_EMBEDDING,
                 )
 
-        documents = index_processor.transform(
-            text_docs,
-            current_user,
-            embedding_model_instance=embedding_model_instance,
-            process_rule=process_rule,
-            tenant_id=dataset.tenant_id,
-            doc_language=doc_language,
-        )
-
+        transform_args: dict[str, Any] = {
+            "embedding_model_instance": embedding_model_instance,
+            "process_rule": process_rule,
+            "tenant_id": dataset.tenant_id,
+            "doc_language": doc_language,
+        }
+        if isinstance(text_docs, list):
+            return index_processor.transform(text_docs, current_user, **transform_args)
+
+        # Lazily extracted rows are split in batches, so they are never all held besides their chunks
+        documents: list[Document] = []
+        text_docs = iter(text_docs)
+        while batch := list(islice(text_docs, _TRANSFORM_BATCH_SIZE)):
+            documents.extend(index_processor.transform(batch, current_user, **transform_args))
         return documents
 
     def _load_segments(self, dataset: Dataset, dataset_document: DatasetDocument, documents: list[Document]):
@@ -0,0 +1,186 @@
+"""Pool of initialized MCP client sessions reused across tool calls."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+
+from configs import dify_config
+from core.mcp.mcp_client import MCPClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MCPClientKey:
+    tenant_id: str
+    provider_id: str
+    server_url: str
+    auth_fingerprint: str
+    timeout: float | None = None
+    sse_read_timeout: float | None = None
+
+    @staticmethod
+    def fingerprint(headers: dict[str, str]) -> str:
+        return hashlib.sha256(json.dumps(headers, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class MCPClientPoolStats:
+    created: int = 0
+    reused: int = 0
+    discarded: int = 0
+    health_check_failures: int = 0
+    idle: int = 0
+
+
+@dataclass
+class _IdleClient:
+    client: MCPClient
+    idle_since: float
+
+
+class MCPClientPool:
+    """
+    Keeps initialized MCP sessions alive between tool calls.
+
+    A session is checked out exclusively for one call and returned to the pool afterwards, unless
+    the call raised, in which case the session is closed since its state is unknown. Sessions are
+    pooled under the credentials they hold when returned, so a session that re-authenticated during
+    the call is found again by callers using the refreshed token.
+    """
+
+    def __init__(self, enabled: bool, max_idle_per_key: int, idle_timeout: float, health_check_interval: float):
+        self._enabled = enabled
+        self._max_idle_per_key = max_idle_per_key
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._idle: dict[MCPClientKey, list[_IdleClient]] = {}
+        self._stats = MCPClientPoolStats()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def client(self, key: MCPClientKey, factory: Callable[[], MCPClient]) -> Iterator[MCPClient]:
+        """
+        Check out an initialized client for ``key``, creating and initializing one with ``factory`` if needed.
+        """
+        if not self._enabled:
+            with factory() as client:
+                yield client
+            return
+
+        client = self._checkout(key)
+        if client is None:
+            client = factory()
+            try:
+                client.__enter__()
+            except BaseException:
+                self._close(client)
+                raise
+            with self._lock:
+                self._stats.created += 1
+
+        try:
+            yield client
+        except BaseException:
+            self._discard(client)
+            raise
+
+        # The client re-authenticated during the call when its headers no longer match the key.
+        returned_key = key
+        fingerprint = MCPClientKey.fingerprint(client.headers)
+        if fingerprint != key.auth_fingerprint:
+            returned_key = replace(key, auth_fingerprint=fingerprint)
+        self._checkin(returned_key, client)
+
+    def stats(self) -> MCPClientPoolStats:
+        with self._lock:
+            return MCPClientPoolStats(
+                created=self._stats.created,
+                reused=self._stats.reused,
+                discarded=self._stats.discarded,
+                health_check_failures=self._stats.health_check_failures,
+                idle=sum(len(clients) for clients in self._idle.values()),
+            )
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for clients in idle.values():
+            for entry in clients:
+                self._close(entry.client)
+
+    def _checkout(self, key: MCPClientKey) -> MCPClient | None:
+        self._evict_idle()
+        while True:
+            with self._lock:
+                clients = self._idle.get(key)
+                if not clients:
+                    return None
+                # Most recently returned first, it is the least likely to have been dropped by the server.
+                entry = clients.pop()
+                if not clients:
+                    del self._idle[key]
+
+            if time.monotonic() - entry.idle_since < self._health_check_interval or self._is_healthy(entry.client):
+                with self._lock:
+                    self._stats.reused += 1
+                return entry.client
+
+            with self._lock:
+                self._stats.health_check_failures += 1
+            self._close(entry.client)
+
+    def _checkin(self, key: MCPClientKey, client: MCPClient):
+        with self._lock:
+            clients = self._idle.setdefault(key, [])
+            if len(clients) < self._max_idle_per_key:
+                clients.append(_IdleClient(client, idle_since=time.monotonic()))
+                return
+        self._discard(client)
+
+    def _discard(self, client: MCPClient):
+        with self._lock:
+            self._stats.discarded += 1
+        self._close(client)
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        expired: list[MCPClient] = []
+        with self._lock:
+            for key in list(self._idle):
+                clients = self._idle[key]
+                expired.extend(entry.client for entry in clients if now - entry.idle_since >= self._idle_timeout)
+                clients[:] = [entry for entry in clients if now - entry.idle_since < self._idle_timeout]
+                if not clients:
+                    del self._idle[key]
+        for client in expired:
+            self._close(client)
+
+    @staticmethod
+    def _is_healthy(client: MCPClient) -> bool:
+        try:
+            client.ping()
+            return True
+        except Exception:
+            logger.debug("Pooled MCP session failed its health check", exc_info=True)
+            return False
+
+    @staticmethod
+    def _close(client: MCPClient):
+        try:
+            client.cleanup()
+        except Exception:
+            logger.debug("Failed to close pooled MCP session", exc_info=True)
+
+
+mcp_client_pool = MCPClientPool(
+    enabled=dify_config.MCP_SESSION_POOL_ENABLED,
+    max_idle_per_key=dify_config.MCP_SESSION_POOL_MAX_IDLE_PER_KEY,
+    idle_timeout=dify_config.MCP_SESSION_POOL_IDLE_TIMEOUT,
+    health_check_interval=dify_config.MCP_SESSION_POOL_HEALTH_CHECK_INTERVAL,
+)
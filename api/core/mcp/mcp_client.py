@@ -102,6 +102,12 @@ class MCPClient:
             raise ValueError("Session not initialized.")
         return self._session.call_tool(tool_name, tool_args)
 
+    def ping(self) -> None:
+        """Check that the session is still alive"""
+        if not self._session:
+            raise ValueError("Session not initialized.")
+        self._session.send_ping()
+
     def cleanup(self):
         """Clean up resources"""
         try:
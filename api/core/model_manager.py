@@ -7,6 +7,7 @@ from core.entities.embedding_type import EmbeddingInputType
 from core.entities.provider_configuration import ProviderConfiguration, ProviderModelBundle
 from core.entities.provider_entities import ModelLoadBalancingConfiguration
 from core.errors.error import ProviderTokenNotInitError
+from core.helper.llm_result_cache import llm_result_cache
 from core.model_runtime.callbacks.base_callback import Callback
 from core.model_runtime.entities.llm_entities import LLMResult
 from core.model_runtime.entities.message_entities import PromptMessage, PromptMessageTool
@@ -109,6 +110,7 @@ class ModelInstance:
         stream: Literal[True] = True,
         user: str | None = None,
         callbacks: list[Callback] | None = None,
+        cache_scope: str | None = None,
     ) -> Generator: ...
 
     @overload
@@ -121,6 +123,7 @@ class ModelInstance:
         stream: Literal[False] = False,
         user: str | None = None,
         callbacks: list[Callback] | None = None,
+        cache_scope: str | None = None,
     ) -> LLMResult: ...
 
     @overload
@@ -133,6 +136,7 @@ class ModelInstance:
         stream: bool = True,
         user: str | None = None,
         callbacks: list[Callback] | None = None,
+        cache_scope: str | None = None,
     ) -> Union[LLMResult, Generator]: ...
 
     def invoke_llm(
@@ -144,6 +148,7 @@ class ModelInstance:
         stream: bool = True,
         user: str | None = None,
         callbacks: list[Callback] | None = None,
+        cache_scope: str | None = None,
     ) -> Union[LLMResult, Generator]:
         """
         Invoke large language model
@@ -155,11 +160,31 @@ class ModelInstance:
         :param stream: is stream response
         :param user: unique user id
         :param callbacks: callbacks
+        :param cache_scope: opt in to the LLM result cache for deterministic calls, entries are shared
+            between invocations with the same scope (e.g. app and node id) and identical inputs
         :return: full response or stream response chunk generator result
         """
         if not isinstance(self.model_type_instance, LargeLanguageModel):
             raise Exception("Model type instance is not LargeLanguageModel")
-        return cast(
+
+        cache_key = None
+        if cache_scope is not None and llm_result_cache.enabled:
+            cache_key = llm_result_cache.build_key(
+                scope=cache_scope,
+                provider=self.provider,
+                model=self.model,
+                model_parameters=model_parameters,
+                prompt_messages=prompt_messages,
+                tools=tools,
+                stop=stop,
+            )
+            cached_result = llm_result_cache.get(cache_key)
+            if cached_result is not None:
+                if stream:
+                    return llm_result_cache.replay(cached_result, prompt_messages)
+                return cached_result.model_copy(update={"prompt_messages": prompt_messages})
+
+        result = cast(
             Union[LLMResult, Generator],
             self._round_robin_invoke(
                 function=self.model_type_instance.invoke,
@@ -174,6 +199,12 @@ class ModelInstance:
                 callbacks=callbacks,
             ),
         )
+        if cache_key is None:
+            return result
+        if isinstance(result, LLMResult):
+            llm_result_cache.set(cache_key, result)
+            return result
+        return llm_result_cache.cache_stream(cache_key, result)
 
     def get_llm_num_tokens(
         self, prompt_messages: Sequence[PromptMessage], tools: Sequence[PromptMessageTool] | None = None
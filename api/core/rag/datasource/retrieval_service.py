@@ -1,18 +1,17 @@
-import concurrent.futures
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any
 
 from flask import Flask, current_app
 from sqlalchemy import select
 from sqlalchemy.orm import Session, load_only
 
-from configs import dify_config
 from core.db.session_factory import session_factory
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from core.rag.data_post_processor.data_post_processor import DataPostProcessor
 from core.rag.datasource.keyword.keyword_factory import Keyword
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.embedding.retrieval import RetrievalChildChunk, RetrievalSegments
 from core.rag.entities.metadata_entities import MetadataCondition
@@ -21,6 +20,7 @@ from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.models.document import Document
 from core.rag.rerank.rerank_type import RerankMode
+from core.rag.retrieval.retrieval_executor import retrieval_executor
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
 from core.tools.signature import sign_upload_file
 from extensions.ext_database import db
@@ -71,56 +71,28 @@ class RetrievalService:
         all_documents: list[Document] = []
         exceptions: list[str] = []
 
-        # Optimize multithreading with thread pools
-        with ThreadPoolExecutor(max_workers=dify_config.RETRIEVAL_SERVICE_EXECUTORS) as executor:  # type: ignore
-            futures = []
-            retrieval_service = RetrievalService()
-            if query:
-                futures.append(
-                    executor.submit(
-                        retrieval_service._retrieve,
-                        flask_app=current_app._get_current_object(),  # type: ignore
-                        retrieval_method=retrieval_method,
-                        dataset=dataset,
-                        query=query,
-                        top_k=top_k,
-                        score_threshold=score_threshold,
-                        reranking_model=reranking_model,
-                        reranking_mode=reranking_mode,
-                        weights=weights,
-                        document_ids_filter=document_ids_filter,
-                        attachment_id=None,
-                        all_documents=all_documents,
-                        exceptions=exceptions,
-                    )
-                )
-            if attachment_ids:
-                for attachment_id in attachment_ids:
-                    futures.append(
-                        executor.submit(
-                            retrieval_service._retrieve,
-                            flask_app=current_app._get_current_object(),  # type: ignore
-                            retrieval_method=retrieval_method,
-                            dataset=dataset,
-                            query=None,
-                            top_k=top_k,
-                            score_threshold=score_threshold,
-                            reranking_model=reranking_model,
-                            reranking_mode=reranking_mode,
-                            weights=weights,
-                            document_ids_filter=document_ids_filter,
-                            attachment_id=attachment_id,
-                            all_documents=all_documents,
-                            exceptions=exceptions,
-                        )
-                    )
-
-            if futures:
-                for future in concurrent.futures.as_completed(futures, timeout=3600):
-                    if exceptions:
-                        for f in futures:
-                            f.cancel()
-                        break
+        flask_app = current_app._get_current_object()  # type: ignore
+        retrieval_service = RetrievalService()
+        retrieve = partial(
+            retrieval_service._retrieve,
+            flask_app=flask_app,
+            retrieval_method=retrieval_method,
+            dataset=dataset,
+            top_k=top_k,
+            score_threshold=score_threshold,
+            reranking_model=reranking_model,
+            reranking_mode=reranking_mode,
+            weights=weights,
+            document_ids_filter=document_ids_filter,
+            all_documents=all_documents,
+            exceptions=exceptions,
+        )
+        tasks = []
+        if query:
+            tasks.append(partial(retrieve, query=query, attachment_id=None))
+        for attachment_id in attachment_ids or []:
+            tasks.append(partial(retrieve, query=None, attachment_id=attachment_id))
+        retrieval_executor.run(tasks, should_stop=lambda: bool(exceptions), timeout=3600)
 
         if exceptions:
             raise ValueError(";\n".join(exceptions))
@@ -386,14 +358,25 @@ class RetrievalService:
             if not document_ids:
                 return []
 
+            # Versions of the datasets the hydration cache entries are checked against
+            cache_versions = segment_hydration_cache.versions(
+                {doc.metadata["dataset_id"] for doc in documents if doc.metadata.get("dataset_id")}
+            )
+
             # Batch query dataset documents
-            dataset_documents = {
-                doc.id: doc
-                for doc in db.session.query(DatasetDocument)
-                .where(DatasetDocument.id.in_(document_ids))
-                .options(load_only(DatasetDocument.id, DatasetDocument.doc_form, DatasetDocument.dataset_id))
-                .all()
-            }
+            dataset_documents = segment_hydration_cache.hydrate(
+                "document",
+                DatasetDocument,
+                [document_id for document_id in document_ids if document_id],
+                cache_versions,
+                lambda ids: {
+                    doc.id: doc
+                    for doc in db.session.query(DatasetDocument)
+                    .where(DatasetDocument.id.in_(ids))
+                    .options(load_only(DatasetDocument.id, DatasetDocument.doc_form, DatasetDocument.dataset_id))
+                    .all()
+                },
+            )
 
             valid_dataset_documents = {}
             image_doc_ids: list[Any] = []
@@ -478,8 +461,19 @@ class RetrievalService:
                     else:
                         doc_segment_map[attachment["segment_id"]] = [attachment["attachment_id"]]
 
-                child_chunk_stmt = select(ChildChunk).where(ChildChunk.index_node_id.in_(child_index_node_ids))
-                child_index_nodes = session.execute(child_chunk_stmt).scalars().all()
+                child_index_nodes = segment_hydration_cache.hydrate(
+                    "child_chunk",
+                    ChildChunk,
+                    child_index_node_ids,
+                    cache_versions,
+                    lambda ids: {
+                        chunk.index_node_id: chunk
+                        for chunk in session.execute(select(ChildChunk).where(ChildChunk.index_node_id.in_(ids)))
+                        .scalars()
+                        .all()
+                    },
+                    is_fresh=lambda chunk: cls._matches_index_hash(doc_to_document_map, chunk),
+                ).values()
 
                 for i in child_index_nodes:
                     segment_ids.append(i.segment_id)
@@ -493,22 +487,51 @@ class RetrievalService:
                         doc_segment_map[i.segment_id] = [i.index_node_id]
 
                 if index_node_ids:
-                    document_segment_stmt = select(DocumentSegment).where(
-                        DocumentSegment.enabled == True,
-                        DocumentSegment.status == "completed",
-                        DocumentSegment.index_node_id.in_(index_node_ids),
+                    index_node_segments = list(
+                        segment_hydration_cache.hydrate(
+                            "segment_node",
+                            DocumentSegment,
+                            index_node_ids,
+                            cache_versions,
+                            lambda ids: {
+                                segment.index_node_id: segment
+                                for segment in session.execute(
+                                    select(DocumentSegment).where(
+                                        DocumentSegment.enabled == True,
+                                        DocumentSegment.status == "completed",
+                                        DocumentSegment.index_node_id.in_(ids),
+                                    )
+                                )
+                                .scalars()
+                                .all()
+                            },
+                            is_fresh=lambda segment: cls._matches_index_hash(doc_to_document_map, segment),
+                        ).values()
                     )
-                    index_node_segments = session.execute(document_segment_stmt).scalars().all()  # type: ignore
                     for index_node_segment in index_node_segments:
                         doc_segment_map[index_node_segment.id] = [index_node_segment.index_node_id]
 
                 if segment_ids:
-                    document_segment_stmt = select(DocumentSegment).where(
-                        DocumentSegment.enabled == True,
-                        DocumentSegment.status == "completed",
-                        DocumentSegment.id.in_(segment_ids),
+                    segments = list(
+                        segment_hydration_cache.hydrate(
+                            "segment",
+                            DocumentSegment,
+                            segment_ids,
+                            cache_versions,
+                            lambda ids: {
+                                segment.id: segment
+                                for segment in session.execute(
+                                    select(DocumentSegment).where(
+                                        DocumentSegment.enabled == True,
+                                        DocumentSegment.status == "completed",
+                                        DocumentSegment.id.in_(ids),
+                                    )
+                                )
+                                .scalars()
+                                .all()
+                            },
+                        ).values()
                     )
-                    segments = session.execute(document_segment_stmt).scalars().all()  # type: ignore
 
                 if index_node_segments:
                     segments.extend(index_node_segments)
@@ -683,6 +706,13 @@ class RetrievalService:
             db.session.rollback()
             raise e
 
+    @staticmethod
+    def _matches_index_hash(doc_to_document_map: dict[str, Document], row: DocumentSegment | ChildChunk) -> bool:
+        """Whether a cached row still has the content hash the index returned for it."""
+        document = doc_to_document_map.get(row.index_node_id or "")
+        doc_hash = document.metadata.get("doc_hash") if document else None
+        return not doc_hash or doc_hash == row.index_node_hash
+
     def _retrieve(
         self,
         flask_app: Flask,
@@ -703,64 +733,45 @@ class RetrievalService:
             return
         with flask_app.app_context():
             all_documents_item: list[Document] = []
-            # Optimize multithreading with thread pools
-            with ThreadPoolExecutor(max_workers=dify_config.RETRIEVAL_SERVICE_EXECUTORS) as executor:  # type: ignore
-                futures = []
-                if retrieval_method == RetrievalMethod.KEYWORD_SEARCH and query:
-                    futures.append(
-                        executor.submit(
-                            self.keyword_search,
-                            flask_app=current_app._get_current_object(),  # type: ignore
+            tasks = []
+            if retrieval_method == RetrievalMethod.KEYWORD_SEARCH and query:
+                tasks.append(
+                    partial(
+                        self.keyword_search,
+                        flask_app=flask_app,
+                        dataset_id=dataset.id,
+                        query=query,
+                        top_k=top_k,
+                        all_documents=all_documents_item,
+                        exceptions=exceptions,
+                        document_ids_filter=document_ids_filter,
+                    )
+                )
+            if RetrievalMethod.is_support_semantic_search(retrieval_method):
+                if query:
+                    tasks.append(
+                        partial(
+                            self.embedding_search,
+                            flask_app=flask_app,
                             dataset_id=dataset.id,
                             query=query,
                             top_k=top_k,
+                            score_threshold=score_threshold,
+                            reranking_model=reranking_model,
                             all_documents=all_documents_item,
+                            retrieval_method=retrieval_method,
                             exceptions=exceptions,
                             document_ids_filter=document_ids_filter,
+                            query_type=QueryType.TEXT_QUERY,
                         )
                     )
-                if RetrievalMethod.is_support_semantic_search(retrieval_method):
-                    if query:
-                        futures.append(
-                            executor.submit(
-                                self.embedding_search,
-                                flask_app=current_app._get_current_object(),  # type: ignore
-                                dataset_id=dataset.id,
-                                query=query,
-                                top_k=top_k,
-                                score_threshold=score_threshold,
-                                reranking_model=reranking_model,
-                                all_documents=all_documents_item,
-                                retrieval_method=retrieval_method,
-                                exceptions=exceptions,
-                                document_ids_filter=document_ids_filter,
-                                query_type=QueryType.TEXT_QUERY,
-                            )
-                        )
-                    if attachment_id:
-                        futures.append(
-                            executor.submit(
-                                self.embedding_search,
-                                flask_app=current_app._get_current_object(),  # type: ignore
-                                dataset_id=dataset.id,
-                                query=attachment_id,
-                                top_k=top_k,
-                                score_threshold=score_threshold,
-                                reranking_model=reranking_model,
-                                all_documents=all_documents_item,
-                                retrieval_method=retrieval_method,
-                                exceptions=exceptions,
-                                document_ids_filter=document_ids_filter,
-                                query_type=QueryType.IMAGE_QUERY,
-                            )
-                        )
-                if RetrievalMethod.is_support_fulltext_search(retrieval_method) and query:
-                    futures.append(
-                        executor.submit(
-                            self.full_text_index_search,
-                            flask_app=current_app._get_current_object(),  # type: ignore
+                if attachment_id:
+                    tasks.append(
+                        partial(
+                            self.embedding_search,
+                            flask_app=flask_app,
                             dataset_id=dataset.id,
-                            query=query,
+                            query=attachment_id,
                             top_k=top_k,
                             score_threshold=score_threshold,
                             reranking_model=reranking_model,
@@ -768,16 +779,27 @@ class RetrievalService:
                             retrieval_method=retrieval_method,
                             exceptions=exceptions,
                             document_ids_filter=document_ids_filter,
+                            query_type=QueryType.IMAGE_QUERY,
                         )
                     )
-                # Use as_completed for early error propagation - cancel remaining futures on first error
-                if futures:
-                    for future in concurrent.futures.as_completed(futures, timeout=300):
-                        if future.exception():
-                            # Cancel remaining futures to avoid unnecessary waiting
-                            for f in futures:
-                                f.cancel()
-                            break
+            if RetrievalMethod.is_support_fulltext_search(retrieval_method) and query:
+                tasks.append(
+                    partial(
+                        self.full_text_index_search,
+                        flask_app=flask_app,
+                        dataset_id=dataset.id,
+                        query=query,
+                        top_k=top_k,
+                        score_threshold=score_threshold,
+                        reranking_model=reranking_model,
+                        all_documents=all_documents_item,
+                        retrieval_method=retrieval_method,
+                        exceptions=exceptions,
+                        document_ids_filter=document_ids_filter,
+                    )
+                )
+            # Skip the searches that haven't started yet on the first error
+            retrieval_executor.run(tasks, should_stop=lambda: bool(exceptions), timeout=300)
 
             if exceptions:
                 raise ValueError(";\n".join(exceptions))
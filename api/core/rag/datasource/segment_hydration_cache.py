@@ -0,0 +1,213 @@
+"""Cache of the segments, child chunks and documents retrieval results are hydrated from."""
+
+import json
+import logging
+import threading
+from collections.abc import Callable, Collection, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, TypeVar
+
+import sqlalchemy as sa
+from cachetools import TTLCache
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from models.base import Base
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=Base)
+
+_VERSION_KEY_PREFIX = "segment_hydration_version:"
+_ENTRY_KEY_PREFIX = "segment_hydration:"
+
+
+@dataclass
+class SegmentHydrationCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    dataset_id: str
+    version: int
+    row: dict[str, Any]
+
+
+class SegmentHydrationCache:
+    """
+    Versioned cache of the rows retrieval results are hydrated from, keyed by row kind and id.
+
+    Entries live in a per-process TTL cache and optionally in Redis. Every entry records the version
+    of its dataset at the time it was cached; ``invalidate()`` increments the version in Redis, which
+    makes the entries of the dataset stale in every process at once. Looking up entries therefore
+    costs a single Redis round trip for the dataset versions instead of the database queries.
+
+    Cached rows are returned as new, transient model instances with all columns loaded.
+    """
+
+    def __init__(self, enabled: bool, local_max_size: int, ttl: int, redis_enabled: bool):
+        self._enabled = enabled
+        self._ttl = ttl
+        self._redis_enabled = redis_enabled
+        self._local: TTLCache[str, _Entry] = TTLCache(maxsize=local_max_size, ttl=ttl)
+        self._stats = SegmentHydrationCacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def versions(self, dataset_ids: Collection[str]) -> dict[str, int] | None:
+        """Current versions of the datasets, or None if the cache can't be used right now."""
+        if not self._enabled or not dataset_ids:
+            return None
+        dataset_ids = list(dataset_ids)
+        try:
+            values = redis_client.mget([f"{_VERSION_KEY_PREFIX}{dataset_id}" for dataset_id in dataset_ids])
+            return {dataset_id: int(value or 0) for dataset_id, value in zip(dataset_ids, values)}
+        except Exception:
+            logger.warning("Failed to read segment hydration cache versions", exc_info=True)
+            return None
+
+    def hydrate(
+        self,
+        kind: str,
+        model: type[T],
+        ids: Iterable[str],
+        versions: Mapping[str, int] | None,
+        load: Callable[[list[str]], Mapping[str, T]],
+        is_fresh: Callable[[T], bool] | None = None,
+    ) -> dict[str, T]:
+        """
+        Look up rows by id, loading the missing ones with ``load`` and caching them.
+
+        ``load`` returns the rows it found keyed by id. ``is_fresh`` can reject a cached row, e.g.
+        when its content hash no longer matches the index. Rows of datasets missing from
+        ``versions`` are neither read from nor written to the cache.
+        """
+        ids = list(dict.fromkeys(ids))
+        if versions is None:
+            return dict(load(ids)) if ids else {}
+
+        found: dict[str, T] = {}
+        for key_id, entry in self._get_entries(kind, ids).items():
+            if versions.get(entry.dataset_id) != entry.version:
+                continue
+            instance = self._to_instance(model, entry.row)
+            if is_fresh is None or is_fresh(instance):
+                found[key_id] = instance
+
+        missing = [key_id for key_id in ids if key_id not in found]
+        with self._lock:
+            self._stats.hits += len(found)
+            self._stats.misses += len(missing)
+        if missing:
+            loaded = load(missing)
+            entries = {}
+            for key_id, instance in loaded.items():
+                dataset_id = getattr(instance, "dataset_id", None)
+                if dataset_id in versions:
+                    entries[key_id] = _Entry(dataset_id, versions[dataset_id], self._to_row(instance))
+            self._set_entries(kind, entries)
+            found.update(loaded)
+        return found
+
+    def invalidate(self, dataset_id: str):
+        """Make all cached rows of the dataset stale, in this and every other process."""
+        if not self._enabled:
+            return
+        try:
+            redis_client.incr(f"{_VERSION_KEY_PREFIX}{dataset_id}")
+        except Exception:
+            logger.warning("Failed to invalidate segment hydration cache of dataset %s", dataset_id, exc_info=True)
+        with self._lock:
+            self._stats.invalidations += 1
+
+    def stats(self) -> SegmentHydrationCacheStats:
+        with self._lock:
+            return SegmentHydrationCacheStats(
+                hits=self._stats.hits, misses=self._stats.misses, invalidations=self._stats.invalidations
+            )
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _get_entries(self, kind: str, ids: list[str]) -> dict[str, _Entry]:
+        entries: dict[str, _Entry] = {}
+        with self._lock:
+            for key_id in ids:
+                entry = self._local.get(f"{kind}:{key_id}")
+                if entry is not None:
+                    entries[key_id] = entry
+
+        remote_ids = [key_id for key_id in ids if key_id not in entries]
+        if not self._redis_enabled or not remote_ids:
+            return entries
+        try:
+            values = redis_client.mget([f"{_ENTRY_KEY_PREFIX}{kind}:{key_id}" for key_id in remote_ids])
+        except Exception:
+            logger.warning("Failed to read segment hydration cache entries", exc_info=True)
+            return entries
+
+        with self._lock:
+            for key_id, value in zip(remote_ids, values):
+                if not value:
+                    continue
+                try:
+                    entry = _Entry(**json.loads(value))
+                except (ValueError, TypeError):
+                    continue
+                entries[key_id] = entry
+                self._local[f"{kind}:{key_id}"] = entry
+        return entries
+
+    def _set_entries(self, kind: str, entries: Mapping[str, _Entry]):
+        if not entries:
+            return
+        with self._lock:
+            for key_id, entry in entries.items():
+                self._local[f"{kind}:{key_id}"] = entry
+        if not self._redis_enabled:
+            return
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            for key_id, entry in entries.items():
+                data = json.dumps(
+                    {"dataset_id": entry.dataset_id, "version": entry.version, "row": entry.row}, default=str
+                )
+                pipeline.setex(f"{_ENTRY_KEY_PREFIX}{kind}:{key_id}", self._ttl, data)
+            pipeline.execute()
+        except Exception:
+            logger.warning("Failed to store segment hydration cache entries", exc_info=True)
+
+    @staticmethod
+    def _to_row(instance: Base) -> dict[str, Any]:
+        state = sa.inspect(instance)
+        return {
+            column.key: getattr(instance, column.key)
+            for column in state.mapper.column_attrs
+            if column.key not in state.unloaded
+        }
+
+    @staticmethod
+    def _to_instance(model: type[T], row: Mapping[str, Any]) -> T:
+        values = dict(row)
+        for column in sa.inspect(model).column_attrs:
+            value = values.get(column.key)
+            if isinstance(value, str) and isinstance(column.expression.type, sa.DateTime):
+                # Rows read back from Redis carry their datetimes as strings
+                values[column.key] = datetime.fromisoformat(value)
+        return model(**values)
+
+
+segment_hydration_cache = SegmentHydrationCache(
+    enabled=dify_config.SEGMENT_HYDRATION_CACHE_ENABLED,
+    local_max_size=dify_config.SEGMENT_HYDRATION_CACHE_LOCAL_SIZE,
+    ttl=dify_config.SEGMENT_HYDRATION_CACHE_TTL,
+    redis_enabled=dify_config.SEGMENT_HYDRATION_CACHE_REDIS_ENABLED,
+)
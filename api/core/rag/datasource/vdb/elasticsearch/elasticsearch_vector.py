@@ -12,6 +12,7 @@ from pydantic import BaseModel, model_validator
 
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_client_registry import vector_client_registry
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -73,7 +74,14 @@ class ElasticSearchConfig(BaseModel):
 class ElasticSearchVector(BaseVector):
     def __init__(self, index_name: str, config: ElasticSearchConfig, attributes: list):
         super().__init__(index_name.lower())
-        self._client = self._init_client(config)
+        self._client = vector_client_registry.acquire(
+            self,
+            self.get_type(),
+            config,
+            lambda: self._init_client(config),
+            health_check=lambda client: client.ping(),
+            close=lambda client: client.close(),
+        )
         self._version = self._get_version()
         self._check_version()
         self._attributes = attributes
@@ -1,6 +1,7 @@
 import hashlib
 import json
 import logging
+import threading
 import uuid
 from contextlib import contextmanager
 from typing import Any
@@ -12,6 +13,7 @@ from pydantic import BaseModel, model_validator
 
 from configs import dify_config
 from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_client_registry import vector_client_registry
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -74,10 +76,43 @@ USING gin (text gin_bigm_ops);
 """
 
 
+class BlockingThreadedConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    Thread-safe connection pool that waits up to ``timeout`` seconds for a free connection instead of
+    raising when exhausted.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, timeout: float = 30.0, **kwargs):
+        self._semaphore = threading.BoundedSemaphore(maxconn)
+        self._timeout = timeout
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def getconn(self, key=None):
+        if not self._semaphore.acquire(timeout=self._timeout):
+            raise psycopg2.pool.PoolError(f"no connection available within {self._timeout} seconds")
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._semaphore.release()
+
+
 class PGVector(BaseVector):
     def __init__(self, collection_name: str, config: PGVectorConfig):
         super().__init__(collection_name)
-        self.pool = self._create_connection_pool(config)
+        self.pool = vector_client_registry.acquire(
+            self,
+            VectorType.PGVECTOR,
+            config,
+            lambda: self._create_connection_pool(config),
+            close=lambda pool: pool.closeall(),
+        )
         self.table_name = f"embedding_{collection_name}"
         self.index_hash = hashlib.md5(self.table_name.encode()).hexdigest()[:8]
         self.pg_bigm = config.pg_bigm
@@ -86,7 +121,8 @@ class PGVector(BaseVector):
         return VectorType.PGVECTOR
 
     def _create_connection_pool(self, config: PGVectorConfig):
-        return psycopg2.pool.SimpleConnectionPool(
+        # The pool is shared by all PGVector instances with the same config, so it must be thread-safe.
+        return BlockingThreadedConnectionPool(
             config.min_connection,
             config.max_connection,
             host=config.host,
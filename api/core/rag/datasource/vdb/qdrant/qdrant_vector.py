@@ -23,6 +23,7 @@ from sqlalchemy import select
 from configs import dify_config
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_client_registry import vector_client_registry
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -87,7 +88,13 @@ class QdrantVector(BaseVector):
     def __init__(self, collection_name: str, group_id: str, config: QdrantConfig, distance_func: str = "Cosine"):
         super().__init__(collection_name)
         self._client_config = config
-        self._client = qdrant_client.QdrantClient(**self._client_config.to_qdrant_params().model_dump())
+        self._client = vector_client_registry.acquire(
+            self,
+            VectorType.QDRANT,
+            config,
+            lambda: qdrant_client.QdrantClient(**config.to_qdrant_params().model_dump()),
+            close=lambda client: client.close(),
+        )
         self._distance_func = distance_func.upper()
         self._group_id = group_id
 
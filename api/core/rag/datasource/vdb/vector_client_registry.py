@@ -0,0 +1,196 @@
+"""Process-wide registry of vector store clients shared by vector instances."""
+
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel
+
+from configs import dify_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class VectorClientRegistryStats:
+    created: int = 0
+    reused: int = 0
+    evicted: int = 0
+    health_check_failures: int = 0
+    clients: int = 0
+    leases: int = 0
+
+
+@dataclass
+class _Entry:
+    client: Any
+    close: Callable[[Any], None] | None
+    health_check: Callable[[Any], bool] | None
+    leases: int = 0
+    last_used: float = 0.0
+    last_checked: float = 0.0
+    # Removed from the registry after a failed health check, closed once its last lease is released
+    retired: bool = False
+
+
+def _close_quietly(client: Any, close: Callable[[Any], None] | None):
+    if close is None:
+        return
+    try:
+        close(client)
+    except Exception:
+        logger.warning("Failed to close vector store client", exc_info=True)
+
+
+class VectorClientRegistry:
+    """
+    Thread-safe registry of vector store clients keyed by connection config.
+
+    Vector instances lease a client for their lifetime, the lease is released when the instance is
+    garbage collected. A client nobody leases for ``idle_timeout`` seconds is closed, and a reused
+    client whose health check fails is replaced by a new one and closed once its last lease is released.
+    """
+
+    def __init__(self, enabled: bool, idle_timeout: float, health_check_interval: float):
+        self._enabled = enabled
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._stats = VectorClientRegistryStats()
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        owner: object,
+        namespace: str,
+        config: BaseModel,
+        factory: Callable[[], T],
+        *,
+        health_check: Callable[[T], bool] | None = None,
+        close: Callable[[T], None] | None = None,
+    ) -> T:
+        """
+        Return the shared client for ``config``, creating it with ``factory`` when missing.
+
+        :param owner: the vector instance using the client, the lease ends when it is garbage collected
+        :param namespace: the vector store type, so that equal configs of different stores never collide
+        :param config: the connection config the client was built from
+        :param factory: creates a new connected client
+        :param health_check: returns whether a reused client is still usable
+        :param close: releases the resources of a client
+        """
+        if not self._enabled:
+            client = factory()
+            if close is not None:
+                weakref.finalize(owner, _close_quietly, client, close)
+            return client
+
+        key = (namespace, hashlib.sha256(config.model_dump_json().encode("utf-8")).hexdigest())
+        self._evict_idle(exclude=key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.leases += 1
+                entry.last_used = time.monotonic()
+
+        if entry is not None and not self._is_healthy(key, entry):
+            entry = None
+
+        if entry is None:
+            client = factory()
+            now = time.monotonic()
+            entry = _Entry(client=client, close=close, health_check=health_check, leases=1, last_used=now)
+            entry.last_checked = now
+            with self._lock:
+                existing = self._entries.get(key)
+                if existing is not None:
+                    # Another thread created the client concurrently, keep the first one.
+                    existing.leases += 1
+                    self._stats.reused += 1
+                    redundant, entry = entry, existing
+                else:
+                    self._entries[key] = entry
+                    self._stats.created += 1
+                    redundant = None
+            if redundant is not None:
+                _close_quietly(redundant.client, close)
+        else:
+            with self._lock:
+                self._stats.reused += 1
+
+        weakref.finalize(owner, self._release, entry)
+        return cast(T, entry.client)
+
+    def stats(self) -> VectorClientRegistryStats:
+        with self._lock:
+            return VectorClientRegistryStats(
+                created=self._stats.created,
+                reused=self._stats.reused,
+                evicted=self._stats.evicted,
+                health_check_failures=self._stats.health_check_failures,
+                clients=len(self._entries),
+                leases=sum(entry.leases for entry in self._entries.values()),
+            )
+
+    def clear(self):
+        """Close and forget all clients, e.g. after forking a worker process."""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            _close_quietly(entry.client, entry.close)
+
+    def _is_healthy(self, key: tuple[str, str], entry: _Entry) -> bool:
+        if entry.health_check is None or time.monotonic() - entry.last_checked < self._health_check_interval:
+            return True
+        try:
+            healthy = entry.health_check(entry.client)
+        except Exception:
+            logger.warning("Health check of vector store client failed", exc_info=True)
+            healthy = False
+        with self._lock:
+            entry.last_checked = time.monotonic()
+            if healthy:
+                return True
+            self._stats.health_check_failures += 1
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            entry.retired = True
+        # Other vector instances may still be using the client
+        self._release(entry)
+        return False
+
+    def _release(self, entry: _Entry):
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            closing = entry.retired and entry.leases == 0
+        if closing:
+            _close_quietly(entry.client, entry.close)
+
+    def _evict_idle(self, exclude: tuple[str, str]):
+        now = time.monotonic()
+        with self._lock:
+            idle_keys = [
+                key
+                for key, entry in self._entries.items()
+                if key != exclude and entry.leases <= 0 and now - entry.last_used >= self._idle_timeout
+            ]
+            evicted = [self._entries.pop(key) for key in idle_keys]
+            self._stats.evicted += len(evicted)
+        for entry in evicted:
+            _close_quietly(entry.client, entry.close)
+
+
+vector_client_registry = VectorClientRegistry(
+    enabled=dify_config.VECTOR_STORE_CLIENT_REUSE_ENABLED,
+    idle_timeout=dify_config.VECTOR_STORE_CLIENT_IDLE_TIMEOUT,
+    health_check_interval=dify_config.VECTOR_STORE_CLIENT_HEALTH_CHECK_INTERVAL,
+)
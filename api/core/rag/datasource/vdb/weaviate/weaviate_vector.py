@@ -23,6 +23,7 @@ from weaviate.exceptions import UnexpectedStatusCodeError
 from configs import dify_config
 from core.rag.datasource.vdb.field import Field
 from core.rag.datasource.vdb.vector_base import BaseVector
+from core.rag.datasource.vdb.vector_client_registry import vector_client_registry
 from core.rag.datasource.vdb.vector_factory import AbstractVectorFactory
 from core.rag.datasource.vdb.vector_type import VectorType
 from core.rag.embedding.embedding_base import Embeddings
@@ -78,21 +79,16 @@ class WeaviateVector(BaseVector):
             attributes: List of metadata attributes to store
         """
         super().__init__(collection_name)
-        self._client = self._init_client(config)
+        self._client = vector_client_registry.acquire(
+            self,
+            VectorType.WEAVIATE,
+            config,
+            lambda: self._init_client(config),
+            health_check=lambda client: client.is_ready(),
+            close=lambda client: client.close(),
+        )
         self._attributes = attributes
 
-    def __del__(self):
-        """
-        Destructor to properly close the Weaviate client connection.
-        Prevents connection leaks and resource warnings.
-        """
-        if hasattr(self, "_client") and self._client is not None:
-            try:
-                self._client.close()
-            except Exception as e:
-                # Ignore errors during cleanup as object is being destroyed
-                logger.warning("Error closing Weaviate client %s", e, exc_info=True)
-
     def _init_client(self, config: WeaviateConfig) -> weaviate.WeaviateClient:
         """
         Initializes and returns a connected Weaviate client.
@@ -1,6 +1,5 @@
 import base64
 import logging
-import pickle
 from typing import Any, cast
 
 import numpy as np
@@ -12,10 +11,11 @@ from core.model_manager import ModelInstance
 from core.model_runtime.entities.model_entities import ModelPropertyKey
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from core.rag.embedding.embedding_base import Embeddings
+from core.rag.embedding.embedding_cache_store import embedding_cache_store
+from core.rag.embedding.query_embedding_cache import query_embedding_cache
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
 from libs import helper
-from models.dataset import Embedding
 
 logger = logging.getLogger(__name__)
 
@@ -30,17 +30,13 @@ class CacheEmbedding(Embeddings):
         # use doc embedding cache or store if not exists
         text_embeddings: list[Any] = [None for _ in range(len(texts))]
         embedding_queue_indices = []
-        for i, text in enumerate(texts):
-            hash = helper.generate_text_hash(text)
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=hash, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                text_embeddings[i] = embedding.get_embedding()
+        hashes = [helper.generate_text_hash(text) for text in texts]
+        cached_embeddings = embedding_cache_store.get(
+            db.session, self._model_instance.provider, self._model_instance.model, hashes
+        )
+        for i, hash in enumerate(hashes):
+            if hash in cached_embeddings:
+                text_embeddings[i] = cached_embeddings[hash]
             else:
                 embedding_queue_indices.append(i)
 
@@ -80,20 +76,14 @@ class CacheEmbedding(Embeddings):
                             db.session.rollback()
                         except Exception:
                             logger.exception("Failed transform embedding")
-                cache_embeddings = []
+                cache_embeddings: dict[str, list[float]] = {}
                 try:
                     for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
                         text_embeddings[i] = n_embedding
-                        hash = helper.generate_text_hash(texts[i])
-                        if hash not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=hash,
-                                provider_name=self._model_instance.provider,
-                                embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
-                            )
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(hash)
+                        cache_embeddings.setdefault(hashes[i], n_embedding)
+                    embedding_cache_store.add(
+                        db.session, self._model_instance.provider, self._model_instance.model, cache_embeddings
+                    )
                     db.session.commit()
                 except IntegrityError:
                     db.session.rollback()
@@ -109,17 +99,13 @@ class CacheEmbedding(Embeddings):
         # use doc embedding cache or store if not exists
         multimodel_embeddings: list[Any] = [None for _ in range(len(multimodel_documents))]
         embedding_queue_indices = []
-        for i, multimodel_document in enumerate(multimodel_documents):
-            file_id = multimodel_document["file_id"]
-            embedding = (
-                db.session.query(Embedding)
-                .filter_by(
-                    model_name=self._model_instance.model, hash=file_id, provider_name=self._model_instance.provider
-                )
-                .first()
-            )
-            if embedding:
-                multimodel_embeddings[i] = embedding.get_embedding()
+        file_ids = [multimodel_document["file_id"] for multimodel_document in multimodel_documents]
+        cached_embeddings = embedding_cache_store.get(
+            db.session, self._model_instance.provider, self._model_instance.model, file_ids
+        )
+        for i, file_id in enumerate(file_ids):
+            if file_id in cached_embeddings:
+                multimodel_embeddings[i] = cached_embeddings[file_id]
             else:
                 embedding_queue_indices.append(i)
 
@@ -161,21 +147,14 @@ class CacheEmbedding(Embeddings):
                             db.session.rollback()
                         except Exception:
                             logger.exception("Failed transform embedding")
-                cache_embeddings = []
+                cache_embeddings: dict[str, list[float]] = {}
                 try:
                     for i, n_embedding in zip(embedding_queue_indices, embedding_queue_embeddings):
                         multimodel_embeddings[i] = n_embedding
-                        file_id = multimodel_documents[i]["file_id"]
-                        if file_id not in cache_embeddings:
-                            embedding_cache = Embedding(
-                                model_name=self._model_instance.model,
-                                hash=file_id,
-                                provider_name=self._model_instance.provider,
-                                embedding=pickle.dumps(n_embedding, protocol=pickle.HIGHEST_PROTOCOL),
-                            )
-                            embedding_cache.set_embedding(n_embedding)
-                            db.session.add(embedding_cache)
-                            cache_embeddings.append(file_id)
+                        cache_embeddings.setdefault(file_ids[i], n_embedding)
+                    embedding_cache_store.add(
+                        db.session, self._model_instance.provider, self._model_instance.model, cache_embeddings
+                    )
                     db.session.commit()
                 except IntegrityError:
                     db.session.rollback()
@@ -188,14 +167,14 @@ class CacheEmbedding(Embeddings):
 
     def embed_query(self, text: str) -> list[float]:
         """Embed query text."""
-        # use doc embedding cache or store if not exists
         hash = helper.generate_text_hash(text)
-        embedding_cache_key = f"{self._model_instance.provider}_{self._model_instance.model}_{hash}"
-        embedding = redis_client.get(embedding_cache_key)
-        if embedding:
-            redis_client.expire(embedding_cache_key, 600)
-            decoded_embedding = np.frombuffer(base64.b64decode(embedding), dtype="float")
-            return [float(x) for x in decoded_embedding]
+        embedding_cache_key = f"query_embedding:{self._model_instance.provider}_{self._model_instance.model}_{hash}"
+        embedding = query_embedding_cache.get_or_compute(
+            embedding_cache_key, lambda: self._invoke_query_embedding(text)
+        )
+        return embedding.tolist()
+
+    def _invoke_query_embedding(self, text: str) -> list[float]:
         try:
             embedding_result = self._model_instance.invoke_text_embedding(
                 texts=[text], user=self._user, input_type=EmbeddingInputType.QUERY
@@ -210,23 +189,6 @@ class CacheEmbedding(Embeddings):
             if dify_config.DEBUG:
                 logger.exception("Failed to embed query text '%s...(%s chars)'", text[:10], len(text))
             raise ex
-
-        try:
-            # encode embedding to base64
-            embedding_vector = np.array(embedding_results)
-            vector_bytes = embedding_vector.tobytes()
-            # Transform to Base64
-            encoded_vector = base64.b64encode(vector_bytes)
-            # Transform to string
-            encoded_str = encoded_vector.decode("utf-8")
-            redis_client.setex(embedding_cache_key, 600, encoded_str)
-        except Exception as ex:
-            if dify_config.DEBUG:
-                logger.exception(
-                    "Failed to add embedding to redis for the text '%s...(%s chars)'", text[:10], len(text)
-                )
-            raise ex
-
         return embedding_results  # type: ignore
 
     def embed_multimodal_query(self, multimodel_document: dict) -> list[float]:
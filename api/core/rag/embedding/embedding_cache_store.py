@@ -0,0 +1,155 @@
+"""Lookups and writes of the month-partitioned cache of document embeddings."""
+
+import logging
+import pickle
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from core.db.session_factory import session_factory
+from libs.datetime_utils import naive_utc_now
+from models.dataset import Embedding, EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+_HIT_FLUSH_BATCH_SIZE = 1000
+# Hits of rows that were hit more recently than this aren't recorded again
+_HIT_RESOLUTION = timedelta(days=1)
+
+
+def partition_month(moment: datetime) -> int:
+    """The partition of the embedding cache rows cached at ``moment`` belong to, e.g. 202610."""
+    return moment.year * 100 + moment.month
+
+
+class EmbeddingCacheStore:
+    """
+    Reads and writes ``EmbeddingCache`` rows, recording hits of the rows of previous months.
+
+    Hits are only recorded for rows outside the current month, at most once a day per row, and are
+    written by a single UPDATE per month and ``hit_flush_interval`` seconds, so that the expiry of a
+    month can keep the embeddings that are still in use without every lookup writing to the table.
+    Until the legacy ``embeddings`` table has been backfilled, lookups can fall back to it.
+    """
+
+    def __init__(self, hit_tracking_enabled: bool, hit_flush_interval: int, legacy_lookup_enabled: bool):
+        self._hit_tracking_enabled = hit_tracking_enabled
+        self._hit_flush_interval = hit_flush_interval
+        self._legacy_lookup_enabled = legacy_lookup_enabled
+        self._pending_hits: dict[int, set[str]] = defaultdict(set)
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get(
+        self, session: Session, provider_name: str, model_name: str, hashes: Sequence[str]
+    ) -> dict[str, list[float]]:
+        """The cached embeddings of the hashes, keyed by hash."""
+        hashes = list(dict.fromkeys(hashes))
+        if not hashes:
+            return {}
+
+        now = naive_utc_now()
+        current_month = partition_month(now)
+        rows = session.execute(
+            select(
+                EmbeddingCache.id,
+                EmbeddingCache.hash,
+                EmbeddingCache.partition_month,
+                EmbeddingCache.last_hit_at,
+                EmbeddingCache.embedding,
+            )
+            .where(
+                EmbeddingCache.provider_name == provider_name,
+                EmbeddingCache.model_name == model_name,
+                EmbeddingCache.hash.in_(hashes),
+            )
+            .order_by(EmbeddingCache.partition_month.desc())
+        ).all()
+
+        embeddings: dict[str, list[float]] = {}
+        hits: list[tuple[int, str]] = []
+        for row in rows:
+            if row.hash in embeddings:
+                continue
+            embeddings[row.hash] = pickle.loads(row.embedding)  # noqa: S301
+            if row.partition_month < current_month and (
+                row.last_hit_at is None or row.last_hit_at < now - _HIT_RESOLUTION
+            ):
+                hits.append((row.partition_month, row.id))
+
+        missing = [hash for hash in hashes if hash not in embeddings]
+        if missing and self._legacy_lookup_enabled:
+            legacy_rows = session.scalars(
+                select(Embedding).where(
+                    Embedding.provider_name == provider_name,
+                    Embedding.model_name == model_name,
+                    Embedding.hash.in_(missing),
+                )
+            ).all()
+            for legacy_row in legacy_rows:
+                embeddings.setdefault(legacy_row.hash, legacy_row.get_embedding())
+
+        if hits:
+            self._record_hits(hits)
+        return embeddings
+
+    def add(self, session: Session, provider_name: str, model_name: str, embeddings: Mapping[str, list[float]]):
+        """Add the embeddings to the session as rows of the current month, the caller commits."""
+        month = partition_month(naive_utc_now())
+        for hash, embedding in embeddings.items():
+            embedding_cache = EmbeddingCache(
+                model_name=model_name,
+                hash=hash,
+                provider_name=provider_name,
+                partition_month=month,
+                embedding=pickle.dumps(embedding, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            session.add(embedding_cache)
+
+    def flush_hits(self):
+        with self._lock:
+            pending_hits = self._pending_hits
+            self._pending_hits = defaultdict(set)
+            self._last_flush = time.monotonic()
+        if not pending_hits:
+            return
+
+        now = naive_utc_now()
+        try:
+            with session_factory.create_session() as session, session.begin():
+                for month, ids in pending_hits.items():
+                    id_list = list(ids)
+                    for i in range(0, len(id_list), _HIT_FLUSH_BATCH_SIZE):
+                        session.execute(
+                            update(EmbeddingCache)
+                            .where(
+                                EmbeddingCache.partition_month == month,
+                                EmbeddingCache.id.in_(id_list[i : i + _HIT_FLUSH_BATCH_SIZE]),
+                            )
+                            .values(last_hit_at=now)
+                        )
+        except Exception:
+            logger.warning("Failed to record embedding cache hits", exc_info=True)
+
+    def _record_hits(self, hits: Sequence[tuple[int, str]]):
+        if not self._hit_tracking_enabled:
+            return
+        with self._lock:
+            for month, row_id in hits:
+                self._pending_hits[month].add(row_id)
+            due = time.monotonic() - self._last_flush >= self._hit_flush_interval
+        if due:
+            self.flush_hits()
+
+
+embedding_cache_store = EmbeddingCacheStore(
+    hit_tracking_enabled=dify_config.EMBEDDING_CACHE_HIT_TRACKING_ENABLED,
+    hit_flush_interval=dify_config.EMBEDDING_CACHE_HIT_FLUSH_INTERVAL,
+    legacy_lookup_enabled=dify_config.EMBEDDING_CACHE_LEGACY_LOOKUP_ENABLED,
+)
@@ -0,0 +1,77 @@
+"""Two-tier cache of query embeddings with coalescing of concurrent identical requests."""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+
+import numpy as np
+import numpy.typing as npt
+from cachetools import TTLCache
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+
+EmbeddingVector = npt.NDArray[np.float32]
+
+
+class QueryEmbeddingCache:
+    """
+    Query embeddings cached in a per-process TTL cache in front of Redis.
+
+    Vectors are stored as raw float32 bytes. Concurrent lookups of the same key that miss both
+    tiers wait for the first one to compute the embedding instead of invoking the model
+    themselves, so retrieving from several datasets sharing an embedding model at once costs a
+    single model call.
+    """
+
+    def __init__(self, local_max_size: int, local_ttl: int, redis_ttl: int):
+        self._local: TTLCache[str, EmbeddingVector] = TTLCache(maxsize=local_max_size, ttl=local_ttl)
+        self._redis_ttl = redis_ttl
+        self._in_flight: dict[str, Future[EmbeddingVector]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], list[float]]) -> EmbeddingVector:
+        with self._lock:
+            vector = self._local.get(key)
+            if vector is not None:
+                return vector
+            future = self._in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            vector = self._load(key, compute)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        future.set_result(vector)
+        return vector
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _load(self, key: str, compute: Callable[[], list[float]]) -> EmbeddingVector:
+        cached = redis_client.get(key)
+        if cached:
+            vector = np.frombuffer(cached, dtype=np.float32)
+        else:
+            vector = np.asarray(compute(), dtype=np.float32)
+            redis_client.setex(key, self._redis_ttl, vector.tobytes())
+        with self._lock:
+            self._local[key] = vector
+        return vector
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    local_max_size=dify_config.QUERY_EMBEDDING_CACHE_LOCAL_SIZE,
+    local_ttl=dify_config.QUERY_EMBEDDING_CACHE_LOCAL_TTL,
+    redis_ttl=dify_config.QUERY_EMBEDDING_CACHE_TTL,
+)
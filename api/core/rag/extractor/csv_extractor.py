@@ -1,6 +1,8 @@
 """Abstract interface for document loader implementations."""
 
 import csv
+from collections.abc import Iterator
+from itertools import islice
 
 import pandas as pd
 
@@ -15,6 +17,7 @@ class CSVExtractor(BaseExtractor):
 
     Args:
         file_path: Path to the file to load.
+        chunk_size: Number of rows parsed at a time, bounding memory usage for large files.
     """
 
     def __init__(
@@ -24,6 +27,7 @@ class CSVExtractor(BaseExtractor):
         autodetect_encoding: bool = False,
         source_column: str | None = None,
         csv_args: dict | None = None,
+        chunk_size: int = 10000,
     ):
         """Initialize with file path."""
         self._file_path = file_path
@@ -31,47 +35,54 @@ class CSVExtractor(BaseExtractor):
         self._autodetect_encoding = autodetect_encoding
         self.source_column = source_column
         self.csv_args = csv_args or {}
+        self.chunk_size = chunk_size
 
     def extract(self) -> list[Document]:
         """Load data into document objects."""
-        docs = []
+        return list(self.extract_iter())
+
+    def extract_iter(self) -> Iterator[Document]:
+        """Lazily load data into document objects, one row at a time."""
+        # Rows are parsed in chunks, so a decoding error may surface after some rows have already
+        # been yielded. Those rows are skipped when retrying with another encoding.
+        yielded = 0
         try:
-            with open(self._file_path, newline="", encoding=self._encoding) as csvfile:
-                docs = self._read_from_file(csvfile)
+            for doc in self._read_from_path(self._encoding, skip=0):
+                yield doc
+                yielded += 1
         except UnicodeDecodeError as e:
-            if self._autodetect_encoding:
-                detected_encodings = detect_file_encodings(self._file_path)
-                for encoding in detected_encodings:
-                    try:
-                        with open(self._file_path, newline="", encoding=encoding.encoding) as csvfile:
-                            docs = self._read_from_file(csvfile)
-                        break
-                    except UnicodeDecodeError:
-                        continue
-            else:
+            if not self._autodetect_encoding:
                 raise RuntimeError(f"Error loading {self._file_path}") from e
 
-        return docs
-
-    def _read_from_file(self, csvfile) -> list[Document]:
-        docs = []
-        try:
-            # load csv file into pandas dataframe
-            df = pd.read_csv(csvfile, on_bad_lines="skip", **self.csv_args)
+            detected_encodings = detect_file_encodings(self._file_path)
+            for encoding in detected_encodings:
+                try:
+                    for doc in self._read_from_path(encoding.encoding, skip=yielded):
+                        yield doc
+                        yielded += 1
+                    break
+                except UnicodeDecodeError:
+                    continue
 
-            # check source column exists
-            if self.source_column and self.source_column not in df.columns:
-                raise ValueError(f"Source column '{self.source_column}' not found in CSV file.")
+    def _read_from_path(self, encoding: str | None, skip: int) -> Iterator[Document]:
+        with open(self._file_path, newline="", encoding=encoding) as csvfile:
+            yield from islice(self._read_from_file(csvfile), skip, None)
 
-            # create document objects
+    def _read_from_file(self, csvfile) -> Iterator[Document]:
+        try:
+            # load csv file into pandas dataframes of at most `chunk_size` rows
+            reader = pd.read_csv(csvfile, on_bad_lines="skip", chunksize=self.chunk_size, **self.csv_args)
+            with reader:
+                for df in reader:
+                    # check source column exists
+                    if self.source_column and self.source_column not in df.columns:
+                        raise ValueError(f"Source column '{self.source_column}' not found in CSV file.")
 
-            for i, row in df.iterrows():
-                content = ";".join(f"{col.strip()}: {str(row[col]).strip()}" for col in df.columns)
-                source = row[self.source_column] if self.source_column else ""
-                metadata = {"source": source, "row": i}
-                doc = Document(page_content=content, metadata=metadata)
-                docs.append(doc)
+                    # create document objects
+                    for i, row in df.iterrows():
+                        content = ";".join(f"{col.strip()}: {str(row[col]).strip()}" for col in df.columns)
+                        source = row[self.source_column] if self.source_column else ""
+                        metadata = {"source": source, "row": i}
+                        yield Document(page_content=content, metadata=metadata)
         except csv.Error as e:
             raise e
-
-        return docs
@@ -1,6 +1,7 @@
 """Abstract interface for document loader implementations."""
 
 import os
+from collections.abc import Iterator
 from typing import TypedDict
 
 import pandas as pd
@@ -32,7 +33,13 @@ class ExcelExtractor(BaseExtractor):
 
     def extract(self) -> list[Document]:
         """Load from Excel file in xls or xlsx format using Pandas and openpyxl."""
-        documents = []
+        return list(self.extract_iter())
+
+    def extract_iter(self) -> Iterator[Document]:
+        """
+        Lazily load documents row by row.
+        xlsx files are streamed with openpyxl in read-only mode, xls files are parsed one sheet at a time.
+        """
         file_extension = os.path.splitext(self._file_path)[-1].lower()
 
         if file_extension == ".xlsx":
@@ -63,9 +70,7 @@ class ExcelExtractor(BaseExtractor):
                                 value = value.strip().replace('"', '\\"')
                                 page_content.append(f'"{col_name}":"{value}"')
                         if page_content:
-                            documents.append(
-                                Document(page_content=";".join(page_content), metadata={"source": self._file_path})
-                            )
+                            yield Document(page_content=";".join(page_content), metadata={"source": self._file_path})
             finally:
                 wb.close()
 
@@ -80,14 +85,10 @@ class ExcelExtractor(BaseExtractor):
                     for k, v in series_row.items():
                         if pd.notna(v):
                             page_content.append(f'"{k}":"{v}"')
-                    documents.append(
-                        Document(page_content=";".join(page_content), metadata={"source": self._file_path})
-                    )
+                    yield Document(page_content=";".join(page_content), metadata={"source": self._file_path})
         else:
             raise ValueError(f"Unsupported file extension: {file_extension}")
 
-        return documents
-
     def _find_header_and_columns(self, sheet, scan_rows=10) -> tuple[int, dict[int, str], int]:
         """
         Scan first N rows to find the most likely header row.
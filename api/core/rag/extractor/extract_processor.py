@@ -1,5 +1,6 @@
 import re
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Union
 from urllib.parse import unquote
@@ -33,6 +34,8 @@ from extensions.ext_storage import storage
 from models.model import UploadFile
 
 SUPPORT_URL_CONTENT_TYPES = ["application/pdf", "text/plain", "application/json"]
+# Extensions of the files whose rows `ExtractProcessor.extract_iter` yields while parsing them
+STREAMED_FILE_EXTENSIONS = {"csv", "xls", "xlsx"}
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124"
     " Safari/537.36"
@@ -88,6 +91,30 @@ class ExtractProcessor:
             else:
                 return cls.extract(extract_setting=extract_setting, file_path=file_path)
 
+    @classmethod
+    def extract_iter(
+        cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: str | None = None
+    ) -> Iterator[Document]:
+        """
+        Like `extract`, but the rows of CSV and Excel files are yielded while the file is parsed instead of
+        being loaded all at once.
+        """
+        upload_file = extract_setting.upload_file
+        suffix = Path(file_path or (upload_file.key if upload_file else "")).suffix.lower()
+        if extract_setting.datasource_type != DatasourceType.FILE or suffix.lstrip(".") not in STREAMED_FILE_EXTENSIONS:
+            yield from cls.extract(extract_setting, is_automatic, file_path)
+            return
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if not file_path:
+                assert upload_file is not None
+                file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
+                storage.download(upload_file.key, file_path)
+            extractor = (
+                CSVExtractor(file_path, autodetect_encoding=True) if suffix == ".csv" else ExcelExtractor(file_path)
+            )
+            yield from extractor.extract_iter()
+
     @classmethod
     def extract(
         cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: str | None = None
@@ -0,0 +1,284 @@
+"""Weighted fair scheduling of tenant tasks sharing a Celery queue."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from redis.exceptions import LockError
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Drops a tenant from the pending set only if its queue is empty, atomically with respect to enqueue(),
+# which pushes to the queue before adding the tenant to the pending set
+_REMOVE_IDLE_TENANT_SCRIPT = """
+if redis.call('llen', KEYS[1]) == 0 then
+    return redis.call('zrem', KEYS[2], ARGV[1])
+end
+return 0
+"""
+
+
+class _QueuedTask(BaseModel):
+    cost: int
+    data: Any
+
+
+@dataclass
+class ScheduledTask:
+    """A task handed out by the scheduler, its lease must be completed once the task finished."""
+
+    scheduler: str
+    tenant_id: str
+    lease_id: str
+    data: Any
+    cost: int = 1
+
+
+@dataclass
+class TenantQueueSnapshot:
+    tenant_id: str
+    weight: float
+    queued: int
+    running: int
+    virtual_time: float | None
+    dispatched: int
+
+
+@dataclass
+class SchedulerSnapshot:
+    name: str
+    running: int
+    global_concurrency: int
+    tenant_concurrency: int
+    tenants: list[TenantQueueSnapshot] = field(default_factory=list)
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class TenantFairScheduler:
+    """
+    Weighted fair scheduler over per-tenant virtual queues in Redis.
+
+    Tasks wait in a Redis list per tenant instead of the Celery queue, and are only handed to Celery
+    while the global and per-tenant concurrency caps allow it. Among the tenants with waiting tasks,
+    the one with the lowest virtual time is served next; dispatching a task advances the tenant's
+    virtual time by the task's cost divided by the tenant's weight, so tenants are served in
+    proportion to their weight no matter how much work each of them queued. A tenant becoming
+    active starts at the current virtual time and can't claim credit for the time it was idle.
+
+    Running tasks hold a lease which is released by ``complete()``. Leases expire after
+    ``lease_ttl`` seconds, so a crashed worker can't block its tenant forever, and are renewed
+    while the task runs by ``hold_lease()``, so a long task keeps counting towards the caps.
+    Dispatch happens on enqueue and completion, and periodically from a beat task, which hands
+    out the slots freed by expired leases.
+    """
+
+    def __init__(self, name: str, tenant_concurrency: int, global_concurrency: int, lease_ttl: int):
+        self._name = name
+        self._tenant_concurrency = tenant_concurrency
+        self._global_concurrency = global_concurrency
+        self._lease_ttl = lease_ttl
+        prefix = f"tenant_fair_scheduler:{name}"
+        self._pending_key = f"{prefix}:pending"
+        self._running_key = f"{prefix}:running"
+        self._weights_key = f"{prefix}:weights"
+        self._dispatched_key = f"{prefix}:dispatched"
+        self._virtual_time_key = f"{prefix}:virtual_time"
+        self._lock_key = f"{prefix}:lock"
+        self._queue_prefix = f"{prefix}:queue:"
+
+    @classmethod
+    def from_config(cls, name: str) -> TenantFairScheduler:
+        return cls(
+            name=name,
+            tenant_concurrency=dify_config.TENANT_ISOLATED_TASK_CONCURRENCY,
+            global_concurrency=dify_config.TENANT_FAIR_SCHEDULER_GLOBAL_CONCURRENCY,
+            lease_ttl=dify_config.TENANT_FAIR_SCHEDULER_LEASE_TTL,
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def enqueue(self, tenant_id: str, data: Any, weight: float = 1.0, cost: int = 1):
+        """Append a task to the tenant's queue. ``cost`` is the amount of work the task represents."""
+        redis_client.rpush(self._queue_key(tenant_id), _QueuedTask(cost=max(cost, 1), data=data).model_dump_json())
+        redis_client.hset(self._weights_key, tenant_id, weight)
+        redis_client.zadd(self._pending_key, {tenant_id: self._virtual_time()}, nx=True)
+
+    def dispatch(self, send: Callable[[ScheduledTask], None]) -> int:
+        """
+        Hand as many waiting tasks to ``send`` as the concurrency caps allow.
+
+        A task that ``send`` fails for is put back at the head of its tenant's queue. Dispatch is
+        skipped while another caller holds the scheduler lock, so the request path never waits on it;
+        what it leaves behind is handed out on the next completion or beat.
+        Returns the number of tasks sent.
+        """
+        try:
+            with redis_client.lock(self._lock_key, timeout=30, blocking=False):
+                tasks = self._acquire_tasks()
+        except LockError:
+            logger.warning("Tenant fair scheduler %s is busy, skipping dispatch", self._name)
+            return 0
+
+        sent = 0
+        for task in tasks:
+            try:
+                send(task)
+                sent += 1
+            except Exception:
+                logger.exception("Failed to send task of tenant %s from scheduler %s", task.tenant_id, self._name)
+                self._requeue(task)
+        return sent
+
+    def complete(self, tenant_id: str, lease_id: str):
+        redis_client.zrem(self._running_key, self._lease_member(tenant_id, lease_id))
+
+    def renew(self, tenant_id: str, lease_id: str) -> bool:
+        """Extend a lease by ``lease_ttl`` seconds. Returns False if the lease already expired."""
+        member = self._lease_member(tenant_id, lease_id)
+        return bool(redis_client.zadd(self._running_key, {member: time.time() + self._lease_ttl}, xx=True, ch=True))
+
+    @contextmanager
+    def hold_lease(self, tenant_id: str, lease_id: str) -> Iterator[None]:
+        """Renew the lease of a task in the background while the block runs."""
+        stopped = threading.Event()
+
+        def renew_until_stopped():
+            while not stopped.wait(self._lease_ttl / 3):
+                try:
+                    if not self.renew(tenant_id, lease_id):
+                        logger.warning(
+                            "Lease of tenant %s on scheduler %s expired before renewal", tenant_id, self._name
+                        )
+                        return
+                except Exception:
+                    logger.exception("Failed to renew lease of tenant %s on scheduler %s", tenant_id, self._name)
+
+        renewer = threading.Thread(target=renew_until_stopped, name=f"fair-scheduler-lease-{lease_id}", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+
+    def snapshot(self) -> SchedulerSnapshot:
+        redis_client.zremrangebyscore(self._running_key, "-inf", time.time())
+        running = self._running_per_tenant()
+        pending = {_decode(tenant): score for tenant, score in redis_client.zrange(self._pending_key, 0, -1, True)}
+        weights = {_decode(tenant): float(weight) for tenant, weight in redis_client.hgetall(self._weights_key).items()}
+        dispatched = {
+            _decode(tenant): int(count) for tenant, count in redis_client.hgetall(self._dispatched_key).items()
+        }
+
+        tenants = [
+            TenantQueueSnapshot(
+                tenant_id=tenant_id,
+                weight=weights.get(tenant_id, 1.0),
+                queued=redis_client.llen(self._queue_key(tenant_id)),
+                running=running.get(tenant_id, 0),
+                virtual_time=pending.get(tenant_id),
+                dispatched=dispatched.get(tenant_id, 0),
+            )
+            for tenant_id in sorted(pending.keys() | running.keys())
+        ]
+        return SchedulerSnapshot(
+            name=self._name,
+            running=sum(running.values()),
+            global_concurrency=self._global_concurrency,
+            tenant_concurrency=self._tenant_concurrency,
+            tenants=tenants,
+        )
+
+    def _acquire_tasks(self) -> list[ScheduledTask]:
+        now = time.time()
+        redis_client.zremrangebyscore(self._running_key, "-inf", now)
+        running = self._running_per_tenant()
+        total_running = sum(running.values())
+
+        candidates = [(score, _decode(tenant)) for tenant, score in redis_client.zrange(self._pending_key, 0, -1, True)]
+        heapq.heapify(candidates)
+        tasks: list[ScheduledTask] = []
+        while candidates and (self._global_concurrency <= 0 or total_running < self._global_concurrency):
+            virtual_time, tenant_id = heapq.heappop(candidates)
+            if running[tenant_id] >= self._tenant_concurrency:
+                continue
+
+            queue_key = self._queue_key(tenant_id)
+            raw = redis_client.lpop(queue_key)
+            if raw is None:
+                self._remove_idle_tenant(tenant_id)
+                continue
+            try:
+                queued = _QueuedTask.model_validate_json(raw)
+            except ValidationError:
+                logger.warning("Dropping invalid task of tenant %s from scheduler %s", tenant_id, self._name)
+                heapq.heappush(candidates, (virtual_time, tenant_id))
+                continue
+
+            lease_id = uuid.uuid4().hex
+            redis_client.zadd(self._running_key, {self._lease_member(tenant_id, lease_id): now + self._lease_ttl})
+            redis_client.hincrby(self._dispatched_key, tenant_id, 1)
+            redis_client.set(self._virtual_time_key, max(virtual_time, self._virtual_time()))
+            running[tenant_id] += 1
+            total_running += 1
+            tasks.append(
+                ScheduledTask(
+                    scheduler=self._name, tenant_id=tenant_id, lease_id=lease_id, data=queued.data, cost=queued.cost
+                )
+            )
+
+            if redis_client.llen(queue_key):
+                next_virtual_time = virtual_time + queued.cost / self._weight(tenant_id)
+                redis_client.zadd(self._pending_key, {tenant_id: next_virtual_time})
+                heapq.heappush(candidates, (next_virtual_time, tenant_id))
+            else:
+                self._remove_idle_tenant(tenant_id)
+        return tasks
+
+    def _remove_idle_tenant(self, tenant_id: str):
+        """Stop considering a tenant for dispatch, unless a task was enqueued since its queue was seen empty."""
+        redis_client.eval(_REMOVE_IDLE_TENANT_SCRIPT, 2, self._queue_key(tenant_id), self._pending_key, tenant_id)
+
+    def _requeue(self, task: ScheduledTask):
+        self.complete(task.tenant_id, task.lease_id)
+        redis_client.lpush(
+            self._queue_key(task.tenant_id), _QueuedTask(cost=task.cost, data=task.data).model_dump_json()
+        )
+        redis_client.zadd(self._pending_key, {task.tenant_id: self._virtual_time()}, nx=True)
+
+    def _running_per_tenant(self) -> Counter[str]:
+        members = redis_client.zrange(self._running_key, 0, -1)
+        return Counter(_decode(member).rsplit(":", 1)[0] for member in members)
+
+    def _virtual_time(self) -> float:
+        value = redis_client.get(self._virtual_time_key)
+        return float(value) if value else 0.0
+
+    def _weight(self, tenant_id: str) -> float:
+        value = redis_client.hget(self._weights_key, tenant_id)
+        weight = float(value) if value else 1.0
+        return weight if weight > 0 else 1.0
+
+    def _queue_key(self, tenant_id: str) -> str:
+        return f"{self._queue_prefix}{tenant_id}"
+
+    @staticmethod
+    def _lease_member(tenant_id: str, lease_id: str) -> str:
+        return f"{tenant_id}:{lease_id}"
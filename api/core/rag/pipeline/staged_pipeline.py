@@ -0,0 +1,178 @@
+"""Multi-stage pipeline running each stage in its own threads, connected by bounded queues."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    items: int = 0
+    batches: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per busy second."""
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+
+@dataclass
+class PipelineStage:
+    """
+    One stage of a pipeline.
+
+    ``process`` receives a batch of items and returns the items handed to the next stage. Batches
+    hold a single item unless ``batch_limit`` is set, in which case a worker keeps taking items that
+    are already queued while the summed ``batch_weight`` of the batch stays below the limit of the
+    batch's first item.
+    """
+
+    name: str
+    process: Callable[[list[Any]], Iterable[Any]]
+    workers: int = 1
+    batch_limit: Callable[[Any], int] | None = None
+    batch_weight: Callable[[Any], int] = field(default=lambda _: 1)
+
+
+class StagedPipeline:
+    """
+    Runs items through stages concurrently, e.g. extracting one document while embedding another.
+
+    Queues between stages are bounded, so a slow stage applies backpressure to the stages feeding
+    it instead of letting them buffer unbounded work. A stage raising for a batch drops the batch,
+    handling per-item failures is up to the stage. ``abort()`` makes all stages drop their remaining
+    work.
+    """
+
+    def __init__(
+        self,
+        stages: list[PipelineStage],
+        queue_size: int,
+        worker_context: Callable[[], AbstractContextManager[Any]] | None = None,
+    ):
+        self._stages = stages
+        self._queues: list[queue.Queue[Any]] = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self._worker_context = worker_context or nullcontext
+        self._metrics = [StageMetrics(name=stage.name) for stage in stages]
+        self._metrics_lock = threading.Lock()
+        self._aborted = threading.Event()
+
+    def abort(self):
+        self._aborted.set()
+
+    @property
+    def aborted(self) -> bool:
+        return self._aborted.is_set()
+
+    def run(self, items: Iterable[Any]) -> list[StageMetrics]:
+        """Feed ``items`` through all stages and wait until every stage finished."""
+        workers: list[list[threading.Thread]] = []
+        for index, stage in enumerate(self._stages):
+            stage_workers = [
+                threading.Thread(
+                    target=self._work,
+                    args=(index,),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True,
+                )
+                for worker in range(stage.workers)
+            ]
+            for worker in stage_workers:
+                worker.start()
+            workers.append(stage_workers)
+
+        for item in items:
+            if self.aborted:
+                break
+            self._queues[0].put(item)
+
+        # Close the stages in order, each one only after all workers of the previous one finished.
+        for index, stage_workers in enumerate(workers):
+            for _ in stage_workers:
+                self._queues[index].put(_END)
+            for worker in stage_workers:
+                worker.join()
+
+        return self.metrics()
+
+    def metrics(self) -> list[StageMetrics]:
+        with self._metrics_lock:
+            return [
+                StageMetrics(
+                    name=metric.name,
+                    items=metric.items,
+                    batches=metric.batches,
+                    errors=metric.errors,
+                    busy_seconds=metric.busy_seconds,
+                )
+                for metric in self._metrics
+            ]
+
+    def _work(self, index: int):
+        with self._worker_context():
+            while True:
+                batch, finished = self._next_batch(index)
+                if batch and not self.aborted:
+                    self._process(index, batch)
+                if finished:
+                    return
+
+    def _next_batch(self, index: int) -> tuple[list[Any], bool]:
+        stage = self._stages[index]
+        input_queue = self._queues[index]
+        item = input_queue.get()
+        if item is _END:
+            return [], True
+
+        batch = [item]
+        if stage.batch_limit is None:
+            return batch, False
+
+        limit = stage.batch_limit(item)
+        weight = stage.batch_weight(item)
+        while weight < limit:
+            try:
+                item = input_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+            weight += stage.batch_weight(item)
+        return batch, False
+
+    def _process(self, index: int, batch: list[Any]):
+        stage = self._stages[index]
+        start = time.perf_counter()
+        try:
+            outputs = list(stage.process(batch))
+        except Exception:
+            logger.exception("Pipeline stage %s failed for a batch of %s items", stage.name, len(batch))
+            outputs = []
+            with self._metrics_lock:
+                self._metrics[index].errors += 1
+        elapsed = time.perf_counter() - start
+
+        with self._metrics_lock:
+            metric = self._metrics[index]
+            metric.items += len(batch)
+            metric.batches += 1
+            metric.busy_seconds += elapsed
+
+        if index + 1 < len(self._stages):
+            for output in outputs:
+                self._queues[index + 1].put(output)
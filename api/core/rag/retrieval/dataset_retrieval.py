@@ -1,3 +1,4 @@
+import heapq
 import json
 import logging
 import math
@@ -6,12 +7,14 @@ import threading
 import time
 from collections import Counter, defaultdict
 from collections.abc import Generator, Mapping
+from functools import partial
 from typing import Any, Union, cast
 
 from flask import Flask, current_app
 from sqlalchemy import and_, func, literal, or_, select
 from sqlalchemy.orm import Session
 
+from configs import dify_config
 from core.app.app_config.entities import (
     DatasetEntity,
     DatasetRetrieveConfigEntity,
@@ -47,6 +50,7 @@ from core.rag.index_processor.constant.index_type import IndexStructureType, Ind
 from core.rag.index_processor.constant.query_type import QueryType
 from core.rag.models.document import Document
 from core.rag.rerank.rerank_type import RerankMode
+from core.rag.retrieval.retrieval_executor import retrieval_executor
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
 from core.rag.retrieval.router.multi_dataset_function_call_router import FunctionCallMultiDatasetRouter
 from core.rag.retrieval.router.multi_dataset_react_route import ReactMultiDatasetRouter
@@ -732,7 +736,6 @@ class DatasetRetrieval:
     ):
         if not available_datasets:
             return []
-        all_threads = []
         all_documents: list[Document] = []
         dataset_ids = [dataset.id for dataset in available_datasets]
         index_type_check = all(
@@ -770,67 +773,31 @@ class DatasetRetrieval:
             cancel_event = threading.Event()
             thread_exceptions: list[Exception] = []
 
+            retrieve = partial(
+                self._multiple_retrieve_thread,
+                flask_app=current_app._get_current_object(),  # type: ignore
+                available_datasets=available_datasets,
+                metadata_condition=metadata_condition,
+                metadata_filter_document_ids=metadata_filter_document_ids,
+                all_documents=all_documents,
+                tenant_id=tenant_id,
+                reranking_enable=reranking_enable,
+                reranking_mode=reranking_mode,
+                reranking_model=reranking_model,
+                weights=weights,
+                top_k=top_k,
+                score_threshold=score_threshold,
+                dataset_count=dataset_count,
+                cancel_event=cancel_event,
+                thread_exceptions=thread_exceptions,
+            )
+            tasks = []
             if query:
-                query_thread = threading.Thread(
-                    target=self._multiple_retrieve_thread,
-                    kwargs={
-                        "flask_app": current_app._get_current_object(),  # type: ignore
-                        "available_datasets": available_datasets,
-                        "metadata_condition": metadata_condition,
-                        "metadata_filter_document_ids": metadata_filter_document_ids,
-                        "all_documents": all_documents,
-                        "tenant_id": tenant_id,
-                        "reranking_enable": reranking_enable,
-                        "reranking_mode": reranking_mode,
-                        "reranking_model": reranking_model,
-                        "weights": weights,
-                        "top_k": top_k,
-                        "score_threshold": score_threshold,
-                        "query": query,
-                        "attachment_id": None,
-                        "dataset_count": dataset_count,
-                        "cancel_event": cancel_event,
-                        "thread_exceptions": thread_exceptions,
-                    },
-                )
-                all_threads.append(query_thread)
-                query_thread.start()
-            if attachment_ids:
-                for attachment_id in attachment_ids:
-                    attachment_thread = threading.Thread(
-                        target=self._multiple_retrieve_thread,
-                        kwargs={
-                            "flask_app": current_app._get_current_object(),  # type: ignore
-                            "available_datasets": available_datasets,
-                            "metadata_condition": metadata_condition,
-                            "metadata_filter_document_ids": metadata_filter_document_ids,
-                            "all_documents": all_documents,
-                            "tenant_id": tenant_id,
-                            "reranking_enable": reranking_enable,
-                            "reranking_mode": reranking_mode,
-                            "reranking_model": reranking_model,
-                            "weights": weights,
-                            "top_k": top_k,
-                            "score_threshold": score_threshold,
-                            "query": None,
-                            "attachment_id": attachment_id,
-                            "dataset_count": dataset_count,
-                            "cancel_event": cancel_event,
-                            "thread_exceptions": thread_exceptions,
-                        },
-                    )
-                    all_threads.append(attachment_thread)
-                    attachment_thread.start()
-
-            # Poll threads with short timeout to detect errors quickly (fail-fast)
-            while any(t.is_alive() for t in all_threads):
-                for thread in all_threads:
-                    thread.join(timeout=0.1)
-                    if thread_exceptions:
-                        cancel_event.set()
-                        break
-                if thread_exceptions:
-                    break
+                tasks.append(partial(retrieve, query=query, attachment_id=None))
+            for attachment_id in attachment_ids or []:
+                tasks.append(partial(retrieve, query=None, attachment_id=attachment_id))
+            # Fail fast, the retrievals that haven't started yet are skipped on the first error
+            retrieval_executor.run(tasks, should_stop=cancel_event.is_set)
 
             if thread_exceptions:
                 raise thread_exceptions[0]
@@ -1274,10 +1241,11 @@ class DatasetRetrieval:
 
         if not filter_documents:
             return []
-        filter_documents = sorted(
-            filter_documents, key=lambda x: x.metadata.get("score", 0) if x.metadata else 0, reverse=True
-        )
-        return filter_documents[:top_k] if top_k else filter_documents
+        if top_k:
+            return heapq.nlargest(
+                top_k, filter_documents, key=lambda x: x.metadata.get("score", 0) if x.metadata else 0
+            )
+        return sorted(filter_documents, key=lambda x: x.metadata.get("score", 0) if x.metadata else 0, reverse=True)
 
     def get_metadata_filter_condition(
         self,
@@ -1692,13 +1660,10 @@ class DatasetRetrieval:
     ):
         try:
             with flask_app.app_context():
-                threads = []
+                tasks = []
                 all_documents_item: list[Document] = []
                 index_type = None
                 for dataset in available_datasets:
-                    # Check for cancellation signal
-                    if cancel_event and cancel_event.is_set():
-                        break
                     index_type = dataset.indexing_technique
                     document_ids_filter = None
                     if dataset.provider != "external":
@@ -1710,33 +1675,26 @@ class DatasetRetrieval:
                                 document_ids_filter = document_ids
                             else:
                                 continue
-                    retrieval_thread = threading.Thread(
-                        target=self._retriever,
-                        kwargs={
-                            "flask_app": flask_app,
-                            "dataset_id": dataset.id,
-                            "query": query,
-                            "top_k": top_k,
-                            "all_documents": all_documents_item,
-                            "document_ids_filter": document_ids_filter,
-                            "metadata_condition": metadata_condition,
-                            "attachment_ids": [attachment_id] if attachment_id else None,
-                        },
+                    tasks.append(
+                        partial(
+                            self._retrieve_dataset,
+                            flask_app=flask_app,
+                            dataset_id=dataset.id,
+                            query=query,
+                            top_k=top_k,
+                            all_documents=all_documents_item,
+                            document_ids_filter=document_ids_filter,
+                            metadata_condition=metadata_condition,
+                            attachment_ids=[attachment_id] if attachment_id else None,
+                        )
                     )
-                    threads.append(retrieval_thread)
-                    retrieval_thread.start()
-
-                # Poll threads with short timeout to respond quickly to cancellation
-                while any(t.is_alive() for t in threads):
-                    for thread in threads:
-                        thread.join(timeout=0.1)
-                        if cancel_event and cancel_event.is_set():
-                            break
-                    if cancel_event and cancel_event.is_set():
-                        break
+                retrieval_executor.run(tasks, should_stop=cancel_event.is_set if cancel_event else None)
+                if cancel_event and cancel_event.is_set():
+                    return
 
                 # Skip second reranking when there is only one dataset
                 if reranking_enable and dataset_count > 1:
+                    all_documents_item = self._limit_rerank_candidates(all_documents_item)
                     # do rerank for searched documents
                     data_post_processor = DataPostProcessor(tenant_id, reranking_mode, reranking_model, weights, False)
                     if query:
@@ -1773,6 +1731,21 @@ class DatasetRetrieval:
             if thread_exceptions is not None:
                 thread_exceptions.append(e)
 
+    def _retrieve_dataset(self, **kwargs: Any):
+        # A dataset failing to retrieve doesn't fail the retrieval from the other datasets
+        try:
+            self._retriever(**kwargs)
+        except Exception:
+            logger.exception("Failed to retrieve from dataset %s", kwargs.get("dataset_id"))
+
+    @staticmethod
+    def _limit_rerank_candidates(documents: list[Document]) -> list[Document]:
+        """Keep the highest scored documents of the ones merged from several datasets before reranking them."""
+        limit = dify_config.DATASET_RETRIEVAL_RERANK_CANDIDATES
+        if not limit or len(documents) <= limit:
+            return documents
+        return heapq.nlargest(limit, documents, key=lambda x: x.metadata.get("score") or 0 if x.metadata else 0)
+
     def _get_available_datasets(self, tenant_id: str, dataset_ids: list[str]) -> list[Dataset]:
         with session_factory.create_session() as session:
             subquery = (
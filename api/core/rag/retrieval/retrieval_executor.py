@@ -0,0 +1,57 @@
+"""Thread pool shared by the tasks of dataset retrievals."""
+
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from configs import dify_config
+
+
+class RetrievalExecutor:
+    """
+    Runs the tasks of retrievals on a thread pool shared by the process, so the number of threads
+    used by retrievals stays bounded however many datasets, queries and attachments they span.
+
+    Retrieval tasks nest: a multi-dataset retrieval runs a task per query and dataset, each of
+    which runs its searches as tasks of their own. A caller never blocks on a task that hasn't
+    started yet, it takes the task back from the pool and runs it itself, so nested tasks can't
+    deadlock on a saturated pool and every caller keeps making progress.
+    """
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="retrieval")
+
+    def run(
+        self,
+        tasks: Sequence[Callable[[], Any]],
+        should_stop: Callable[[], bool] | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Run the tasks concurrently and wait for them, raising the first exception raised by a task.
+
+        Once ``should_stop`` returns true, the tasks that haven't started yet are skipped. Waiting
+        for the tasks run by the pool raises ``TimeoutError`` once ``timeout`` seconds have passed
+        since the run started, and skips the tasks that haven't started yet.
+        """
+        if not tasks:
+            return
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        # The calling thread runs the first task itself instead of idling
+        futures = [self._executor.submit(task) for task in tasks[1:]]
+        try:
+            tasks[0]()
+            for task, future in zip(tasks[1:], futures):
+                if should_stop and should_stop():
+                    break
+                if future.cancel():
+                    task()
+                else:
+                    future.result(timeout=max(0.0, deadline - time.monotonic()) if deadline is not None else None)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+retrieval_executor = RetrievalExecutor(max_workers=dify_config.RETRIEVAL_SERVICE_EXECUTORS)
@@ -0,0 +1,55 @@
+"""Short-lived cache of MCP provider entities and their decrypted credentials."""
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+
+from configs import dify_config
+from core.entities.mcp_provider import MCPProviderEntity
+
+
+@dataclass(frozen=True)
+class MCPProviderCredentials:
+    provider_entity: MCPProviderEntity
+    server_url: str
+    headers: Mapping[str, str]
+
+
+class MCPProviderCredentialCache:
+    """
+    Per-process TTL cache of MCP provider credentials keyed by ``(tenant_id, provider_id)``.
+
+    Updates made through this process invalidate the tenant's entries immediately, updates made by
+    other processes become visible once the TTL expires.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self._enabled = ttl > 0
+        self._cache: TTLCache[tuple[str, str], MCPProviderCredentials] = TTLCache(maxsize=max_size, ttl=ttl or 1)
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: str, provider_id: str) -> MCPProviderCredentials | None:
+        if not self._enabled:
+            return None
+        with self._lock:
+            return self._cache.get((tenant_id, provider_id))
+
+    def set(self, tenant_id: str, provider_id: str, credentials: MCPProviderCredentials):
+        if not self._enabled:
+            return
+        with self._lock:
+            self._cache[(tenant_id, provider_id)] = credentials
+
+    def invalidate(self, tenant_id: str, provider_id: str | None = None):
+        """Drop the credentials of one provider, or of all providers of the tenant."""
+        with self._lock:
+            if provider_id is not None:
+                self._cache.pop((tenant_id, provider_id), None)
+                return
+            for key in [key for key in self._cache if key[0] == tenant_id]:
+                self._cache.pop(key, None)
+
+
+mcp_provider_credential_cache = MCPProviderCredentialCache(ttl=dify_config.MCP_PROVIDER_CACHE_TTL)
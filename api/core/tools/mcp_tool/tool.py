@@ -7,6 +7,7 @@ from collections.abc import Generator, Mapping
 from typing import Any, cast
 
 from core.mcp.auth_client import MCPClientWithAuthRetry
+from core.mcp.client_pool import MCPClientKey, mcp_client_pool
 from core.mcp.error import MCPConnectionError
 from core.mcp.types import (
     AudioContent,
@@ -22,6 +23,7 @@ from core.tools.__base.tool import Tool
 from core.tools.__base.tool_runtime import ToolRuntime
 from core.tools.entities.tool_entities import ToolEntity, ToolInvokeMessage, ToolProviderType
 from core.tools.errors import ToolInvokeError
+from core.tools.mcp_tool.credential_cache import MCPProviderCredentials, mcp_provider_credential_cache
 
 logger = logging.getLogger(__name__)
 
@@ -243,15 +245,54 @@ class MCPTool(Tool):
         }
 
     def invoke_remote_mcp_tool(self, tool_parameters: dict[str, Any]) -> CallToolResult:
-        headers = self.headers.copy() if self.headers else {}
         tool_parameters = self._handle_none_parameter(tool_parameters)
+        credentials = self._load_provider_credentials()
+        headers = dict(credentials.headers)
+
+        key = MCPClientKey(
+            tenant_id=self.tenant_id,
+            provider_id=self.provider_id,
+            server_url=credentials.server_url,
+            auth_fingerprint=MCPClientKey.fingerprint(headers),
+            timeout=self.timeout,
+            sse_read_timeout=self.sse_read_timeout,
+        )
+
+        # Perform network operations without holding a database connection, pooled sessions are
+        # already initialized. MCPClientWithAuthRetry will create a new session lazily only if auth
+        # retry is needed.
+        try:
+            with mcp_client_pool.client(
+                key,
+                lambda: MCPClientWithAuthRetry(
+                    server_url=credentials.server_url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    sse_read_timeout=self.sse_read_timeout,
+                    provider_entity=credentials.provider_entity,
+                ),
+            ) as mcp_client:
+                result = mcp_client.invoke_tool(tool_name=self.entity.identity.name, tool_args=tool_parameters)
+                if MCPClientKey.fingerprint(mcp_client.headers) != key.auth_fingerprint:
+                    # Tokens were refreshed, the cached credentials are stale.
+                    mcp_provider_credential_cache.invalidate(self.tenant_id, self.provider_id)
+                return result
+        except MCPConnectionError as e:
+            raise ToolInvokeError(f"Failed to connect to MCP server: {e}") from e
+        except Exception as e:
+            raise ToolInvokeError(f"Failed to invoke tool: {e}") from e
+
+    def _load_provider_credentials(self) -> MCPProviderCredentials:
+        credentials = mcp_provider_credential_cache.get(self.tenant_id, self.provider_id)
+        if credentials is not None:
+            return credentials
 
         from sqlalchemy.orm import Session
 
         from extensions.ext_database import db
         from services.tools.mcp_tools_manage_service import MCPToolManageService
 
-        # Step 1: Load provider entity and credentials in a short-lived session
+        # Load provider entity and credentials in a short-lived session
         # This minimizes database connection hold time
         with Session(db.engine, expire_on_commit=False) as session:
             mcp_service = MCPToolManageService(session=session)
@@ -267,18 +308,6 @@ class MCPTool(Tool):
                 if tokens and tokens.access_token:
                     headers["Authorization"] = f"{tokens.token_type.capitalize()} {tokens.access_token}"
 
-        # Step 2: Session is now closed, perform network operations without holding database connection
-        # MCPClientWithAuthRetry will create a new session lazily only if auth retry is needed
-        try:
-            with MCPClientWithAuthRetry(
-                server_url=server_url,
-                headers=headers,
-                timeout=self.timeout,
-                sse_read_timeout=self.sse_read_timeout,
-                provider_entity=provider_entity,
-            ) as mcp_client:
-                return mcp_client.invoke_tool(tool_name=self.entity.identity.name, tool_args=tool_parameters)
-        except MCPConnectionError as e:
-            raise ToolInvokeError(f"Failed to connect to MCP server: {e}") from e
-        except Exception as e:
-            raise ToolInvokeError(f"Failed to invoke tool: {e}") from e
+        credentials = MCPProviderCredentials(provider_entity=provider_entity, server_url=server_url, headers=headers)
+        mcp_provider_credential_cache.set(self.tenant_id, self.provider_id, credentials)
+        return credentials
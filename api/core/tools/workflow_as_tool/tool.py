@@ -19,6 +19,7 @@ from core.tools.entities.tool_entities import (
     ToolProviderType,
 )
 from core.tools.errors import ToolInvokeError
+from core.workflow.context import blocking_wait
 from factories.file_factory import build_from_mapping
 from models import Account, Tenant
 from models.model import App, EndUser
@@ -90,19 +91,21 @@ class WorkflowTool(Tool):
 
         self._latest_usage = LLMUsage.empty_usage()
 
-        result = generator.generate(
-            app_model=app,
-            workflow=workflow,
-            user=user,
-            args={"inputs": tool_parameters, "files": files},
-            invoke_from=self.runtime.invoke_from,
-            streaming=False,
-            call_depth=self.workflow_call_depth + 1,
-            # NOTE(QuantumGhost): We explicitly set `pause_state_config` to `None`
-            # because workflow pausing mechanisms (such as HumanInput) are not
-            # supported within WorkflowTool execution context.
-            pause_state_config=None,
-        )
+        # The nodes of the workflow may be executed by the worker pool executing the calling node
+        with blocking_wait():
+            result = generator.generate(
+                app_model=app,
+                workflow=workflow,
+                user=user,
+                args={"inputs": tool_parameters, "files": files},
+                invoke_from=self.runtime.invoke_from,
+                streaming=False,
+                call_depth=self.workflow_call_depth + 1,
+                # NOTE(QuantumGhost): We explicitly set `pause_state_config` to `None`
+                # because workflow pausing mechanisms (such as HumanInput) are not
+                # supported within WorkflowTool execution context.
+                pause_state_config=None,
+            )
         assert isinstance(result, dict)
         data = result.get("data", {})
 
@@ -5,6 +5,7 @@ This package provides Flask-independent context management for workflow
 execution in multi-threaded environments.
 """
 
+from core.workflow.context.blocking_wait import blocking_wait, register_blocking_handler
 from core.workflow.context.execution_context import (
     AppContext,
     ContextProviderNotFoundError,
@@ -26,8 +27,10 @@ __all__ = [
     "IExecutionContext",
     "NullAppContext",
     "SandboxContext",
+    "blocking_wait",
     "capture_current_context",
     "read_context",
+    "register_blocking_handler",
     "register_context",
     "register_context_capturer",
     "reset_context_provider",
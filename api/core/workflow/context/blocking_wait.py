@@ -0,0 +1,27 @@
+"""
+Blocking waits of nodes on nested workflow runs.
+
+A node that synchronously waits on a nested workflow run, e.g. a workflow
+invoked as a tool, wraps the wait in ``blocking_wait()``. The worker pool
+executing the node registers a handler for its workers, so it can start
+another worker for the nodes of the nested run meanwhile.
+"""
+
+import contextvars
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+
+_blocking_handler: contextvars.ContextVar[Callable[[], AbstractContextManager[None]] | None] = contextvars.ContextVar(
+    "workflow_blocking_handler", default=None
+)
+
+
+def blocking_wait() -> AbstractContextManager[None]:
+    """Mark the current thread as waiting on a nested workflow run until the context exits."""
+    handler = _blocking_handler.get()
+    return handler() if handler is not None else nullcontext()
+
+
+def register_blocking_handler(handler: Callable[[], AbstractContextManager[None]]) -> None:
+    """Set the handler the blocking waits of the current context are reported to."""
+    _blocking_handler.set(handler)
@@ -2,5 +2,6 @@
 
 from .in_memory_channel import InMemoryChannel
 from .redis_channel import RedisChannel
+from .redis_stream_channel import RedisStreamChannel, RedisStreamCommandSubscriber
 
-__all__ = ["InMemoryChannel", "RedisChannel"]
+__all__ = ["InMemoryChannel", "RedisChannel", "RedisStreamChannel", "RedisStreamCommandSubscriber"]
@@ -9,7 +9,7 @@ Each instance uses a unique key for its command queue.
 import json
 from typing import TYPE_CHECKING, Any, final
 
-from ..entities.commands import AbortCommand, CommandType, GraphEngineCommand, PauseCommand, UpdateVariablesCommand
+from ..entities.commands import GraphEngineCommand, deserialize_command
 
 if TYPE_CHECKING:
     from extensions.ext_redis import RedisClientWrapper
@@ -102,25 +102,7 @@ class RedisChannel:
         Returns:
             Deserialized command or None if invalid
         """
-        command_type_value = data.get("command_type")
-        if not isinstance(command_type_value, str):
-            return None
-
-        try:
-            command_type = CommandType(command_type_value)
-
-            if command_type == CommandType.ABORT:
-                return AbortCommand.model_validate(data)
-            if command_type == CommandType.PAUSE:
-                return PauseCommand.model_validate(data)
-            if command_type == CommandType.UPDATE_VARIABLES:
-                return UpdateVariablesCommand.model_validate(data)
-
-            # For other command types, use base class
-            return GraphEngineCommand.model_validate(data)
-
-        except (ValueError, TypeError):
-            return None
+        return deserialize_command(data)
 
     def _has_pending_commands(self) -> bool:
         """
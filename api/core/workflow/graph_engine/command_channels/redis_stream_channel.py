@@ -0,0 +1,307 @@
+"""
+Redis Streams-based implementation of CommandChannel for distributed scenarios.
+
+Commands are appended to a Redis stream per channel. Rather than every
+running GraphEngine polling Redis, a single subscriber per process reads
+the streams of all the channels receiving commands in one blocking XREAD,
+pushes each command to the in-memory queue of the channel it belongs to,
+and deletes the entries it delivered from the streams.
+"""
+
+import json
+import logging
+import threading
+import weakref
+from collections.abc import Mapping
+from queue import Empty, Queue
+from typing import TYPE_CHECKING, Any, ClassVar, final
+
+from ..entities.commands import GraphEngineCommand, deserialize_command
+
+if TYPE_CHECKING:
+    from extensions.ext_redis import RedisClientWrapper
+
+logger = logging.getLogger(__name__)
+
+# The command streams share a hash tag, so a single XREAD can read all of them on Redis Cluster too
+_STREAM_KEY_PREFIX = "{graph_engine_commands}:"
+
+_STREAM_START_ID = "0-0"
+
+
+def _parse_entry_id(entry_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@final
+class RedisStreamChannel:
+    """
+    Redis Streams-based command channel implementation for distributed systems.
+
+    Commands are JSON-serialized and appended to the stream of the channel.
+    The first fetch subscribes the channel to the process-wide subscriber,
+    after which fetching commands only drains the local queue it fills.
+
+    The stream is read from its start, so commands sent before the channel
+    subscribed are delivered as well, and the subscriber keeps reading from
+    the last entry delivered after Redis errors, so commands are delivered
+    at least once. Entries are deleted once delivered, so a channel created
+    again with the same key, e.g. for a resumed run, doesn't receive the
+    commands of the previous one. Entries never delivered are expired along
+    with the stream.
+    """
+
+    def __init__(
+        self,
+        redis_client: "RedisClientWrapper",
+        channel_key: str,
+        command_ttl: int = 3600,
+        max_stream_length: int = 100,
+        subscriber: "RedisStreamCommandSubscriber | None" = None,
+    ) -> None:
+        """
+        Initialize the Redis stream channel.
+
+        Args:
+            redis_client: Redis client instance
+            channel_key: Unique key for this channel's commands
+            command_ttl: TTL for the command stream in seconds (default: 3600)
+            max_stream_length: Approximate number of commands kept in the stream (default: 100)
+            subscriber: Subscriber delivering the commands, the process-wide one by default
+        """
+        self._redis = redis_client
+        self._key = channel_key
+        self._stream_key = f"{_STREAM_KEY_PREFIX}{channel_key}"
+        self._command_ttl = command_ttl
+        self._max_stream_length = max_stream_length
+        self._subscriber = subscriber
+        self._subscribed = False
+        self._queue: Queue[GraphEngineCommand] = Queue()
+        self._last_entry_id = _STREAM_START_ID
+
+    @property
+    def stream_key(self) -> str:
+        """Key of the Redis stream holding the commands of this channel."""
+        return self._stream_key
+
+    @property
+    def last_entry_id(self) -> str:
+        """ID of the last stream entry delivered to this channel."""
+        return self._last_entry_id
+
+    def fetch_commands(self) -> list[GraphEngineCommand]:
+        """
+        Fetch the commands delivered by the subscriber.
+
+        Returns:
+            List of pending commands (drains the local queue)
+        """
+        if not self._subscribed:
+            subscriber = self._subscriber or RedisStreamCommandSubscriber.shared(self._redis)
+            subscriber.subscribe(self)
+            self._subscribed = True
+
+        commands: list[GraphEngineCommand] = []
+        while True:
+            try:
+                commands.append(self._queue.get_nowait())
+            except Empty:
+                break
+        return commands
+
+    def send_command(self, command: GraphEngineCommand) -> None:
+        """
+        Append a command to the stream of this channel.
+
+        Args:
+            command: The command to send
+        """
+        command_json = json.dumps(command.model_dump())
+
+        with self._redis.pipeline() as pipe:
+            pipe.xadd(self._stream_key, {"command": command_json}, maxlen=self._max_stream_length, approximate=True)
+            pipe.expire(self._stream_key, self._command_ttl)
+            pipe.execute()
+
+    def deliver(self, entry_id: str, fields: Mapping[Any, Any]) -> None:
+        """
+        Queue the command of a stream entry, called by the subscriber.
+
+        Entries already delivered are skipped, so reading an entry again after
+        an error doesn't queue its command twice.
+
+        Args:
+            entry_id: ID of the stream entry
+            fields: Fields of the stream entry
+        """
+        if _parse_entry_id(entry_id) <= _parse_entry_id(self._last_entry_id):
+            return
+        self._last_entry_id = entry_id
+
+        command_json = fields.get(b"command", fields.get("command"))
+        if command_json is None:
+            return
+        try:
+            command_data = json.loads(command_json)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Skip invalid commands
+            return
+        if not isinstance(command_data, dict):
+            return
+
+        command = deserialize_command(command_data)
+        if command:
+            self._queue.put(command)
+
+
+@final
+class RedisStreamCommandSubscriber:
+    """
+    Reads the command streams of all the subscribed channels of the process.
+
+    A single thread reads the streams in one blocking XREAD, so the cost of
+    waiting for commands doesn't grow with the number of running workflows,
+    and no Redis command is issued while no channel is subscribed. Channels
+    are held weakly and are unsubscribed once their engine is gone.
+
+    A channel subscribing while the thread waits on the streams subscribed
+    before is read from the next XREAD, at most ``block_ms`` later.
+    The entries delivered are deleted from their streams with XDEL.
+    """
+
+    _shared: ClassVar["RedisStreamCommandSubscriber | None"] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        redis_client: "RedisClientWrapper",
+        block_ms: int = 1000,
+        batch_size: int = 100,
+        retry_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the subscriber.
+
+        Args:
+            redis_client: Redis client instance
+            block_ms: Milliseconds an XREAD waits for new commands
+            batch_size: Maximum number of entries read per stream at once
+            retry_interval: Seconds to wait before reading again after a Redis error
+        """
+        self._redis = redis_client
+        self._block_ms = block_ms
+        self._batch_size = batch_size
+        self._retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        self._subscribed = threading.Condition(self._lock)
+        self._channels: weakref.WeakSet[RedisStreamChannel] = weakref.WeakSet()
+        self._thread: threading.Thread | None = None
+        self._stop_requested = threading.Event()
+
+    @classmethod
+    def shared(cls, redis_client: "RedisClientWrapper") -> "RedisStreamCommandSubscriber":
+        """The subscriber shared by the channels of the process, created on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(redis_client)
+            return cls._shared
+
+    def subscribe(self, channel: RedisStreamChannel) -> None:
+        """Start delivering the commands of a channel."""
+        with self._lock:
+            self._channels.add(channel)
+            self._stop_requested.clear()
+            # Also restarts the thread in processes forked after it started
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._read_loop, name="GraphCommandSubscriber", daemon=True)
+                self._thread.start()
+            self._subscribed.notify()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop reading the streams until a channel subscribes again.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit, at most ``block_ms`` are needed
+        """
+        with self._lock:
+            self._stop_requested.set()
+            self._subscribed.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def get_subscribed_count(self) -> int:
+        """Get the number of channels subscribed."""
+        with self._lock:
+            return len(self._channels)
+
+    def _streams(self) -> dict[str, str]:
+        """The ID to read each subscribed stream after, lock held."""
+        streams: dict[str, str] = {}
+        for channel in self._channels:
+            last_entry_id = streams.get(channel.stream_key)
+            if last_entry_id is None or _parse_entry_id(channel.last_entry_id) < _parse_entry_id(last_entry_id):
+                streams[channel.stream_key] = channel.last_entry_id
+        return streams
+
+    def _read_loop(self) -> None:
+        while not self._stop_requested.is_set():
+            with self._lock:
+                streams = self._streams()
+                if not streams:
+                    self._subscribed.wait(timeout=self._block_ms / 1000)
+                    continue
+
+            try:
+                response = self._redis.xread(streams, count=self._batch_size, block=self._block_ms)
+            except Exception:
+                # Read again from the last entries delivered, the commands sent meanwhile stay in the streams
+                logger.exception("Failed to read graph engine commands from Redis")
+                self._stop_requested.wait(self._retry_interval)
+                continue
+
+            self._deliver(response)
+
+    def _deliver(self, response: Any) -> None:
+        if not response:
+            return
+        # RESP3 replies map each stream to a list holding its entries
+        if isinstance(response, dict):
+            entries_by_stream = [
+                (stream_key, entries[0] if entries else []) for stream_key, entries in response.items()
+            ]
+        else:
+            entries_by_stream = response
+
+        with self._lock:
+            channels = list(self._channels)
+        delivered: dict[str, list[str]] = {}
+        for stream_key, entries in entries_by_stream:
+            stream_key = _decode(stream_key)
+            receivers = [channel for channel in channels if channel.stream_key == stream_key]
+            if not receivers:
+                continue
+            for entry_id, fields in entries:
+                if entry_id is None:
+                    continue
+                for channel in receivers:
+                    channel.deliver(_decode(entry_id), fields or {})
+                delivered.setdefault(stream_key, []).append(_decode(entry_id))
+
+        if not delivered:
+            return
+        try:
+            with self._redis.pipeline() as pipe:
+                for stream_key, entry_ids in delivered.items():
+                    pipe.xdel(stream_key, *entry_ids)
+                pipe.execute()
+        except Exception:
+            # The entries are read again only by channels created after this one, until the stream expires
+            logger.warning("Failed to delete delivered graph engine commands from Redis", exc_info=True)
@@ -6,7 +6,7 @@ from pydantic import BaseModel, ConfigDict
 
 
 class GraphEngineConfig(BaseModel):
-    """Configuration for GraphEngine worker pool scaling."""
+    """Configuration for GraphEngine worker pool scaling and event emission."""
 
     model_config = ConfigDict(frozen=True)
 
@@ -14,3 +14,7 @@ class GraphEngineConfig(BaseModel):
     max_workers: int = 5
     scale_up_threshold: int = 3
     scale_down_idle_time: float = 5.0
+
+    # Stream chunk coalescing, disabled when the window is 0
+    stream_chunk_coalesce_window: float = 0.0
+    stream_chunk_coalesce_max_bytes: int = 256
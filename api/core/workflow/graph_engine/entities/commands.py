@@ -54,3 +54,34 @@ class UpdateVariablesCommand(GraphEngineCommand):
 
     command_type: CommandType = Field(default=CommandType.UPDATE_VARIABLES, description="Type of command")
     updates: Sequence[VariableUpdate] = Field(default_factory=list, description="Variable updates")
+
+
+def deserialize_command(data: dict[str, Any]) -> GraphEngineCommand | None:
+    """
+    Deserialize a command from dictionary data.
+
+    Args:
+        data: Command data dictionary
+
+    Returns:
+        Deserialized command or None if invalid
+    """
+    command_type_value = data.get("command_type")
+    if not isinstance(command_type_value, str):
+        return None
+
+    try:
+        command_type = CommandType(command_type_value)
+
+        if command_type == CommandType.ABORT:
+            return AbortCommand.model_validate(data)
+        if command_type == CommandType.PAUSE:
+            return PauseCommand.model_validate(data)
+        if command_type == CommandType.UPDATE_VARIABLES:
+            return UpdateVariablesCommand.model_validate(data)
+
+        # For other command types, use base class
+        return GraphEngineCommand.model_validate(data)
+
+    except (ValueError, TypeError):
+        return None
@@ -12,6 +12,7 @@ from typing import final
 from core.workflow.graph_events import GraphEngineEvent
 
 from ..layers.base import GraphEngineLayer
+from .stream_chunk_coalescer import StreamChunkCoalescer
 
 _logger = logging.getLogger(__name__)
 
@@ -84,8 +85,17 @@ class EventManager:
     streaming events to external consumers.
     """
 
-    def __init__(self) -> None:
-        """Initialize the event manager."""
+    def __init__(self, stream_chunk_coalesce_window: float = 0.0, stream_chunk_coalesce_max_bytes: int = 0) -> None:
+        """
+        Initialize the event manager.
+
+        Args:
+            stream_chunk_coalesce_window: Maximum seconds consecutive stream chunks are merged
+                over before being emitted, 0 disables coalescing
+            stream_chunk_coalesce_max_bytes: Size in bytes at which merged stream chunks are emitted
+        """
+        self._stream_chunk_coalesce_window = stream_chunk_coalesce_window
+        self._stream_chunk_coalesce_max_bytes = stream_chunk_coalesce_max_bytes
         self._events: list[GraphEngineEvent] = []
         self._lock = ReadWriteLock()
         self._layers: list[GraphEngineLayer] = []
@@ -152,9 +162,18 @@ class EventManager:
         """
         Generator that yields events as they're collected.
 
+        Consecutive stream chunks of the same output are merged when coalescing is enabled.
+        Layers are still notified of every chunk as it is collected.
+
         Yields:
             GraphEngineEvent instances as they're processed
         """
+        coalescer: StreamChunkCoalescer | None = None
+        if self._stream_chunk_coalesce_window > 0 and self._stream_chunk_coalesce_max_bytes > 0:
+            coalescer = StreamChunkCoalescer(
+                window=self._stream_chunk_coalesce_window,
+                max_bytes=self._stream_chunk_coalesce_max_bytes,
+            )
         yielded_count = 0
 
         while not self._execution_complete.is_set() or yielded_count < self._event_count():
@@ -163,13 +182,22 @@ class EventManager:
 
             # Yield any new events
             for event in new_events:
-                yield event
+                if coalescer is None:
+                    yield event
+                else:
+                    yield from coalescer.push(event)
                 yielded_count += 1
 
+            if coalescer is not None:
+                yield from coalescer.poll()
+
             # Small sleep to avoid busy waiting
             if not self._execution_complete.is_set() and not new_events:
                 time.sleep(0.001)
 
+        if coalescer is not None:
+            yield from coalescer.flush()
+
     def _notify_layers(self, event: GraphEngineEvent) -> None:
         """
         Notify all layers of an event.
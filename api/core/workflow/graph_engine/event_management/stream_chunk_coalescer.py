@@ -0,0 +1,109 @@
+"""
+Coalescing of consecutive stream chunk events.
+"""
+
+import time
+from typing import final
+
+from core.workflow.graph_events import GraphEngineEvent, NodeRunStreamChunkEvent
+
+_ChunkKey = tuple[str, tuple[str, ...], str | None, str | None]
+
+
+@final
+class StreamChunkCoalescer:
+    """
+    Merges consecutive stream chunks of the same output into fewer, larger chunks.
+
+    The first chunk of each output is passed through immediately so first-token latency is
+    unchanged. Following chunks are buffered until the buffer is ``window`` seconds old, holds
+    ``max_bytes`` bytes, a final chunk arrives, or any other event has to be emitted, which keeps
+    the order of events intact.
+    """
+
+    def __init__(self, window: float, max_bytes: int) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            window: Maximum seconds a chunk is held back
+            max_bytes: Buffer size in bytes that triggers a flush
+        """
+        self._window = window
+        self._max_bytes = max_bytes
+        self._started_keys: set[_ChunkKey] = set()
+        self._pending: NodeRunStreamChunkEvent | None = None
+        self._pending_key: _ChunkKey | None = None
+        self._pending_parts: list[str] = []
+        self._pending_bytes = 0
+        self._pending_is_final = False
+        self._pending_since = 0.0
+
+    def push(self, event: GraphEngineEvent) -> list[GraphEngineEvent]:
+        """
+        Add an event, returning the events that are ready to be emitted.
+
+        Args:
+            event: The next event in emission order
+
+        Returns:
+            Events to emit, in order
+        """
+        if not isinstance(event, NodeRunStreamChunkEvent):
+            return [*self.flush(), event]
+
+        key: _ChunkKey = (event.id, tuple(event.selector), event.in_iteration_id, event.in_loop_id)
+        ready: list[GraphEngineEvent] = []
+        if self._pending is not None and key != self._pending_key:
+            ready.extend(self.flush())
+
+        if key not in self._started_keys:
+            self._started_keys.add(key)
+            ready.append(event)
+            return ready
+
+        if self._pending is None:
+            self._pending = event
+            self._pending_key = key
+            self._pending_since = time.monotonic()
+        self._pending_parts.append(event.chunk)
+        self._pending_is_final = event.is_final
+        self._pending_bytes += len(event.chunk.encode("utf-8"))
+
+        if event.is_final or self._pending_bytes >= self._max_bytes:
+            ready.extend(self.flush())
+        return ready
+
+    def poll(self) -> list[GraphEngineEvent]:
+        """
+        Return the buffered chunk once it has been held for the whole window.
+
+        Returns:
+            The merged chunk event, or an empty list
+        """
+        if self._pending is not None and time.monotonic() - self._pending_since >= self._window:
+            return self.flush()
+        return []
+
+    def flush(self) -> list[GraphEngineEvent]:
+        """
+        Return the buffered chunk, if any, merged into a single event.
+
+        Returns:
+            The merged chunk event, or an empty list
+        """
+        pending = self._pending
+        if pending is None:
+            return []
+
+        parts = self._pending_parts
+        is_final = self._pending_is_final
+        self._pending = None
+        self._pending_key = None
+        self._pending_parts = []
+        self._pending_bytes = 0
+        self._pending_is_final = False
+        if len(parts) == 1:
+            return [pending]
+        # Keep the metadata of the first chunk and the final flag of the last one.
+        return [pending.model_copy(update={"chunk": "".join(parts), "is_final": is_final})]
@@ -47,7 +47,7 @@ from .graph_traversal import EdgeProcessor, SkipPropagator
 from .layers.base import GraphEngineLayer
 from .orchestration import Dispatcher, ExecutionCoordinator
 from .protocols.command_channel import CommandChannel
-from .worker_management import WorkerPool
+from .worker_management import SharedWorkerPool, WorkerPool
 
 if TYPE_CHECKING:
     from core.workflow.graph_engine.domain.graph_execution import GraphExecution
@@ -75,8 +75,15 @@ class GraphEngine:
         graph_runtime_state: GraphRuntimeState,
         command_channel: CommandChannel,
         config: GraphEngineConfig = _DEFAULT_CONFIG,
+        shared_worker_pool: SharedWorkerPool | None = None,
     ) -> None:
-        """Initialize the graph engine with all subsystems and dependencies."""
+        """
+        Initialize the graph engine with all subsystems and dependencies.
+
+        Nodes are executed by ``shared_worker_pool`` when given, by the shared pool executing the
+        current node for the sub-graphs of iteration and loop nodes, and by workers dedicated to
+        the run otherwise.
+        """
         # stop event
         self._stop_event = threading.Event()
 
@@ -98,9 +105,29 @@ class GraphEngine:
         # Queue for events generated during execution
         self._event_queue: queue.Queue[GraphNodeEventBase] = queue.Queue()
 
+        # === Extensibility ===
+        # Layers allow plugins to extend engine functionality
+        self._layers: list[GraphEngineLayer] = []
+
+        # === Worker Pool Setup ===
+        # Capture execution context for worker threads
+        execution_context = capture_current_context()
+
+        # Create worker pool for parallel node execution
+        self._worker_pool = WorkerPool(
+            ready_queue=self._ready_queue,
+            event_queue=self._event_queue,
+            graph=self._graph,
+            layers=self._layers,
+            execution_context=execution_context,
+            config=self._config,
+            stop_event=self._stop_event,
+            shared_pool=shared_worker_pool or SharedWorkerPool.current(),
+        )
+
         # === State Management ===
         # Unified state manager handles all node state transitions and queue operations
-        self._state_manager = GraphStateManager(self._graph, self._ready_queue)
+        self._state_manager = GraphStateManager(self._graph, self._ready_queue, on_enqueue=self._worker_pool.notify)
 
         # === Response Coordination ===
         # Coordinates response streaming from response nodes
@@ -108,7 +135,10 @@ class GraphEngine:
 
         # === Event Management ===
         # Event manager handles both collection and emission of events
-        self._event_manager = EventManager()
+        self._event_manager = EventManager(
+            stream_chunk_coalesce_window=config.stream_chunk_coalesce_window,
+            stream_chunk_coalesce_max_bytes=config.stream_chunk_coalesce_max_bytes,
+        )
 
         # === Error Handling ===
         # Centralized error handler for graph execution errors
@@ -147,25 +177,6 @@ class GraphEngine:
         update_variables_handler = UpdateVariablesCommandHandler(self._graph_runtime_state.variable_pool)
         self._command_processor.register_handler(UpdateVariablesCommand, update_variables_handler)
 
-        # === Extensibility ===
-        # Layers allow plugins to extend engine functionality
-        self._layers: list[GraphEngineLayer] = []
-
-        # === Worker Pool Setup ===
-        # Capture execution context for worker threads
-        execution_context = capture_current_context()
-
-        # Create worker pool for parallel node execution
-        self._worker_pool = WorkerPool(
-            ready_queue=self._ready_queue,
-            event_queue=self._event_queue,
-            graph=self._graph,
-            layers=self._layers,
-            execution_context=execution_context,
-            config=self._config,
-            stop_event=self._stop_event,
-        )
-
         # === Orchestration ===
         # Coordinates the overall execution lifecycle
         self._execution_coordinator = ExecutionCoordinator(
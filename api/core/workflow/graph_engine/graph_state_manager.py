@@ -3,7 +3,7 @@ Graph state manager that combines node, edge, and execution tracking.
 """
 
 import threading
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from typing import TypedDict, final
 
 from core.workflow.enums import NodeState
@@ -22,16 +22,18 @@ class EdgeStateAnalysis(TypedDict):
 
 @final
 class GraphStateManager:
-    def __init__(self, graph: Graph, ready_queue: ReadyQueue) -> None:
+    def __init__(self, graph: Graph, ready_queue: ReadyQueue, on_enqueue: Callable[[], None] | None = None) -> None:
         """
         Initialize the state manager.
 
         Args:
             graph: The workflow graph
             ready_queue: Queue for nodes ready to execute
+            on_enqueue: Optional callback invoked after a node is added to the ready queue
         """
         self._graph = graph
         self._ready_queue = ready_queue
+        self._on_enqueue = on_enqueue
         self._lock = threading.RLock()
 
         # Execution tracking state
@@ -52,6 +54,8 @@ class GraphStateManager:
         with self._lock:
             self._graph.nodes[node_id].state = NodeState.TAKEN
             self._ready_queue.put(node_id)
+        if self._on_enqueue is not None:
+            self._on_enqueue()
 
     def mark_node_skipped(self, node_id: str) -> None:
         """
@@ -10,6 +10,7 @@ from collections.abc import Sequence
 from typing import final
 
 from core.workflow.graph_engine.command_channels.redis_channel import RedisChannel
+from core.workflow.graph_engine.command_channels.redis_stream_channel import RedisStreamChannel
 from core.workflow.graph_engine.entities.commands import (
     AbortCommand,
     GraphEngineCommand,
@@ -62,17 +63,25 @@ class GraphEngineManager:
 
     @staticmethod
     def _send_command(task_id: str, command: GraphEngineCommand) -> None:
-        """Send a command to the workflow-specific Redis channel."""
+        """
+        Send a command to the workflow-specific Redis channels.
+
+        The command is sent through both the stream and the list channels, so it reaches
+        the workflow whichever of them the process running it receives commands from.
+        """
 
         if not task_id:
             return
 
         channel_key = f"workflow:{task_id}:commands"
-        channel = RedisChannel(redis_client, channel_key)
-
-        try:
-            channel.send_command(command)
-        except Exception:
-            # Silently fail if Redis is unavailable
-            # The legacy control mechanisms will still work
-            logger.exception("Failed to send graph engine command %s for task %s", command.__class__.__name__, task_id)
+        channels = (RedisStreamChannel(redis_client, channel_key), RedisChannel(redis_client, channel_key))
+
+        for channel in channels:
+            try:
+                channel.send_command(command)
+            except Exception:
+                # Silently fail if Redis is unavailable
+                # The legacy control mechanisms will still work
+                logger.exception(
+                    "Failed to send graph engine command %s for task %s", command.__class__.__name__, task_id
+                )
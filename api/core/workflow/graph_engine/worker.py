@@ -1,8 +1,8 @@
 """
 Worker - Thread implementation for queue-based node execution
 
-Workers pull node IDs from the ready_queue, execute nodes, and push events
-to the event_queue for the dispatcher to process.
+Workers pull node IDs from the ready_queue, execute nodes with a NodeRunner,
+and push events to the event_queue for the dispatcher to process.
 """
 
 import queue
@@ -27,99 +27,57 @@ if TYPE_CHECKING:
 
 
 @final
-class Worker(threading.Thread):
+class NodeRunner:
     """
-    Worker thread that executes nodes from the ready queue.
+    Executes the nodes of a graph run.
 
-    Workers continuously pull node IDs from the ready_queue, execute the
-    corresponding nodes, and push the resulting events to the event_queue
-    for the dispatcher to process.
+    Pushes the events of the nodes to the run's event queue and invokes the
+    hooks of its layers around each node. Shared by the workers of the run,
+    whether they are dedicated to it or belong to the shared worker pool.
     """
 
     def __init__(
         self,
-        ready_queue: ReadyQueue,
         event_queue: queue.Queue[GraphNodeEventBase],
-        graph: Graph,
         layers: Sequence[GraphEngineLayer],
-        stop_event: threading.Event,
-        worker_id: int = 0,
         execution_context: IExecutionContext | None = None,
     ) -> None:
         """
-        Initialize worker thread.
+        Initialize the node runner.
 
         Args:
-            ready_queue: Ready queue containing node IDs ready for execution
             event_queue: Queue for pushing execution events
-            graph: Graph containing nodes to execute
             layers: Graph engine layers for node execution hooks
-            worker_id: Unique identifier for this worker
             execution_context: Optional execution context for context preservation
         """
-        super().__init__(name=f"GraphWorker-{worker_id}", daemon=True)
-        self._ready_queue = ready_queue
         self._event_queue = event_queue
-        self._graph = graph
-        self._worker_id = worker_id
-        self._execution_context = execution_context
-        self._stop_event = stop_event
         self._layers = layers if layers is not None else []
-        self._last_task_time = time.time()
-
-    def stop(self) -> None:
-        """Worker is controlled via shared stop_event from GraphEngine.
+        self._execution_context = execution_context
 
-        This method is a no-op retained for backward compatibility.
+    def execute(self, node: Node) -> bool:
         """
-        pass
-
-    @property
-    def is_idle(self) -> bool:
-        """Check if the worker is currently idle."""
-        # Worker is idle if it hasn't processed a task recently (within 0.2 seconds)
-        return (time.time() - self._last_task_time) > 0.2
+        Execute a node, reporting an exception raised by it as a failure event.
 
-    @property
-    def idle_duration(self) -> float:
-        """Get the duration in seconds since the worker last processed a task."""
-        return time.time() - self._last_task_time
-
-    @property
-    def worker_id(self) -> int:
-        """Get the worker's ID."""
-        return self._worker_id
+        Args:
+            node: The node instance to execute
 
-    @override
-    def run(self) -> None:
+        Returns:
+            True if the node ran without raising
         """
-        Main worker loop.
-
-        Continuously pulls node IDs from ready_queue, executes them,
-        and pushes events to event_queue until stopped.
-        """
-        while not self._stop_event.is_set():
-            # Try to get a node ID from the ready queue (with timeout)
-            try:
-                node_id = self._ready_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-
-            self._last_task_time = time.time()
-            node = self._graph.nodes[node_id]
-            try:
-                self._execute_node(node)
-                self._ready_queue.task_done()
-            except Exception as e:
-                error_event = NodeRunFailedEvent(
-                    id=node.execution_id,
-                    node_id=node.id,
-                    node_type=node.node_type,
-                    in_iteration_id=None,
-                    error=str(e),
-                    start_at=datetime.now(),
-                )
-                self._event_queue.put(error_event)
+        try:
+            self._execute_node(node)
+            return True
+        except Exception as e:
+            error_event = NodeRunFailedEvent(
+                id=node.execution_id,
+                node_id=node.id,
+                node_type=node.node_type,
+                in_iteration_id=None,
+                error=str(e),
+                start_at=datetime.now(),
+            )
+            self._event_queue.put(error_event)
+            return False
 
     def _execute_node(self, node: Node) -> None:
         """
@@ -181,3 +139,86 @@ class Worker(threading.Thread):
             except Exception:
                 # Silently ignore layer errors to prevent disrupting node execution
                 continue
+
+
+@final
+class Worker(threading.Thread):
+    """
+    Worker thread that executes nodes from the ready queue.
+
+    Workers continuously pull node IDs from the ready_queue, execute the
+    corresponding nodes, and push the resulting events to the event_queue
+    for the dispatcher to process.
+    """
+
+    def __init__(
+        self,
+        ready_queue: ReadyQueue,
+        event_queue: queue.Queue[GraphNodeEventBase],
+        graph: Graph,
+        layers: Sequence[GraphEngineLayer],
+        stop_event: threading.Event,
+        worker_id: int = 0,
+        execution_context: IExecutionContext | None = None,
+    ) -> None:
+        """
+        Initialize worker thread.
+
+        Args:
+            ready_queue: Ready queue containing node IDs ready for execution
+            event_queue: Queue for pushing execution events
+            graph: Graph containing nodes to execute
+            layers: Graph engine layers for node execution hooks
+            worker_id: Unique identifier for this worker
+            execution_context: Optional execution context for context preservation
+        """
+        super().__init__(name=f"GraphWorker-{worker_id}", daemon=True)
+        self._ready_queue = ready_queue
+        self._graph = graph
+        self._worker_id = worker_id
+        self._stop_event = stop_event
+        self._runner = NodeRunner(event_queue=event_queue, layers=layers, execution_context=execution_context)
+        self._last_task_time = time.time()
+
+    def stop(self) -> None:
+        """Worker is controlled via shared stop_event from GraphEngine.
+
+        This method is a no-op retained for backward compatibility.
+        """
+        pass
+
+    @property
+    def is_idle(self) -> bool:
+        """Check if the worker is currently idle."""
+        # Worker is idle if it hasn't processed a task recently (within 0.2 seconds)
+        return (time.time() - self._last_task_time) > 0.2
+
+    @property
+    def idle_duration(self) -> float:
+        """Get the duration in seconds since the worker last processed a task."""
+        return time.time() - self._last_task_time
+
+    @property
+    def worker_id(self) -> int:
+        """Get the worker's ID."""
+        return self._worker_id
+
+    @override
+    def run(self) -> None:
+        """
+        Main worker loop.
+
+        Continuously pulls node IDs from ready_queue, executes them,
+        and pushes events to event_queue until stopped.
+        """
+        while not self._stop_event.is_set():
+            # Try to get a node ID from the ready queue (with timeout)
+            try:
+                node_id = self._ready_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            self._last_task_time = time.time()
+            node = self._graph.nodes[node_id]
+            if self._runner.execute(node):
+                self._ready_queue.task_done()
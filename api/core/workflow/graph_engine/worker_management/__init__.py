@@ -5,8 +5,10 @@ This package manages the worker pool, including creation,
 scaling, and activity tracking.
 """
 
+from .shared_worker_pool import SharedWorkerPool
 from .worker_pool import WorkerPool
 
 __all__ = [
+    "SharedWorkerPool",
     "WorkerPool",
 ]
@@ -0,0 +1,279 @@
+"""
+Process-wide worker pool shared by GraphEngine runs.
+
+Instead of starting worker threads for every run, runs register a logical
+queue with the shared pool, whose threads execute the ready nodes of all
+the registered runs.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import final
+
+from core.workflow.context import register_blocking_handler
+from core.workflow.enums import NodeExecutionType
+from core.workflow.graph import Graph
+
+from ..ready_queue import ReadyQueue
+from ..worker import NodeRunner
+
+logger = logging.getLogger(__name__)
+
+# The pool whose worker is executing the current node, inherited by the sub-graphs of iteration and loop nodes
+_current_pool: contextvars.ContextVar["SharedWorkerPool | None"] = contextvars.ContextVar(
+    "graph_engine_shared_worker_pool", default=None
+)
+
+
+@final
+class RunQueue:
+    """
+    Logical queue of a run in the shared worker pool.
+
+    Holds what the pool needs to execute the ready nodes of the run, and
+    how many of them it executes at once.
+    """
+
+    def __init__(
+        self,
+        ready_queue: ReadyQueue,
+        graph: Graph,
+        runner: NodeRunner,
+        stop_event: threading.Event,
+        max_concurrency: int,
+    ) -> None:
+        """
+        Initialize the run queue.
+
+        Args:
+            ready_queue: Ready queue of the run
+            graph: The workflow graph of the run
+            runner: Runner executing the nodes of the run
+            stop_event: Stop event of the run, no more nodes are started once it is set
+            max_concurrency: Maximum number of nodes of the run executed at once
+        """
+        self.ready_queue = ready_queue
+        self.graph = graph
+        self.runner = runner
+        self.stop_event = stop_event
+        self.max_concurrency = max(1, max_concurrency)
+        self.in_flight = 0
+
+
+@final
+class SharedWorkerPool:
+    """
+    Worker threads shared by all the GraphEngine runs of the process.
+
+    Runs are served round-robin, one node at a time, so a run with many
+    ready nodes can't starve the others, and each run executes at most
+    ``max_concurrency`` nodes at once.
+
+    Workers are started when nodes are enqueued while none is idle, and
+    retire after ``idle_timeout`` seconds without work down to
+    ``min_workers``. A worker executing a container node waits on its
+    sub-graph, which is executed by the pool as well, and a node waiting on
+    a nested workflow run within ``blocking_wait()`` waits on nodes executed
+    by the pool too: such workers don't count against ``max_workers``, so
+    nested runs always have workers to execute their nodes.
+    """
+
+    def __init__(self, min_workers: int, max_workers: int, idle_timeout: float) -> None:
+        """
+        Initialize the shared worker pool.
+
+        Args:
+            min_workers: Number of workers kept while idle
+            max_workers: Maximum number of workers not blocked on a sub-graph or a nested run
+            idle_timeout: Seconds a worker waits for work before retiring
+        """
+        self._min_workers = min_workers
+        self._max_workers = max(1, max_workers)
+        self._idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._run_idle = threading.Condition(self._lock)
+        self._runs: deque[RunQueue] = deque()
+
+        self._workers: set[threading.Thread] = set()
+        self._worker_counter = 0
+        self._idle_count = 0
+        self._busy_count = 0
+        self._blocked_count = 0
+
+        # Cumulative counters
+        self._started_count = 0
+        self._retired_count = 0
+        self._executed_count = 0
+
+    @staticmethod
+    def current() -> "SharedWorkerPool | None":
+        """The pool executing the current node, if any."""
+        return _current_pool.get()
+
+    def register(self, run: RunQueue) -> None:
+        """Start executing the ready nodes of a run."""
+        with self._lock:
+            self._runs.append(run)
+            self._dispatch()
+
+    def unregister(self, run: RunQueue, timeout: float) -> None:
+        """
+        Stop executing the nodes of a run.
+
+        Args:
+            run: The run to unregister
+            timeout: Seconds to wait for the nodes of the run being executed to finish
+        """
+        with self._lock:
+            if run in self._runs:
+                self._runs.remove(run)
+            self._run_idle.wait_for(lambda: run.in_flight == 0, timeout=timeout)
+
+    def notify(self) -> None:
+        """Signal that nodes have been enqueued in a registered run."""
+        with self._lock:
+            self._dispatch()
+
+    def get_worker_count(self) -> int:
+        """Get current number of workers."""
+        with self._lock:
+            return len(self._workers)
+
+    def get_status(self) -> dict[str, int]:
+        """
+        Get pool status information, exported as scaling metrics.
+
+        Returns:
+            Dictionary with status information
+        """
+        with self._lock:
+            return {
+                "total_workers": len(self._workers),
+                "idle_workers": self._idle_count,
+                "busy_workers": self._busy_count,
+                "blocked_workers": self._blocked_count,
+                "runs": len(self._runs),
+                "queue_depth": sum(run.ready_queue.qsize() for run in self._runs),
+                "min_workers": self._min_workers,
+                "max_workers": self._max_workers,
+                "started_workers": self._started_count,
+                "retired_workers": self._retired_count,
+                "executed_nodes": self._executed_count,
+            }
+
+    def _capacity(self) -> int:
+        return self._max_workers + self._blocked_count
+
+    def _runnable_count(self) -> int:
+        """Number of nodes that could be started right now, called with the lock held."""
+        count = 0
+        for run in self._runs:
+            if not run.stop_event.is_set():
+                count += min(run.ready_queue.qsize(), run.max_concurrency - run.in_flight)
+        return count
+
+    def _dispatch(self) -> None:
+        """Wake idle workers for the runnable nodes, starting a worker if they aren't enough. Lock held."""
+        runnable = self._runnable_count()
+        if not runnable:
+            return
+        if self._idle_count:
+            self._work_available.notify(runnable)
+        if runnable > self._idle_count and len(self._workers) < self._capacity():
+            self._start_worker()
+
+    def _start_worker(self) -> None:
+        worker_id = self._worker_counter
+        self._worker_counter += 1
+        worker = threading.Thread(target=self._worker_loop, name=f"GraphSharedWorker-{worker_id}", daemon=True)
+        self._workers.add(worker)
+        self._started_count += 1
+        worker.start()
+        logger.debug(
+            "Started shared graph worker: %d workers (busy=%d, blocked=%d, max=%d)",
+            len(self._workers),
+            self._busy_count,
+            self._blocked_count,
+            self._max_workers,
+        )
+
+    def _next_node(self) -> tuple[RunQueue, str] | None:
+        """Take the next ready node, round-robin over the runs. Lock held."""
+        for _ in range(len(self._runs)):
+            run = self._runs[0]
+            self._runs.rotate(-1)
+            if run.stop_event.is_set() or run.in_flight >= run.max_concurrency:
+                continue
+            try:
+                node_id = run.ready_queue.get(timeout=0)
+            except queue.Empty:
+                continue
+            run.in_flight += 1
+            return run, node_id
+        return None
+
+    def _worker_loop(self) -> None:
+        worker = threading.current_thread()
+        self._lock.acquire()
+        try:
+            while True:
+                next_node = self._next_node()
+                if next_node is None:
+                    if len(self._workers) > self._capacity():
+                        break
+                    self._idle_count += 1
+                    notified = self._work_available.wait(timeout=self._idle_timeout)
+                    self._idle_count -= 1
+                    if not notified and len(self._workers) > self._min_workers and not self._runnable_count():
+                        break
+                    continue
+
+                run, node_id = next_node
+                self._busy_count += 1
+                self._lock.release()
+                try:
+                    # A fresh context per node, so context variables of a run never leak into the next one
+                    contextvars.Context().run(self._execute, run, node_id)
+                finally:
+                    self._lock.acquire()
+                    self._busy_count -= 1
+                    self._executed_count += 1
+                    run.in_flight -= 1
+                    self._run_idle.notify_all()
+        finally:
+            self._workers.discard(worker)
+            self._retired_count += 1
+            self._lock.release()
+        logger.debug("Retired shared graph worker %s", worker.name)
+
+    def _execute(self, run: RunQueue, node_id: str) -> None:
+        _current_pool.set(self)
+        register_blocking_handler(self._blocking)
+        node = run.graph.nodes[node_id]
+        # A container node waits on its sub-graph for as long as it runs
+        with self._blocking() if node.execution_type == NodeExecutionType.CONTAINER else nullcontext():
+            if run.runner.execute(node):
+                run.ready_queue.task_done()
+
+    @contextmanager
+    def _blocking(self) -> Iterator[None]:
+        """Don't count the current worker against ``max_workers`` while it waits on nodes executed by the pool."""
+        with self._lock:
+            # The handler may be inherited by threads other than the workers along with the context
+            blocking = threading.current_thread() in self._workers
+            if blocking:
+                self._blocked_count += 1
+                self._dispatch()
+        try:
+            yield
+        finally:
+            if blocking:
+                with self._lock:
+                    self._blocked_count -= 1
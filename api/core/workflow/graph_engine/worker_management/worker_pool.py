@@ -2,7 +2,8 @@
 Simple worker pool that consolidates functionality.
 
 This is a simpler implementation that merges WorkerPool, ActivityTracker,
-DynamicScaler, and WorkerFactory into a single class.
+DynamicScaler, and WorkerFactory into a single class. With a shared worker
+pool, it registers the run with it instead of starting workers of its own.
 """
 
 import logging
@@ -17,7 +18,8 @@ from core.workflow.graph_events import GraphNodeEventBase
 from ..config import GraphEngineConfig
 from ..layers.base import GraphEngineLayer
 from ..ready_queue import ReadyQueue
-from ..worker import Worker
+from ..worker import NodeRunner, Worker
+from .shared_worker_pool import RunQueue, SharedWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,7 @@ class WorkerPool:
         stop_event: threading.Event,
         config: GraphEngineConfig,
         execution_context: IExecutionContext | None = None,
+        shared_pool: SharedWorkerPool | None = None,
     ) -> None:
         """
         Initialize the simple worker pool.
@@ -51,6 +54,7 @@ class WorkerPool:
             layers: Graph engine layers for node execution hooks
             config: GraphEngine worker pool configuration
             execution_context: Optional execution context for context preservation
+            shared_pool: Optional process-wide pool executing the nodes instead of dedicated workers
         """
         self._ready_queue = ready_queue
         self._event_queue = event_queue
@@ -66,6 +70,18 @@ class WorkerPool:
         self._running = False
         self._stop_event = stop_event
 
+        # The run's logical queue when nodes are executed by the shared pool, capped at max_workers nodes at once
+        self._shared_pool = shared_pool
+        self._run_queue: RunQueue | None = None
+        if shared_pool is not None:
+            self._run_queue = RunQueue(
+                ready_queue=ready_queue,
+                graph=graph,
+                runner=NodeRunner(event_queue=event_queue, layers=layers, execution_context=execution_context),
+                stop_event=stop_event,
+                max_concurrency=config.max_workers,
+            )
+
         # No longer tracking worker states with callbacks to avoid lock contention
 
     def start(self, initial_count: int | None = None) -> None:
@@ -81,6 +97,10 @@ class WorkerPool:
 
             self._running = True
 
+            if self._shared_pool is not None and self._run_queue is not None:
+                self._shared_pool.register(self._run_queue)
+                return
+
             # Calculate initial worker count
             if initial_count is None:
                 node_count = len(self._graph.nodes)
@@ -107,6 +127,11 @@ class WorkerPool:
         """Stop all workers in the pool."""
         with self._lock:
             self._running = False
+
+            if self._shared_pool is not None and self._run_queue is not None:
+                # Wait for the nodes being executed as long as for dedicated workers to finish
+                self._shared_pool.unregister(self._run_queue, timeout=2.0)
+                return
             worker_count = len(self._workers)
 
             if worker_count > 0:
@@ -240,10 +265,16 @@ class WorkerPool:
 
         return False
 
+    def notify(self) -> None:
+        """Signal that a node has been enqueued, dedicated workers poll the ready queue instead."""
+        if self._shared_pool is not None:
+            self._shared_pool.notify()
+
     def check_and_scale(self) -> None:
         """Check and perform scaling if needed."""
         with self._lock:
-            if not self._running:
+            # The shared pool scales as nodes are enqueued and workers go idle
+            if not self._running or self._shared_pool is not None:
                 return
 
             current_count = len(self._workers)
@@ -261,6 +292,8 @@ class WorkerPool:
 
     def get_worker_count(self) -> int:
         """Get current number of workers."""
+        if self._shared_pool is not None:
+            return self._shared_pool.get_worker_count()
         with self._lock:
             return len(self._workers)
 
@@ -271,6 +304,8 @@ class WorkerPool:
         Returns:
             Dictionary with status information
         """
+        if self._shared_pool is not None:
+            return self._shared_pool.get_status()
         with self._lock:
             return {
                 "total_workers": len(self._workers),
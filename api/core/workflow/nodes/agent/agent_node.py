@@ -27,6 +27,7 @@ from core.tools.entities.tool_entities import (
 from core.tools.tool_manager import ToolManager
 from core.tools.utils.message_transformer import ToolFileMessageTransformer
 from core.variables.segments import ArrayFileSegment, StringSegment
+from core.workflow.context import blocking_wait
 from core.workflow.enums import (
     NodeType,
     SystemVariableKey,
@@ -137,19 +138,21 @@ class AgentNode(Node[AgentNodeData]):
             return
 
         try:
-            yield from self._transform_message(
-                messages=message_stream,
-                tool_info={
-                    "icon": self.agent_strategy_icon,
-                    "agent_strategy": self.node_data.agent_strategy_name,
-                },
-                parameters_for_log=parameters_for_log,
-                user_id=self.user_id,
-                tenant_id=self.tenant_id,
-                node_type=self.node_type,
-                node_id=self._node_id,
-                node_execution_id=self.id,
-            )
+            # The tools called by the agent may run workflows executed by the worker pool executing this node
+            with blocking_wait():
+                yield from self._transform_message(
+                    messages=message_stream,
+                    tool_info={
+                        "icon": self.agent_strategy_icon,
+                        "agent_strategy": self.node_data.agent_strategy_name,
+                    },
+                    parameters_for_log=parameters_for_log,
+                    user_id=self.user_id,
+                    tenant_id=self.tenant_id,
+                    node_type=self.node_type,
+                    node_id=self._node_id,
+                    node_execution_id=self.id,
+                )
         except PluginDaemonClientSideError as e:
             transform_error = AgentMessageTransformError(
                 f"Failed to transform agent message: {str(e)}", original_error=e
@@ -0,0 +1,103 @@
+"""Process-pool execution and result caching for document text extraction."""
+
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from multiprocessing.pool import Pool
+
+from cachetools import LRUCache
+from gevent import get_hub, monkey
+
+from .exc import TextExtractionError
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionProcessPool:
+    """
+    Lazily created pool of worker processes for CPU-bound extraction.
+
+    Workers are started with the ``spawn`` method, forking a process that runs
+    gevent or several threads is not safe. A task exceeding its timeout cannot
+    be cancelled individually, so the whole pool is terminated and recreated on
+    the next submission.
+
+    In gevent-patched processes the pool is driven from a native thread of the
+    hub's threadpool, as its blocking pipe reads would otherwise stall the hub.
+    """
+
+    def __init__(self, processes: int, max_tasks_per_child: int = 100):
+        self._processes = processes
+        self._max_tasks_per_child = max_tasks_per_child
+        self._pool: Pool | None = None
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable[..., str], /, *args, timeout: float) -> str:
+        if monkey.is_module_patched("threading"):
+            return get_hub().threadpool.apply(self._run, (func, args, timeout))
+        return self._run(func, args, timeout)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def _run(self, func: Callable[..., str], args: tuple, timeout: float) -> str:
+        pool = self._get_pool()
+        async_result = pool.apply_async(func, args)
+        try:
+            return async_result.get(timeout=timeout)
+        except multiprocessing.TimeoutError as e:
+            logger.warning("Document extraction timed out after %s seconds, restarting the process pool", timeout)
+            self._terminate(pool)
+            raise TextExtractionError(f"Document extraction timed out after {timeout} seconds") from e
+
+    def _get_pool(self) -> Pool:
+        with self._lock:
+            if self._pool is None:
+                context = multiprocessing.get_context("spawn")
+                self._pool = context.Pool(processes=self._processes, maxtasksperchild=self._max_tasks_per_child)
+            return self._pool
+
+    def _terminate(self, pool: Pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.terminate()
+
+
+class ExtractedTextCache:
+    """
+    Thread-safe LRU cache of extracted text, bounded by the total number of characters.
+
+    Entries are keyed by the file location (storage key or URL) together with a hash of
+    the file content, so a location whose content changes never serves stale text.
+    """
+
+    def __init__(self, max_size: int):
+        self._cache: LRUCache[tuple[str, str], str] = LRUCache(maxsize=max_size, getsizeof=len)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(location: str, file_content: bytes) -> tuple[str, str]:
+        return location, hashlib.sha256(file_content).hexdigest()
+
+    def get(self, key: tuple[str, str]) -> str | None:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: tuple[str, str], text: str):
+        with self._lock:
+            try:
+                self._cache[key] = text
+            except ValueError:
+                # The text alone is larger than the whole cache.
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
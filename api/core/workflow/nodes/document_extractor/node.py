@@ -5,20 +5,10 @@ import logging
 import os
 import tempfile
 from collections.abc import Mapping, Sequence
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import charset_normalizer
-import docx
-import pandas as pd
-import pypandoc
-import pypdfium2
-import webvtt
 import yaml
-from docx.document import Document
-from docx.oxml.table import CT_Tbl
-from docx.oxml.text.paragraph import CT_P
-from docx.table import Table
-from docx.text.paragraph import Paragraph
 
 from configs import dify_config
 from core.file import File, FileTransferMethod, file_manager
@@ -31,9 +21,31 @@ from core.workflow.nodes.base.node import Node
 
 from .entities import DocumentExtractorNodeData
 from .exc import DocumentExtractorError, FileDownloadError, TextExtractionError, UnsupportedFileTypeError
+from .execution import ExtractedTextCache, ExtractionProcessPool
+
+# The heavy parsing libraries (pandas, python-docx, pypandoc, pypdfium2, webvtt) are imported
+# lazily inside the extraction functions, so importing the node does not pay for them.
+if TYPE_CHECKING:
+    import pandas as pd
+    from docx.document import Document
+    from docx.text.paragraph import Paragraph
 
 logger = logging.getLogger(__name__)
 
+# Extensions and MIME types whose extraction is CPU-bound enough to be worth a process pool.
+_PROCESS_POOL_EXTENSIONS = frozenset({".pdf", ".docx", ".xls", ".xlsx"})
+_PROCESS_POOL_MIME_TYPES = frozenset(
+    {
+        "application/pdf",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "application/vnd.ms-excel",
+    }
+)
+
+_extraction_process_pool = ExtractionProcessPool(processes=dify_config.DOCUMENT_EXTRACTOR_PROCESS_POOL_SIZE)
+_extracted_text_cache = ExtractedTextCache(max_size=dify_config.DOCUMENT_EXTRACTOR_RESULT_CACHE_SIZE)
+
 
 class DocumentExtractorNode(Node[DocumentExtractorNodeData]):
     """
@@ -298,6 +310,8 @@ def _extract_text_from_yaml(file_content: bytes) -> str:
 
 
 def _extract_text_from_pdf(file_content: bytes) -> str:
+    import pypdfium2
+
     try:
         pdf_file = io.BytesIO(file_content)
         pdf_document = pypdfium2.PdfDocument(pdf_file, autoclose=True)
@@ -338,7 +352,12 @@ def _extract_text_from_doc(file_content: bytes) -> str:
         raise TextExtractionError(f"Failed to extract text from DOC: {str(e)}") from e
 
 
-def parser_docx_part(block, doc: Document, content_items, i):
+def parser_docx_part(block, doc: "Document", content_items, i):
+    from docx.oxml.table import CT_Tbl
+    from docx.oxml.text.paragraph import CT_P
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
     if isinstance(block, CT_P):
         content_items.append((i, "paragraph", Paragraph(block, doc)))
     elif isinstance(block, CT_Tbl):
@@ -350,6 +369,9 @@ def _extract_text_from_docx(file_content: bytes) -> str:
     Extract text from a DOCX file.
     For now support only paragraph and table add more if needed
     """
+    import docx
+    from docx.table import Table
+
     try:
         doc_file = io.BytesIO(file_content)
         doc = docx.Document(doc_file)
@@ -421,16 +443,105 @@ def _download_file_content(file: File) -> bytes:
 
 
 def _extract_text_from_file(file: File):
+    if not file.extension and not file.mime_type:
+        raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
+
     file_content = _download_file_content(file)
-    if file.extension:
-        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
-    elif file.mime_type:
-        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type)
+
+    location = _get_file_location(file)
+    cache_key = None
+    if location and dify_config.DOCUMENT_EXTRACTOR_RESULT_CACHE_SIZE > 0:
+        cache_key = ExtractedTextCache.build_key(location, file_content)
+        cached_text = _extracted_text_cache.get(cache_key)
+        if cached_text is not None:
+            return cached_text
+
+    if dify_config.DOCUMENT_EXTRACTOR_EXECUTION_MODE == "process" and _should_use_process_pool(file):
+        extracted_text = _extraction_process_pool.run(
+            _extract_text_by_file_type,
+            file_content,
+            file.extension,
+            file.mime_type,
+            timeout=dify_config.DOCUMENT_EXTRACTOR_TIMEOUT,
+        )
     else:
-        raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
+        extracted_text = _extract_text_by_file_type(file_content, file.extension, file.mime_type)
+
+    if cache_key is not None:
+        _extracted_text_cache.set(cache_key, extracted_text)
     return extracted_text
 
 
+def _extract_text_by_file_type(file_content: bytes, extension: str | None, mime_type: str | None) -> str:
+    # Module level function so that it can be pickled and executed by the extraction process pool.
+    if extension:
+        return _extract_text_by_file_extension(file_content=file_content, file_extension=extension)
+    assert mime_type is not None
+    return _extract_text_by_mime_type(file_content=file_content, mime_type=mime_type)
+
+
+def _should_use_process_pool(file: File) -> bool:
+    if file.extension:
+        return file.extension in _PROCESS_POOL_EXTENSIONS
+    return file.mime_type in _PROCESS_POOL_MIME_TYPES
+
+
+def _get_file_location(file: File) -> str | None:
+    if file.transfer_method == FileTransferMethod.REMOTE_URL:
+        return file.remote_url
+    return file.storage_key or None
+
+
+class _TableTextBuilder:
+    """
+    Accumulates the lines of markdown tables while enforcing the configured row and byte caps.
+
+    Callers feed lines one at a time from a lazy row iterator and stop as soon as ``add``
+    returns False, so the memory held is bounded by the produced text instead of the input.
+    """
+
+    def __init__(self, max_rows: int, max_bytes: int):
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._parts: list[str] = []
+        self._rows = 0
+        self._bytes = 0
+        self.truncated = False
+
+    @property
+    def remaining_rows(self) -> int | None:
+        """Number of rows that can still be added, or None when rows are not capped."""
+        if not self._max_rows:
+            return None
+        return max(self._max_rows - self._rows, 0)
+
+    def add(self, text: str, *, is_row: bool = True) -> bool:
+        """Append ``text``, return False when a cap has been reached and no more text is accepted."""
+        if self.truncated:
+            return False
+        size = len(text.encode("utf-8"))
+        if (self._max_rows and is_row and self._rows >= self._max_rows) or (
+            self._max_bytes and self._bytes + size > self._max_bytes
+        ):
+            self.truncated = True
+            return False
+        self._parts.append(text)
+        self._bytes += size
+        if is_row:
+            self._rows += 1
+        return True
+
+    def build(self) -> str:
+        return "".join(self._parts)
+
+
+def _new_table_text_builder() -> _TableTextBuilder:
+    return _TableTextBuilder(
+        max_rows=dify_config.DOCUMENT_EXTRACTOR_TABLE_MAX_ROWS,
+        max_bytes=dify_config.DOCUMENT_EXTRACTOR_TABLE_MAX_BYTES,
+    )
+
+
 def _extract_text_from_csv(file_content: bytes) -> str:
     try:
         # Detect encoding using charset_normalizer
@@ -450,56 +561,68 @@ def _extract_text_from_csv(file_content: bytes) -> str:
             # If decoding fails, try with utf-8 as last resort
             csv_file = io.StringIO(file_content.decode("utf-8", errors="ignore"))
 
+        # Rows are consumed lazily so that only the produced text is kept in memory.
         csv_reader = csv.reader(csv_file)
-        rows = list(csv_reader)
+        header = next(csv_reader, None)
 
-        if not rows:
+        if header is None:
             return ""
 
         # Combine multi-line text in the header row
-        header_row = [cell.replace("\n", " ").replace("\r", "") for cell in rows[0]]
+        header_row = [cell.replace("\n", " ").replace("\r", "") for cell in header]
 
         # Create Markdown table
-        markdown_table = "| " + " | ".join(header_row) + " |\n"
-        markdown_table += "| " + " | ".join(["-" * len(col) for col in rows[0]]) + " |\n"
+        builder = _new_table_text_builder()
+        builder.add("| " + " | ".join(header_row) + " |\n", is_row=False)
+        builder.add("| " + " | ".join(["-" * len(col) for col in header]) + " |\n", is_row=False)
 
         # Process each data row and combine multi-line text in each cell
-        for row in rows[1:]:
+        for row in csv_reader:
             processed_row = [cell.replace("\n", " ").replace("\r", "") for cell in row]
-            markdown_table += "| " + " | ".join(processed_row) + " |\n"
+            if not builder.add("| " + " | ".join(processed_row) + " |\n"):
+                break
 
-        return markdown_table
+        return builder.build()
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from CSV: {str(e)}") from e
 
 
 def _extract_text_from_excel(file_content: bytes) -> str:
     """Extract text from an Excel file using pandas."""
+    import pandas as pd
 
-    def _construct_markdown_table(df: pd.DataFrame) -> str:
-        """Manually construct a Markdown table from a DataFrame."""
+    builder = _new_table_text_builder()
+
+    def _add_markdown_table(df: "pd.DataFrame") -> bool:
+        """Manually construct a Markdown table from a DataFrame, row by row."""
         # Construct the header row
         header_row = "| " + " | ".join(df.columns) + " |"
 
         # Construct the separator row
         separator_row = "| " + " | ".join(["-" * len(col) for col in df.columns]) + " |"
 
+        if not builder.add(header_row + "\n" + separator_row, is_row=False):
+            return False
+
         # Construct the data rows
-        data_rows = []
         for _, row in df.iterrows():
             data_row = "| " + " | ".join(map(str, row)) + " |"
-            data_rows.append(data_row)
+            if not builder.add("\n" + data_row):
+                return False
 
-        # Combine all rows into a single string
-        markdown_table = "\n".join([header_row, separator_row] + data_rows)
-        return markdown_table
+        return builder.add("\n\n", is_row=False)
 
     try:
         excel_file = pd.ExcelFile(io.BytesIO(file_content))
-        markdown_table = ""
         for sheet_name in excel_file.sheet_names:
+            if builder.remaining_rows == 0:
+                break
             try:
-                df = excel_file.parse(sheet_name=sheet_name)
+                # Never parse more rows than can still be emitted.
+                parse_kwargs: dict[str, Any] = {"sheet_name": sheet_name}
+                if builder.remaining_rows is not None:
+                    parse_kwargs["nrows"] = builder.remaining_rows
+                df = excel_file.parse(**parse_kwargs)
                 df.dropna(how="all", inplace=True)
 
                 # Combine multi-line text in each cell into a single line
@@ -509,10 +632,11 @@ def _extract_text_from_excel(file_content: bytes) -> str:
                 df.columns = pd.Index([" ".join(str(col).splitlines()) for col in df.columns])
 
                 # Manually construct the Markdown table
-                markdown_table += _construct_markdown_table(df) + "\n\n"
+                if not _add_markdown_table(df):
+                    break
             except Exception:
                 continue
-        return markdown_table
+        return builder.build()
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from Excel file: {str(e)}") from e
 
@@ -586,6 +710,8 @@ def _extract_text_from_epub(file_content: bytes) -> str:
                     )
                 os.unlink(temp_file.name)
         else:
+            import pypandoc
+
             pypandoc.download_pandoc()
             with io.BytesIO(file_content) as file:
                 elements = partition_epub(file=file)
@@ -617,6 +743,8 @@ def _extract_text_from_msg(file_content: bytes) -> str:
 
 
 def _extract_text_from_vtt(vtt_bytes: bytes) -> str:
+    import webvtt
+
     text = _extract_text_from_plain_text(vtt_bytes)
 
     # remove bom
@@ -518,11 +518,13 @@ class IterationNode(LLMUsageTrackingMixin, Node[IterationNodeData]):
         return variable_mapping
 
     def _extract_conversation_variable_snapshot(self, *, variable_pool: VariablePool) -> dict[str, Variable]:
+        variable_pool.load_variables(CONVERSATION_VARIABLE_NODE_ID)
         conversation_variables = variable_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
         return {name: variable.model_copy(deep=True) for name, variable in conversation_variables.items()}
 
     def _sync_conversation_variables_from_snapshot(self, snapshot: dict[str, Variable]) -> None:
         parent_pool = self.graph_runtime_state.variable_pool
+        parent_pool.load_variables(CONVERSATION_VARIABLE_NODE_ID)
         parent_conversations = parent_pool.variable_dictionary.get(CONVERSATION_VARIABLE_NODE_ID, {})
 
         current_keys = set(parent_conversations.keys())
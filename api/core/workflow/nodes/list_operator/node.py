@@ -1,6 +1,10 @@
-from collections.abc import Callable, Sequence
+import heapq
+from collections.abc import Callable, Mapping, Sequence
+from itertools import compress
 from typing import Any, TypeAlias, TypeVar
 
+import numpy as np
+
 from core.file import File
 from core.variables import ArrayFileSegment, ArrayNumberSegment, ArrayStringSegment
 from core.variables.segments import ArrayAnySegment, ArrayBooleanSegment, ArraySegment
@@ -22,6 +26,22 @@ _SUPPORTED_TYPES_ALIAS: TypeAlias = ArrayFileSegment | ArrayNumberSegment | Arra
 
 _T = TypeVar("_T")
 
+# Number arrays at least this long are filtered with vectorized comparisons
+_VECTORIZED_FILTER_MIN_SIZE = 1024
+# Integers of larger magnitude can't be compared exactly once converted to float64
+_FLOAT64_EXACT_INT_LIMIT = 2**53
+# Ordering with a limit below this fraction of the array only keeps the first items in a heap
+_TOP_K_MAX_FRACTION = 0.25
+
+_NUMPY_COMPARISONS: Mapping[str, Callable[[Any, float], Any]] = {
+    "=": np.equal,
+    "≠": np.not_equal,
+    "<": np.less,
+    "≤": np.less_equal,
+    ">": np.greater,
+    "≥": np.greater_equal,
+}
+
 
 def _negation(filter_: Callable[[_T], bool]) -> Callable[[_T], bool]:
     """Returns the negation of a given filter function. If the original filter
@@ -43,7 +63,7 @@ class ListOperatorNode(Node[ListOperatorNodeData]):
 
     def _run(self):
         inputs: dict[str, Sequence[object]] = {}
-        process_data: dict[str, Sequence[object]] = {}
+        process_data: dict[str, Any] = {}
         outputs: dict[str, Any] = {}
 
         variable = self.graph_runtime_state.variable_pool.get(self.node_data.variable)
@@ -54,7 +74,7 @@ class ListOperatorNode(Node[ListOperatorNodeData]):
             )
         if not variable.value:
             inputs = {"variable": []}
-            process_data = {"variable": []}
+            process_data = {"variable": _summarize(variable.value_type, [])}
             if isinstance(variable, ArraySegment):
                 result = variable.model_copy(update={"value": []})
             else:
@@ -74,32 +94,37 @@ class ListOperatorNode(Node[ListOperatorNodeData]):
 
         if isinstance(variable, ArrayFileSegment):
             inputs = {"variable": [item.to_dict() for item in variable.value]}
-            process_data["variable"] = [item.to_dict() for item in variable.value]
         else:
             inputs = {"variable": variable.value}
-            process_data["variable"] = variable.value
+        # The inputs already hold the whole array, which can be large
+        process_data["variable"] = _summarize(variable.value_type, variable.value)
 
         try:
+            # The steps work on plain lists, only the final result is wrapped into a segment
+            values: Sequence[Any] = variable.value
+
             # Filter
             if self.node_data.filter_by.enabled:
-                variable = self._apply_filter(variable)
+                values = self._apply_filter(variable)
 
             # Extract
             if self.node_data.extract_by.enabled:
-                variable = self._extract_slice(variable)
+                values = self._extract_slice(values)
 
             # Order
             if self.node_data.order_by.enabled:
-                variable = self._apply_order(variable)
+                values = self._apply_order(variable, values)
 
             # Slice
             if self.node_data.limit.enabled:
-                variable = self._apply_slice(variable)
+                values = values[: self.node_data.limit.size]
 
+            result = variable if values is variable.value else variable.model_copy(update={"value": list(values)})
+            process_data["result"] = _summarize(result.value_type, result.value)
             outputs = {
-                "result": variable,
-                "first_record": variable.value[0] if variable.value else None,
-                "last_record": variable.value[-1] if variable.value else None,
+                "result": result,
+                "first_record": result.value[0] if result.value else None,
+                "last_record": result.value[-1] if result.value else None,
             }
             return NodeRunResult(
                 status=WorkflowNodeExecutionStatus.SUCCEEDED,
@@ -116,24 +141,25 @@ class ListOperatorNode(Node[ListOperatorNodeData]):
                 outputs=outputs,
             )
 
-    def _apply_filter(self, variable: _SUPPORTED_TYPES_ALIAS) -> _SUPPORTED_TYPES_ALIAS:
-        filter_func: Callable[[Any], bool]
-        result: list[Any] = []
-        for condition in self.node_data.filter_by.conditions:
-            if isinstance(variable, ArrayStringSegment):
+    def _apply_filter(self, variable: _SUPPORTED_TYPES_ALIAS) -> list[Any]:
+        """Keep the items matching all conditions, evaluated in a single pass over the array."""
+        conditions = self.node_data.filter_by.conditions
+        if isinstance(variable, ArrayNumberSegment):
+            number_conditions: list[tuple[str, float]] = []
+            for condition in conditions:
                 if not isinstance(condition.value, str):
                     raise InvalidFilterValueError(f"Invalid filter value: {condition.value}")
                 value = self.graph_runtime_state.variable_pool.convert_template(condition.value).text
-                filter_func = _get_string_filter_func(condition=condition.comparison_operator, value=value)
-                result = list(filter(filter_func, variable.value))
-                variable = variable.model_copy(update={"value": result})
-            elif isinstance(variable, ArrayNumberSegment):
+                number_conditions.append((condition.comparison_operator, float(value)))
+            return _filter_numbers(variable.value, number_conditions)
+
+        filter_funcs: list[Callable[[Any], bool]] = []
+        for condition in conditions:
+            if isinstance(variable, ArrayStringSegment):
                 if not isinstance(condition.value, str):
                     raise InvalidFilterValueError(f"Invalid filter value: {condition.value}")
                 value = self.graph_runtime_state.variable_pool.convert_template(condition.value).text
-                filter_func = _get_number_filter_func(condition=condition.comparison_operator, value=float(value))
-                result = list(filter(filter_func, variable.value))
-                variable = variable.model_copy(update={"value": result})
+                filter_funcs.append(_get_string_filter_func(condition=condition.comparison_operator, value=value))
             elif isinstance(variable, ArrayFileSegment):
                 if isinstance(condition.value, str):
                     value = self.graph_runtime_state.variable_pool.convert_template(condition.value).text
@@ -141,46 +167,79 @@ class ListOperatorNode(Node[ListOperatorNodeData]):
                     raise ValueError(f"File filter expects a string value, got {type(condition.value)}")
                 else:
                     value = condition.value
-                filter_func = _get_file_filter_func(
-                    key=condition.key,
-                    condition=condition.comparison_operator,
-                    value=value,
+                filter_funcs.append(
+                    _get_file_filter_func(
+                        key=condition.key,
+                        condition=condition.comparison_operator,
+                        value=value,
+                    )
                 )
-                result = list(filter(filter_func, variable.value))
-                variable = variable.model_copy(update={"value": result})
             else:
                 if not isinstance(condition.value, bool):
                     raise ValueError(f"Boolean filter expects a boolean value, got {type(condition.value)}")
-                filter_func = _get_boolean_filter_func(condition=condition.comparison_operator, value=condition.value)
-                result = list(filter(filter_func, variable.value))
-                variable = variable.model_copy(update={"value": result})
-        return variable
-
-    def _apply_order(self, variable: _SUPPORTED_TYPES_ALIAS) -> _SUPPORTED_TYPES_ALIAS:
-        if isinstance(variable, (ArrayStringSegment, ArrayNumberSegment, ArrayBooleanSegment)):
-            result = sorted(variable.value, reverse=self.node_data.order_by.value == Order.DESC)
-            variable = variable.model_copy(update={"value": result})
-        else:
-            result = _order_file(
-                order=self.node_data.order_by.value, order_by=self.node_data.order_by.key, array=variable.value
-            )
-            variable = variable.model_copy(update={"value": result})
-
-        return variable
-
-    def _apply_slice(self, variable: _SUPPORTED_TYPES_ALIAS) -> _SUPPORTED_TYPES_ALIAS:
-        result = variable.value[: self.node_data.limit.size]
-        return variable.model_copy(update={"value": result})
+                filter_funcs.append(
+                    _get_boolean_filter_func(condition=condition.comparison_operator, value=condition.value)
+                )
+        return list(filter(_conjunction(filter_funcs), variable.value))
 
-    def _extract_slice(self, variable: _SUPPORTED_TYPES_ALIAS) -> _SUPPORTED_TYPES_ALIAS:
+    def _apply_order(self, variable: _SUPPORTED_TYPES_ALIAS, values: Sequence[Any]) -> Sequence[Any]:
+        key: Callable[[Any], Any] | None = None
+        if isinstance(variable, ArrayFileSegment):
+            key = _get_file_order_key(self.node_data.order_by.key)
+        reverse = self.node_data.order_by.value == Order.DESC
+
+        # When only the first items are kept, selecting them is cheaper than sorting the whole array.
+        # heapq.nsmallest and heapq.nlargest return the same items in the same order as the sort would.
+        size = self.node_data.limit.size
+        if self.node_data.limit.enabled and 0 <= size < len(values) * _TOP_K_MAX_FRACTION:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            return select(size, values, key=key)
+        return sorted(values, key=key, reverse=reverse)
+
+    def _extract_slice(self, values: Sequence[Any]) -> Sequence[Any]:
         value = int(self.graph_runtime_state.variable_pool.convert_template(self.node_data.extract_by.serial).text)
         if value < 1:
             raise ValueError(f"Invalid serial index: must be >= 1, got {value}")
-        if value > len(variable.value):
-            raise InvalidKeyError(f"Invalid serial index: must be <= {len(variable.value)}, got {value}")
+        if value > len(values):
+            raise InvalidKeyError(f"Invalid serial index: must be <= {len(values)}, got {value}")
         value -= 1
-        result = variable.value[value]
-        return variable.model_copy(update={"value": [result]})
+        return [values[value]]
+
+
+def _summarize(value_type: Any, values: Sequence[object]) -> dict[str, Any]:
+    return {"type": str(value_type), "size": len(values)}
+
+
+def _conjunction(filter_funcs: Sequence[Callable[[_T], bool]]) -> Callable[[_T], bool]:
+    if len(filter_funcs) == 1:
+        return filter_funcs[0]
+    return lambda value: all(filter_func(value) for filter_func in filter_funcs)
+
+
+def _filter_numbers(values: Sequence[int | float], conditions: Sequence[tuple[str, float]]) -> list[int | float]:
+    filter_funcs = [_get_number_filter_func(condition=condition, value=value) for condition, value in conditions]
+    array = _as_exact_float_array(values) if len(values) >= _VECTORIZED_FILTER_MIN_SIZE else None
+    if array is None:
+        return list(filter(_conjunction(filter_funcs), values))
+
+    mask = np.ones(len(values), dtype=bool)
+    for condition, value in conditions:
+        mask &= _NUMPY_COMPARISONS[condition](array, value)
+    return list(compress(values, mask.tolist()))
+
+
+def _as_exact_float_array(values: Sequence[int | float]) -> Any:
+    """The values as a float64 array if comparing it gives the same results as comparing the values, else None."""
+    try:
+        array = np.asarray(values)
+    except (ValueError, OverflowError):
+        return None
+    # Booleans and integers beyond int64 aren't converted to numbers
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+    if np.any(np.abs(array) > _FLOAT64_EXACT_INT_LIMIT):
+        return None
+    return array.astype(np.float64, copy=False)
 
 
 def _get_file_extract_number_func(*, key: str) -> Callable[[File], int]:
@@ -278,13 +337,16 @@ def _get_boolean_filter_func(*, condition: FilterOperator, value: bool) -> Calla
 def _get_file_filter_func(*, key: str, condition: str, value: str | Sequence[str]) -> Callable[[File], bool]:
     if key in {"name", "extension", "mime_type", "url", "related_id"} and isinstance(value, str):
         extract_func = _get_file_extract_string_func(key=key)
-        return lambda x: _get_string_filter_func(condition=condition, value=value)(extract_func(x))
+        string_filter = _get_string_filter_func(condition=condition, value=value)
+        return lambda x: string_filter(extract_func(x))
     if key in {"type", "transfer_method"}:
         extract_func = _get_file_extract_string_func(key=key)
-        return lambda x: _get_sequence_filter_func(condition=condition, value=value)(extract_func(x))
+        sequence_filter = _get_sequence_filter_func(condition=condition, value=value)
+        return lambda x: sequence_filter(extract_func(x))
     elif key == "size" and isinstance(value, str):
         extract_number = _get_file_extract_number_func(key=key)
-        return lambda x: _get_number_filter_func(condition=condition, value=float(value))(extract_number(x))
+        number_filter = _get_number_filter_func(condition=condition, value=float(value))
+        return lambda x: number_filter(extract_number(x))
     else:
         raise InvalidKeyError(f"Invalid key: {key}")
 
@@ -333,13 +395,10 @@ def _ge(value: int | float) -> Callable[[int | float], bool]:
     return lambda x: x >= value
 
 
-def _order_file(*, order: Order, order_by: str = "", array: Sequence[File]):
-    extract_func: Callable[[File], Any]
+def _get_file_order_key(order_by: str) -> Callable[[File], Any]:
     if order_by in {"name", "type", "extension", "mime_type", "transfer_method", "url", "related_id"}:
-        extract_func = _get_file_extract_string_func(key=order_by)
-        return sorted(array, key=lambda x: extract_func(x), reverse=order == Order.DESC)
+        return _get_file_extract_string_func(key=order_by)
     elif order_by == "size":
-        extract_func = _get_file_extract_number_func(key=order_by)
-        return sorted(array, key=lambda x: extract_func(x), reverse=order == Order.DESC)
+        return _get_file_extract_number_func(key=order_by)
     else:
         raise InvalidKeyError(f"Invalid order key: {order_by}")
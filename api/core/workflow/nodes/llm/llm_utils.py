@@ -107,6 +107,15 @@ def fetch_memory(
     return memory
 
 
+def fetch_result_cache_scope(app_id: str, node_id: str, node_data_model: ModelConfig) -> str | None:
+    """
+    Return the LLM result cache scope of a node, or None when its model parameters are not deterministic.
+    """
+    if node_data_model.completion_params.get("temperature") != 0:
+        return None
+    return f"{app_id}:{node_id}"
+
+
 def deduct_llm_quota(tenant_id: str, model_instance: ModelInstance, usage: LLMUsage):
     provider_model_bundle = model_instance.provider_model_bundle
     provider_configuration = provider_model_bundle.configuration
@@ -277,6 +277,7 @@ class ParameterExtractorNode(Node[ParameterExtractorNodeData]):
             stop=stop,
             stream=False,
             user=self.user_id,
+            cache_scope=llm_utils.fetch_result_cache_scope(self.app_id, self._node_id, node_data_model),
         )
 
         # handle invoke result
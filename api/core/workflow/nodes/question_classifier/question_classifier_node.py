@@ -160,6 +160,7 @@ class QuestionClassifierNode(Node[QuestionClassifierNodeData]):
                 file_outputs=self._file_outputs,
                 node_id=self._node_id,
                 node_type=self.node_type,
+                cache_scope=llm_utils.fetch_result_cache_scope(self.app_id, self._node_id, node_data.model),
             )
 
             for event in generator:
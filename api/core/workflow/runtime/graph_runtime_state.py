@@ -1,23 +1,31 @@
 from __future__ import annotations
 
+import hashlib
 import importlib
 import json
+import struct
 import threading
 from collections.abc import Mapping, Sequence
 from copy import deepcopy
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, ClassVar, Protocol
 
+import orjson
 from pydantic import BaseModel, Field
 from pydantic.json import pydantic_encoder
+from pydantic_core import to_jsonable_python
 
 from core.model_runtime.entities.llm_entities import LLMUsage
 from core.workflow.enums import NodeExecutionType, NodeState, NodeType
-from core.workflow.runtime.variable_pool import VariablePool
+from core.workflow.runtime.variable_pool import SerializedVariable, VariablePool
 
 if TYPE_CHECKING:
     from core.workflow.entities.pause_reason import PauseReason
 
+# Binary snapshots start with the magic and the length of their JSON header, the variable chunks follow the header
+_BINARY_SNAPSHOT_PREFIX = struct.Struct(">4sI")
+_BINARY_SNAPSHOT_MAGIC = b"GRS2"
+
 
 class ReadyQueueProtocol(Protocol):
     """Structural interface required from ready queue implementations."""
@@ -351,32 +359,44 @@ class GraphRuntimeState:
     def dumps(self) -> str:
         """Serialize runtime state into a JSON string."""
 
-        snapshot: dict[str, Any] = {
-            "version": "1.0",
-            "start_at": self._start_at,
-            "total_tokens": self._total_tokens,
-            "node_run_steps": self._node_run_steps,
-            "llm_usage": self._llm_usage.model_dump(mode="json"),
-            "outputs": self.outputs,
-            "variable_pool": self.variable_pool.model_dump(mode="json"),
-            "ready_queue": self.ready_queue.dumps(),
-            "graph_execution": self.graph_execution.dumps(),
-            "paused_nodes": list(self._paused_nodes),
-            "deferred_nodes": list(self._deferred_nodes),
-        }
-
-        graph_state = self._snapshot_graph_state()
-        if graph_state is not None:
-            snapshot["graph_state"] = graph_state
-
-        if self._response_coordinator is not None and self._graph is not None:
-            snapshot["response_coordinator"] = self._response_coordinator.dumps()
-
+        self.variable_pool.load_variables()
+        snapshot = self._snapshot_payload(version="1.0")
+        snapshot["variable_pool"] = self.variable_pool.model_dump(mode="json")
         return json.dumps(snapshot, default=pydantic_encoder)
 
+    def dumps_binary(self) -> bytes:
+        """Serialize runtime state into a binary snapshot.
+
+        The value of each variable of the pool is stored as a separate chunk addressed by the digest of its
+        JSON, so identical values are stored once. Variables unchanged since they were restored or last
+        serialized aren't serialized again, and the variables restored from a binary snapshot are only
+        validated when read.
+        """
+
+        chunk_offsets: dict[str, tuple[int, int]] = {}
+        chunks: list[bytes] = []
+        offset = 0
+        variables: dict[str, dict[str, tuple[dict[str, Any], str]]] = {}
+        for node_id, node_chunks in self.variable_pool.dump_variable_chunks().items():
+            node_variables = variables[node_id] = {}
+            for name, (fields, value) in node_chunks.items():
+                digest = hashlib.blake2b(value, digest_size=16).hexdigest()
+                if digest not in chunk_offsets:
+                    chunk_offsets[digest] = (offset, len(value))
+                    chunks.append(value)
+                    offset += len(value)
+                node_variables[name] = (fields, digest)
+
+        snapshot = self._snapshot_payload(version="2.0")
+        snapshot["variable_pool"] = self.variable_pool.model_dump(mode="json", exclude={"variable_dictionary"})
+        snapshot["variables"] = variables
+        snapshot["chunks"] = chunk_offsets
+        header = orjson.dumps(snapshot, default=to_jsonable_python, option=orjson.OPT_NON_STR_KEYS)
+        return b"".join([_BINARY_SNAPSHOT_PREFIX.pack(_BINARY_SNAPSHOT_MAGIC, len(header)), header, *chunks])
+
     @classmethod
-    def from_snapshot(cls, data: str | Mapping[str, Any]) -> GraphRuntimeState:
-        """Restore runtime state from a serialized snapshot."""
+    def from_snapshot(cls, data: str | bytes | Mapping[str, Any]) -> GraphRuntimeState:
+        """Restore runtime state from a snapshot serialized by `dumps` or `dumps_binary`."""
 
         snapshot = cls._parse_snapshot_payload(data)
 
@@ -391,7 +411,7 @@ class GraphRuntimeState:
         state._apply_snapshot(snapshot)
         return state
 
-    def loads(self, data: str | Mapping[str, Any]) -> None:
+    def loads(self, data: str | bytes | Mapping[str, Any]) -> None:
         """Restore runtime state from a serialized snapshot (legacy API)."""
 
         snapshot = self._parse_snapshot_payload(data)
@@ -457,16 +477,42 @@ class GraphRuntimeState:
     # ------------------------------------------------------------------
     # Snapshot helpers
     # ------------------------------------------------------------------
+    def _snapshot_payload(self, *, version: str) -> dict[str, Any]:
+        snapshot: dict[str, Any] = {
+            "version": version,
+            "start_at": self._start_at,
+            "total_tokens": self._total_tokens,
+            "node_run_steps": self._node_run_steps,
+            "llm_usage": self._llm_usage.model_dump(mode="json"),
+            "outputs": self.outputs,
+            "ready_queue": self.ready_queue.dumps(),
+            "graph_execution": self.graph_execution.dumps(),
+            "paused_nodes": list(self._paused_nodes),
+            "deferred_nodes": list(self._deferred_nodes),
+        }
+
+        graph_state = self._snapshot_graph_state()
+        if graph_state is not None:
+            snapshot["graph_state"] = graph_state
+
+        if self._response_coordinator is not None and self._graph is not None:
+            snapshot["response_coordinator"] = self._response_coordinator.dumps()
+
+        return snapshot
+
     @classmethod
-    def _parse_snapshot_payload(cls, data: str | Mapping[str, Any]) -> _GraphRuntimeStateSnapshot:
+    def _parse_snapshot_payload(cls, data: str | bytes | Mapping[str, Any]) -> _GraphRuntimeStateSnapshot:
         payload: dict[str, Any]
-        if isinstance(data, str):
+        variable_chunks: dict[str, dict[str, SerializedVariable]] | None = None
+        if isinstance(data, bytes):
+            payload, variable_chunks = _split_binary_snapshot(data)
+        elif isinstance(data, str):
             payload = json.loads(data)
         else:
             payload = dict(data)
 
         version = payload.get("version")
-        if version != "1.0":
+        if version != ("1.0" if variable_chunks is None else "2.0"):
             raise ValueError(f"Unsupported GraphRuntimeState snapshot version: {version}")
 
         start_at = float(payload.get("start_at", 0.0))
@@ -486,7 +532,12 @@ class GraphRuntimeState:
 
         variable_pool_payload = payload.get("variable_pool")
         has_variable_pool = variable_pool_payload is not None
-        variable_pool = VariablePool.model_validate(variable_pool_payload) if has_variable_pool else VariablePool()
+        if not has_variable_pool:
+            variable_pool = VariablePool()
+        elif variable_chunks is not None:
+            variable_pool = VariablePool.from_variable_chunks(variable_pool_payload, variable_chunks)
+        else:
+            variable_pool = VariablePool.model_validate(variable_pool_payload)
 
         ready_queue_payload = payload.get("ready_queue")
         graph_execution_payload = payload.get("graph_execution")
@@ -632,3 +683,26 @@ def _coerce_graph_state_map(payload: Any, key: str) -> dict[str, NodeState]:
         except ValueError:
             continue
     return result
+
+
+def _split_binary_snapshot(data: bytes) -> tuple[dict[str, Any], dict[str, dict[str, SerializedVariable]]]:
+    """Split a snapshot serialized by `GraphRuntimeState.dumps_binary` into its header and variables."""
+    if len(data) < _BINARY_SNAPSHOT_PREFIX.size:
+        raise ValueError("Truncated GraphRuntimeState snapshot")
+    magic, header_length = _BINARY_SNAPSHOT_PREFIX.unpack_from(data)
+    if magic != _BINARY_SNAPSHOT_MAGIC:
+        raise ValueError("Unsupported GraphRuntimeState snapshot format")
+    chunks_start = _BINARY_SNAPSHOT_PREFIX.size + header_length
+    payload = orjson.loads(memoryview(data)[_BINARY_SNAPSHOT_PREFIX.size : chunks_start])
+
+    chunk_offsets: Mapping[str, Sequence[int]] = payload.pop("chunks", {})
+    variable_chunks: dict[str, dict[str, SerializedVariable]] = {}
+    for node_id, node_variables in payload.pop("variables", {}).items():
+        node_chunks = variable_chunks[node_id] = {}
+        for name, (fields, digest) in node_variables.items():
+            offset, length = chunk_offsets[digest]
+            start = chunks_start + offset
+            if start + length > len(data):
+                raise ValueError("Truncated GraphRuntimeState snapshot")
+            node_chunks[name] = (fields, data[start : start + length])
+    return payload, variable_chunks
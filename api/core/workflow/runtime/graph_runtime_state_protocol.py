@@ -81,3 +81,7 @@ class ReadOnlyGraphRuntimeState(Protocol):
     def dumps(self) -> str:
         """Serialize the runtime state into a JSON snapshot (read-only)."""
         ...
+
+    def dumps_binary(self) -> bytes:
+        """Serialize the runtime state into a binary snapshot (read-only)."""
+        ...
@@ -26,6 +26,7 @@ class ReadOnlyVariablePoolWrapper:
     def get_all_by_node(self, node_id: str) -> Mapping[str, object]:
         """Return a copy of all variables for the specified node."""
         variables: dict[str, object] = {}
+        self._variable_pool.load_variables(node_id)
         if node_id in self._variable_pool.variable_dictionary:
             for key, variable in self._variable_pool.variable_dictionary[node_id].items():
                 variables[key] = deepcopy(variable.value)
@@ -85,3 +86,7 @@ class ReadOnlyGraphRuntimeStateWrapper:
     def dumps(self) -> str:
         """Serialize the underlying runtime state for external persistence."""
         return self._state.dumps()
+
+    def dumps_binary(self) -> bytes:
+        """Serialize the underlying runtime state into a binary snapshot for external persistence."""
+        return self._state.dumps_binary()
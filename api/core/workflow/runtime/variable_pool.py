@@ -4,9 +4,10 @@ import re
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
 from copy import deepcopy
-from typing import Annotated, Any, Union, cast
+from typing import Annotated, Any, TypeAlias, Union, cast
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 
 from core.file import File, FileAttribute, file_manager
 from core.variables import Segment, SegmentGroup, VariableBase
@@ -26,6 +27,12 @@ VariableValue = Union[str, int, float, dict[str, object], list[object], File]
 
 VARIABLE_PATTERN = re.compile(r"\{\{#([a-zA-Z0-9_]{1,50}(?:\.[a-zA-Z_][a-zA-Z0-9_]{0,29}){1,10})#\}\}")
 
+_VARIABLE_ADAPTER: TypeAdapter[Variable] = TypeAdapter(Variable)
+
+# A variable serialized by `VariablePool.dump_variable_chunks`: its JSON fields other than the value,
+# and the JSON of its value.
+SerializedVariable: TypeAlias = tuple[dict[str, Any], bytes]
+
 
 class VariablePool(BaseModel):
     # Variable dictionary is a dictionary for looking up variables by their selector.
@@ -59,6 +66,12 @@ class VariablePool(BaseModel):
         default_factory=list,
     )
 
+    # Variables restored by `from_variable_chunks` that haven't been read yet.
+    _unloaded_variables: dict[str, dict[str, SerializedVariable]] = PrivateAttr(default_factory=dict)
+    # What each variable was last loaded from or serialized to, reused while the variable is unchanged.
+    # Variables are immutable, so a variable is unchanged as long as the pool holds the same instance.
+    _variable_chunks: dict[tuple[str, str], tuple[Variable, SerializedVariable]] = PrivateAttr(default_factory=dict)
+
     def model_post_init(self, context: Any, /):
         # Create a mapping from field names to SystemVariableKey enum values
         self._add_system_variables(self.system_variables)
@@ -114,6 +127,8 @@ class VariablePool(BaseModel):
             variable = variable_factory.segment_to_variable(segment=segment, selector=selector)
 
         node_id, name = self._selector_to_keys(selector)
+        self._discard_unloaded(node_id, name)
+        self._variable_chunks.pop((node_id, name), None)
         # Based on the definition of `Variable`,
         # `VariableBase` instances can be safely used as `Variable` since they are compatible.
         self.variable_dictionary[node_id][name] = cast(Variable, variable)
@@ -124,6 +139,8 @@ class VariablePool(BaseModel):
 
     def _has(self, selector: Sequence[str]) -> bool:
         node_id, name = self._selector_to_keys(selector)
+        if self._unloaded_variables:
+            self._load_unloaded(node_id, name)
         if node_id not in self.variable_dictionary:
             return False
         if name not in self.variable_dictionary[node_id]:
@@ -155,6 +172,8 @@ class VariablePool(BaseModel):
             return None
 
         node_id, name = self._selector_to_keys(selector)
+        if self._unloaded_variables:
+            self._load_unloaded(node_id, name)
         node_map = self.variable_dictionary.get(node_id)
         if node_map is None:
             return None
@@ -221,9 +240,11 @@ class VariablePool(BaseModel):
         if not selector:
             return
         if len(selector) == 1:
+            self._unloaded_variables.pop(selector[0], None)
             self.variable_dictionary[selector[0]] = {}
             return
         key, hash_key = self._selector_to_keys(selector)
+        self._discard_unloaded(key, hash_key)
         self.variable_dictionary[key].pop(hash_key, None)
 
     def convert_template(self, template: str, /):
@@ -245,6 +266,7 @@ class VariablePool(BaseModel):
     def get_by_prefix(self, prefix: str, /) -> Mapping[str, object]:
         """Return a copy of all variables stored under the given node prefix."""
 
+        self.load_variables(prefix)
         nodes = self.variable_dictionary.get(prefix)
         if not nodes:
             return {}
@@ -268,7 +290,93 @@ class VariablePool(BaseModel):
                 continue
             self.add(selector, value)
 
+    def load_variables(self, node_id: str | None = None, /):
+        """
+        Load the variables restored by `from_variable_chunks` that haven't been read yet, those of
+        ``node_id`` or all of them, into `variable_dictionary`.
+
+        The pool's methods load the variables they need themselves, this is only needed before reading
+        `variable_dictionary` directly.
+        """
+        node_ids = list(self._unloaded_variables) if node_id is None else [node_id]
+        for unloaded_node_id in node_ids:
+            self._load_unloaded(unloaded_node_id)
+
+    def dump_variable_chunks(self) -> dict[str, dict[str, SerializedVariable]]:
+        """
+        Serialize each variable of `variable_dictionary` separately, keyed by node id and name, with its
+        value apart from its other fields so that identical values can be stored once.
+
+        Variables unchanged since they were loaded or last serialized aren't serialized again, and
+        variables that haven't been loaded yet are returned as they were restored.
+        """
+        chunks: dict[str, dict[str, SerializedVariable]] = {
+            node_id: dict(node_chunks) for node_id, node_chunks in self._unloaded_variables.items()
+        }
+        for node_id, variables in self.variable_dictionary.items():
+            for name, variable in variables.items():
+                cached = self._variable_chunks.get((node_id, name))
+                if cached is not None and cached[0] is variable:
+                    chunk = cached[1]
+                else:
+                    fields = _VARIABLE_ADAPTER.dump_python(variable, mode="json")
+                    chunk = (fields, orjson.dumps(fields.pop("value")))
+                    self._variable_chunks[(node_id, name)] = (variable, chunk)
+                chunks.setdefault(node_id, {})[name] = chunk
+        return chunks
+
+    @classmethod
+    def from_variable_chunks(
+        cls, data: Mapping[str, Any], chunks: Mapping[str, Mapping[str, SerializedVariable]]
+    ) -> VariablePool:
+        """
+        Restore a pool from its fields other than `variable_dictionary` and the variables serialized by
+        `dump_variable_chunks`.
+
+        Only the system variables are validated right away, the others are validated when first read.
+        As with `model_validate`, the given system variables take precedence over ``system_variables``
+        while ``environment_variables``, ``conversation_variables`` and ``rag_pipeline_variables`` take
+        precedence over the given variables.
+        """
+        system_chunks = chunks.get(SYSTEM_VARIABLE_NODE_ID, {})
+        system_variables = {name: _load_variable(chunk) for name, chunk in system_chunks.items()}
+        pool = cls.model_validate({**data, "variable_dictionary": {SYSTEM_VARIABLE_NODE_ID: system_variables}})
+        for name, variable in system_variables.items():
+            pool._variable_chunks[(SYSTEM_VARIABLE_NODE_ID, name)] = (variable, system_chunks[name])
+
+        for node_id, node_chunks in chunks.items():
+            if node_id == SYSTEM_VARIABLE_NODE_ID:
+                continue
+            loaded = pool.variable_dictionary.get(node_id, {})
+            unloaded = {name: chunk for name, chunk in node_chunks.items() if name not in loaded}
+            if unloaded:
+                pool._unloaded_variables[node_id] = unloaded
+        return pool
+
+    def _load_unloaded(self, node_id: str, name: str | None = None):
+        node_chunks = self._unloaded_variables.get(node_id)
+        if not node_chunks:
+            return
+        names = list(node_chunks) if name is None else [name] if name in node_chunks else []
+        for variable_name in names:
+            chunk = node_chunks.pop(variable_name)
+            variable = _load_variable(chunk)
+            self.variable_dictionary[node_id][variable_name] = variable
+            self._variable_chunks[(node_id, variable_name)] = (variable, chunk)
+        if not node_chunks:
+            del self._unloaded_variables[node_id]
+
+    def _discard_unloaded(self, node_id: str, name: str):
+        node_chunks = self._unloaded_variables.get(node_id)
+        if node_chunks is not None:
+            node_chunks.pop(name, None)
+
     @classmethod
     def empty(cls) -> VariablePool:
         """Create an empty variable pool."""
         return cls(system_variables=SystemVariable.default())
+
+
+def _load_variable(chunk: SerializedVariable) -> Variable:
+    fields, value = chunk
+    return _VARIABLE_ADAPTER.validate_python({**fields, "value": orjson.loads(value)})
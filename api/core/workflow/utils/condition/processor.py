@@ -1,14 +1,17 @@
 import json
-from collections.abc import Mapping, Sequence
+from collections.abc import Collection, Iterable, Mapping, Sequence
 from typing import Literal, NamedTuple
 
 from core.file import FileAttribute, file_manager
 from core.variables import ArrayFileSegment
-from core.variables.segments import ArrayBooleanSegment, BooleanSegment
+from core.variables.segments import ArrayBooleanSegment, BooleanSegment, Segment
 from core.workflow.runtime import VariablePool
 
 from .entities import Condition, SubCondition, SupportedComparisonOperator
 
+# Arrays at least this long are turned into a set before looking up several expected items in them
+_MEMBERSHIP_SET_MIN_SIZE = 64
+
 
 def _convert_to_bool(value: object) -> bool:
     if isinstance(value, int):
@@ -38,9 +41,15 @@ class ConditionProcessor:
     ) -> ConditionCheckResult:
         input_conditions: list[Mapping[str, object]] = []
         group_results: list[bool] = []
+        # Conditions often share variables and expected values, each is looked up or rendered once per check
+        variables: dict[tuple[str, ...], Segment | None] = {}
+        rendered_templates: dict[str, str] = {}
 
         for condition in conditions:
-            variable = variable_pool.get(condition.variable_selector)
+            selector = tuple(condition.variable_selector)
+            if selector not in variables:
+                variables[selector] = variable_pool.get(condition.variable_selector)
+            variable = variables[selector]
             if variable is None:
                 raise ValueError(f"Variable {condition.variable_selector} not found")
 
@@ -70,7 +79,9 @@ class ConditionProcessor:
                 actual_value = variable.value if variable else None
                 expected_value: str | Sequence[str] | bool | list[bool] | None = condition.value
                 if isinstance(expected_value, str):
-                    expected_value = variable_pool.convert_template(expected_value).text
+                    if expected_value not in rendered_templates:
+                        rendered_templates[expected_value] = variable_pool.convert_template(expected_value).text
+                    expected_value = rendered_templates[expected_value]
                 # Here we need to explicit convet the input string to boolean.
                 if isinstance(variable, (BooleanSegment, ArrayBooleanSegment)) and expected_value is not None:
                     # The following two lines is for compatibility with existing workflows.
@@ -444,7 +455,8 @@ def _assert_all_of(*, value: object, expected: Sequence[str]) -> bool:
     if not isinstance(value, (list, tuple, set, str)):
         return False
 
-    return all(item in value for item in expected)
+    container = _as_membership_container(value, len(expected))
+    return all(item in container for item in expected)
 
 
 def _assert_all_of_bool(*, value: object, expected: Sequence[bool]) -> bool:
@@ -455,7 +467,19 @@ def _assert_all_of_bool(*, value: object, expected: Sequence[bool]) -> bool:
     if not isinstance(value, (list, tuple, set)):
         return False
 
-    return all(item in value for item in expected)
+    container = _as_membership_container(value, len(expected))
+    return all(item in container for item in expected)
+
+
+def _as_membership_container(value: list | tuple | set | str, lookups: int) -> Collection[object]:
+    """A set of the items of a large array looked up more than once, so each lookup doesn't scan the array."""
+    if lookups < 2 or not isinstance(value, (list, tuple)) or len(value) < _MEMBERSHIP_SET_MIN_SIZE:
+        return value
+    try:
+        return set(value)
+    except TypeError:
+        # Unhashable items, e.g. objects of an array[object]
+        return value
 
 
 def _assert_exists(*, value: object) -> bool:
@@ -472,33 +496,33 @@ def _process_sub_conditions(
     operator: Literal["and", "or"],
 ) -> bool:
     files = variable.value
-    group_results: list[bool] = []
     for condition in sub_conditions:
         key = FileAttribute(condition.key)
-        values = [file_manager.get_attr(file=file, attr=key) for file in files]
         expected_value = condition.value
+        values: Iterable[object] = (file_manager.get_attr(file=file, attr=key) for file in files)
         if key == FileAttribute.EXTENSION:
             if not isinstance(expected_value, str):
                 raise TypeError("Expected value must be a string when key is FileAttribute.EXTENSION")
             if expected_value and not expected_value.startswith("."):
                 expected_value = "." + expected_value
-
-            normalized_values: list[object] = []
-            for value in values:
-                if value and isinstance(value, str):
-                    if not value.startswith("."):
-                        value = "." + value
-                normalized_values.append(value)
-            values = normalized_values
-        sub_group_results: list[bool] = [
+            values = (_normalize_extension(value) for value in values)
+        sub_group_results = (
             _evaluate_condition(
                 value=value,
                 operator=condition.comparison_operator,
                 expected=expected_value,
             )
             for value in values
-        ]
-        # Determine the result based on the presence of "not" in the comparison operator
+        )
+        # Determine the result based on the presence of "not" in the comparison operator,
+        # evaluating the files only until the result is known
         result = all(sub_group_results) if "not" in condition.comparison_operator else any(sub_group_results)
-        group_results.append(result)
-    return all(group_results) if operator == "and" else any(group_results)
+        if (operator == "and" and not result) or (operator == "or" and result):
+            return result
+    return operator == "and"
+
+
+def _normalize_extension(value: object) -> object:
+    if value and isinstance(value, str) and not value.startswith("."):
+        return "." + value
+    return value
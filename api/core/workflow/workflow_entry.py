@@ -18,6 +18,7 @@ from core.workflow.graph_engine import GraphEngine, GraphEngineConfig
 from core.workflow.graph_engine.command_channels import InMemoryChannel
 from core.workflow.graph_engine.layers import DebugLoggingLayer, ExecutionLimitsLayer
 from core.workflow.graph_engine.protocols.command_channel import CommandChannel
+from core.workflow.graph_engine.worker_management import SharedWorkerPool
 from core.workflow.graph_events import GraphEngineEvent, GraphNodeEventBase, GraphRunFailedEvent
 from core.workflow.nodes import NodeType
 from core.workflow.nodes.base.node import Node
@@ -32,6 +33,17 @@ from models.workflow import Workflow
 
 logger = logging.getLogger(__name__)
 
+# Executes the nodes of all the workflow runs of the process, including the sub-graphs of their iterations and loops
+shared_worker_pool = (
+    SharedWorkerPool(
+        min_workers=dify_config.GRAPH_ENGINE_SHARED_MIN_WORKERS,
+        max_workers=dify_config.GRAPH_ENGINE_SHARED_MAX_WORKERS,
+        idle_timeout=dify_config.GRAPH_ENGINE_SCALE_DOWN_IDLE_TIME,
+    )
+    if dify_config.GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED
+    else None
+)
+
 
 class WorkflowEntry:
     def __init__(
@@ -86,7 +98,10 @@ class WorkflowEntry:
                 max_workers=dify_config.GRAPH_ENGINE_MAX_WORKERS,
                 scale_up_threshold=dify_config.GRAPH_ENGINE_SCALE_UP_THRESHOLD,
                 scale_down_idle_time=dify_config.GRAPH_ENGINE_SCALE_DOWN_IDLE_TIME,
+                stream_chunk_coalesce_window=dify_config.GRAPH_ENGINE_STREAM_CHUNK_COALESCE_WINDOW,
+                stream_chunk_coalesce_max_bytes=dify_config.GRAPH_ENGINE_STREAM_CHUNK_COALESCE_MAX_BYTES,
             ),
+            shared_worker_pool=shared_worker_pool,
         )
 
         # Add debug logging layer when in debug mode
@@ -110,6 +110,7 @@ def init_app(app: DifyApp) -> Celery:
         "tasks.trigger_processing_tasks",  # async trigger processing
         "tasks.generate_summary_index_task",  # summary index generation
         "tasks.regenerate_summary_index_task",  # summary index regeneration
+        "tasks.webhook_ingestion_tasks",  # buffered webhook dispatch
     ]
     day = dify_config.CELERY_BEAT_SCHEDULER_TIME
 
@@ -204,6 +205,13 @@ def init_app(app: DifyApp) -> Celery:
             "schedule": timedelta(minutes=dify_config.API_TOKEN_LAST_USED_UPDATE_INTERVAL),
         }
 
+    if dify_config.TENANT_FAIR_SCHEDULER_ENABLED:
+        imports.append("schedule.tenant_fair_scheduler_dispatch_task")
+        beat_schedule["tenant_fair_scheduler_dispatch"] = {
+            "task": "schedule.tenant_fair_scheduler_dispatch_task.tenant_fair_scheduler_dispatch",
+            "schedule": timedelta(seconds=dify_config.TENANT_FAIR_SCHEDULER_DISPATCH_INTERVAL),
+        }
+
     celery_app.conf.update(beat_schedule=beat_schedule, imports=imports)
 
     return celery_app
@@ -5,6 +5,7 @@ def init_app(app: DifyApp):
     from commands import (
         add_qdrant_index,
         archive_workflow_runs,
+        backfill_embedding_cache,
         clean_expired_messages,
         clean_workflow_runs,
         cleanup_orphaned_draft_variables,
@@ -30,6 +31,7 @@ def init_app(app: DifyApp):
         setup_datasource_oauth_client,
         setup_system_tool_oauth_client,
         setup_system_trigger_oauth_client,
+        tenant_fair_scheduler_status,
         transform_datasource_credentials,
         upgrade_db,
         vdb_migrate,
@@ -66,6 +68,8 @@ def init_app(app: DifyApp):
         restore_workflow_runs,
         clean_workflow_runs,
         clean_expired_messages,
+        tenant_fair_scheduler_status,
+        backfill_embedding_cache,
     ]
     for cmd in cmds_to_register:
         app.cli.add_command(cmd)
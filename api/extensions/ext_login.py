@@ -14,6 +14,7 @@ from libs.token import extract_access_token, extract_webapp_passport
 from models import Account, Tenant, TenantAccountJoin
 from models.model import AppMCPServer, EndUser
 from services.account_service import AccountService
+from services.principal_cache import principal_cache
 
 login_manager = flask_login.LoginManager()
 
@@ -70,7 +71,7 @@ def load_user_from_request(request_from_flask_login):
             end_user_id = decoded.get("end_user_id")
             if not end_user_id:
                 raise Unauthorized("Invalid Authorization token.")
-            end_user = db.session.query(EndUser).where(EndUser.id == end_user_id).first()
+            end_user = _load_end_user(end_user_id)
             if not end_user:
                 raise NotFound("End user not found.")
             return end_user
@@ -80,7 +81,7 @@ def load_user_from_request(request_from_flask_login):
             decoded = PassportService().verify(auth_token)
             end_user_id = decoded.get("end_user_id")
             if end_user_id:
-                end_user = db.session.query(EndUser).where(EndUser.id == end_user_id).first()
+                end_user = _load_end_user(end_user_id)
                 if not end_user:
                     raise NotFound("End user not found.")
                 return end_user
@@ -90,17 +91,25 @@ def load_user_from_request(request_from_flask_login):
         server_code = request.view_args.get("server_code") if request.view_args else None
         if not server_code:
             raise Unauthorized("Invalid Authorization token.")
-        app_mcp_server = db.session.query(AppMCPServer).where(AppMCPServer.server_code == server_code).first()
-        if not app_mcp_server:
-            raise NotFound("App MCP server not found.")
-        end_user = (
-            db.session.query(EndUser).where(EndUser.session_id == app_mcp_server.id, EndUser.type == "mcp").first()
-        )
+        end_user = principal_cache.get_mcp_end_user(server_code, lambda: _load_mcp_end_user(server_code))
         if not end_user:
             raise NotFound("End user not found.")
         return end_user
 
 
+def _load_end_user(end_user_id: str) -> EndUser | None:
+    return principal_cache.get_end_user(
+        end_user_id, lambda: db.session.query(EndUser).where(EndUser.id == end_user_id).first()
+    )
+
+
+def _load_mcp_end_user(server_code: str) -> EndUser | None:
+    app_mcp_server = db.session.query(AppMCPServer).where(AppMCPServer.server_code == server_code).first()
+    if not app_mcp_server:
+        raise NotFound("App MCP server not found.")
+    return db.session.query(EndUser).where(EndUser.session_id == app_mcp_server.id, EndUser.type == "mcp").first()
+
+
 @user_logged_in.connect
 @user_loaded_from_request.connect
 def on_user_logged_in(_sender, user):
@@ -1,7 +1,21 @@
-from core.db.session_factory import configure_session_factory
+from configs import dify_config
+from core.db.read_replica import ReadReplicaRouter
+from core.db.session_factory import configure_read_only_session_factory, configure_session_factory
 from extensions.ext_database import db
 
 
 def init_app(app):
     with app.app_context():
         configure_session_factory(db.engine)
+
+        replica_engine = db.engines.get("replica")
+        configure_read_only_session_factory(
+            ReadReplicaRouter(
+                primary=db.engine,
+                replica=replica_engine,
+                max_lag_seconds=dify_config.DB_REPLICA_MAX_LAG_SECONDS,
+                lag_check_interval=dify_config.DB_REPLICA_LAG_CHECK_INTERVAL,
+            )
+            if replica_engine is not None
+            else None
+        )
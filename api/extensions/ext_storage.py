@@ -7,6 +7,7 @@ from flask import Flask
 from configs import dify_config
 from dify_app import DifyApp
 from extensions.storage.base_storage import BaseStorage
+from extensions.storage.cached_storage import CachedStorage, LocalDiskCache, StorageCacheStats
 from extensions.storage.storage_type import StorageType
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,28 @@ class Storage:
         storage_factory = self.get_storage_factory(dify_config.STORAGE_TYPE)
         with app.app_context():
             self.storage_runner = storage_factory()
+        if dify_config.STORAGE_LOCAL_CACHE_ENABLED:
+            self.storage_runner = self._wrap_with_local_cache(self.storage_runner)
+
+    @staticmethod
+    def _wrap_with_local_cache(storage_runner: BaseStorage) -> BaseStorage:
+        key_prefixes = [
+            prefix.strip() for prefix in dify_config.STORAGE_LOCAL_CACHE_KEY_PREFIXES.split(",") if prefix.strip()
+        ]
+        logger.info(
+            "Local storage cache enabled at %s for prefixes %s",
+            dify_config.STORAGE_LOCAL_CACHE_PATH,
+            key_prefixes,
+        )
+        return CachedStorage(
+            storage=storage_runner,
+            cache=LocalDiskCache(
+                directory=dify_config.STORAGE_LOCAL_CACHE_PATH,
+                max_size_bytes=dify_config.STORAGE_LOCAL_CACHE_MAX_SIZE,
+            ),
+            key_prefixes=key_prefixes,
+            max_file_size=dify_config.STORAGE_LOCAL_CACHE_MAX_FILE_SIZE,
+        )
 
     @staticmethod
     def get_storage_factory(storage_type: str) -> Callable[[], BaseStorage]:
@@ -106,6 +129,16 @@ class Storage:
     def load_stream(self, filename: str) -> Generator:
         return self.storage_runner.load_stream(filename)
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        """Load the bytes in the half-open range ``[start, end)`` of a file."""
+        return self.storage_runner.load_range(filename, start, end)
+
+    def cache_stats(self) -> StorageCacheStats | None:
+        """Return hit/miss statistics of the local storage cache, or None when it is disabled."""
+        if isinstance(self.storage_runner, CachedStorage):
+            return self.storage_runner.stats()
+        return None
+
     def download(self, filename, target_filepath):
         self.storage_runner.download(filename, target_filepath)
 
@@ -1,12 +1,13 @@
 import contextlib
 import logging
+from collections.abc import Iterable
 
 import flask
 from opentelemetry.instrumentation.celery import CeleryInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.instrumentation.redis import RedisInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
-from opentelemetry.metrics import get_meter, get_meter_provider
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter, get_meter_provider
 from opentelemetry.semconv.trace import SpanAttributes
 from opentelemetry.trace import Span, get_tracer_provider
 from opentelemetry.trace.status import StatusCode
@@ -114,6 +115,48 @@ def init_httpx_instrumentor() -> None:
     HTTPXClientInstrumentor().instrument()
 
 
+def init_graph_engine_metrics() -> None:
+    if not dify_config.GRAPH_ENGINE_SHARED_WORKER_POOL_ENABLED:
+        return
+    meter = get_meter("graph_engine_metrics", version=dify_config.project.version)
+
+    def pool_status() -> dict[str, int]:
+        # Imported on collection, the workflow modules aren't loaded yet when the instruments are set up
+        from core.workflow.workflow_entry import shared_worker_pool
+
+        return shared_worker_pool.get_status() if shared_worker_pool else {}
+
+    def observe_workers(options: CallbackOptions) -> Iterable[Observation]:
+        status = pool_status()
+        for state in ("idle", "busy", "blocked"):
+            yield Observation(status.get(f"{state}_workers", 0), {"state": state})
+
+    def observe_queue_depth(options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(pool_status().get("queue_depth", 0))
+
+    def observe_runs(options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(pool_status().get("runs", 0))
+
+    meter.create_observable_gauge(
+        "graph_engine.worker_pool.workers",
+        callbacks=[observe_workers],
+        description="Workers of the shared GraphEngine worker pool by state",
+        unit="{worker}",
+    )
+    meter.create_observable_gauge(
+        "graph_engine.worker_pool.queue_depth",
+        callbacks=[observe_queue_depth],
+        description="Ready nodes waiting for a worker of the shared GraphEngine worker pool",
+        unit="{node}",
+    )
+    meter.create_observable_gauge(
+        "graph_engine.worker_pool.runs",
+        callbacks=[observe_runs],
+        description="GraphEngine runs registered with the shared worker pool",
+        unit="{run}",
+    )
+
+
 def init_instruments(app: DifyApp) -> None:
     if not is_celery_worker():
         init_flask_instrumentor(app)
@@ -123,3 +166,4 @@ def init_instruments(app: DifyApp) -> None:
     init_sqlalchemy_instrumentor(app)
     init_redis_instrumentor()
     init_httpx_instrumentor()
+    init_graph_engine_metrics()
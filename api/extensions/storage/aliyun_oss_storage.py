@@ -4,7 +4,7 @@ from collections.abc import Generator
 import oss2 as aliyun_s3
 
 from configs import dify_config
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import BaseStorage, validate_range
 
 
 class AliyunOssStorage(BaseStorage):
@@ -44,6 +44,17 @@ class AliyunOssStorage(BaseStorage):
         while chunk := obj.read(4096):
             yield chunk
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if start == end:
+            return b""
+        # `byte_range` is inclusive on both ends.
+        obj = self.client.get_object(self.__wrapper_folder_filename(filename), byte_range=(start, end - 1))
+        data = obj.read()
+        if not isinstance(data, bytes):
+            return b""
+        return data
+
     def download(self, filename: str, target_filepath):
         self.client.get_object_to_file(self.__wrapper_folder_filename(filename), target_filepath)
 
@@ -6,7 +6,7 @@ from botocore.client import Config
 from botocore.exceptions import ClientError
 
 from configs import dify_config
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import BaseStorage, validate_range
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +73,23 @@ class AwsS3Storage(BaseStorage):
             else:
                 raise
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if start == end:
+            return b""
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=filename, Range=f"bytes={start}-{end - 1}")
+            data: bytes = response["Body"].read()
+        except ClientError as ex:
+            if ex.response.get("Error", {}).get("Code") == "NoSuchKey":
+                raise FileNotFoundError("File not found")
+            # The requested range starts beyond the end of the object.
+            elif ex.response.get("Error", {}).get("Code") == "InvalidRange":
+                return b""
+            else:
+                raise
+        return data
+
     def download(self, filename, target_filepath):
         self.client.download_file(self.bucket_name, filename, target_filepath)
 
@@ -6,7 +6,7 @@ from azure.storage.blob import AccountSasPermissions, BlobServiceClient, Resourc
 
 from configs import dify_config
 from extensions.ext_redis import redis_client
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import BaseStorage, validate_range
 from libs.datetime_utils import naive_utc_now
 
 
@@ -55,6 +55,20 @@ class AzureBlobStorage(BaseStorage):
         blob_data = blob.download_blob()
         yield from blob_data.chunks()
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if not self.bucket_name:
+            raise FileNotFoundError("Azure bucket name is not configured.")
+        if start == end:
+            return b""
+
+        client = self._sync_client()
+        blob = client.get_blob_client(container=self.bucket_name, blob=filename)
+        data = blob.download_blob(offset=start, length=end - start).readall()
+        if not isinstance(data, bytes):
+            raise TypeError(f"Expected bytes from blob.readall(), got {type(data).__name__}")
+        return data
+
     def download(self, filename, target_filepath):
         if not self.bucket_name:
             return
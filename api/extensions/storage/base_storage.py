@@ -19,6 +19,27 @@ class BaseStorage(ABC):
     def load_stream(self, filename: str) -> Generator:
         raise NotImplementedError
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        """
+        Load the bytes in the half-open range ``[start, end)`` of a file.
+        Backends that support ranged reads natively override this method,
+        the default implementation streams the file and discards the bytes outside the range.
+        """
+        validate_range(start, end)
+        if start == end:
+            return b""
+
+        buffer = bytearray()
+        offset = 0
+        for chunk in self.load_stream(filename):
+            chunk_end = offset + len(chunk)
+            if chunk_end > start:
+                buffer += chunk[max(start - offset, 0) : end - offset]
+            offset = chunk_end
+            if offset >= end:
+                break
+        return bytes(buffer)
+
     @abstractmethod
     def download(self, filename, target_filepath):
         raise NotImplementedError
@@ -38,3 +59,8 @@ class BaseStorage(ABC):
         If a storage backend doesn't support scanning, it will raise NotImplementedError.
         """
         raise NotImplementedError("This storage backend doesn't support scanning")
+
+
+def validate_range(start: int, end: int):
+    if start < 0 or end < start:
+        raise ValueError(f"invalid byte range [{start}, {end})")
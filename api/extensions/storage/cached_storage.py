@@ -0,0 +1,268 @@
+"""Read-through local disk cache for file storage implementations."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Generator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from extensions.storage.base_storage import BaseStorage, validate_range
+
+_CHUNK_SIZE = 4096
+
+
+@dataclass
+class StorageCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size_bytes: int = 0
+    entries: int = 0
+
+
+class LocalDiskCache:
+    """
+    Size-bounded LRU cache of storage objects on the local disk.
+
+    Entries are stored as one file per storage key, named after the SHA-256 digest of the key.
+    The size limit is tracked per process, processes sharing the same directory tolerate
+    entries being evicted underneath them by treating a vanished file as a cache miss.
+    """
+
+    def __init__(self, directory: str, max_size_bytes: int):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size_bytes = max_size_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = StorageCacheStats()
+        self._restore_index()
+
+    @property
+    def max_size_bytes(self) -> int:
+        return self._max_size_bytes
+
+    def stats(self) -> StorageCacheStats:
+        with self._lock:
+            return StorageCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size_bytes=self._size_bytes,
+                entries=len(self._entries),
+            )
+
+    def get_path(self, key: str) -> Path | None:
+        """Return the local path of a cached key and mark it as recently used, or None on a miss."""
+        digest = self._digest(key)
+        path = self._directory / digest
+        with self._lock:
+            if digest in self._entries and path.exists():
+                self._entries.move_to_end(digest)
+                self._stats.hits += 1
+                return path
+            self._forget(digest)
+            self._stats.misses += 1
+            return None
+
+    def get(self, key: str) -> bytes | None:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Evicted by another process sharing the cache directory.
+            return None
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self._max_size_bytes:
+            return
+        fd, tmp_path = self.new_temp_file()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.put_file(key, tmp_path)
+
+    def put_file(self, key: str, tmp_path: str):
+        """Move a fully written temporary file into the cache, the file must live in the cache directory."""
+        size = os.path.getsize(tmp_path)
+        if size > self._max_size_bytes:
+            os.remove(tmp_path)
+            return
+        digest = self._digest(key)
+        with self._lock:
+            os.replace(tmp_path, self._directory / digest)
+            self._forget(digest)
+            self._entries[digest] = size
+            self._size_bytes += size
+            self._evict()
+
+    def new_temp_file(self) -> tuple[int, str]:
+        return tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+
+    def remove(self, key: str):
+        digest = self._digest(key)
+        with self._lock:
+            self._forget(digest)
+            (self._directory / digest).unlink(missing_ok=True)
+
+    def _forget(self, digest: str):
+        size = self._entries.pop(digest, None)
+        if size is not None:
+            self._size_bytes -= size
+
+    def _evict(self):
+        while self._size_bytes > self._max_size_bytes and self._entries:
+            digest, size = self._entries.popitem(last=False)
+            self._size_bytes -= size
+            self._stats.evictions += 1
+            (self._directory / digest).unlink(missing_ok=True)
+
+    def _restore_index(self):
+        # Rebuild the LRU order from modification times so that a restarted process keeps its warm cache.
+        files = []
+        for path in self._directory.iterdir():
+            if not path.is_file():
+                continue
+            if path.name.startswith(".tmp-"):
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path.name, stat.st_size))
+        with self._lock:
+            for _, digest, size in sorted(files):
+                self._entries[digest] = size
+                self._size_bytes += size
+            self._evict()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class CachedStorage(BaseStorage):
+    """
+    Read-through cache in front of another storage implementation.
+
+    Only keys starting with one of ``key_prefixes`` are cached. These prefixes must only contain
+    objects that are never rewritten in place (e.g. uploads stored under generated UUIDs),
+    since writes made by other processes cannot invalidate this process's cache.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        cache: LocalDiskCache,
+        key_prefixes: Sequence[str],
+        max_file_size: int,
+    ):
+        super().__init__()
+        self._storage = storage
+        self._cache = cache
+        self._key_prefixes = tuple(key_prefixes)
+        self._max_file_size = max_file_size
+
+    @property
+    def storage(self) -> BaseStorage:
+        return self._storage
+
+    def stats(self) -> StorageCacheStats:
+        return self._cache.stats()
+
+    def _is_cacheable(self, filename: str) -> bool:
+        return filename.startswith(self._key_prefixes)
+
+    def save(self, filename: str, data: bytes):
+        self._storage.save(filename, data)
+        if self._is_cacheable(filename):
+            self._cache.remove(filename)
+
+    def load_once(self, filename: str) -> bytes:
+        if not self._is_cacheable(filename):
+            return self._storage.load_once(filename)
+
+        data = self._cache.get(filename)
+        if data is not None:
+            return data
+
+        data = self._storage.load_once(filename)
+        if len(data) <= self._max_file_size:
+            self._cache.put(filename, data)
+        return data
+
+    def load_stream(self, filename: str) -> Generator:
+        if not self._is_cacheable(filename):
+            yield from self._storage.load_stream(filename)
+            return
+
+        path = self._cache.get_path(filename)
+        if path is not None:
+            try:
+                with path.open("rb") as f:
+                    while chunk := f.read(_CHUNK_SIZE):
+                        yield chunk
+                return
+            except FileNotFoundError:
+                # Evicted by another process sharing the cache directory.
+                pass
+
+        yield from self._tee_stream_into_cache(filename)
+
+    def _tee_stream_into_cache(self, filename: str) -> Generator:
+        fd, tmp_path = self._cache.new_temp_file()
+        size = 0
+        completed = False
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                for chunk in self._storage.load_stream(filename):
+                    size += len(chunk)
+                    if size <= self._max_file_size:
+                        tmp_file.write(chunk)
+                    yield chunk
+            completed = True
+        finally:
+            # Only fully consumed streams of acceptable size are cached.
+            if completed and size <= self._max_file_size:
+                self._cache.put_file(filename, tmp_path)
+            else:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if self._is_cacheable(filename):
+            path = self._cache.get_path(filename)
+            if path is not None:
+                try:
+                    with path.open("rb") as f:
+                        f.seek(start)
+                        return f.read(end - start)
+                except FileNotFoundError:
+                    pass
+        return self._storage.load_range(filename, start, end)
+
+    def download(self, filename, target_filepath):
+        if self._is_cacheable(filename):
+            path = self._cache.get_path(filename)
+            if path is not None:
+                try:
+                    shutil.copyfile(path, target_filepath)
+                    return
+                except FileNotFoundError:
+                    pass
+        self._storage.download(filename, target_filepath)
+
+    def exists(self, filename):
+        return self._storage.exists(filename)
+
+    def delete(self, filename):
+        self._storage.delete(filename)
+        if self._is_cacheable(filename):
+            self._cache.remove(filename)
+
+    def scan(self, path, files=True, directories=False) -> list[str]:
+        return self._storage.scan(path, files=files, directories=directories)
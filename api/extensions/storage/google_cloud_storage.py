@@ -6,7 +6,7 @@ from collections.abc import Generator
 from google.cloud import storage as google_cloud_storage  # type: ignore
 
 from configs import dify_config
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import BaseStorage, validate_range
 
 
 class GoogleCloudStorage(BaseStorage):
@@ -49,6 +49,18 @@ class GoogleCloudStorage(BaseStorage):
             while chunk := blob_stream.read(4096):
                 yield chunk
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if start == end:
+            return b""
+        bucket = self.client.get_bucket(self.bucket_name)
+        blob = bucket.get_blob(filename)
+        if blob is None:
+            raise FileNotFoundError("File not found")
+        # `end` is inclusive for Google Cloud Storage.
+        data: bytes = blob.download_as_bytes(start=start, end=end - 1)
+        return data
+
     def download(self, filename, target_filepath):
         bucket = self.client.get_bucket(self.bucket_name)
         blob = bucket.get_blob(filename)
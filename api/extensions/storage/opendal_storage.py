@@ -7,7 +7,7 @@ import opendal
 from dotenv import dotenv_values
 from opendal import Operator
 
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import BaseStorage, validate_range
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +66,19 @@ class OpenDALStorage(BaseStorage):
                 yield chunk
         logger.debug("file %s loaded as stream", filename)
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if not self.exists(filename):
+            raise FileNotFoundError("File not found")
+        if start == end:
+            return b""
+
+        with self.op.open(path=filename, mode="rb") as file:
+            file.seek(start)
+            content: bytes = file.read(end - start)
+        logger.debug("file %s loaded in range [%d, %d)", filename, start, end)
+        return content
+
     def download(self, filename: str, target_filepath: str):
         if not self.exists(filename):
             raise FileNotFoundError("File not found")
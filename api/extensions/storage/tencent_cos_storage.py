@@ -3,7 +3,7 @@ from collections.abc import Generator
 from qcloud_cos import CosConfig, CosS3Client
 
 from configs import dify_config
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import BaseStorage, validate_range
 
 
 class TencentCosStorage(BaseStorage):
@@ -40,6 +40,14 @@ class TencentCosStorage(BaseStorage):
         response = self.client.get_object(Bucket=self.bucket_name, Key=filename)
         yield from response["Body"].get_stream(chunk_size=4096)
 
+    def load_range(self, filename: str, start: int, end: int) -> bytes:
+        validate_range(start, end)
+        if start == end:
+            return b""
+        response = self.client.get_object(Bucket=self.bucket_name, Key=filename, Range=f"bytes={start}-{end - 1}")
+        data: bytes = response["Body"].get_raw_stream().read()
+        return data
+
     def download(self, filename, target_filepath):
         response = self.client.get_object(Bucket=self.bucket_name, Key=filename)
         response["Body"].get_stream_to_file(target_filepath)
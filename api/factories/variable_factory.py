@@ -157,34 +157,97 @@ def build_segment(value: Any, /) -> Segment:
     if isinstance(value, File):
         return FileSegment(value=value)
     if isinstance(value, list):
-        items = [build_segment(item) for item in value]
-        types = {item.value_type for item in items}
-        if all(isinstance(item, ArraySegment) for item in items):
-            return ArrayAnySegment(value=value)
-        elif len(types) != 1:
-            if types.issubset({SegmentType.NUMBER, SegmentType.INTEGER, SegmentType.FLOAT}):
-                return ArrayNumberSegment(value=value)
-            return ArrayAnySegment(value=value)
+        element_type, has_segments = _infer_element_type(value)
+        segment_class = _ARRAY_SEGMENT_BY_ELEMENT_TYPE.get(element_type)
+        if segment_class is None:
+            # This should be unreachable.
+            raise ValueError(f"not supported value {value}")
+        if has_segments:
+            # Segment elements aren't valid values of the typed arrays, leave rejecting them to validation.
+            return segment_class.model_validate({"value": value})
+        # The element types were checked by `_infer_element_type`, so the elements aren't validated again.
+        return segment_class.model_construct(value_type=segment_class.model_fields["value_type"].default, value=value)
+    raise ValueError(f"not supported value {value}")
+
+
+_NUMBER_TYPES = frozenset({SegmentType.NUMBER, SegmentType.INTEGER, SegmentType.FLOAT})
+
+# Element types of the exact Python types, subclasses are resolved by `_element_type`.
+_ELEMENT_TYPE_BY_PYTHON_TYPE: Mapping[type, SegmentType] = {
+    str: SegmentType.STRING,
+    bool: SegmentType.BOOLEAN,
+    int: SegmentType.INTEGER,
+    float: SegmentType.FLOAT,
+    dict: SegmentType.OBJECT,
+    list: SegmentType.ARRAY_ANY,
+    type(None): SegmentType.NONE,
+    File: SegmentType.FILE,
+}
+
+_ARRAY_SEGMENT_BY_ELEMENT_TYPE: Mapping[SegmentType | None, type[ArraySegment]] = {
+    None: ArrayAnySegment,
+    SegmentType.NONE: ArrayAnySegment,
+    SegmentType.ARRAY_ANY: ArrayAnySegment,
+    SegmentType.STRING: ArrayStringSegment,
+    SegmentType.NUMBER: ArrayNumberSegment,
+    SegmentType.INTEGER: ArrayNumberSegment,
+    SegmentType.FLOAT: ArrayNumberSegment,
+    SegmentType.BOOLEAN: ArrayBooleanSegment,
+    SegmentType.OBJECT: ArrayObjectSegment,
+    SegmentType.FILE: ArrayFileSegment,
+}
 
-        match types.pop():
-            case SegmentType.STRING:
-                return ArrayStringSegment(value=value)
-            case SegmentType.NUMBER | SegmentType.INTEGER | SegmentType.FLOAT:
-                return ArrayNumberSegment(value=value)
-            case SegmentType.BOOLEAN:
-                return ArrayBooleanSegment(value=value)
-            case SegmentType.OBJECT:
-                return ArrayObjectSegment(value=value)
-            case SegmentType.FILE:
-                return ArrayFileSegment(value=value)
-            case SegmentType.NONE:
-                return ArrayAnySegment(value=value)
-            case _:
-                # This should be unreachable.
-                raise ValueError(f"not supported value {value}")
+
+def _element_type(value: Any) -> SegmentType:
+    """
+    The segment type `build_segment` would give the value, with all array types reported as `ARRAY_ANY`.
+    """
+    element_type = _ELEMENT_TYPE_BY_PYTHON_TYPE.get(type(value))
+    if element_type is not None:
+        return element_type
+    if isinstance(value, Segment):
+        return SegmentType.ARRAY_ANY if isinstance(value, ArraySegment) else value.value_type
+    # Important: The check for `bool` must precede the check for `int`.
+    for python_type in (str, bool, int, float, dict, File, list):
+        if isinstance(value, python_type):
+            return _ELEMENT_TYPE_BY_PYTHON_TYPE[python_type]
     raise ValueError(f"not supported value {value}")
 
 
+def _infer_element_type(values: list[Any]) -> tuple[SegmentType | None, bool]:
+    """
+    Infer the common element type of a list without building segments for its elements.
+
+    Integers and floats mix into `NUMBER`; any other mix of types is `ARRAY_ANY`. Once the list is
+    known to be mixed, the remaining elements are only checked for being supported at all. Nested
+    lists are checked the same way. The type is None for an empty list, and is returned along with
+    whether any element of the list is a `Segment`.
+    """
+    common_type: SegmentType | None = None
+    mixed = False
+    has_segments = False
+    previous_python_type: type | None = None
+    for item in values:
+        python_type = type(item)
+        if python_type is previous_python_type and python_type is not list:
+            # Same type as the previous element, which has already been accounted for
+            continue
+        previous_python_type = python_type
+        element_type = _element_type(item)
+        has_segments = has_segments or isinstance(item, Segment)
+        if element_type == SegmentType.ARRAY_ANY and isinstance(item, list):
+            _infer_element_type(item)
+        if mixed or element_type == common_type:
+            continue
+        if common_type is None:
+            common_type = element_type
+        elif element_type in _NUMBER_TYPES and common_type in _NUMBER_TYPES:
+            common_type = SegmentType.NUMBER
+        else:
+            mixed = True
+    return (SegmentType.ARRAY_ANY if mixed else common_type), has_segments
+
+
 _segment_factory: Mapping[SegmentType, type[Segment]] = {
     SegmentType.NONE: NoneSegment,
     SegmentType.STRING: StringSegment,
@@ -0,0 +1,85 @@
+"""add partitioned embedding caches
+
+Revision ID: 65c6ccf5127b
+Revises: fce013ca180e
+Create Date: 2026-10-19 10:30:12.482913
+
+"""
+
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+import models
+
+
+def _is_pg(conn):
+    return conn.dialect.name == "postgresql"
+
+
+def _next_month(month):
+    year, month = divmod(month, 100)
+    return (year + 1) * 100 + 1 if month == 12 else year * 100 + month + 1
+
+
+# revision identifiers, used by Alembic.
+revision = "65c6ccf5127b"
+down_revision = "fce013ca180e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    now = datetime.now(UTC)
+    current_month = now.year * 100 + now.month
+    # The partitions of later months are created by the clean embedding cache task and the backfill command
+    months = [current_month, _next_month(current_month)]
+
+    if _is_pg(conn):
+        op.create_table(
+            "embedding_caches",
+            sa.Column("id", models.types.StringUUID(), nullable=False),
+            sa.Column("model_name", sa.String(length=255), nullable=False),
+            sa.Column("hash", sa.String(length=64), nullable=False),
+            sa.Column("provider_name", sa.String(length=255), nullable=False),
+            sa.Column("partition_month", sa.Integer(), nullable=False),
+            sa.Column("embedding", sa.LargeBinary(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+            sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id", "partition_month", name="embedding_cache_pkey"),
+            sa.UniqueConstraint(
+                "model_name", "hash", "provider_name", "partition_month", name="embedding_cache_hash_month_idx"
+            ),
+            postgresql_partition_by="RANGE (partition_month)",
+        )
+        op.execute("CREATE TABLE embedding_caches_default PARTITION OF embedding_caches DEFAULT")
+        for month in months:
+            op.execute(
+                f"CREATE TABLE embedding_caches_p{month} PARTITION OF embedding_caches "
+                f"FOR VALUES FROM ({month}) TO ({_next_month(month)})"
+            )
+    else:
+        partitions = ", ".join(f"PARTITION p{month} VALUES LESS THAN ({_next_month(month)})" for month in months)
+        op.create_table(
+            "embedding_caches",
+            sa.Column("id", models.types.StringUUID(), nullable=False),
+            sa.Column("model_name", sa.String(length=255), nullable=False),
+            sa.Column("hash", sa.String(length=64), nullable=False),
+            sa.Column("provider_name", sa.String(length=255), nullable=False),
+            sa.Column("partition_month", sa.Integer(), nullable=False),
+            sa.Column("embedding", models.types.BinaryData(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.current_timestamp(), nullable=False),
+            sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id", "partition_month", name="embedding_cache_pkey"),
+            sa.UniqueConstraint(
+                "model_name", "hash", "provider_name", "partition_month", name="embedding_cache_hash_month_idx"
+            ),
+            mysql_partition_by=f"RANGE (partition_month) ({partitions}, PARTITION pmax VALUES LESS THAN MAXVALUE)",
+        )
+
+
+def downgrade():
+    # Dropping the table drops its partitions
+    op.drop_table("embedding_caches")
@@ -21,6 +21,7 @@ from .dataset import (
     Document,
     DocumentSegment,
     Embedding,
+    EmbeddingCache,
     ExternalKnowledgeApis,
     ExternalKnowledgeBindings,
     TidbAuthBinding,
@@ -156,6 +157,7 @@ __all__ = [
     "Document",
     "DocumentSegment",
     "Embedding",
+    "EmbeddingCache",
     "EndUser",
     "ExecutionExtraContent",
     "ExporleBanner",
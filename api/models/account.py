@@ -115,6 +115,7 @@ class Account(UserMixin, TypeBase):
 
     role: TenantAccountRole | None = field(default=None, init=False)
     _current_tenant: "Tenant | None" = field(default=None, init=False)
+    _password_set: bool | None = field(default=None, init=False)
 
     @validates("status")
     def _normalize_status(self, _key: str, value: str | AccountStatus) -> str:
@@ -122,8 +123,15 @@ class Account(UserMixin, TypeBase):
             return value.value
         return value
 
+    @validates("password")
+    def _reset_password_set(self, _key: str, value: str | None) -> str | None:
+        self._password_set = None
+        return value
+
     @property
     def is_password_set(self):
+        if self._password_set is not None:
+            return self._password_set
         return self.password is not None
 
     @property
@@ -172,6 +180,15 @@ class Account(UserMixin, TypeBase):
             self.role = TenantAccountRole(join.role)
             self._current_tenant = tenant
 
+    def set_loaded_tenant(self, tenant: "Tenant", role: TenantAccountRole | None):
+        """Set the current tenant and role that have already been loaded, e.g. from a cache."""
+        self.role = role
+        self._current_tenant = tenant
+
+    def set_loaded_password_set(self, password_set: bool):
+        """Set whether the account has a password, for an account loaded without its credentials."""
+        self._password_set = password_set
+
     @property
     def current_role(self):
         return self.role
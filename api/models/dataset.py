@@ -1128,6 +1128,47 @@ class Embedding(TypeBase):
         return cast(list[float], pickle.loads(self.embedding))  # noqa: S301
 
 
+class EmbeddingCache(TypeBase):
+    """
+    Cached embeddings of document texts and files, partitioned by the month they were cached in.
+
+    ``partition_month`` is the year and month as a number, e.g. 202610. Expired months are removed by
+    dropping their partitions instead of deleting rows, see ``EmbeddingCachePartitionService``; the
+    embeddings hit since are copied to the current month first. A text can therefore be cached once
+    per month, lookups take the latest row.
+    """
+
+    __tablename__ = "embedding_caches"
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("id", "partition_month", name="embedding_cache_pkey"),
+        sa.UniqueConstraint(
+            "model_name", "hash", "provider_name", "partition_month", name="embedding_cache_hash_month_idx"
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(
+        StringUUID,
+        insert_default=lambda: str(uuid4()),
+        default_factory=lambda: str(uuid4()),
+        init=False,
+    )
+    model_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    provider_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    partition_month: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    embedding: Mapped[bytes] = mapped_column(BinaryData, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.current_timestamp(), init=False
+    )
+    last_hit_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, default=None)
+
+    def set_embedding(self, embedding_data: list[float]):
+        self.embedding = pickle.dumps(embedding_data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get_embedding(self) -> list[float]:
+        return cast(list[float], pickle.loads(self.embedding))  # noqa: S301
+
+
 class DatasetCollectionBinding(TypeBase):
     __tablename__ = "dataset_collection_bindings"
     __table_args__ = (
@@ -405,7 +405,7 @@ class APIWorkflowRunRepository(WorkflowExecutionRepository, Protocol):
         self,
         workflow_run_id: str,
         state_owner_user_id: str,
-        state: str,
+        state: str | bytes,
         pause_reasons: Sequence[PauseReason],
     ) -> WorkflowPauseEntity:
         """
@@ -418,7 +418,7 @@ class APIWorkflowRunRepository(WorkflowExecutionRepository, Protocol):
         Args:
             workflow_run_id: Identifier of the workflow run to pause
             state_owner_user_id: User ID who owns the pause state for file storage
-            state: Serialized workflow execution state (JSON string)
+            state: Serialized workflow execution state, a JSON string or a binary snapshot
 
         Returns:
             WorkflowPauseEntity representing the created pause state
@@ -711,7 +711,7 @@ class DifyAPISQLAlchemyWorkflowRunRepository(APIWorkflowRunRepository):
         self,
         workflow_run_id: str,
         state_owner_user_id: str,
-        state: str,
+        state: str | bytes,
         pause_reasons: Sequence[PauseReason],
     ) -> WorkflowPauseEntity:
         """
@@ -724,7 +724,7 @@ class DifyAPISQLAlchemyWorkflowRunRepository(APIWorkflowRunRepository):
         Args:
             workflow_run_id: Identifier of the workflow run to pause
             state_owner_user_id: User ID who owns the pause state for file storage
-            state: Serialized workflow execution state (JSON string)
+            state: Serialized workflow execution state, a JSON string or a binary snapshot
 
         Returns:
             RepositoryWorkflowPauseEntity representing the created pause state
@@ -755,8 +755,12 @@ class DifyAPISQLAlchemyWorkflowRunRepository(APIWorkflowRunRepository):
                 # we need to flush here to ensure that the old one is actually deleted.
                 session.flush()
 
-            state_obj_key = f"workflow-state-{uuid.uuid4()}.json"
-            storage.save(state_obj_key, state.encode())
+            if isinstance(state, str):
+                state_obj_key = f"workflow-state-{uuid.uuid4()}.json"
+                storage.save(state_obj_key, state.encode())
+            else:
+                state_obj_key = f"workflow-state-{uuid.uuid4()}.bin"
+                storage.save(state_obj_key, state)
             # Upload the state file
 
             # Create the pause record
@@ -1,14 +1,12 @@
-import datetime
 import time
 
 import click
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
 
 import app
 from configs import dify_config
-from extensions.ext_database import db
-from models.dataset import Embedding
+from core.rag.embedding.embedding_cache_store import partition_month
+from libs.datetime_utils import naive_utc_now
+from services.embedding_cache_partition_service import EmbeddingCachePartitionService
 
 
 @app.celery.task(queue="dataset")
@@ -16,27 +14,22 @@ def clean_embedding_cache_task():
     click.echo(click.style("Start clean embedding cache.", fg="green"))
     clean_days = int(dify_config.PLAN_SANDBOX_CLEAN_DAY_SETTING)
     start_at = time.perf_counter()
-    thirty_days_ago = datetime.datetime.now() - datetime.timedelta(days=clean_days)
-    while True:
-        try:
-            embedding_ids = (
-                db.session.query(Embedding.id)
-                .where(Embedding.created_at < thirty_days_ago)
-                .order_by(Embedding.created_at.desc())
-                .limit(100)
-                .all()
-            )
-            embedding_ids = [embedding_id[0] for embedding_id in embedding_ids]
-        except SQLAlchemyError:
-            raise
-        if embedding_ids:
-            for embedding_id in embedding_ids:
-                db.session.execute(
-                    text("DELETE FROM embeddings WHERE id = :embedding_id"), {"embedding_id": embedding_id}
-                )
 
-            db.session.commit()
-        else:
-            break
+    EmbeddingCachePartitionService.ensure_partitions(
+        partition_month(naive_utc_now()), dify_config.EMBEDDING_CACHE_PARTITIONS_AHEAD
+    )
+    # Expired months are dropped as a whole instead of deleting their rows one by one
+    dropped = EmbeddingCachePartitionService.expire_partitions(
+        clean_days, keep_hit=dify_config.EMBEDDING_CACHE_HIT_TRACKING_ENABLED
+    )
+    if dify_config.EMBEDDING_CACHE_LEGACY_LOOKUP_ENABLED:
+        deleted = EmbeddingCachePartitionService.clean_legacy(clean_days, batch_size=1000)
+        click.echo(click.style(f"Deleted {deleted} expired rows of the legacy embeddings table.", fg="green"))
+
     end_at = time.perf_counter()
-    click.echo(click.style(f"Cleaned embedding cache from db success latency: {end_at - start_at}", fg="green"))
+    click.echo(
+        click.style(
+            f"Cleaned embedding cache from db success, dropped partitions {dropped} latency: {end_at - start_at}",
+            fg="green",
+        )
+    )
@@ -0,0 +1,34 @@
+"""
+Scheduled task handing out the slots of the tenant fair schedulers.
+
+Schedulers dispatch when a task is enqueued or completes. A worker that crashed never
+completes its task, and its lease only frees the slot once expired, so this task
+dispatches periodically to hand such slots to the tenants waiting for them.
+"""
+
+import logging
+
+import app
+from services.document_indexing_proxy.document_indexing_task_proxy import DocumentIndexingTaskProxy
+from services.document_indexing_proxy.duplicate_document_indexing_task_proxy import (
+    DuplicateDocumentIndexingTaskProxy,
+)
+from tasks.document_indexing_task import send_scheduled_document_task
+
+logger = logging.getLogger(__name__)
+
+
+@app.celery.task(queue="dataset")
+def tenant_fair_scheduler_dispatch():
+    for proxy in (DocumentIndexingTaskProxy, DuplicateDocumentIndexingTaskProxy):
+        for task_func in (proxy.NORMAL_TASK_FUNC, proxy.PRIORITY_TASK_FUNC):
+            scheduler = proxy.fair_scheduler(priority=task_func is proxy.PRIORITY_TASK_FUNC)
+            try:
+                sent = scheduler.dispatch(
+                    lambda task, task_func=task_func: send_scheduled_document_task(task_func, task)
+                )
+            except Exception:
+                logger.exception("Failed to dispatch tasks of tenant fair scheduler %s", scheduler.name)
+                continue
+            if sent:
+                logger.info("Tenant fair scheduler %s dispatched %d tasks", scheduler.name, sent)
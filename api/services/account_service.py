@@ -52,6 +52,7 @@ from services.errors.account import (
 )
 from services.errors.workspace import WorkSpaceNotAllowedCreateError, WorkspacesLimitExceededError
 from services.feature_service import FeatureService
+from services.principal_cache import principal_cache
 from tasks.delete_account_task import delete_account_task
 from tasks.mail_account_deletion_task import send_account_deletion_verification_code
 from tasks.mail_change_mail_task import (
@@ -125,6 +126,10 @@ class AccountService:
 
     @staticmethod
     def load_user(user_id: str) -> None | Account:
+        return principal_cache.get_account(user_id, lambda: AccountService._load_user_from_db(user_id))
+
+    @staticmethod
+    def _load_user_from_db(user_id: str) -> None | Account:
         account = db.session.query(Account).filter_by(id=user_id).first()
         if not account:
             return None
@@ -200,13 +205,18 @@ class AccountService:
             account.initialized_at = naive_utc_now()
 
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
 
         return account
 
     @staticmethod
     def update_account_password(account, password, new_password):
         """update account password"""
-        if account.password and not compare_password(password, account.password, account.password_salt):
+        # Read the credentials from the database, the account may have been restored from the principal cache
+        current_password, current_password_salt = db.session.execute(
+            select(Account.password, Account.password_salt).where(Account.id == account.id)
+        ).one()
+        if current_password and not compare_password(password, current_password, current_password_salt):
             raise CurrentPasswordIncorrectError("Current password is incorrect.")
 
         # may be raised
@@ -223,6 +233,7 @@ class AccountService:
         account.password_salt = base64_salt
         db.session.add(account)
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
         return account
 
     @staticmethod
@@ -339,6 +350,7 @@ class AccountService:
 
         # Now proceed with async account deletion
         delete_account_task.delay(account.id)
+        principal_cache.invalidate_accounts(account.id)
 
     @staticmethod
     def link_account_integrate(provider: str, open_id: str, account: Account):
@@ -372,6 +384,7 @@ class AccountService:
         """Close account"""
         account.status = AccountStatus.CLOSED
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
 
     @staticmethod
     def update_account(account, **kwargs):
@@ -384,6 +397,7 @@ class AccountService:
                 raise AttributeError(f"Invalid field: {field}")
 
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
         return account
 
     @staticmethod
@@ -395,6 +409,7 @@ class AccountService:
             db.session.delete(account_integrate)
         db.session.add(account)
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
         return account
 
     @staticmethod
@@ -404,6 +419,7 @@ class AccountService:
         account.last_login_ip = ip_address
         db.session.add(account)
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
 
     @staticmethod
     def login(account: Account, *, ip_address: str | None = None) -> TokenPair:
@@ -413,6 +429,7 @@ class AccountService:
         if account.status == AccountStatus.PENDING:
             account.status = AccountStatus.ACTIVE
             db.session.commit()
+            principal_cache.invalidate_accounts(account.id)
 
         access_token = AccountService.get_account_jwt_token(account=account)
         refresh_token = _generate_refresh_token()
@@ -427,6 +444,7 @@ class AccountService:
         refresh_token = redis_client.get(AccountService._get_account_refresh_token_key(account.id))
         if refresh_token:
             AccountService._delete_refresh_token(refresh_token.decode("utf-8"), account.id)
+        principal_cache.invalidate_accounts(account.id)
 
     @staticmethod
     def refresh_token(refresh_token: str) -> TokenPair:
@@ -1078,6 +1096,7 @@ class TenantService:
             db.session.add(ta)
 
         db.session.commit()
+        principal_cache.invalidate_accounts(account.id)
         if dify_config.BILLING_ENABLED:
             BillingService.clean_billing_info_cache(tenant.id)
         return ta
@@ -1135,6 +1154,7 @@ class TenantService:
             # Set the current tenant for the account
             account.set_tenant_id(tenant_account_join.tenant_id)
             db.session.commit()
+            principal_cache.invalidate_accounts(account.id)
 
     @staticmethod
     def get_tenant_members(tenant: Tenant) -> list[Account]:
@@ -1257,6 +1277,7 @@ class TenantService:
                 should_delete_account = True
 
         db.session.commit()
+        principal_cache.invalidate_accounts(account_id)
 
         if should_delete_account:
             logger.info(
@@ -1303,10 +1324,12 @@ class TenantService:
             )
             if current_owner_join:
                 current_owner_join.role = "admin"
+                principal_cache.invalidate_accounts(current_owner_join.account_id)
 
         # Update the role of the target member
         target_member_join.role = new_role
         db.session.commit()
+        principal_cache.invalidate_accounts(member.id)
 
     @staticmethod
     def get_custom_config(tenant_id: str):
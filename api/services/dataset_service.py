@@ -23,6 +23,7 @@ from core.helper.name_generator import generate_incremental_name
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelFeature, ModelType
 from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.index_processor.constant.built_in_field import BuiltInField
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
@@ -1143,11 +1144,18 @@ class DatasetService:
 
     @staticmethod
     def get_dataset_queries(dataset_id: str, page: int, per_page: int):
-        stmt = select(DatasetQuery).filter_by(dataset_id=dataset_id).order_by(db.desc(DatasetQuery.created_at))
+        page = max(page, 1)
+        per_page = min(per_page, 100) if per_page > 0 else 20
+        stmt = select(DatasetQuery).filter_by(dataset_id=dataset_id)
 
-        dataset_queries = db.paginate(select=stmt, page=page, per_page=per_page, max_per_page=100, error_out=False)
+        # The query history can lag behind a little, so it's read from the read replica when there is one
+        with session_factory.create_read_only_session() as session:
+            total = session.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+            dataset_queries = session.scalars(
+                stmt.order_by(DatasetQuery.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
+            ).all()
 
-        return dataset_queries.items, dataset_queries.total
+        return dataset_queries, total
 
     @staticmethod
     def get_related_apps(dataset_id: str):
@@ -3274,6 +3282,7 @@ class SegmentService:
                     segment.disabled_by = current_user.id
                     db.session.add(segment)
                     db.session.commit()
+                    segment_hydration_cache.invalidate(dataset.id)
                     # Set cache to prevent indexing the same segment multiple times
                     redis_client.setex(indexing_cache_key, 600, 1)
                     disable_segment_from_index_task.delay(segment.id)
@@ -3523,6 +3532,7 @@ class SegmentService:
             segment.status = "error"
             segment.error = str(e)
             db.session.commit()
+        segment_hydration_cache.invalidate(dataset.id)
         new_segment = db.session.query(DocumentSegment).where(DocumentSegment.id == segment.id).first()
         if not new_segment:
             raise ValueError("new_segment is not found")
@@ -3563,6 +3573,7 @@ class SegmentService:
         document.word_count -= segment.word_count
         db.session.add(document)
         db.session.commit()
+        segment_hydration_cache.invalidate(dataset.id)
 
     @classmethod
     def delete_segments(cls, segment_ids: list, document: Document, dataset: Dataset):
@@ -3618,6 +3629,7 @@ class SegmentService:
         # Delete database records
         db.session.query(DocumentSegment).where(DocumentSegment.id.in_(segment_ids)).delete()
         db.session.commit()
+        segment_hydration_cache.invalidate(dataset.id)
 
     @classmethod
     def update_segments_status(
@@ -3652,6 +3664,7 @@ class SegmentService:
                     db.session.add(segment)
                     real_deal_segment_ids.append(segment.id)
                 db.session.commit()
+                segment_hydration_cache.invalidate(dataset.id)
 
                 enable_segments_to_index_task.delay(real_deal_segment_ids, dataset.id, document.id)
             case "disable":
@@ -3677,6 +3690,7 @@ class SegmentService:
                     db.session.add(segment)
                     real_deal_segment_ids.append(segment.id)
                 db.session.commit()
+                segment_hydration_cache.invalidate(dataset.id)
 
                 disable_segments_from_index_task.delay(real_deal_segment_ids, dataset.id, document.id)
 
@@ -3791,6 +3805,7 @@ class SegmentService:
                     new_child_chunks.append(child_chunk)
             VectorService.update_child_chunk_vector(new_child_chunks, update_child_chunks, delete_child_chunks, dataset)
             db.session.commit()
+            segment_hydration_cache.invalidate(dataset.id)
         except Exception as e:
             logger.exception("update child chunk index failed")
             db.session.rollback()
@@ -3817,6 +3832,7 @@ class SegmentService:
             db.session.add(child_chunk)
             VectorService.update_child_chunk_vector([], [child_chunk], [], dataset)
             db.session.commit()
+            segment_hydration_cache.invalidate(dataset.id)
         except Exception as e:
             logger.exception("update child chunk index failed")
             db.session.rollback()
@@ -3833,6 +3849,7 @@ class SegmentService:
             db.session.rollback()
             raise ChildChunkDeleteIndexError(str(e))
         db.session.commit()
+        segment_hydration_cache.invalidate(dataset.id)
 
     @classmethod
     def get_child_chunks(
@@ -3,8 +3,11 @@ from collections.abc import Callable, Sequence
 from dataclasses import asdict
 from typing import Any
 
+from configs import dify_config
 from core.entities.document_task import DocumentTask
+from core.rag.pipeline.fair_scheduler import TenantFairScheduler
 from core.rag.pipeline.queue import TenantIsolatedTaskQueue
+from tasks.document_indexing_task import send_scheduled_document_task
 
 from .base import DocumentTaskProxyBase
 
@@ -17,6 +20,7 @@ class BatchDocumentIndexingProxy(DocumentTaskProxyBase):
 
     Adds:
     - Tenant isolated queue management
+    - Weighted fair scheduling across tenants when TENANT_FAIR_SCHEDULER_ENABLED is set
     - Batch document handling
     """
 
@@ -33,6 +37,11 @@ class BatchDocumentIndexingProxy(DocumentTaskProxyBase):
         self._document_ids = document_ids
         self._tenant_isolated_task_queue = TenantIsolatedTaskQueue(tenant_id, self.QUEUE_NAME)
 
+    @classmethod
+    def fair_scheduler(cls, priority: bool) -> TenantFairScheduler:
+        """The fair scheduler shared by all tenants sending tasks to the normal or priority Celery queue."""
+        return TenantFairScheduler.from_config(f"{cls.QUEUE_NAME}:{'priority' if priority else 'normal'}")
+
     def _send_to_direct_queue(self, task_func: Callable[[str, str, Sequence[str]], Any]):
         """
         Send batch task to direct queue.
@@ -55,6 +64,10 @@ class BatchDocumentIndexingProxy(DocumentTaskProxyBase):
         logger.info(
             "tenant %s send documents %s to tenant queue %s", self._tenant_id, self._document_ids, self.QUEUE_NAME
         )
+        if dify_config.TENANT_FAIR_SCHEDULER_ENABLED:
+            self._send_to_fair_scheduler(task_func)
+            return
+
         if self._tenant_isolated_task_queue.get_task_key():
             # Add to waiting queue using List operations (lpush)
             self._tenant_isolated_task_queue.push_tasks(
@@ -74,3 +87,32 @@ class BatchDocumentIndexingProxy(DocumentTaskProxyBase):
                 tenant_id=self._tenant_id, dataset_id=self._dataset_id, document_ids=self._document_ids
             )
             logger.info("tenant %s init tasks: %s - %s", self._tenant_id, self._dataset_id, self._document_ids)
+
+    def _send_to_fair_scheduler(self, task_func: Callable[..., Any]):
+        """
+        Queue the batch in the tenant's virtual queue of the fair scheduler and dispatch what the caps allow.
+
+        Tasks are weighted by the tenant's plan and cost one unit per document, so a tenant importing
+        many documents only gets its share of the workers.
+
+        Args:
+            task_func: The Celery task function to call with (tenant_id, dataset_id, document_ids)
+        """
+        scheduler = self.fair_scheduler(priority=task_func is self.PRIORITY_TASK_FUNC)
+        weight = dify_config.TENANT_FAIR_SCHEDULER_PLAN_WEIGHTS.get(self.features.billing.subscription.plan, 1.0)
+        scheduler.enqueue(
+            self._tenant_id,
+            asdict(
+                DocumentTask(tenant_id=self._tenant_id, dataset_id=self._dataset_id, document_ids=self._document_ids)
+            ),
+            weight=weight,
+            cost=len(self._document_ids),
+        )
+        scheduler.dispatch(lambda task: send_scheduled_document_task(task_func, task))
+        logger.info(
+            "tenant %s queued tasks in fair scheduler %s: %s - %s",
+            self._tenant_id,
+            scheduler.name,
+            self._dataset_id,
+            self._document_ids,
+        )
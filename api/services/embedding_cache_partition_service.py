@@ -0,0 +1,242 @@
+"""Maintenance of the monthly partitions of the embedding cache."""
+
+import logging
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import Connection, delete, insert, select, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from configs import dify_config
+from core.rag.embedding.embedding_cache_store import partition_month
+from extensions.ext_database import db
+from libs.datetime_utils import naive_utc_now
+from models.dataset import Embedding, EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+_TABLE = EmbeddingCache.__tablename__
+_PARTITION_NAME_PATTERN = re.compile(r"p(\d{6})$")
+# Catches rows of months without a partition, see the migration creating the table
+_PG_DEFAULT_PARTITION = f"{_TABLE}_default"
+_MYSQL_MAX_PARTITION = "pmax"
+
+
+def next_month(month: int) -> int:
+    year, month = divmod(month, 100)
+    return (year + 1) * 100 + 1 if month == 12 else year * 100 + month + 1
+
+
+class EmbeddingCachePartitionService:
+    """
+    Creates and drops the monthly partitions of ``embedding_caches``.
+
+    On PostgreSQL the table is range partitioned by ``partition_month`` with one partition table per
+    month (``embedding_caches_p202610``) and a default partition. On MySQL compatible
+    databases it is range partitioned with partitions named ``p202610`` holding the months up to and
+    including 202610, followed by a ``pmax`` partition; a partition is added by splitting the one
+    holding its month.
+    """
+
+    @classmethod
+    def list_partitions(cls) -> list[int]:
+        """The months with a partition, in ascending order."""
+        with db.engine.connect() as conn:
+            return cls._list_partitions(conn)
+
+    @classmethod
+    def ensure_partitions(cls, from_month: int, months_ahead: int) -> list[int]:
+        """Create the missing partitions from ``from_month`` up to ``months_ahead`` months after the current one."""
+        last_month = partition_month(naive_utc_now())
+        for _ in range(months_ahead):
+            last_month = next_month(last_month)
+
+        created = []
+        with db.engine.begin() as conn:
+            existing = set(cls._list_partitions(conn))
+            month = from_month
+            while month <= last_month:
+                if month not in existing:
+                    cls._create_partition(conn, month, sorted(existing))
+                    existing.add(month)
+                    created.append(month)
+                month = next_month(month)
+        if created:
+            logger.info("Created embedding cache partitions %s", created)
+        return created
+
+    @classmethod
+    def expire_partitions(cls, retention_days: int, keep_hit: bool) -> list[int]:
+        """
+        Drop the partitions of the months that ended more than ``retention_days`` ago.
+
+        With ``keep_hit``, the rows hit within the retention period are copied to the current month
+        before their partition is dropped.
+        """
+        now = naive_utc_now()
+        cutoff = now - timedelta(days=retention_days)
+        cutoff_month = partition_month(cutoff)
+        current_month = partition_month(now)
+        cls.ensure_partitions(current_month, 0)
+
+        dropped = []
+        for month in cls.list_partitions():
+            if month >= cutoff_month:
+                continue
+            with db.engine.begin() as conn:
+                if keep_hit:
+                    kept = cls._copy_hit_rows(conn, month, current_month, cutoff)
+                    logger.info("Kept %d embeddings of month %d hit since %s", kept, month, cutoff)
+                cls._drop_partition(conn, month)
+            dropped.append(month)
+
+        if dify_config.DB_TYPE == "postgresql":
+            # Rows of months without a partition of their own are the only ones deleted row by row
+            with db.engine.begin() as conn:
+                conn.execute(
+                    text(f"DELETE FROM {_PG_DEFAULT_PARTITION} WHERE partition_month < :cutoff_month"),
+                    {"cutoff_month": cutoff_month},
+                )
+        if dropped:
+            logger.info("Dropped embedding cache partitions %s", dropped)
+        return dropped
+
+    @classmethod
+    def backfill(cls, retention_days: int, batch_size: int) -> int:
+        """Copy the rows of the legacy ``embeddings`` table cached within the retention period, returning how many."""
+        cutoff = naive_utc_now() - timedelta(days=retention_days)
+        cls.ensure_partitions(partition_month(cutoff), dify_config.EMBEDDING_CACHE_PARTITIONS_AHEAD)
+
+        copied = 0
+        last_id = ""
+        while True:
+            with db.engine.begin() as conn:
+                rows = conn.execute(
+                    select(
+                        Embedding.id,
+                        Embedding.model_name,
+                        Embedding.hash,
+                        Embedding.provider_name,
+                        Embedding.embedding,
+                        Embedding.created_at,
+                    )
+                    .where(Embedding.id > last_id, Embedding.created_at >= cutoff)
+                    .order_by(Embedding.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                values = [
+                    {
+                        "id": row.id,
+                        "model_name": row.model_name,
+                        "hash": row.hash,
+                        "provider_name": row.provider_name,
+                        "partition_month": partition_month(row.created_at),
+                        "embedding": row.embedding,
+                        "created_at": row.created_at,
+                    }
+                    for row in rows
+                ]
+                if dify_config.DB_TYPE == "postgresql":
+                    conn.execute(pg_insert(EmbeddingCache).values(values).on_conflict_do_nothing())
+                else:
+                    conn.execute(mysql_insert(EmbeddingCache).values(values).prefix_with("IGNORE"))
+            copied += len(rows)
+            last_id = rows[-1].id
+            logger.info("Backfilled %d embeddings into the embedding cache", copied)
+        return copied
+
+    @classmethod
+    def clean_legacy(cls, retention_days: int, batch_size: int) -> int:
+        """Delete the rows of the legacy ``embeddings`` table older than the retention period, returning how many."""
+        cutoff = naive_utc_now() - timedelta(days=retention_days)
+        deleted = 0
+        while True:
+            with db.engine.begin() as conn:
+                ids = conn.scalars(select(Embedding.id).where(Embedding.created_at < cutoff).limit(batch_size)).all()
+                if not ids:
+                    break
+                conn.execute(delete(Embedding).where(Embedding.id.in_(ids)))
+            deleted += len(ids)
+        return deleted
+
+    @classmethod
+    def _list_partitions(cls, conn: Connection) -> list[int]:
+        if dify_config.DB_TYPE == "postgresql":
+            names = conn.scalars(
+                text(
+                    "SELECT child.relname FROM pg_inherits"
+                    " JOIN pg_class parent ON pg_inherits.inhparent = parent.oid"
+                    " JOIN pg_class child ON pg_inherits.inhrelid = child.oid"
+                    " WHERE parent.relname = :table"
+                ),
+                {"table": _TABLE},
+            ).all()
+        else:
+            names = conn.scalars(
+                text(
+                    "SELECT partition_name FROM information_schema.partitions"
+                    " WHERE table_schema = DATABASE() AND table_name = :table AND partition_name IS NOT NULL"
+                ),
+                {"table": _TABLE},
+            ).all()
+        months = []
+        for name in names:
+            match = _PARTITION_NAME_PATTERN.search(name)
+            if match:
+                months.append(int(match.group(1)))
+        return sorted(months)
+
+    @classmethod
+    def _create_partition(cls, conn: Connection, month: int, existing: list[int]):
+        if dify_config.DB_TYPE == "postgresql":
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {_TABLE}_p{month} PARTITION OF {_TABLE}"
+                    f" FOR VALUES FROM ({month}) TO ({next_month(month)})"
+                )
+            )
+            return
+
+        # Split the partition currently holding the month, which is cheap as long as it holds no rows of it
+        container = next((f"p{later}" for later in existing if later > month), _MYSQL_MAX_PARTITION)
+        container_bound = "MAXVALUE" if container == _MYSQL_MAX_PARTITION else str(next_month(int(container[1:])))
+        conn.execute(
+            text(
+                f"ALTER TABLE {_TABLE} REORGANIZE PARTITION {container} INTO ("
+                f"PARTITION p{month} VALUES LESS THAN ({next_month(month)}), "
+                f"PARTITION {container} VALUES LESS THAN ({container_bound}))"
+            )
+        )
+
+    @classmethod
+    def _drop_partition(cls, conn: Connection, month: int):
+        if dify_config.DB_TYPE == "postgresql":
+            conn.execute(text(f"DROP TABLE {_TABLE}_p{month}"))
+        else:
+            conn.execute(text(f"ALTER TABLE {_TABLE} DROP PARTITION p{month}"))
+
+    @classmethod
+    def _copy_hit_rows(cls, conn: Connection, month: int, current_month: int, since: datetime) -> int:
+        source = f"{_TABLE}_p{month}" if dify_config.DB_TYPE == "postgresql" else f"{_TABLE} PARTITION (p{month})"
+        select_hit = text(
+            f"SELECT id, model_name, hash, provider_name, {current_month}, embedding, created_at, last_hit_at"
+            f" FROM {source} WHERE last_hit_at >= :since"
+        ).columns()
+        columns = [
+            "id",
+            "model_name",
+            "hash",
+            "provider_name",
+            "partition_month",
+            "embedding",
+            "created_at",
+            "last_hit_at",
+        ]
+        if dify_config.DB_TYPE == "postgresql":
+            stmt = pg_insert(EmbeddingCache).from_select(columns, select_hit).on_conflict_do_nothing()
+        else:
+            stmt = insert(EmbeddingCache).from_select(columns, select_hit).prefix_with("IGNORE")
+        return conn.execute(stmt, {"since": since}).rowcount
@@ -0,0 +1,253 @@
+"""Short-lived cache of the principals authenticated requests are loaded as."""
+
+import json
+import logging
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, TypeVar
+
+import sqlalchemy as sa
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.orm import class_mapper, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from configs import dify_config
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models import Account, Tenant, TenantAccountJoin
+from models.account import TenantAccountRole
+from models.model import EndUser
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_VERSION_KEY_PREFIX = "principal_version:"
+_ENTRY_KEY_PREFIX = "principal:"
+
+_ACCOUNT = "account"
+_END_USER = "end_user"
+_MCP_SERVER = "mcp_server"
+
+# Never written to the cache, accounts are restored without them
+_ACCOUNT_CREDENTIAL_COLUMNS = frozenset({"password", "password_salt"})
+
+
+@dataclass
+class PrincipalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    version: int
+    snapshot: dict[str, Any]
+
+
+class PrincipalCache:
+    """
+    Versioned cache of the accounts and end users requests are authenticated as.
+
+    An account is cached together with its current tenant and role, an end user on its own, and the
+    end user of an MCP server by the server code. Each principal has a version counter in Redis that
+    is read together with the cached snapshot in one round trip; invalidating a principal increments
+    the counter, which makes the snapshot stale in every process at once. Snapshots are kept in a
+    per-process TTL cache and in Redis, and are restored as detached model instances. The password
+    and salt of an account are never cached, so restored accounts don't hold their credentials.
+
+    Only the changes made through the services calling the ``invalidate_*`` methods are seen right
+    away, others (e.g. made directly in the database) are seen once the snapshot expires, which is
+    why the cache is disabled unless ``PRINCIPAL_CACHE_ENABLED`` is set.
+
+    If Redis can't be reached, principals are loaded from the database as if there was no cache.
+    """
+
+    def __init__(self, enabled: bool, local_max_size: int, ttl: int):
+        self._enabled = enabled
+        self._ttl = ttl
+        self._local: TTLCache[str, _Entry] = TTLCache(maxsize=local_max_size, ttl=ttl)
+        self._stats = PrincipalCacheStats()
+        self._lock = threading.Lock()
+
+    def get_account(self, account_id: str, load: Callable[[], Account | None]) -> Account | None:
+        """The account with its current tenant and role, loaded with ``load`` if it isn't cached."""
+        return self._get(_ACCOUNT, account_id, load, self._dump_account, self._restore_account)
+
+    def get_end_user(self, end_user_id: str, load: Callable[[], EndUser | None]) -> EndUser | None:
+        return self._get(_END_USER, end_user_id, load, self._dump_end_user, self._restore_end_user)
+
+    def get_mcp_end_user(self, server_code: str, load: Callable[[], EndUser | None]) -> EndUser | None:
+        """The end user requests to the MCP server with the given code are made as."""
+        return self._get(_MCP_SERVER, server_code, load, self._dump_end_user, self._restore_end_user)
+
+    def invalidate_accounts(self, *account_ids: str):
+        self._invalidate(_ACCOUNT, account_ids)
+
+    def invalidate_tenant(self, tenant_id: str):
+        """Invalidate the accounts of all members of the tenant, e.g. after the tenant itself changed."""
+        if not self._enabled:
+            return
+        account_ids = db.session.scalars(
+            select(TenantAccountJoin.account_id).where(TenantAccountJoin.tenant_id == tenant_id)
+        ).all()
+        self._invalidate(_ACCOUNT, account_ids)
+
+    def invalidate_end_user(self, end_user_id: str):
+        self._invalidate(_END_USER, [end_user_id])
+
+    def invalidate_mcp_server(self, server_code: str):
+        self._invalidate(_MCP_SERVER, [server_code])
+
+    def stats(self) -> PrincipalCacheStats:
+        with self._lock:
+            return PrincipalCacheStats(
+                hits=self._stats.hits, misses=self._stats.misses, invalidations=self._stats.invalidations
+            )
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _get(
+        self,
+        kind: str,
+        key_id: str,
+        load: Callable[[], T | None],
+        dump: Callable[[T], dict[str, Any]],
+        restore: Callable[[Mapping[str, Any]], T],
+    ) -> T | None:
+        if not self._enabled:
+            return load()
+
+        local_key = f"{kind}:{key_id}"
+        try:
+            version_value, entry_value = redis_client.mget(
+                [f"{_VERSION_KEY_PREFIX}{local_key}", f"{_ENTRY_KEY_PREFIX}{local_key}"]
+            )
+            version = int(version_value or 0)
+        except Exception:
+            logger.warning("Failed to read principal cache", exc_info=True)
+            return load()
+
+        with self._lock:
+            entry = self._local.get(local_key)
+        if entry is None or entry.version != version:
+            entry = self._parse_entry(entry_value)
+        if entry is not None and entry.version == version:
+            with self._lock:
+                self._stats.hits += 1
+                self._local[local_key] = entry
+            return restore(entry.snapshot)
+
+        with self._lock:
+            self._stats.misses += 1
+        principal = load()
+        if principal is not None:
+            try:
+                self._set(local_key, _Entry(version=version, snapshot=dump(principal)))
+            except Exception:
+                logger.warning("Failed to store principal cache entry", exc_info=True)
+        return principal
+
+    def _set(self, local_key: str, entry: _Entry):
+        data = json.dumps({"version": entry.version, "snapshot": entry.snapshot}, default=str)
+        with self._lock:
+            self._local[local_key] = entry
+        redis_client.setex(f"{_ENTRY_KEY_PREFIX}{local_key}", self._ttl, data)
+
+    def _invalidate(self, kind: str, key_ids: Iterable[str]):
+        if not self._enabled:
+            return
+        local_keys = [f"{kind}:{key_id}" for key_id in key_ids]
+        if not local_keys:
+            return
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            for local_key in local_keys:
+                version_key = f"{_VERSION_KEY_PREFIX}{local_key}"
+                pipeline.incr(version_key)
+                # Outlive every snapshot cached with an older version, so the counter can't be reset
+                # to the version of a snapshot that is still around
+                pipeline.expire(version_key, self._ttl * 2)
+                pipeline.delete(f"{_ENTRY_KEY_PREFIX}{local_key}")
+            pipeline.execute()
+        except Exception:
+            logger.warning("Failed to invalidate principal cache", exc_info=True)
+        with self._lock:
+            for local_key in local_keys:
+                self._local.pop(local_key, None)
+            self._stats.invalidations += len(local_keys)
+
+    @staticmethod
+    def _parse_entry(value: bytes | str | None) -> _Entry | None:
+        if not value:
+            return None
+        try:
+            return _Entry(**json.loads(value))
+        except (ValueError, TypeError):
+            return None
+
+    @classmethod
+    def _dump_account(cls, account: Account) -> dict[str, Any]:
+        tenant = account.current_tenant
+        return {
+            "account": cls._to_row(account, exclude=_ACCOUNT_CREDENTIAL_COLUMNS),
+            "password_set": account.is_password_set,
+            "tenant": cls._to_row(tenant) if tenant else None,
+            "role": account.role.value if account.role else None,
+        }
+
+    @classmethod
+    def _restore_account(cls, snapshot: Mapping[str, Any]) -> Account:
+        account = cls._to_instance(Account, snapshot["account"])
+        account.set_loaded_password_set(snapshot["password_set"])
+        if snapshot["tenant"]:
+            account.set_loaded_tenant(
+                cls._to_instance(Tenant, snapshot["tenant"]),
+                TenantAccountRole(snapshot["role"]) if snapshot["role"] else None,
+            )
+        return account
+
+    @classmethod
+    def _dump_end_user(cls, end_user: EndUser) -> dict[str, Any]:
+        return cls._to_row(end_user)
+
+    @classmethod
+    def _restore_end_user(cls, snapshot: Mapping[str, Any]) -> EndUser:
+        return cls._to_instance(EndUser, snapshot)
+
+    @staticmethod
+    def _to_row(instance: Any, exclude: frozenset[str] = frozenset()) -> dict[str, Any]:
+        state = sa.inspect(instance)
+        return {
+            column.key: getattr(instance, column.key)
+            for column in state.mapper.column_attrs
+            if column.key not in state.unloaded and column.key not in exclude
+        }
+
+    @staticmethod
+    def _to_instance(model: type[T], row: Mapping[str, Any]) -> T:
+        """A detached instance of the row, as if it had been loaded by a session that has been closed."""
+        mapper = class_mapper(model)
+        instance = mapper.class_manager.new_instance()
+        for column in mapper.column_attrs:
+            if column.key not in row:
+                continue
+            value = row[column.key]
+            if isinstance(value, str) and isinstance(column.expression.type, sa.DateTime):
+                value = datetime.fromisoformat(value)
+            set_committed_value(instance, column.key, value)
+        make_transient_to_detached(instance)
+        return instance
+
+
+principal_cache = PrincipalCache(
+    enabled=dify_config.PRINCIPAL_CACHE_ENABLED,
+    local_max_size=dify_config.PRINCIPAL_CACHE_LOCAL_SIZE,
+    ttl=dify_config.PRINCIPAL_CACHE_TTL,
+)
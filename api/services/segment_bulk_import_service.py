@@ -0,0 +1,239 @@
+"""Chunked import of dataset segments from a CSV file."""
+
+import json
+import logging
+import uuid
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+from redis.exceptions import LockError
+from redis.lock import Lock
+from sqlalchemy import delete, func, insert, select, update
+
+from core.db.session_factory import session_factory
+from core.model_manager import ModelInstance
+from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
+from extensions.ext_redis import redis_client
+from libs import helper
+from libs.datetime_utils import naive_utc_now
+from models.dataset import Dataset, Document, DocumentSegment
+from services.vector_service import VectorService
+
+logger = logging.getLogger(__name__)
+
+_CHECKPOINT_TTL = 24 * 60 * 60
+# Lease on a job held by the run importing it, renewed after every block
+_LEASE_TTL = 10 * 60
+
+
+class SegmentImportInProgressError(Exception):
+    """Raised when another run still holds the lease on the job being imported."""
+
+
+@dataclass
+class SegmentImportCheckpoint:
+    # CSV rows imported and indexed so far
+    rows: int
+    # position of the last imported segment
+    position: int
+    # rows per block of the run that wrote the checkpoint
+    block_size: int
+
+
+class SegmentBulkImporter:
+    """
+    Imports the rows of a CSV file as segments of a document, ``block_size`` rows at a time.
+
+    Each block is token counted in one request, written with a single multi-row INSERT and indexed
+    before the next block is read, so neither memory nor the session grows with the size of the file.
+    Progress is checkpointed in Redis before the first block and after every block. Segment ids are
+    derived from the job id and the row number, so running the same job again skips the imported
+    blocks and cleans up a block that was interrupted between being written and being indexed before
+    redoing it, and rows whose segment already exists are never inserted twice.
+
+    A run holds a lease on the job in Redis, renewed after every block, so a delivery of the job while
+    another run is still importing it, e.g. a redelivery after the broker's visibility timeout, raises
+    ``SegmentImportInProgressError`` instead of discarding the block the live run is writing. A run that
+    lost its lease stops before writing another block.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        tenant_id: str,
+        dataset_id: str,
+        document_id: str,
+        user_id: str,
+        doc_form: str,
+        embedding_model: ModelInstance | None,
+        block_size: int,
+    ):
+        self._job_id = job_id
+        self._tenant_id = tenant_id
+        self._dataset_id = dataset_id
+        self._document_id = document_id
+        self._user_id = user_id
+        self._doc_form = doc_form
+        self._embedding_model = embedding_model
+        self._block_size = block_size
+        self._checkpoint_key = f"segment_batch_import_{job_id}_checkpoint"
+        self._lease_key = f"segment_batch_import_{job_id}_lease"
+
+    def run(self, file_path: str) -> int:
+        """Import the CSV file at ``file_path``, returning the number of rows it contains."""
+        lease = redis_client.lock(self._lease_key, timeout=_LEASE_TTL, blocking=False)
+        if not lease.acquire():
+            raise SegmentImportInProgressError(f"Segment batch import {self._job_id} is already running.")
+        try:
+            return self._import(file_path, lease)
+        finally:
+            try:
+                lease.release()
+            except LockError:
+                logger.warning("Lease on segment batch import %s expired before the import stopped", self._job_id)
+
+    def _import(self, file_path: str, lease: Lock) -> int:
+        checkpoint = self._load_checkpoint()
+        if checkpoint is None:
+            checkpoint = SegmentImportCheckpoint(rows=0, position=self._max_position(), block_size=self._block_size)
+            # Saved before the first block is written, so a run interrupted before its first checkpoint
+            # still discards the block it left behind when redelivered
+            self._save_checkpoint(checkpoint)
+        else:
+            logger.info("Resuming segment batch import %s after %s rows", self._job_id, checkpoint.rows)
+            self._discard_unfinished_block(checkpoint)
+            checkpoint.block_size = self._block_size
+
+        rows = 0
+        for block in pd.read_csv(file_path, chunksize=self._block_size, dtype=str, keep_default_na=False):
+            block_start = rows
+            rows += len(block)
+            if rows <= checkpoint.rows:
+                continue
+            block = block.iloc[checkpoint.rows - block_start :]
+            checkpoint.position = self._import_block(block, checkpoint.rows, checkpoint.position)
+            checkpoint.rows = rows
+            self._save_checkpoint(checkpoint)
+            # Raises once the lease expired, another run may have taken over the job
+            lease.extend(_LEASE_TTL, replace_ttl=True)
+
+        if rows == 0:
+            raise ValueError("The CSV file is empty.")
+        redis_client.delete(self._checkpoint_key)
+        return rows
+
+    def _import_block(self, block: pd.DataFrame, first_row: int, position: int) -> int:
+        segment_ids = [self._segment_ids(first_row + offset) for offset in range(len(block))]
+        with session_factory.create_session() as session:
+            existing_ids = set(
+                session.scalars(
+                    select(DocumentSegment.id).where(
+                        DocumentSegment.id.in_([segment_id for segment_id, _ in segment_ids])
+                    )
+                ).all()
+            )
+        if existing_ids:
+            # Rows a previous delivery of the job already imported, e.g. one redelivered after it completed
+            logger.info("Skipping %s rows already imported by segment batch import %s", len(existing_ids), self._job_id)
+
+        contents: list[str] = block.iloc[:, 0].tolist()
+        answers: list[str] | None = block.iloc[:, 1].tolist() if self._doc_form == "qa_model" else None
+        offsets = [offset for offset, (segment_id, _) in enumerate(segment_ids) if segment_id not in existing_ids]
+        if not offsets:
+            return position + len(block)
+
+        new_contents = [contents[offset] for offset in offsets]
+        if self._embedding_model:
+            tokens_list = self._embedding_model.get_text_embedding_num_tokens(texts=new_contents)
+        else:
+            tokens_list = [0] * len(new_contents)
+
+        now = naive_utc_now()
+        rows = []
+        for offset, content, tokens in zip(offsets, new_contents, tokens_list):
+            segment_id, index_node_id = segment_ids[offset]
+            answer = answers[offset] if answers is not None else None
+            row = {
+                "id": segment_id,
+                "tenant_id": self._tenant_id,
+                "dataset_id": self._dataset_id,
+                "document_id": self._document_id,
+                "index_node_id": index_node_id,
+                "index_node_hash": helper.generate_text_hash(content),
+                "position": position + offset + 1,
+                "content": content,
+                "answer": answer,
+                "word_count": len(content) + len(answer or ""),
+                "tokens": tokens,
+                "created_by": self._user_id,
+                "indexing_at": now,
+                "status": "completed",
+                "completed_at": now,
+            }
+            rows.append(row)
+
+        word_count = sum(row["word_count"] for row in rows)
+        with session_factory.create_session() as session, session.begin():
+            session.execute(insert(DocumentSegment), rows)
+            session.execute(
+                update(Document)
+                .where(Document.id == self._document_id)
+                .values(word_count=func.coalesce(Document.word_count, 0) + word_count)
+            )
+
+        with session_factory.create_session() as session:
+            dataset = session.get(Dataset, self._dataset_id)
+            if dataset:
+                segments = [DocumentSegment(**row) for row in rows]
+                VectorService.create_segments_vector(None, segments, dataset, self._doc_form)
+        return position + len(block)
+
+    def _discard_unfinished_block(self, checkpoint: SegmentImportCheckpoint):
+        """Remove the segments a crashed run wrote after its last checkpoint, they may not be indexed."""
+        segment_ids = [
+            self._segment_ids(row)[0] for row in range(checkpoint.rows, checkpoint.rows + checkpoint.block_size)
+        ]
+        with session_factory.create_session() as session, session.begin():
+            segments = session.execute(
+                select(DocumentSegment.index_node_id, DocumentSegment.word_count).where(
+                    DocumentSegment.id.in_(segment_ids)
+                )
+            ).all()
+            if not segments:
+                return
+
+            dataset = session.get(Dataset, self._dataset_id)
+            if dataset:
+                index_processor = IndexProcessorFactory(self._doc_form).init_index_processor()
+                index_processor.clean(
+                    dataset,
+                    [segment.index_node_id for segment in segments],
+                    with_keywords=True,
+                    delete_child_chunks=True,
+                )
+            session.execute(delete(DocumentSegment).where(DocumentSegment.id.in_(segment_ids)))
+            session.execute(
+                update(Document)
+                .where(Document.id == self._document_id)
+                .values(word_count=Document.word_count - sum(segment.word_count for segment in segments))
+            )
+
+    def _max_position(self) -> int:
+        with session_factory.create_session() as session:
+            max_position = session.scalar(
+                select(func.max(DocumentSegment.position)).where(DocumentSegment.document_id == self._document_id)
+            )
+        return max_position or 0
+
+    def _segment_ids(self, row: int) -> tuple[str, str]:
+        name = f"segment_batch_import:{self._job_id}:{row}"
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, name)), str(uuid.uuid5(uuid.NAMESPACE_URL, f"{name}:index_node"))
+
+    def _load_checkpoint(self) -> SegmentImportCheckpoint | None:
+        data = redis_client.get(self._checkpoint_key)
+        if not data:
+            return None
+        return SegmentImportCheckpoint(**json.loads(data))
+
+    def _save_checkpoint(self, checkpoint: SegmentImportCheckpoint):
+        redis_client.setex(self._checkpoint_key, _CHECKPOINT_TTL, json.dumps(asdict(checkpoint)))
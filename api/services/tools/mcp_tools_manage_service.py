@@ -19,6 +19,7 @@ from core.mcp.auth.auth_flow import auth
 from core.mcp.auth_client import MCPClientWithAuthRetry
 from core.mcp.error import MCPAuthError, MCPError
 from core.tools.entities.api_entities import ToolProviderApiEntity
+from core.tools.mcp_tool.credential_cache import mcp_provider_credential_cache
 from core.tools.utils.encryption import ProviderConfigEncrypter
 from models.tools import MCPToolProvider
 from services.tools.tools_transform_service import ToolTransformService
@@ -259,10 +260,13 @@ class MCPToolManageService:
         except IntegrityError as e:
             self._handle_integrity_error(e, name, server_url, server_identifier)
 
+        mcp_provider_credential_cache.invalidate(tenant_id)
+
     def delete_provider(self, *, tenant_id: str, provider_id: str) -> None:
         """Delete an MCP provider."""
         mcp_tool = self.get_provider(provider_id=provider_id, tenant_id=tenant_id)
         self._session.delete(mcp_tool)
+        mcp_provider_credential_cache.invalidate(tenant_id)
 
     def list_providers(
         self, *, tenant_id: str, for_list: bool = False, include_sensitive: bool = True
@@ -373,6 +377,7 @@ class MCPToolManageService:
 
         # Flush changes to database
         self._session.flush()
+        mcp_provider_credential_cache.invalidate(tenant_id)
 
     def save_oauth_data(
         self, provider_id: str, tenant_id: str, data: dict[str, Any], data_type: OAuthDataType = OAuthDataType.MIXED
@@ -409,6 +414,7 @@ class MCPToolManageService:
         provider.encrypted_credentials = EMPTY_CREDENTIALS_JSON
         provider.updated_at = datetime.now()
         provider.authed = False
+        mcp_provider_credential_cache.invalidate(tenant_id)
 
     # ========== Private Helper Methods ==========
 
@@ -0,0 +1,197 @@
+"""Buffered ingestion of webhook calls through a Redis stream."""
+
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Any
+
+from redis.exceptions import ResponseError
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from core.app.entities.app_invoke_entities import InvokeFrom
+from enums.quota_type import QuotaType
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.trigger import WorkflowWebhookTrigger
+from models.workflow import Workflow
+from services.async_workflow_service import AsyncWorkflowService
+from services.end_user_service import EndUserService
+from services.errors.app import QuotaExceededError
+from services.trigger.app_trigger_service import AppTriggerService
+from services.workflow.entities import WebhookTriggerData
+
+logger = logging.getLogger(__name__)
+
+_STREAM_KEY = "webhook_ingestion"
+_CONSUMER_GROUP = "webhook_ingestion_dispatchers"
+_DISPATCH_SCHEDULED_KEY = "webhook_ingestion:dispatch_scheduled"
+_RATE_KEY_PREFIX = "webhook_ingestion_rate:"
+# Entries read by a dispatcher that didn't acknowledge them within this time are taken over by the next one
+_CLAIM_MIN_IDLE_MS = 60 * 1000
+
+_Entry = tuple[bytes, WebhookTriggerData]
+
+
+class WebhookIngestionService:
+    """
+    Buffers validated webhook calls in a Redis stream and dispatches their workflow runs in batches.
+
+    Handling a webhook call only appends its trigger data to the stream, the first call after a
+    dispatch schedules the next one. A dispatch reads up to ``WEBHOOK_INGESTION_BATCH_SIZE`` entries
+    through a consumer group, resolves the end user of every app once per batch and dispatches the
+    runs of each app up to ``WEBHOOK_INGESTION_APP_RATE_LIMIT`` runs per second; the entries over the
+    limit are appended to the stream again for a later dispatch. Entries of a dispatcher that died
+    or failed before acknowledging them are claimed by the next one, which a failed dispatch
+    schedules before raising.
+    """
+
+    @classmethod
+    def enqueue(cls, webhook_trigger: WorkflowWebhookTrigger, workflow: Workflow, workflow_inputs: dict[str, Any]):
+        trigger_data = WebhookTriggerData(
+            app_id=webhook_trigger.app_id,
+            workflow_id=workflow.id,
+            root_node_id=webhook_trigger.node_id,
+            inputs=workflow_inputs,
+            tenant_id=webhook_trigger.tenant_id,
+        )
+        redis_client.xadd(
+            _STREAM_KEY,
+            {"trigger_data": trigger_data.model_dump_json()},
+            maxlen=dify_config.WEBHOOK_INGESTION_STREAM_MAX_LEN,
+            approximate=True,
+        )
+        cls._schedule_dispatch()
+
+    @classmethod
+    def dispatch(cls) -> int:
+        """Dispatch the workflow runs of one batch of buffered webhook calls, returning how many were dispatched."""
+        # Calls buffered from now on need another dispatch
+        redis_client.delete(_DISPATCH_SCHEDULED_KEY)
+        try:
+            return cls._dispatch_batch()
+        except Exception:
+            # The entries read stay pending, keep dispatching so they are claimed even if no call comes in
+            cls._schedule_dispatch()
+            raise
+
+    @classmethod
+    def _dispatch_batch(cls) -> int:
+        entries = cls._read_batch(dify_config.WEBHOOK_INGESTION_BATCH_SIZE)
+        if not entries:
+            return 0
+
+        entries_by_app: dict[str, list[_Entry]] = defaultdict(list)
+        for entry in entries:
+            entries_by_app[entry[1].app_id].append(entry)
+
+        dispatched = 0
+        dropped = 0
+        deferred: list[_Entry] = []
+        with Session(db.engine) as session:
+            for app_id, app_entries in entries_by_app.items():
+                allowed = cls._acquire_rate(app_id, len(app_entries))
+                deferred.extend(app_entries[allowed:])
+                app_dispatched, app_dropped = cls._dispatch_app_entries(session, app_entries[:allowed])
+                dispatched += app_dispatched
+                dropped += app_dropped
+
+        pipeline = redis_client.pipeline(transaction=False)
+        for _, trigger_data in deferred:
+            pipeline.xadd(_STREAM_KEY, {"trigger_data": trigger_data.model_dump_json()})
+        entry_ids = [entry_id for entry_id, _ in entries]
+        pipeline.xack(_STREAM_KEY, _CONSUMER_GROUP, *entry_ids)
+        pipeline.xdel(_STREAM_KEY, *entry_ids)
+        pipeline.execute()
+
+        if deferred or redis_client.xlen(_STREAM_KEY):
+            cls._schedule_dispatch()
+        logger.info(
+            "Dispatched %d buffered webhook calls, deferred %d, dropped %d over quota",
+            dispatched,
+            len(deferred),
+            dropped,
+        )
+        return dispatched
+
+    @classmethod
+    def _schedule_dispatch(cls):
+        from tasks.webhook_ingestion_tasks import dispatch_buffered_webhooks
+
+        interval = dify_config.WEBHOOK_INGESTION_FLUSH_INTERVAL
+        # The flag expires in case the scheduled dispatch is lost
+        if redis_client.set(_DISPATCH_SCHEDULED_KEY, 1, nx=True, ex=interval + 60):
+            dispatch_buffered_webhooks.apply_async(countdown=interval)
+
+    @classmethod
+    def _read_batch(cls, batch_size: int) -> list[_Entry]:
+        try:
+            redis_client.xgroup_create(_STREAM_KEY, _CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+        consumer = uuid.uuid4().hex
+        _, raw_entries, *_ = redis_client.xautoclaim(
+            _STREAM_KEY, _CONSUMER_GROUP, consumer, min_idle_time=_CLAIM_MIN_IDLE_MS, count=batch_size
+        )
+        raw_entries = list(raw_entries)
+        if len(raw_entries) < batch_size:
+            for _, stream_entries in redis_client.xreadgroup(
+                _CONSUMER_GROUP, consumer, {_STREAM_KEY: ">"}, count=batch_size - len(raw_entries)
+            ):
+                raw_entries.extend(stream_entries)
+
+        entries: list[_Entry] = []
+        for entry_id, fields in raw_entries:
+            # Entries deleted while they were pending are claimed without fields
+            if not fields:
+                continue
+            entries.append((entry_id, WebhookTriggerData.model_validate_json(fields[b"trigger_data"])))
+        return entries
+
+    @classmethod
+    def _acquire_rate(cls, app_id: str, requested: int) -> int:
+        """How many of the ``requested`` runs of the app may be dispatched in the current second."""
+        limit = dify_config.WEBHOOK_INGESTION_APP_RATE_LIMIT
+        if limit <= 0:
+            return requested
+        key = f"{_RATE_KEY_PREFIX}{app_id}:{int(time.time())}"
+        used = redis_client.incrby(key, requested)
+        redis_client.expire(key, 2)
+        return max(0, min(requested, limit - (used - requested)))
+
+    @classmethod
+    def _dispatch_app_entries(cls, session: Session, entries: list[_Entry]) -> tuple[int, int]:
+        """Dispatch the runs of one app, returning how many were dispatched and how many were dropped over quota."""
+        if not entries:
+            return 0, 0
+        first = entries[0][1]
+        end_user = EndUserService.get_or_create_end_user_by_type(
+            type=InvokeFrom.TRIGGER,
+            tenant_id=first.tenant_id,
+            app_id=first.app_id,
+            user_id=None,
+        )
+
+        dispatched = 0
+        for index, (entry_id, trigger_data) in enumerate(entries):
+            try:
+                QuotaType.TRIGGER.consume(trigger_data.tenant_id)
+            except QuotaExceededError:
+                AppTriggerService.mark_tenant_triggers_rate_limited(trigger_data.tenant_id)
+                logger.warning(
+                    "Tenant %s rate limited, dropping %d buffered webhook calls of app %s",
+                    trigger_data.tenant_id,
+                    len(entries) - index,
+                    trigger_data.app_id,
+                )
+                return dispatched, len(entries) - index
+
+            try:
+                AsyncWorkflowService.trigger_workflow_async(session, end_user, trigger_data)
+                dispatched += 1
+            except Exception:
+                logger.exception("Failed to trigger workflow for buffered webhook call %s", entry_id)
+        return dispatched, 0
@@ -0,0 +1,226 @@
+"""Cache of the trigger, workflow and node configuration incoming webhooks are routed to."""
+
+import json
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, TypeVar
+
+import sqlalchemy as sa
+from cachetools import TTLCache
+from sqlalchemy.orm import class_mapper, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from configs import dify_config
+from extensions.ext_redis import redis_client
+from models.trigger import WorkflowWebhookTrigger
+from models.workflow import Workflow
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_APP_VERSION_KEY_PREFIX = "webhook_routing_version:app:"
+_TENANT_VERSION_KEY_PREFIX = "webhook_routing_version:tenant:"
+_ENTRY_KEY_PREFIX = "webhook_routing:"
+
+# The graph and the other large columns are left out, a route only needs to identify its workflow
+_WORKFLOW_COLUMNS = ("id", "tenant_id", "app_id", "type", "version", "created_by", "created_at")
+
+WebhookRoute = tuple[WorkflowWebhookTrigger, Workflow, Mapping[str, Any]]
+
+
+@dataclass
+class WebhookRoutingCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    app_version: int
+    tenant_version: int
+    trigger: dict[str, Any]
+    workflow: dict[str, Any]
+    node_config: dict[str, Any]
+
+
+class WebhookRoutingCache:
+    """
+    Versioned routing table of the published webhooks, keyed by webhook id.
+
+    Every route records the version of its app and tenant at the time it was cached. Syncing the
+    webhooks of an app, publishing it or changing the status of one of its triggers increments the
+    app version, rate limiting the triggers of a tenant increments the tenant version, which makes
+    the affected routes stale in every process at once. Routes are kept in a per-process TTL cache
+    and in Redis, so routing a webhook usually costs a single Redis round trip for the versions.
+
+    Versions are always read before a route is loaded, so a route can't be cached with a version
+    that is newer than its content. If Redis can't be reached, routes are loaded as if there was no
+    cache.
+    """
+
+    def __init__(self, enabled: bool, local_max_size: int, ttl: int):
+        self._enabled = enabled
+        self._ttl = ttl
+        self._local: TTLCache[str, _Entry] = TTLCache(maxsize=local_max_size, ttl=ttl)
+        self._stats = WebhookRoutingCacheStats()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        webhook_id: str,
+        load_trigger: Callable[[], WorkflowWebhookTrigger],
+        load_route: Callable[[WorkflowWebhookTrigger], tuple[Workflow, Mapping[str, Any]]],
+    ) -> WebhookRoute:
+        """
+        The route of the webhook, loaded with ``load_trigger`` and ``load_route`` if it isn't cached.
+
+        Errors raised by the loaders, e.g. for a disabled trigger, are passed on and nothing is cached.
+        """
+        if not self._enabled:
+            webhook_trigger = load_trigger()
+            return webhook_trigger, *load_route(webhook_trigger)
+
+        try:
+            entry = self._get_entry(webhook_id)
+            versions = self._versions(entry.trigger["app_id"], entry.trigger["tenant_id"]) if entry else None
+        except Exception:
+            logger.warning("Failed to read webhook routing cache", exc_info=True)
+            webhook_trigger = load_trigger()
+            return webhook_trigger, *load_route(webhook_trigger)
+
+        if entry is not None and versions == (entry.app_version, entry.tenant_version):
+            with self._lock:
+                self._stats.hits += 1
+            return (
+                self._to_instance(WorkflowWebhookTrigger, entry.trigger),
+                self._to_instance(Workflow, entry.workflow),
+                entry.node_config,
+            )
+
+        with self._lock:
+            self._stats.misses += 1
+        webhook_trigger = load_trigger()
+        try:
+            if versions is None or entry is None or entry.trigger["app_id"] != webhook_trigger.app_id:
+                versions = self._versions(webhook_trigger.app_id, webhook_trigger.tenant_id)
+        except Exception:
+            logger.warning("Failed to read webhook routing cache versions", exc_info=True)
+            return webhook_trigger, *load_route(webhook_trigger)
+
+        workflow, node_config = load_route(webhook_trigger)
+        try:
+            self._set(
+                webhook_id,
+                _Entry(
+                    app_version=versions[0],
+                    tenant_version=versions[1],
+                    trigger=self._to_row(webhook_trigger),
+                    workflow={column: getattr(workflow, column) for column in _WORKFLOW_COLUMNS},
+                    node_config=dict(node_config),
+                ),
+            )
+        except Exception:
+            logger.warning("Failed to store webhook routing cache entry", exc_info=True)
+        return webhook_trigger, workflow, node_config
+
+    def invalidate_app(self, app_id: str):
+        """Make the routes of all webhooks of the app stale, in this and every other process."""
+        self._invalidate(f"{_APP_VERSION_KEY_PREFIX}{app_id}")
+
+    def invalidate_tenant(self, tenant_id: str):
+        """Make the routes of all webhooks of the tenant stale, in this and every other process."""
+        self._invalidate(f"{_TENANT_VERSION_KEY_PREFIX}{tenant_id}")
+
+    def stats(self) -> WebhookRoutingCacheStats:
+        with self._lock:
+            return WebhookRoutingCacheStats(
+                hits=self._stats.hits, misses=self._stats.misses, invalidations=self._stats.invalidations
+            )
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _versions(self, app_id: str, tenant_id: str) -> tuple[int, int]:
+        app_version, tenant_version = redis_client.mget(
+            [f"{_APP_VERSION_KEY_PREFIX}{app_id}", f"{_TENANT_VERSION_KEY_PREFIX}{tenant_id}"]
+        )
+        return int(app_version or 0), int(tenant_version or 0)
+
+    def _get_entry(self, webhook_id: str) -> _Entry | None:
+        with self._lock:
+            entry = self._local.get(webhook_id)
+        if entry is not None:
+            return entry
+
+        value = redis_client.get(f"{_ENTRY_KEY_PREFIX}{webhook_id}")
+        if not value:
+            return None
+        try:
+            entry = _Entry(**json.loads(value))
+        except (ValueError, TypeError):
+            return None
+        with self._lock:
+            self._local[webhook_id] = entry
+        return entry
+
+    def _set(self, webhook_id: str, entry: _Entry):
+        data = json.dumps(
+            {
+                "app_version": entry.app_version,
+                "tenant_version": entry.tenant_version,
+                "trigger": entry.trigger,
+                "workflow": entry.workflow,
+                "node_config": entry.node_config,
+            },
+            default=str,
+        )
+        with self._lock:
+            self._local[webhook_id] = entry
+        redis_client.setex(f"{_ENTRY_KEY_PREFIX}{webhook_id}", self._ttl, data)
+
+    def _invalidate(self, version_key: str):
+        if not self._enabled:
+            return
+        try:
+            redis_client.incr(version_key)
+        except Exception:
+            logger.warning("Failed to invalidate webhook routing cache with %s", version_key, exc_info=True)
+        with self._lock:
+            self._stats.invalidations += 1
+
+    @staticmethod
+    def _to_row(instance: Any) -> dict[str, Any]:
+        state = sa.inspect(instance)
+        return {
+            column.key: getattr(instance, column.key)
+            for column in state.mapper.column_attrs
+            if column.key not in state.unloaded
+        }
+
+    @staticmethod
+    def _to_instance(model: type[T], row: Mapping[str, Any]) -> T:
+        """A detached instance of the row, as if it had been loaded by a session that has been closed."""
+        mapper = class_mapper(model)
+        instance = mapper.class_manager.new_instance()
+        for column in mapper.column_attrs:
+            if column.key not in row:
+                continue
+            value = row[column.key]
+            if isinstance(value, str) and isinstance(column.expression.type, sa.DateTime):
+                value = datetime.fromisoformat(value)
+            set_committed_value(instance, column.key, value)
+        make_transient_to_detached(instance)
+        return instance
+
+
+webhook_routing_cache = WebhookRoutingCache(
+    enabled=dify_config.WEBHOOK_ROUTING_CACHE_ENABLED,
+    local_max_size=dify_config.WEBHOOK_ROUTING_CACHE_LOCAL_SIZE,
+    ttl=dify_config.WEBHOOK_ROUTING_CACHE_TTL,
+)
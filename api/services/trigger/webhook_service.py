@@ -31,6 +31,7 @@ from services.async_workflow_service import AsyncWorkflowService
 from services.end_user_service import EndUserService
 from services.errors.app import QuotaExceededError
 from services.trigger.app_trigger_service import AppTriggerService
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 from services.workflow.entities import WebhookTriggerData
 
 try:
@@ -67,71 +68,88 @@ class WebhookService:
         Returns:
             A tuple containing:
                 - WorkflowWebhookTrigger: The webhook trigger object
-                - Workflow: The associated workflow object
+                - Workflow: The associated workflow object, only its identifying columns are loaded when the
+                  published route comes from the routing cache
                 - Mapping[str, Any]: The node configuration data
 
         Raises:
             ValueError: If webhook not found, app trigger not found, trigger disabled, or workflow not found
         """
         with Session(db.engine) as session:
-            # Get webhook trigger
-            webhook_trigger = (
-                session.query(WorkflowWebhookTrigger).where(WorkflowWebhookTrigger.webhook_id == webhook_id).first()
+            if is_debug:
+                webhook_trigger = cls._load_webhook_trigger(session, webhook_id)
+                return webhook_trigger, *cls._load_webhook_route(session, webhook_trigger, is_debug=True)
+
+            # Published routes only change when the app is synced, published or its triggers change status
+            return webhook_routing_cache.get(
+                webhook_id,
+                load_trigger=lambda: cls._load_webhook_trigger(session, webhook_id),
+                load_route=lambda webhook_trigger: cls._load_webhook_route(session, webhook_trigger, is_debug=False),
             )
-            if not webhook_trigger:
-                raise ValueError(f"Webhook not found: {webhook_id}")
 
-            if is_debug:
-                workflow = (
-                    session.query(Workflow)
-                    .filter(
-                        Workflow.app_id == webhook_trigger.app_id,
-                        Workflow.version == Workflow.VERSION_DRAFT,
-                    )
-                    .order_by(Workflow.created_at.desc())
-                    .first()
+    @classmethod
+    def _load_webhook_trigger(cls, session: Session, webhook_id: str) -> WorkflowWebhookTrigger:
+        webhook_trigger = (
+            session.query(WorkflowWebhookTrigger).where(WorkflowWebhookTrigger.webhook_id == webhook_id).first()
+        )
+        if not webhook_trigger:
+            raise ValueError(f"Webhook not found: {webhook_id}")
+        return webhook_trigger
+
+    @classmethod
+    def _load_webhook_route(
+        cls, session: Session, webhook_trigger: WorkflowWebhookTrigger, is_debug: bool
+    ) -> tuple[Workflow, Mapping[str, Any]]:
+        webhook_id = webhook_trigger.webhook_id
+        if is_debug:
+            workflow = (
+                session.query(Workflow)
+                .filter(
+                    Workflow.app_id == webhook_trigger.app_id,
+                    Workflow.version == Workflow.VERSION_DRAFT,
                 )
-            else:
-                # Check if the corresponding AppTrigger exists
-                app_trigger = (
-                    session.query(AppTrigger)
-                    .filter(
-                        AppTrigger.app_id == webhook_trigger.app_id,
-                        AppTrigger.node_id == webhook_trigger.node_id,
-                        AppTrigger.trigger_type == AppTriggerType.TRIGGER_WEBHOOK,
-                    )
-                    .first()
+                .order_by(Workflow.created_at.desc())
+                .first()
+            )
+        else:
+            # Check if the corresponding AppTrigger exists
+            app_trigger = (
+                session.query(AppTrigger)
+                .filter(
+                    AppTrigger.app_id == webhook_trigger.app_id,
+                    AppTrigger.node_id == webhook_trigger.node_id,
+                    AppTrigger.trigger_type == AppTriggerType.TRIGGER_WEBHOOK,
                 )
+                .first()
+            )
 
-                if not app_trigger:
-                    raise ValueError(f"App trigger not found for webhook {webhook_id}")
+            if not app_trigger:
+                raise ValueError(f"App trigger not found for webhook {webhook_id}")
 
-                # Only check enabled status if not in debug mode
+            # Only check enabled status if not in debug mode
 
-                if app_trigger.status == AppTriggerStatus.RATE_LIMITED:
-                    raise ValueError(
-                        f"Webhook trigger is rate limited for webhook {webhook_id}, please upgrade your plan."
-                    )
+            if app_trigger.status == AppTriggerStatus.RATE_LIMITED:
+                raise ValueError(f"Webhook trigger is rate limited for webhook {webhook_id}, please upgrade your plan.")
 
-                if app_trigger.status != AppTriggerStatus.ENABLED:
-                    raise ValueError(f"Webhook trigger is disabled for webhook {webhook_id}")
+            if app_trigger.status != AppTriggerStatus.ENABLED:
+                raise ValueError(f"Webhook trigger is disabled for webhook {webhook_id}")
 
-                # Get workflow
-                workflow = (
-                    session.query(Workflow)
-                    .filter(
-                        Workflow.app_id == webhook_trigger.app_id,
-                        Workflow.version != Workflow.VERSION_DRAFT,
-                    )
-                    .order_by(Workflow.created_at.desc())
-                    .first()
+            # Get workflow
+            workflow = (
+                session.query(Workflow)
+                .filter(
+                    Workflow.app_id == webhook_trigger.app_id,
+                    Workflow.version != Workflow.VERSION_DRAFT,
                 )
-            if not workflow:
-                raise ValueError(f"Workflow not found for app {webhook_trigger.app_id}")
+                .order_by(Workflow.created_at.desc())
+                .first()
+            )
+        if not workflow:
+            raise ValueError(f"Workflow not found for app {webhook_trigger.app_id}")
 
-            node_config = workflow.get_node_config_by_id(webhook_trigger.node_id)
+        node_config = workflow.get_node_config_by_id(webhook_trigger.node_id)
 
-            return webhook_trigger, workflow, node_config
+        return workflow, node_config
 
     @classmethod
     def extract_and_validate_webhook_data(
@@ -906,11 +924,14 @@ class WebhookService:
                 session.commit()
 
                 # delete the nodes not found in the graph
-                for node_id in nodes_id_in_db:
-                    if node_id not in nodes_id_in_graph:
-                        session.delete(nodes_id_in_db[node_id])
-                        redis_client.delete(f"{cls.__WEBHOOK_NODE_CACHE_KEY__}:{app.id}:{node_id}")
+                nodes_deleted = [node_id for node_id in nodes_id_in_db if node_id not in nodes_id_in_graph]
+                for node_id in nodes_deleted:
+                    session.delete(nodes_id_in_db[node_id])
+                    redis_client.delete(f"{cls.__WEBHOOK_NODE_CACHE_KEY__}:{app.id}:{node_id}")
                 session.commit()
+
+            if nodes_not_found or nodes_deleted:
+                webhook_routing_cache.invalidate_app(app.id)
         except Exception:
             logger.exception("Failed to sync webhook relationships for app %s", app.id)
             raise
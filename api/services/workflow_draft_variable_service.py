@@ -1,6 +1,8 @@
 import dataclasses
 import json
 import logging
+import threading
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
 from concurrent.futures import ThreadPoolExecutor
 from enum import StrEnum
@@ -67,6 +69,55 @@ class UpdateNotSupportedError(WorkflowDraftVariableError):
     pass
 
 
+class OffloadedPayloadCache:
+    """Process-local, size-bounded LRU cache for offloaded draft variable payloads.
+
+    Offloaded payloads are written once under a freshly generated storage key and are
+    never modified in place, so the storage key alone identifies the content. This lets
+    repeated single-step debug runs reuse large upstream values without going back to
+    the object storage.
+    """
+
+    def __init__(self, max_size_bytes: int):
+        self._max_size_bytes = max_size_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: bytes):
+        # Payloads larger than the whole cache would only evict everything else.
+        if len(content) > self._max_size_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= len(previous)
+            self._entries[key] = content
+            self._size_bytes += len(content)
+            while self._size_bytes > self._max_size_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+
+offloaded_payload_cache = OffloadedPayloadCache(dify_config.WORKFLOW_DRAFT_VARIABLE_PAYLOAD_CACHE_SIZE)
+
+
 class DraftVarLoader(VariableLoader):
     # This implements the VariableLoader interface for loading draft variables.
     #
@@ -136,8 +187,12 @@ class DraftVarLoader(VariableLoader):
             selector_tuple = self._selector_to_tuple(variable.selector)
             variable_by_selector[selector_tuple] = variable
 
+        if not offloaded_draft_vars:
+            return list(variable_by_selector.values())
+
         # Load offloaded variables using multithreading.
         # This approach reduces loading time by querying external systems concurrently.
+        # Payloads already present in `offloaded_payload_cache` are served from memory.
         with ThreadPoolExecutor(max_workers=10) as executor:
             offloaded_variables = executor.map(self._load_offloaded_variable, offloaded_draft_vars)
             for selector, variable in offloaded_variables:
@@ -155,7 +210,7 @@ class DraftVarLoader(VariableLoader):
         assert variable_file is not None
         upload_file = variable_file.upload_file
         assert upload_file is not None
-        content = storage.load(upload_file.key)
+        content = self._load_offloaded_content(upload_file.key)
         if variable_file.value_type == SegmentType.STRING:
             # The inferenced type is StringSegment, which is not correct inside this function.
             segment: Segment = StringSegment(value=content.decode())
@@ -181,6 +236,15 @@ class DraftVarLoader(VariableLoader):
         # No special handling needed for  ArrayFileSegment, as we do not offload ArrayFileSegment
         return (draft_var.node_id, draft_var.name), variable
 
+    @staticmethod
+    def _load_offloaded_content(key: str) -> bytes:
+        content = offloaded_payload_cache.get(key)
+        if content is not None:
+            return content
+        content = storage.load(key)
+        offloaded_payload_cache.put(key, content)
+        return content
+
 
 class WorkflowDraftVariableService:
     _session: Session
@@ -223,6 +287,7 @@ class WorkflowDraftVariableService:
 
         The returned WorkflowDraftVariable objects are guaranteed to have their
         associated variable_file and variable_file.upload_file relationships preloaded.
+        Both relationships are resolved with outer joins, so the whole lookup is a single query.
         """
         ors = []
         for selector in selectors:
@@ -240,9 +305,7 @@ class WorkflowDraftVariableService:
         variables = (
             self._session.query(WorkflowDraftVariable)
             .options(
-                orm.selectinload(WorkflowDraftVariable.variable_file).selectinload(
-                    WorkflowDraftVariableFile.upload_file
-                )
+                orm.joinedload(WorkflowDraftVariable.variable_file).joinedload(WorkflowDraftVariableFile.upload_file)
             )
             .where(WorkflowDraftVariable.app_id == app_id, or_(*ors))
             .all()
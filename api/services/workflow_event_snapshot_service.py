@@ -173,8 +173,7 @@ def _load_resumption_context(pause_entity: WorkflowPauseEntity | None) -> Workfl
     if pause_entity is None:
         return None
     try:
-        raw_state = pause_entity.get_state().decode()
-        return WorkflowResumptionContext.loads(raw_state)
+        return WorkflowResumptionContext.loads(pause_entity.get_state())
     except Exception:
         logger.exception("Failed to load resumption context")
         return None
@@ -5,6 +5,7 @@ from sqlalchemy import Engine
 from sqlalchemy.orm import sessionmaker
 
 import contexts
+from core.db.session_factory import get_read_only_session_maker
 from extensions.ext_database import db
 from libs.infinite_scroll_pagination import InfiniteScrollPagination
 from models import (
@@ -22,19 +23,29 @@ from repositories.factory import DifyAPIRepositoryFactory
 class WorkflowRunService:
     _session_factory: sessionmaker
     _workflow_run_repo: APIWorkflowRunRepository
+    _read_only_workflow_run_repo: APIWorkflowRunRepository
 
     def __init__(self, session_factory: Engine | sessionmaker | None = None):
         """Initialize WorkflowRunService with repository dependencies."""
         if session_factory is None:
             session_factory = sessionmaker(bind=db.engine, expire_on_commit=False)
-        elif isinstance(session_factory, Engine):
-            session_factory = sessionmaker(bind=session_factory, expire_on_commit=False)
+            # Run lists and counts tolerate replication lag, unlike the detail of a run that has just finished
+            read_only_session_factory = get_read_only_session_maker()
+        else:
+            if isinstance(session_factory, Engine):
+                session_factory = sessionmaker(bind=session_factory, expire_on_commit=False)
+            read_only_session_factory = session_factory
 
         self._session_factory = session_factory
         self._node_execution_service_repo = DifyAPIRepositoryFactory.create_api_workflow_node_execution_repository(
             self._session_factory
         )
         self._workflow_run_repo = DifyAPIRepositoryFactory.create_api_workflow_run_repository(self._session_factory)
+        self._read_only_workflow_run_repo = (
+            DifyAPIRepositoryFactory.create_api_workflow_run_repository(read_only_session_factory)
+            if read_only_session_factory is not session_factory
+            else self._workflow_run_repo
+        )
 
     def get_paginate_advanced_chat_workflow_runs(
         self, app_model: App, args: dict, triggered_from: WorkflowRunTriggeredFrom = WorkflowRunTriggeredFrom.DEBUGGING
@@ -86,7 +97,7 @@ class WorkflowRunService:
         last_id = args.get("last_id")
         status = args.get("status")
 
-        return self._workflow_run_repo.get_paginated_workflow_runs(
+        return self._read_only_workflow_run_repo.get_paginated_workflow_runs(
             tenant_id=app_model.tenant_id,
             app_id=app_model.id,
             triggered_from=triggered_from,
@@ -124,7 +135,7 @@ class WorkflowRunService:
         :param triggered_from: workflow run triggered from (default: DEBUGGING)
         :return: dict with total and status counts
         """
-        return self._workflow_run_repo.get_workflow_runs_count(
+        return self._read_only_workflow_run_repo.get_workflow_runs_count(
             tenant_id=app_model.tenant_id,
             app_id=app_model.id,
             triggered_from=triggered_from,
@@ -13,6 +13,7 @@ from core.app.app_config.entities import VariableEntityType
 from core.app.apps.advanced_chat.app_config_manager import AdvancedChatAppConfigManager
 from core.app.apps.workflow.app_config_manager import WorkflowAppConfigManager
 from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.workflow.compiled_workflow import compiled_workflow_cache
 from core.file import File
 from core.repositories import DifyCoreRepositoryFactory
 from core.repositories.human_input_repository import HumanInputFormRepositoryImpl
@@ -336,6 +337,10 @@ class WorkflowService:
         # trigger app workflow events
         app_published_workflow_was_updated.send(app_model, published_workflow=workflow)
 
+        # drop compiled versions of the app cached by this process, other processes keep serving
+        # the versions they cached until evicted, as entries are keyed by workflow id
+        compiled_workflow_cache.invalidate_app(app_model.id)
+
         # return new workflow
         return workflow
 
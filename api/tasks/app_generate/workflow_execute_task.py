@@ -276,7 +276,7 @@ def _resume_app_execution(payload: dict[str, Any]) -> None:
         return
 
     try:
-        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state().decode())
+        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state())
     except Exception:
         logger.exception("Failed to load resumption context for workflow run %s", workflow_run_id)
         return
@@ -206,7 +206,7 @@ def resume_workflow_execution(task_data_dict: dict[str, Any]) -> None:
         return
 
     try:
-        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state().decode())
+        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state())
     except Exception as exc:
         logger.exception("Failed to load resumption context for workflow run %s", task_data.workflow_run_id)
         raise exc
@@ -1,29 +1,25 @@
 import logging
 import tempfile
 import time
-import uuid
 from pathlib import Path
 
 import click
-import pandas as pd
 from celery import shared_task
-from sqlalchemy import func
 
+from configs import dify_config
 from core.db.session_factory import session_factory
 from core.model_manager import ModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
-from libs import helper
-from libs.datetime_utils import naive_utc_now
-from models.dataset import Dataset, Document, DocumentSegment
+from models.dataset import Dataset, Document
 from models.model import UploadFile
-from services.vector_service import VectorService
+from services.segment_bulk_import_service import SegmentBulkImporter, SegmentImportInProgressError
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(queue="dataset")
+@shared_task(queue="dataset", acks_late=True)
 def batch_create_segment_to_index_task(
     job_id: str,
     upload_file_id: str,
@@ -41,6 +37,11 @@ def batch_create_segment_to_index_task(
     :param tenant_id:
     :param user_id:
 
+    The import is checkpointed per block of rows, a redelivered task resumes where the previous run stopped.
+    The task is acknowledged late, so the broker redelivers an import still running after its visibility
+    timeout. Such a delivery is skipped while the running import holds its lease, which needs the visibility
+    timeout to be longer than the lease (10 minutes) so the redelivery of a crashed import can resume it.
+
     Usage: batch_create_segment_to_index_task.delay(job_id, upload_file_id, dataset_id, document_id, tenant_id, user_id)
     """
     logger.info(click.style(f"Start batch create segment jobId: {job_id}", fg="green"))
@@ -101,23 +102,6 @@ def batch_create_segment_to_index_task(
         redis_client.setex(indexing_cache_key, 600, "error")
         return
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        suffix = Path(upload_file_key).suffix
-        file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
-        storage.download(upload_file_key, file_path)
-
-        df = pd.read_csv(file_path)
-        content = []
-        for _, row in df.iterrows():
-            if document_config["doc_form"] == "qa_model":
-                data = {"content": row.iloc[0], "answer": row.iloc[1]}
-            else:
-                data = {"content": row.iloc[0]}
-            content.append(data)
-        if len(content) == 0:
-            raise ValueError("The CSV file is empty.")
-
-    document_segments = []
     embedding_model = None
     if dataset_config["indexing_technique"] == "high_quality":
         model_manager = ModelManager()
@@ -128,55 +112,25 @@ def batch_create_segment_to_index_task(
             model=dataset_config["embedding_model"],
         )
 
-    word_count_change = 0
-    if embedding_model:
-        tokens_list = embedding_model.get_text_embedding_num_tokens(texts=[segment["content"] for segment in content])
-    else:
-        tokens_list = [0] * len(content)
-
-    with session_factory.create_session() as session, session.begin():
-        for segment, tokens in zip(content, tokens_list):
-            content = segment["content"]
-            doc_id = str(uuid.uuid4())
-            segment_hash = helper.generate_text_hash(content)
-            max_position = (
-                session.query(func.max(DocumentSegment.position))
-                .where(DocumentSegment.document_id == document_config["id"])
-                .scalar()
-            )
-            segment_document = DocumentSegment(
-                tenant_id=tenant_id,
-                dataset_id=dataset_id,
-                document_id=document_id,
-                index_node_id=doc_id,
-                index_node_hash=segment_hash,
-                position=max_position + 1 if max_position else 1,
-                content=content,
-                word_count=len(content),
-                tokens=tokens,
-                created_by=user_id,
-                indexing_at=naive_utc_now(),
-                status="completed",
-                completed_at=naive_utc_now(),
-            )
-            if document_config["doc_form"] == "qa_model":
-                segment_document.answer = segment["answer"]
-                segment_document.word_count += len(segment["answer"])
-            word_count_change += segment_document.word_count
-            session.add(segment_document)
-            document_segments.append(segment_document)
-
-    with session_factory.create_session() as session, session.begin():
-        dataset_document = session.get(Document, document_id)
-        if dataset_document:
-            assert dataset_document.word_count is not None
-            dataset_document.word_count += word_count_change
-            session.add(dataset_document)
-
-    with session_factory.create_session() as session:
-        dataset = session.get(Dataset, dataset_id)
-        if dataset:
-            VectorService.create_segments_vector(None, document_segments, dataset, document_config["doc_form"])
+    importer = SegmentBulkImporter(
+        job_id=job_id,
+        tenant_id=tenant_id,
+        dataset_id=dataset_id,
+        document_id=document_id,
+        user_id=user_id,
+        doc_form=document_config["doc_form"],
+        embedding_model=embedding_model,
+        block_size=dify_config.SEGMENT_BULK_IMPORT_BLOCK_SIZE,
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        suffix = Path(upload_file_key).suffix
+        file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
+        storage.download(upload_file_key, file_path)
+        try:
+            importer.run(file_path)
+        except SegmentImportInProgressError:
+            logger.info("Segment batch import %s is already running, skipping this delivery", job_id)
+            return
 
     redis_client.setex(indexing_cache_key, 600, "completed")
     end_at = time.perf_counter()
@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import delete
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from models.dataset import Dataset, Document, SegmentAttachmentBinding
 from models.model import UploadFile
@@ -58,6 +59,7 @@ def delete_segment_from_index_task(
                 precomputed_child_node_ids=child_node_ids,
                 delete_summaries=True,  # Actually delete summaries when segment is deleted
             )
+            segment_hydration_cache.invalidate(dataset_id)
             if dataset.is_multimodal:
                 # delete segment attachment binding
                 segment_attachment_bindings = (
@@ -5,6 +5,7 @@ import click
 from celery import shared_task
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from extensions.ext_redis import redis_client
 from models.dataset import DocumentSegment
@@ -59,6 +60,7 @@ def disable_segment_from_index_task(segment_id: str):
             index_type = dataset_document.doc_form
             index_processor = IndexProcessorFactory(index_type).init_index_processor()
             index_processor.clean(dataset, [segment.index_node_id])
+            segment_hydration_cache.invalidate(segment.dataset_id)
 
             # Disable summary index for this segment
             from services.summary_index_service import SummaryIndexService
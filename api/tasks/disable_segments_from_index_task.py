@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import select
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from extensions.ext_redis import redis_client
 from models.dataset import Dataset, DocumentSegment, SegmentAttachmentBinding
@@ -67,6 +68,7 @@ def disable_segments_from_index_task(segment_ids: list, dataset_id: str, documen
                     attachment_ids = [binding.attachment_id for binding in segment_attachment_bindings]
                     index_node_ids.extend(attachment_ids)
             index_processor.clean(dataset, index_node_ids, with_keywords=True, delete_child_chunks=False)
+            segment_hydration_cache.invalidate(dataset_id)
 
             # Disable summary indexes for these segments
             from services.summary_index_service import SummaryIndexService
@@ -1,6 +1,7 @@
 import logging
 import time
 from collections.abc import Callable, Sequence
+from typing import Any
 
 import click
 from celery import shared_task
@@ -9,6 +10,7 @@ from configs import dify_config
 from core.db.session_factory import session_factory
 from core.entities.document_task import DocumentTask
 from core.indexing_runner import DocumentIsPausedError, IndexingRunner
+from core.rag.pipeline.fair_scheduler import ScheduledTask, TenantFairScheduler
 from core.rag.pipeline.queue import TenantIsolatedTaskQueue
 from enums.cloud_plan import CloudPlan
 from libs.datetime_utils import naive_utc_now
@@ -178,6 +180,18 @@ def _document_indexing(dataset_id: str, document_ids: Sequence[str]):
                 )
 
 
+def send_scheduled_document_task(task_func: Callable[..., Any], task: ScheduledTask):
+    """Deliver a document task handed out by the tenant fair scheduler to its Celery task."""
+    document_task = DocumentTask(**task.data)
+    task_func.delay(  # type: ignore
+        tenant_id=document_task.tenant_id,
+        dataset_id=document_task.dataset_id,
+        document_ids=document_task.document_ids,
+        fair_scheduler=task.scheduler,
+        lease_id=task.lease_id,
+    )
+
+
 def _document_indexing_with_tenant_queue(
     tenant_id: str, dataset_id: str, document_ids: Sequence[str], task_func: Callable[[str, str, Sequence[str]], None]
 ):
@@ -216,29 +230,80 @@ def _document_indexing_with_tenant_queue(
             tenant_isolated_task_queue.delete_task_key()
 
 
+def _document_indexing_with_fair_scheduler(
+    tenant_id: str,
+    dataset_id: str,
+    document_ids: Sequence[str],
+    task_func: Callable[..., None],
+    fair_scheduler: str,
+    lease_id: str,
+):
+    scheduler = TenantFairScheduler.from_config(fair_scheduler)
+    try:
+        with scheduler.hold_lease(tenant_id, lease_id):
+            _document_indexing(dataset_id, document_ids)
+    except Exception:
+        logger.exception(
+            "Error processing document indexing %s for tenant %s: %s",
+            dataset_id,
+            tenant_id,
+            document_ids,
+        )
+    finally:
+        # Release the lease and hand the freed slot to whichever tenant is next in line
+        scheduler.complete(tenant_id, lease_id)
+        scheduler.dispatch(lambda task: send_scheduled_document_task(task_func, task))
+
+
 @shared_task(queue="dataset")
-def normal_document_indexing_task(tenant_id: str, dataset_id: str, document_ids: Sequence[str]):
+def normal_document_indexing_task(
+    tenant_id: str,
+    dataset_id: str,
+    document_ids: Sequence[str],
+    fair_scheduler: str | None = None,
+    lease_id: str | None = None,
+):
     """
     Async process document
     :param tenant_id:
     :param dataset_id:
     :param document_ids:
+    :param fair_scheduler: name of the tenant fair scheduler that dispatched the task, if any
+    :param lease_id: lease held on the fair scheduler while the task runs
 
     Usage: normal_document_indexing_task.delay(tenant_id, dataset_id, document_ids)
     """
     logger.info("normal document indexing task received: %s - %s - %s", tenant_id, dataset_id, document_ids)
-    _document_indexing_with_tenant_queue(tenant_id, dataset_id, document_ids, normal_document_indexing_task)
+    if fair_scheduler and lease_id:
+        _document_indexing_with_fair_scheduler(
+            tenant_id, dataset_id, document_ids, normal_document_indexing_task, fair_scheduler, lease_id
+        )
+    else:
+        _document_indexing_with_tenant_queue(tenant_id, dataset_id, document_ids, normal_document_indexing_task)
 
 
 @shared_task(queue="priority_dataset")
-def priority_document_indexing_task(tenant_id: str, dataset_id: str, document_ids: Sequence[str]):
+def priority_document_indexing_task(
+    tenant_id: str,
+    dataset_id: str,
+    document_ids: Sequence[str],
+    fair_scheduler: str | None = None,
+    lease_id: str | None = None,
+):
     """
     Priority async process document
     :param tenant_id:
     :param dataset_id:
     :param document_ids:
+    :param fair_scheduler: name of the tenant fair scheduler that dispatched the task, if any
+    :param lease_id: lease held on the fair scheduler while the task runs
 
     Usage: priority_document_indexing_task.delay(tenant_id, dataset_id, document_ids)
     """
     logger.info("priority document indexing task received: %s - %s - %s", tenant_id, dataset_id, document_ids)
-    _document_indexing_with_tenant_queue(tenant_id, dataset_id, document_ids, priority_document_indexing_task)
+    if fair_scheduler and lease_id:
+        _document_indexing_with_fair_scheduler(
+            tenant_id, dataset_id, document_ids, priority_document_indexing_task, fair_scheduler, lease_id
+        )
+    else:
+        _document_indexing_with_tenant_queue(tenant_id, dataset_id, document_ids, priority_document_indexing_task)
@@ -11,11 +11,13 @@ from core.db.session_factory import session_factory
 from core.entities.document_task import DocumentTask
 from core.indexing_runner import DocumentIsPausedError, IndexingRunner
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
+from core.rag.pipeline.fair_scheduler import TenantFairScheduler
 from core.rag.pipeline.queue import TenantIsolatedTaskQueue
 from enums.cloud_plan import CloudPlan
 from libs.datetime_utils import naive_utc_now
 from models.dataset import Dataset, Document, DocumentSegment
 from services.feature_service import FeatureService
+from tasks.document_indexing_task import send_scheduled_document_task
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +77,31 @@ def _duplicate_document_indexing_task_with_tenant_queue(
             tenant_isolated_task_queue.delete_task_key()
 
 
+def _duplicate_document_indexing_task_with_fair_scheduler(
+    tenant_id: str,
+    dataset_id: str,
+    document_ids: Sequence[str],
+    task_func: Callable[..., None],
+    fair_scheduler: str,
+    lease_id: str,
+):
+    scheduler = TenantFairScheduler.from_config(fair_scheduler)
+    try:
+        with scheduler.hold_lease(tenant_id, lease_id):
+            _duplicate_document_indexing_task(dataset_id, document_ids)
+    except Exception:
+        logger.exception(
+            "Error processing duplicate document indexing %s for tenant %s: %s",
+            dataset_id,
+            tenant_id,
+            document_ids,
+        )
+    finally:
+        # Release the lease and hand the freed slot to whichever tenant is next in line
+        scheduler.complete(tenant_id, lease_id)
+        scheduler.dispatch(lambda task: send_scheduled_document_task(task_func, task))
+
+
 def _duplicate_document_indexing_task(dataset_id: str, document_ids: Sequence[str]):
     documents: list[Document] = []
     start_at = time.perf_counter()
@@ -162,32 +189,58 @@ def _duplicate_document_indexing_task(dataset_id: str, document_ids: Sequence[st
 
 
 @shared_task(queue="dataset")
-def normal_duplicate_document_indexing_task(tenant_id: str, dataset_id: str, document_ids: Sequence[str]):
+def normal_duplicate_document_indexing_task(
+    tenant_id: str,
+    dataset_id: str,
+    document_ids: Sequence[str],
+    fair_scheduler: str | None = None,
+    lease_id: str | None = None,
+):
     """
     Async process duplicate documents
     :param tenant_id:
     :param dataset_id:
     :param document_ids:
+    :param fair_scheduler: name of the tenant fair scheduler that dispatched the task, if any
+    :param lease_id: lease held on the fair scheduler while the task runs
 
     Usage: normal_duplicate_document_indexing_task.delay(tenant_id, dataset_id, document_ids)
     """
     logger.info("normal duplicate document indexing task received: %s - %s - %s", tenant_id, dataset_id, document_ids)
-    _duplicate_document_indexing_task_with_tenant_queue(
-        tenant_id, dataset_id, document_ids, normal_duplicate_document_indexing_task
-    )
+    if fair_scheduler and lease_id:
+        _duplicate_document_indexing_task_with_fair_scheduler(
+            tenant_id, dataset_id, document_ids, normal_duplicate_document_indexing_task, fair_scheduler, lease_id
+        )
+    else:
+        _duplicate_document_indexing_task_with_tenant_queue(
+            tenant_id, dataset_id, document_ids, normal_duplicate_document_indexing_task
+        )
 
 
 @shared_task(queue="priority_dataset")
-def priority_duplicate_document_indexing_task(tenant_id: str, dataset_id: str, document_ids: Sequence[str]):
+def priority_duplicate_document_indexing_task(
+    tenant_id: str,
+    dataset_id: str,
+    document_ids: Sequence[str],
+    fair_scheduler: str | None = None,
+    lease_id: str | None = None,
+):
     """
     Async process duplicate documents
     :param tenant_id:
     :param dataset_id:
     :param document_ids:
+    :param fair_scheduler: name of the tenant fair scheduler that dispatched the task, if any
+    :param lease_id: lease held on the fair scheduler while the task runs
 
     Usage: priority_duplicate_document_indexing_task.delay(tenant_id, dataset_id, document_ids)
     """
     logger.info("priority duplicate document indexing task received: %s - %s - %s", tenant_id, dataset_id, document_ids)
-    _duplicate_document_indexing_task_with_tenant_queue(
-        tenant_id, dataset_id, document_ids, priority_duplicate_document_indexing_task
-    )
+    if fair_scheduler and lease_id:
+        _duplicate_document_indexing_task_with_fair_scheduler(
+            tenant_id, dataset_id, document_ids, priority_duplicate_document_indexing_task, fair_scheduler, lease_id
+        )
+    else:
+        _duplicate_document_indexing_task_with_tenant_queue(
+            tenant_id, dataset_id, document_ids, priority_duplicate_document_indexing_task
+        )
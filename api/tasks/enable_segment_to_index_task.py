@@ -5,6 +5,7 @@ import click
 from celery import shared_task
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
@@ -105,6 +106,7 @@ def enable_segment_to_index_task(segment_id: str):
 
             # save vector index
             index_processor.load(dataset, [document], multimodal_documents=multimodel_documents)
+            segment_hydration_cache.invalidate(segment.dataset_id)
 
             # Enable summary index for this segment
             from services.summary_index_service import SummaryIndexService
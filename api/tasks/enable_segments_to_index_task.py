@@ -6,6 +6,7 @@ from celery import shared_task
 from sqlalchemy import select
 
 from core.db.session_factory import session_factory
+from core.rag.datasource.segment_hydration_cache import segment_hydration_cache
 from core.rag.index_processor.constant.doc_type import DocType
 from core.rag.index_processor.constant.index_type import IndexStructureType
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
@@ -105,6 +106,7 @@ def enable_segments_to_index_task(segment_ids: list, dataset_id: str, document_i
                 documents.append(document)
             # save vector index
             index_processor.load(dataset, documents, multimodal_documents=multimodal_documents)
+            segment_hydration_cache.invalidate(dataset_id)
 
             # Enable summary indexes for these segments
             from services.summary_index_service import SummaryIndexService
@@ -126,7 +126,7 @@ def _load_variable_pool(workflow_run_id: str | None) -> VariablePool | None:
         return None
 
     try:
-        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state().decode())
+        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state())
     except Exception:
         logger.exception("Failed to load resumption context for workflow run %s", workflow_run_id)
         return None
@@ -49,6 +49,7 @@ from models.workflow import (
 )
 from repositories.factory import DifyAPIRepositoryFactory
 from services.api_token_service import ApiTokenCache
+from services.trigger.webhook_routing_cache import webhook_routing_cache
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +86,7 @@ def remove_app_and_related_data_task(self, tenant_id: str, app_id: str):
         _delete_app_triggers(tenant_id, app_id)
         _delete_workflow_plugin_triggers(tenant_id, app_id)
         _delete_workflow_webhook_triggers(tenant_id, app_id)
+        webhook_routing_cache.invalidate_app(app_id)
         _delete_workflow_schedule_plans(tenant_id, app_id)
         _delete_workflow_trigger_logs(tenant_id, app_id)
         end_at = time.perf_counter()
@@ -0,0 +1,16 @@
+import logging
+
+from celery import shared_task
+
+from services.trigger.webhook_ingestion_service import WebhookIngestionService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(queue="triggered_workflow_dispatcher")
+def dispatch_buffered_webhooks():
+    """Dispatch the workflow runs of a batch of webhook calls buffered by WebhookIngestionService."""
+    try:
+        WebhookIngestionService.dispatch()
+    except Exception:
+        logger.exception("Failed to dispatch buffered webhook calls")
@@ -0,0 +1,46 @@
+"""Benchmarks of `build_segment` over typical node output shapes.
+
+They are kept out of the unit tests run by CI. Run with
+`pytest tests/benchmarks/test_variable_factory_benchmark.py --benchmark-only`.
+"""
+
+import pytest
+
+from core.variables.segments import (
+    ArrayAnySegment,
+    ArrayNumberSegment,
+    ArrayObjectSegment,
+    ArraySegment,
+    ArrayStringSegment,
+)
+from factories.variable_factory import build_segment
+
+_SIZE = 100_000
+
+_SHAPES = {
+    "strings": (lambda: [f"item-{index}" for index in range(_SIZE)], ArrayStringSegment),
+    "numbers": (lambda: [index if index % 2 else index / 2 for index in range(_SIZE)], ArrayNumberSegment),
+    "objects": (
+        lambda: [{"id": index, "title": f"title-{index}", "score": index / _SIZE} for index in range(_SIZE)],
+        ArrayObjectSegment,
+    ),
+    "nested_lists": (lambda: [[index, index + 1, index + 2] for index in range(_SIZE)], ArrayAnySegment),
+    "mixed": (lambda: [index if index % 2 else str(index) for index in range(_SIZE)], ArrayAnySegment),
+}
+
+
+@pytest.fixture(params=list(_SHAPES))
+def shape(request: pytest.FixtureRequest):
+    """Build the values of one shape only when a benchmark of it runs."""
+    build_values, expected_class = _SHAPES[request.param]
+    return build_values(), expected_class
+
+
+@pytest.mark.benchmark(group="build_segment")
+def test_build_segment_large_array(benchmark, shape):
+    values, expected_class = shape
+
+    segment: ArraySegment = benchmark(build_segment, values)
+
+    assert isinstance(segment, expected_class)
+    assert segment.value is values
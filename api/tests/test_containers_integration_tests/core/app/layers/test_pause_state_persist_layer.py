@@ -51,6 +51,11 @@ from services.file_service import FileService
 from services.workflow_run_service import WorkflowRunService
 
 
+def _restored_state(resumption_context: WorkflowResumptionContext) -> dict[str, object]:
+    restored = GraphRuntimeState.from_snapshot(resumption_context.serialized_graph_runtime_state)
+    return json.loads(restored.dumps())
+
+
 class _TestCommandChannelImpl:
     """Real implementation of CommandChannel for testing."""
 
@@ -343,12 +348,12 @@ class TestPauseStatePersistenceLayerTestContainers:
         assert pause_model.state_object_key != ""
         assert pause_model.resumed_at is None
 
-        storage_content = storage.load(pause_model.state_object_key).decode()
+        storage_content = storage.load(pause_model.state_object_key)
         resumption_context = WorkflowResumptionContext.loads(storage_content)
         assert resumption_context.version == "1"
-        assert resumption_context.serialized_graph_runtime_state == graph_runtime_state.dumps()
+        assert resumption_context.serialized_graph_runtime_state == graph_runtime_state.dumps_binary()
         expected_state = json.loads(graph_runtime_state.dumps())
-        actual_state = json.loads(resumption_context.serialized_graph_runtime_state)
+        actual_state = _restored_state(resumption_context)
         assert actual_state == expected_state
         persisted_entity = resumption_context.get_generate_entity()
         assert isinstance(persisted_entity, WorkflowAppGenerateEntity)
@@ -394,8 +399,8 @@ class TestPauseStatePersistenceLayerTestContainers:
         assert pause_entity.get_pause_reasons() == event.reasons
 
         state_bytes = pause_entity.get_state()
-        resumption_context = WorkflowResumptionContext.loads(state_bytes.decode())
-        retrieved_state = json.loads(resumption_context.serialized_graph_runtime_state)
+        resumption_context = WorkflowResumptionContext.loads(state_bytes)
+        retrieved_state = _restored_state(resumption_context)
         expected_state = json.loads(graph_runtime_state.dumps())
 
         assert retrieved_state == expected_state
@@ -464,9 +469,9 @@ class TestPauseStatePersistenceLayerTestContainers:
         assert pause_model.state_object_key != ""
 
         # Verify content in storage
-        storage_content = storage.load(pause_model.state_object_key).decode()
+        storage_content = storage.load(pause_model.state_object_key)
         resumption_context = WorkflowResumptionContext.loads(storage_content)
-        assert resumption_context.serialized_graph_runtime_state == graph_runtime_state.dumps()
+        assert resumption_context.serialized_graph_runtime_state == graph_runtime_state.dumps_binary()
         assert resumption_context.get_generate_entity().workflow_execution_id == self.test_workflow_run_id
 
     def test_workflow_with_different_creators(self, db_session_with_containers):
@@ -531,7 +536,7 @@ class TestPauseStatePersistenceLayerTestContainers:
         # Verify the state owner is the workflow creator
         pause_entity = self.workflow_run_service._workflow_run_repo.get_workflow_pause(different_workflow_run.id)
         assert pause_entity is not None
-        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state().decode())
+        resumption_context = WorkflowResumptionContext.loads(pause_entity.get_state())
         assert resumption_context.get_generate_entity().workflow_execution_id == different_workflow_run.id
 
     def test_layer_ignores_non_pause_events(self, db_session_with_containers):
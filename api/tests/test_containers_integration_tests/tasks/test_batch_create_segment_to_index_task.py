@@ -53,7 +53,7 @@ class TestBatchCreateSegmentToIndexTask:
         with (
             patch("tasks.batch_create_segment_to_index_task.storage") as mock_storage,
             patch("tasks.batch_create_segment_to_index_task.ModelManager") as mock_model_manager,
-            patch("tasks.batch_create_segment_to_index_task.VectorService") as mock_vector_service,
+            patch("services.segment_bulk_import_service.VectorService") as mock_vector_service,
         ):
             # Setup default mock returns
             mock_storage.download.return_value = None
@@ -5,6 +5,7 @@ from unittest.mock import Mock
 
 import pytest
 
+from configs import dify_config
 from core.app.app_config.entities import WorkflowUIBasedAppConfig
 from core.app.entities.app_invoke_entities import AdvancedChatAppGenerateEntity, InvokeFrom, WorkflowAppGenerateEntity
 from core.app.layers.pause_state_persist_layer import (
@@ -165,6 +166,9 @@ class MockReadOnlyGraphRuntimeState:
             }
         )
 
+    def dumps_binary(self) -> bytes:
+        return b"GRS2" + self.dumps().encode()
+
 
 class MockCommandChannel:
     """Mock implementation of CommandChannel for testing."""
@@ -272,6 +276,30 @@ class TestPauseStatePersistenceLayer:
 
         assert isinstance(pause_reasons, list)
 
+    def test_on_event_stores_binary_state_when_binary_snapshots_enabled(self, monkeypatch: pytest.MonkeyPatch):
+        generate_entity = self._create_generate_entity(workflow_execution_id="run-123")
+        layer = PauseStatePersistenceLayer(
+            session_factory=Mock(name="session_factory"),
+            state_owner_user_id="owner-123",
+            generate_entity=generate_entity,
+        )
+
+        mock_repo = Mock()
+        monkeypatch.setattr(
+            DifyAPIRepositoryFactory, "create_api_workflow_run_repository", Mock(return_value=mock_repo)
+        )
+        monkeypatch.setattr(dify_config, "WORKFLOW_PAUSE_BINARY_SNAPSHOT_ENABLED", True)
+
+        graph_runtime_state = MockReadOnlyGraphRuntimeState(workflow_execution_id="run-123")
+        layer.initialize(graph_runtime_state, MockCommandChannel())
+
+        layer.on_event(TestDataFactory.create_graph_run_paused_event())
+
+        serialized_state = mock_repo.create_workflow_pause.call_args.kwargs["state"]
+        assert isinstance(serialized_state, bytes)
+        resumption_context = WorkflowResumptionContext.loads(serialized_state)
+        assert resumption_context.serialized_graph_runtime_state == graph_runtime_state.dumps_binary()
+
     def test_on_event_ignores_non_paused_events(self, monkeypatch: pytest.MonkeyPatch):
         session_factory = Mock(name="session_factory")
         layer = PauseStatePersistenceLayer(
@@ -404,6 +432,12 @@ def _build_advanced_chat_generate_entity_for_roundtrip() -> WorkflowResumptionCo
             _build_workflow_generate_entity_for_roundtrip(),
             id="workflow",
         ),
+        pytest.param(
+            _build_workflow_generate_entity_for_roundtrip().model_copy(
+                update={"serialized_graph_runtime_state": b"GRS2\x00\x00\x00\x02{}binary"}
+            ),
+            id="binary_state",
+        ),
     ],
 )
 def test_workflow_resumption_context_dumps_loads_roundtrip(state: WorkflowResumptionContext):
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, PropertyMock
+
+from core.app.workflow.compiled_workflow import CompiledWorkflowCache
+from models.workflow import Workflow
+
+
+def _workflow(workflow_id: str = "wf-1", app_id: str = "app-1", version: str = "2025-01-01 00:00:00") -> MagicMock:
+    workflow = MagicMock(spec=Workflow)
+    workflow.id = workflow_id
+    workflow.app_id = app_id
+    workflow.version = version
+    workflow.updated_at = datetime(2025, 1, 1)
+    workflow.graph_dict = json.loads('{"nodes": [], "edges": []}')
+    workflow.environment_variables = []
+    return workflow
+
+
+def test_published_workflow_is_compiled_once():
+    cache = CompiledWorkflowCache(max_size=8, env_ttl=60.0)
+    first = cache.get(_workflow())
+    second = cache.get(_workflow())
+
+    assert first is second
+    first.mark_validated(None)
+    assert second.is_validated(None)
+    assert not second.is_validated("start")
+
+
+def test_updated_workflow_is_recompiled():
+    cache = CompiledWorkflowCache(max_size=8, env_ttl=60.0)
+    first = cache.get(_workflow())
+    updated = _workflow()
+    updated.updated_at = datetime(2025, 1, 2)
+
+    assert cache.get(updated) is not first
+
+
+def test_draft_workflow_is_not_cached():
+    cache = CompiledWorkflowCache(max_size=8, env_ttl=60.0)
+
+    assert cache.get(_workflow(version=Workflow.VERSION_DRAFT)) is not cache.get(
+        _workflow(version=Workflow.VERSION_DRAFT)
+    )
+
+
+def test_environment_variables_are_reloaded_after_ttl():
+    cache = CompiledWorkflowCache(max_size=8, env_ttl=0.0)
+    cache.get(_workflow())
+    workflow = _workflow()
+    environment_variables = PropertyMock(return_value=["reloaded"])
+    type(workflow).environment_variables = environment_variables
+
+    assert cache.get(workflow).environment_variables == ["reloaded"]
+    environment_variables.assert_called_once()
+
+
+def test_invalidate_app_drops_its_entries():
+    cache = CompiledWorkflowCache(max_size=8, env_ttl=60.0)
+    compiled = cache.get(_workflow())
+    other = cache.get(_workflow(workflow_id="wf-2", app_id="app-2"))
+
+    cache.invalidate_app("app-1")
+
+    assert cache.get(_workflow()) is not compiled
+    assert cache.get(_workflow(workflow_id="wf-2", app_id="app-2")) is other
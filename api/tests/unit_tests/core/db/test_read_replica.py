@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from core.db.read_replica import ReadOnlySession, ReadReplicaRouter
+
+
+def _router(lag: float | None | Exception, max_lag_seconds: float = 1.0) -> tuple[ReadReplicaRouter, Engine, Engine]:
+    primary = MagicMock(spec=Engine)
+    replica = MagicMock(spec=Engine)
+    router = ReadReplicaRouter(primary, replica, max_lag_seconds=max_lag_seconds, lag_check_interval=60)
+    measure_lag = MagicMock(side_effect=lag) if isinstance(lag, Exception) else MagicMock(return_value=lag)
+    patcher = patch.object(ReadReplicaRouter, "_measure_lag", measure_lag)
+    patcher.start()
+    return router, primary, replica
+
+
+@pytest.fixture(autouse=True)
+def _stop_patches():
+    yield
+    patch.stopall()
+
+
+def test_replica_within_max_lag_is_used():
+    router, _, replica = _router(lag=0.5)
+
+    assert router.get_engine() is replica
+
+
+@pytest.mark.parametrize("lag", [5.0, None, ConnectionError("replica unreachable")])
+def test_primary_is_used_when_replica_lags_or_fails(lag):
+    router, primary, _ = _router(lag=lag)
+
+    assert router.get_engine() is primary
+
+
+def test_lag_is_checked_once_per_interval():
+    router, _, replica = _router(lag=0.0)
+
+    for _ in range(3):
+        assert router.get_engine() is replica
+
+    assert ReadReplicaRouter._measure_lag.call_count == 1  # type: ignore[attr-defined]
+
+
+def test_read_only_session_keeps_the_engine_it_was_routed_to():
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    router = MagicMock(spec=ReadReplicaRouter)
+    router.get_engine.side_effect = [replica, primary]
+    session_maker = sessionmaker(class_=ReadOnlySession, router=router)
+
+    with session_maker() as session:
+        assert session.scalar(text("SELECT 1")) == 1
+        assert session.scalar(text("SELECT 2")) == 2
+        assert session.get_bind() is replica
+
+    router.get_engine.assert_called_once()
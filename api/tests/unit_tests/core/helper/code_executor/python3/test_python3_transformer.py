@@ -10,3 +10,28 @@ def test_get_runner_script():
     code_lines = code.splitlines()
     # Check that the first lines of script are exactly the same as code
     assert script_lines[: len(code_lines)] == code_lines
+
+
+def test_batch_runner_executes_main_per_input():
+    import subprocess
+    import sys
+
+    code = "def main(a):\n    if a == 2:\n        raise ValueError('bad input')\n    return {'result': a * 2}\n"
+    runner, _ = Python3TemplateTransformer.transform_batch_caller(code, [{"a": 1}, {"a": 2}, {"a": 3}])
+    stdout = subprocess.run([sys.executable, "-c", runner], capture_output=True, text=True, check=True).stdout
+
+    results = Python3TemplateTransformer.transform_batch_response(stdout, 3)
+
+    assert results[0] == {"result": 2}
+    assert isinstance(results[1], ValueError)
+    assert str(results[1]) == "ValueError: bad input"
+    assert results[2] == {"result": 6}
+
+
+def test_embedded_script_is_reused_for_same_code():
+    code = Python3CodeProvider.get_default_code()
+    first = Python3TemplateTransformer.assemble_runner_script(code, {"arg1": "a", "arg2": "b"})
+    second = Python3TemplateTransformer.assemble_runner_script(code, {"arg1": "c", "arg2": "d"})
+
+    assert first != second
+    assert first.splitlines()[: len(code.splitlines())] == second.splitlines()[: len(code.splitlines())]
@@ -0,0 +1,118 @@
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from core.helper.code_executor.batch_executor import CodeExecutionBatcher
+from core.helper.code_executor.code_executor import CodeExecutionError, CodeExecutor, CodeLanguage
+
+
+class _RecordingExecutor(CodeExecutor):
+    calls: list[list[Mapping[str, Any]]] = []
+    fail_batches = False
+
+    @classmethod
+    def execute_workflow_code_template_batch(
+        cls, language: CodeLanguage, code: str, inputs_list: Sequence[Mapping[str, Any]]
+    ) -> list[Mapping[str, Any] | CodeExecutionError]:
+        cls.calls.append(list(inputs_list))
+        if cls.fail_batches and len(inputs_list) > 1:
+            raise CodeExecutionError("batch timed out")
+        return [
+            CodeExecutionError("negative") if inputs["value"] < 0 else {"result": inputs["value"] * 2}
+            for inputs in inputs_list
+        ]
+
+
+@pytest.fixture(autouse=True)
+def _reset_executor():
+    _RecordingExecutor.calls = []
+    _RecordingExecutor.fail_batches = False
+
+
+def _run_concurrently(batcher: CodeExecutionBatcher, values: list[int]) -> list[Any]:
+    results: list[Any] = [None] * len(values)
+
+    def run(i: int, value: int):
+        try:
+            results[i] = batcher.execute(CodeLanguage.PYTHON3, "code", {"value": value})
+        except CodeExecutionError as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, value)) for i, value in enumerate(values)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_executions_share_one_batch():
+    batcher = CodeExecutionBatcher(_RecordingExecutor, max_size=4, window=5.0)
+
+    results = _run_concurrently(batcher, [1, 2, 3, 4])
+
+    assert results == [{"result": 2}, {"result": 4}, {"result": 6}, {"result": 8}]
+    assert len(_RecordingExecutor.calls) == 1
+    assert len(_RecordingExecutor.calls[0]) == 4
+
+
+def test_item_error_only_fails_its_own_execution():
+    batcher = CodeExecutionBatcher(_RecordingExecutor, max_size=2, window=5.0)
+
+    results = _run_concurrently(batcher, [-1, 1])
+
+    assert isinstance(results[0], CodeExecutionError)
+    assert results[1] == {"result": 2}
+
+
+def test_single_execution_is_sent_after_window():
+    batcher = CodeExecutionBatcher(_RecordingExecutor, max_size=16, window=0.01)
+
+    assert batcher.execute(CodeLanguage.PYTHON3, "code", {"value": 5}) == {"result": 10}
+    assert _RecordingExecutor.calls == [[{"value": 5}]]
+
+
+def test_failed_batch_is_retried_per_item():
+    _RecordingExecutor.fail_batches = True
+    batcher = CodeExecutionBatcher(_RecordingExecutor, max_size=2, window=5.0)
+
+    results = _run_concurrently(batcher, [1, 2])
+
+    assert sorted(r["result"] for r in results) == [2, 4]
+    assert len(_RecordingExecutor.calls) == 3
+
+
+def test_execute_batch_splits_results(monkeypatch):
+    def fake_execute_code(language, preload, code, batch_size=None):
+        assert batch_size == 2
+        return '<<RESULT>>[{"output": {"a": 1}}, {"error": "ZeroDivisionError: division by zero"}]<<RESULT>>'
+
+    monkeypatch.setattr(CodeExecutor, "execute_code", fake_execute_code)
+
+    results = CodeExecutor.execute_workflow_code_template_batch(
+        CodeLanguage.PYTHON3, "def main(x):\n    return {'a': 1 / x}\n", [{"x": 1}, {"x": 0}]
+    )
+
+    assert results[0] == {"a": 1}
+    assert isinstance(results[1], CodeExecutionError)
+    assert str(results[1]) == "ZeroDivisionError: division by zero"
+
+
+def test_metrics_count_requests_and_failures():
+    from core.helper.code_executor.code_executor import _CodeExecutionLimiter
+
+    limiter = _CodeExecutionLimiter(max_concurrent_requests=1)
+    with limiter.request(batch_size=3):
+        assert limiter.metrics().in_flight == 1
+    with pytest.raises(RuntimeError):
+        with limiter.request():
+            raise RuntimeError("boom")
+
+    metrics = limiter.metrics()
+    assert metrics.requests == 2
+    assert metrics.failed_requests == 1
+    assert metrics.batch_requests == 1
+    assert metrics.batched_executions == 3
+    assert metrics.in_flight == 0
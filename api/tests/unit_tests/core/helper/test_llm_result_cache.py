@@ -0,0 +1,123 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.helper.llm_result_cache import LLMResultCache
+from core.model_runtime.entities.llm_entities import LLMResult, LLMResultChunk, LLMResultChunkDelta, LLMUsage
+from core.model_runtime.entities.message_entities import AssistantPromptMessage, UserPromptMessage
+
+
+def _usage(prompt_tokens: int = 10, completion_tokens: int = 5) -> LLMUsage:
+    usage = LLMUsage.empty_usage()
+    usage.prompt_tokens = prompt_tokens
+    usage.completion_tokens = completion_tokens
+    usage.total_tokens = prompt_tokens + completion_tokens
+    usage.total_price = Decimal("0.01")
+    return usage
+
+
+def _result(text: str) -> LLMResult:
+    return LLMResult(model="gpt-4", message=AssistantPromptMessage(content=text), usage=_usage())
+
+
+def _key(scope: str = "app:node", text: str = "classify this", parameters: dict | None = None) -> str:
+    return LLMResultCache.build_key(
+        scope=scope,
+        provider="openai",
+        model="gpt-4",
+        model_parameters=parameters if parameters is not None else {"temperature": 0, "max_tokens": 10},
+        prompt_messages=[UserPromptMessage(content=text)],
+        tools=None,
+        stop=None,
+    )
+
+
+@pytest.fixture
+def redis_mock():
+    with patch("core.helper.llm_result_cache.redis_client") as redis_client:
+        redis_client.get.return_value = None
+        yield redis_client
+
+
+@pytest.fixture
+def cache() -> LLMResultCache:
+    return LLMResultCache(enabled=True, ttl=60, local_max_size=16, max_entry_size=65536)
+
+
+def test_build_key_is_canonical():
+    assert _key(parameters={"temperature": 0, "max_tokens": 10}) == _key(
+        parameters={"max_tokens": 10, "temperature": 0}
+    )
+    assert _key() != _key(scope="app:other-node")
+    assert _key() != _key(text="classify that")
+
+
+def test_hit_reports_empty_usage_and_counts_saved_tokens(cache: LLMResultCache, redis_mock: MagicMock):
+    key = _key()
+    assert cache.get(key) is None
+
+    cache.set(key, _result("positive"))
+    cached = cache.get(key)
+
+    assert cached is not None
+    assert cached.message.content == "positive"
+    assert cached.usage.total_tokens == 0
+    redis_mock.setex.assert_called_once()
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.stores) == (1, 1, 1)
+    assert (stats.saved_prompt_tokens, stats.saved_completion_tokens) == (10, 5)
+
+
+def test_falls_back_to_redis(cache: LLMResultCache, redis_mock: MagicMock):
+    redis_mock.get.return_value = _result("from redis").model_dump_json().encode()
+
+    cached = cache.get(_key())
+
+    assert cached is not None
+    assert cached.message.content == "from redis"
+
+
+def test_redis_errors_are_treated_as_miss(cache: LLMResultCache, redis_mock: MagicMock):
+    redis_mock.get.side_effect = ConnectionError("down")
+    assert cache.get(_key()) is None
+
+
+def test_skips_oversized_entries(redis_mock: MagicMock):
+    cache = LLMResultCache(enabled=True, ttl=60, local_max_size=16, max_entry_size=100)
+    cache.set(_key(), _result("x" * 200))
+
+    assert cache.get(_key()) is None
+    redis_mock.setex.assert_not_called()
+
+
+def test_cache_stream_stores_completed_text_stream(cache: LLMResultCache, redis_mock: MagicMock):
+    def chunks():
+        for index, text in enumerate(["posi", "tive"]):
+            yield LLMResultChunk(
+                model="gpt-4",
+                delta=LLMResultChunkDelta(
+                    index=index,
+                    message=AssistantPromptMessage(content=text),
+                    usage=_usage() if index == 1 else None,
+                ),
+            )
+
+    streamed = [chunk.delta.message.content for chunk in cache.cache_stream(_key(), chunks())]
+
+    assert streamed == ["posi", "tive"]
+    cached = cache.get(_key())
+    assert cached is not None
+    assert cached.message.content == "positive"
+
+
+def test_replay_yields_synthetic_chunks():
+    result = LLMResult(model="gpt-4", message=AssistantPromptMessage(content="a" * 300), usage=LLMUsage.empty_usage())
+
+    chunks = list(LLMResultCache.replay(result, [UserPromptMessage(content="q")]))
+
+    assert "".join(str(chunk.delta.message.content) for chunk in chunks) == "a" * 300
+    assert len(chunks) == 2
+    assert chunks[-1].delta.usage is not None
+    assert chunks[-1].delta.finish_reason == "stop"
+    assert chunks[0].delta.usage is None
@@ -0,0 +1,148 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.mcp.client_pool import MCPClientKey, MCPClientPool
+from core.tools.mcp_tool.credential_cache import MCPProviderCredentialCache, MCPProviderCredentials
+
+
+def _make_key(headers: dict[str, str] | None = None) -> MCPClientKey:
+    return MCPClientKey(
+        tenant_id="tenant",
+        provider_id="provider",
+        server_url="https://mcp.example.com",
+        auth_fingerprint=MCPClientKey.fingerprint(headers or {}),
+    )
+
+
+def _make_client(headers: dict[str, str] | None = None) -> MagicMock:
+    client = MagicMock()
+    client.headers = headers or {}
+    return client
+
+
+def _make_pool(**kwargs) -> MCPClientPool:
+    options = {"enabled": True, "max_idle_per_key": 2, "idle_timeout": 60.0, "health_check_interval": 15.0}
+    options.update(kwargs)
+    return MCPClientPool(**options)
+
+
+class TestMCPClientPool:
+    def test_reuses_initialized_client(self):
+        pool = _make_pool()
+        client = _make_client()
+        factory = MagicMock(return_value=client)
+
+        with pool.client(_make_key(), factory) as first:
+            pass
+        with pool.client(_make_key(), factory) as second:
+            pass
+
+        assert first is second is client
+        factory.assert_called_once()
+        client.__enter__.assert_called_once()
+        client.cleanup.assert_not_called()
+        stats = pool.stats()
+        assert (stats.created, stats.reused, stats.idle) == (1, 1, 1)
+
+    def test_concurrent_checkouts_get_distinct_clients(self):
+        pool = _make_pool()
+        factory = MagicMock(side_effect=[_make_client(), _make_client()])
+
+        with pool.client(_make_key(), factory) as first, pool.client(_make_key(), factory) as second:
+            assert first is not second
+
+        assert pool.stats().idle == 2
+
+    def test_discards_client_when_call_raises(self):
+        pool = _make_pool()
+        client = _make_client()
+
+        with pytest.raises(RuntimeError):
+            with pool.client(_make_key(), lambda: client):
+                raise RuntimeError("broken session")
+
+        client.cleanup.assert_called_once()
+        stats = pool.stats()
+        assert (stats.discarded, stats.idle) == (1, 0)
+
+    def test_rekeys_client_after_reauthentication(self):
+        pool = _make_pool()
+        client = _make_client({"Authorization": "Bearer old"})
+
+        with pool.client(_make_key({"Authorization": "Bearer old"}), lambda: client) as checked_out:
+            checked_out.headers = {"Authorization": "Bearer new"}
+
+        factory = MagicMock()
+        with pool.client(_make_key({"Authorization": "Bearer new"}), factory) as reused:
+            assert reused is client
+        factory.assert_not_called()
+
+    def test_replaces_client_failing_health_check(self):
+        pool = _make_pool(health_check_interval=0.0)
+        stale = _make_client()
+        stale.ping.side_effect = ConnectionError("gone")
+        fresh = _make_client()
+
+        with pool.client(_make_key(), lambda: stale):
+            pass
+        with pool.client(_make_key(), lambda: fresh) as client:
+            assert client is fresh
+
+        stale.cleanup.assert_called_once()
+        assert pool.stats().health_check_failures == 1
+
+    def test_evicts_idle_clients(self):
+        pool = _make_pool(idle_timeout=10.0)
+        client = _make_client()
+
+        with patch("core.mcp.client_pool.time.monotonic", return_value=100.0):
+            with pool.client(_make_key(), lambda: client):
+                pass
+        with patch("core.mcp.client_pool.time.monotonic", return_value=200.0):
+            with pool.client(_make_key(), _make_client) as new_client:
+                assert new_client is not client
+
+        client.cleanup.assert_called_once()
+
+    def test_closes_clients_beyond_idle_limit(self):
+        pool = _make_pool(max_idle_per_key=1)
+        clients = [_make_client(), _make_client()]
+        factory = MagicMock(side_effect=clients)
+
+        with pool.client(_make_key(), factory), pool.client(_make_key(), factory):
+            pass
+
+        assert pool.stats().idle == 1
+        assert sum(client.cleanup.call_count for client in clients) == 1
+
+    def test_disabled_pool_closes_client_after_call(self):
+        pool = _make_pool(enabled=False)
+        client = _make_client()
+        client.__enter__.return_value = client
+
+        with pool.client(_make_key(), lambda: client) as checked_out:
+            assert checked_out is client
+
+        client.__exit__.assert_called_once()
+        assert pool.stats().idle == 0
+
+
+class TestMCPProviderCredentialCache:
+    def test_invalidate_tenant(self):
+        cache = MCPProviderCredentialCache(ttl=30)
+        credentials = MCPProviderCredentials(provider_entity=MagicMock(), server_url="https://x", headers={})
+        cache.set("tenant", "a", credentials)
+        cache.set("tenant", "b", credentials)
+        cache.set("other", "a", credentials)
+
+        cache.invalidate("tenant")
+
+        assert cache.get("tenant", "a") is None
+        assert cache.get("tenant", "b") is None
+        assert cache.get("other", "a") is credentials
+
+    def test_zero_ttl_disables_cache(self):
+        cache = MCPProviderCredentialCache(ttl=0)
+        cache.set("tenant", "a", MCPProviderCredentials(provider_entity=MagicMock(), server_url="x", headers={}))
+        assert cache.get("tenant", "a") is None
@@ -0,0 +1,132 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from core.rag.datasource.segment_hydration_cache import SegmentHydrationCache
+from models.dataset import DocumentSegment
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self._redis.values[key] = value
+
+    def execute(self) -> None:
+        pass
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    def incr(self, key: str) -> None:
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("core.rag.datasource.segment_hydration_cache.redis_client", redis):
+        yield redis
+
+
+def _cache(redis_enabled: bool = False) -> SegmentHydrationCache:
+    return SegmentHydrationCache(enabled=True, local_max_size=100, ttl=60, redis_enabled=redis_enabled)
+
+
+def _segment(segment_id: str, index_node_hash: str = "hash") -> DocumentSegment:
+    return DocumentSegment(
+        id=segment_id,
+        tenant_id="tenant-1",
+        dataset_id="dataset-1",
+        document_id="document-1",
+        index_node_id=f"node-{segment_id}",
+        index_node_hash=index_node_hash,
+        position=1,
+        content=f"content {segment_id}",
+        word_count=1,
+        tokens=1,
+        created_by="user-1",
+        created_at=datetime(2025, 1, 1, 12, 30),
+    )
+
+
+class _Loader:
+    def __init__(self, segments: list[DocumentSegment]) -> None:
+        self.segments = {segment.id: segment for segment in segments}
+        self.calls: list[list[str]] = []
+
+    def __call__(self, ids: list[str]) -> dict[str, DocumentSegment]:
+        self.calls.append(ids)
+        return {segment_id: self.segments[segment_id] for segment_id in ids if segment_id in self.segments}
+
+
+def test_cached_rows_are_not_loaded_again(fake_redis):
+    cache = _cache()
+    load = _Loader([_segment("a"), _segment("b")])
+
+    cache.hydrate("segment", DocumentSegment, ["a"], cache.versions(["dataset-1"]), load)
+    result = cache.hydrate("segment", DocumentSegment, ["a", "b"], cache.versions(["dataset-1"]), load)
+
+    assert load.calls == [["a"], ["b"]]
+    assert result["a"].content == "content a"
+    assert result["a"] is not load.segments["a"]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_invalidate_makes_dataset_rows_stale(fake_redis):
+    cache = _cache()
+    load = _Loader([_segment("a")])
+    cache.hydrate("segment", DocumentSegment, ["a"], cache.versions(["dataset-1"]), load)
+
+    cache.invalidate("dataset-1")
+    cache.hydrate("segment", DocumentSegment, ["a"], cache.versions(["dataset-1"]), load)
+
+    assert load.calls == [["a"], ["a"]]
+
+
+def test_rows_failing_freshness_check_are_reloaded(fake_redis):
+    cache = _cache()
+    load = _Loader([_segment("a", index_node_hash="old")])
+    versions = cache.versions(["dataset-1"])
+    cache.hydrate("segment", DocumentSegment, ["a"], versions, load)
+
+    load.segments["a"] = _segment("a", index_node_hash="new")
+    result = cache.hydrate(
+        "segment", DocumentSegment, ["a"], versions, load, is_fresh=lambda segment: segment.index_node_hash == "new"
+    )
+
+    assert load.calls == [["a"], ["a"]]
+    assert result["a"].index_node_hash == "new"
+
+
+def test_rows_are_shared_through_redis(fake_redis):
+    load = _Loader([_segment("a")])
+    _cache(redis_enabled=True).hydrate("segment", DocumentSegment, ["a"], {"dataset-1": 0}, load)
+
+    result = _cache(redis_enabled=True).hydrate("segment", DocumentSegment, ["a"], {"dataset-1": 0}, load)
+
+    assert load.calls == [["a"]]
+    assert result["a"].created_at == datetime(2025, 1, 1, 12, 30)
+
+
+def test_cache_is_bypassed_without_versions(fake_redis):
+    cache = SegmentHydrationCache(enabled=False, local_max_size=100, ttl=60, redis_enabled=False)
+    load = _Loader([_segment("a")])
+
+    versions = cache.versions(["dataset-1"])
+    cache.hydrate("segment", DocumentSegment, ["a"], versions, load)
+    cache.hydrate("segment", DocumentSegment, ["a"], versions, load)
+
+    assert versions is None
+    assert load.calls == [["a"], ["a"]]
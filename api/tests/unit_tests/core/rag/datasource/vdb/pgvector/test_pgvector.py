@@ -1,16 +1,20 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+import psycopg2.pool
 import pytest
 
 from core.rag.datasource.vdb.pgvector.pgvector import (
+    BlockingThreadedConnectionPool,
     PGVector,
     PGVectorConfig,
 )
+from core.rag.datasource.vdb.vector_client_registry import vector_client_registry
 
 
 class TestPGVector(unittest.TestCase):
     def setUp(self):
+        vector_client_registry.clear()
         self.config = PGVectorConfig(
             host="localhost",
             port=5432,
@@ -23,7 +27,7 @@ class TestPGVector(unittest.TestCase):
         )
         self.collection_name = "test_collection"
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     def test_init(self, mock_pool_class):
         """Test PGVector initialization."""
         mock_pool = MagicMock()
@@ -38,7 +42,18 @@ class TestPGVector(unittest.TestCase):
         assert pgvector.pg_bigm is False
         assert pgvector.index_hash is not None
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
+    def test_instances_share_connection_pool(self, mock_pool_class):
+        """Test PGVector instances with the same config reuse one connection pool."""
+        mock_pool_class.return_value = MagicMock()
+
+        first = PGVector("collection_a", self.config)
+        second = PGVector("collection_b", self.config)
+
+        assert first.pool is second.pool
+        mock_pool_class.assert_called_once()
+
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     def test_init_with_pg_bigm(self, mock_pool_class):
         """Test PGVector initialization with pg_bigm enabled."""
         config = PGVectorConfig(
@@ -58,7 +73,7 @@ class TestPGVector(unittest.TestCase):
 
         assert pgvector.pg_bigm is True
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     @patch("core.rag.datasource.vdb.pgvector.pgvector.redis_client")
     def test_create_collection_basic(self, mock_redis, mock_pool_class):
         """Test basic collection creation."""
@@ -101,7 +116,7 @@ class TestPGVector(unittest.TestCase):
         # Verify Redis cache was set
         mock_redis.set.assert_called_once()
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     @patch("core.rag.datasource.vdb.pgvector.pgvector.redis_client")
     def test_create_collection_with_large_dimension(self, mock_redis, mock_pool_class):
         """Test collection creation with dimension > 2000 (no HNSW index)."""
@@ -136,7 +151,7 @@ class TestPGVector(unittest.TestCase):
         hnsw_index_calls = [call for call in mock_cursor.execute.call_args_list if "hnsw" in str(call)]
         assert len(hnsw_index_calls) == 0
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     @patch("core.rag.datasource.vdb.pgvector.pgvector.redis_client")
     def test_create_collection_with_pg_bigm(self, mock_redis, mock_pool_class):
         """Test collection creation with pg_bigm enabled."""
@@ -177,7 +192,7 @@ class TestPGVector(unittest.TestCase):
         bigm_index_calls = [call for call in mock_cursor.execute.call_args_list if "gin_bigm_ops" in str(call)]
         assert len(bigm_index_calls) == 1
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     @patch("core.rag.datasource.vdb.pgvector.pgvector.redis_client")
     def test_create_collection_creates_vector_extension(self, mock_redis, mock_pool_class):
         """Test that vector extension is created if it doesn't exist."""
@@ -210,7 +225,7 @@ class TestPGVector(unittest.TestCase):
         ]
         assert len(create_extension_calls) == 1
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     @patch("core.rag.datasource.vdb.pgvector.pgvector.redis_client")
     def test_create_collection_with_cache_hit(self, mock_redis, mock_pool_class):
         """Test that collection creation is skipped when cache exists."""
@@ -237,7 +252,7 @@ class TestPGVector(unittest.TestCase):
         # Check that no SQL was executed (early return due to cache)
         assert mock_cursor.execute.call_count == 0
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     @patch("core.rag.datasource.vdb.pgvector.pgvector.redis_client")
     def test_create_collection_with_redis_lock(self, mock_redis, mock_pool_class):
         """Test that Redis lock is used during collection creation."""
@@ -270,7 +285,7 @@ class TestPGVector(unittest.TestCase):
         mock_lock.__enter__.assert_called_once()
         mock_lock.__exit__.assert_called_once()
 
-    @patch("core.rag.datasource.vdb.pgvector.pgvector.psycopg2.pool.SimpleConnectionPool")
+    @patch("core.rag.datasource.vdb.pgvector.pgvector.BlockingThreadedConnectionPool")
     def test_get_cursor_context_manager(self, mock_pool_class):
         """Test that _get_cursor properly manages connection lifecycle."""
         mock_pool = MagicMock()
@@ -325,3 +340,16 @@ def test_config_validation_parametrized(invalid_config_override):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+@patch("psycopg2.pool.ThreadedConnectionPool.getconn")
+def test_pool_raises_when_no_connection_is_released_in_time(mock_getconn):
+    pool = BlockingThreadedConnectionPool(0, 1, timeout=0.01)
+    conn = pool.getconn()
+
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+
+    with patch("psycopg2.pool.ThreadedConnectionPool.putconn"):
+        pool.putconn(conn)
+    assert pool.getconn() is mock_getconn.return_value
@@ -0,0 +1,105 @@
+import gc
+from unittest.mock import MagicMock
+
+from pydantic import BaseModel
+
+from core.rag.datasource.vdb.vector_client_registry import VectorClientRegistry
+
+
+class _Config(BaseModel):
+    endpoint: str
+
+
+class _Owner:
+    pass
+
+
+def _registry(**kwargs) -> VectorClientRegistry:
+    options = {"enabled": True, "idle_timeout": 600.0, "health_check_interval": 0.0}
+    options.update(kwargs)
+    return VectorClientRegistry(**options)
+
+
+def test_same_config_reuses_client():
+    registry = _registry()
+    factory = MagicMock(side_effect=lambda: object())
+    owners = [_Owner(), _Owner()]
+
+    first = registry.acquire(owners[0], "pgvector", _Config(endpoint="a"), factory)
+    second = registry.acquire(owners[1], "pgvector", _Config(endpoint="a"), factory)
+    other = registry.acquire(_Owner(), "pgvector", _Config(endpoint="b"), factory)
+
+    assert first is second
+    assert other is not first
+    assert factory.call_count == 2
+    stats = registry.stats()
+    assert stats.created == 2
+    assert stats.reused == 1
+    assert stats.clients == 2
+
+
+def test_lease_is_released_when_owner_is_collected():
+    registry = _registry()
+    owner = _Owner()
+    registry.acquire(owner, "qdrant", _Config(endpoint="a"), object)
+    assert registry.stats().leases == 1
+
+    del owner
+    gc.collect()
+
+    assert registry.stats().leases == 0
+
+
+def test_idle_client_is_closed():
+    registry = _registry(idle_timeout=0.0001)
+    close = MagicMock()
+    owner = _Owner()
+    client = registry.acquire(owner, "milvus", _Config(endpoint="a"), object, close=close)
+
+    # Leased clients are never evicted.
+    registry.acquire(_Owner(), "milvus", _Config(endpoint="b"), object)
+    close.assert_not_called()
+
+    del owner
+    gc.collect()
+    registry.acquire(_Owner(), "milvus", _Config(endpoint="b"), object)
+
+    close.assert_called_once_with(client)
+    assert registry.stats().evicted == 1
+
+
+def test_unhealthy_client_is_replaced():
+    registry = _registry()
+    close = MagicMock()
+    owner = _Owner()
+    unhealthy = registry.acquire(
+        owner, "weaviate", _Config(endpoint="a"), object, health_check=lambda c: False, close=close
+    )
+
+    replacement = registry.acquire(
+        _Owner(), "weaviate", _Config(endpoint="a"), object, health_check=lambda c: False, close=close
+    )
+
+    assert replacement is not unhealthy
+    assert registry.stats().health_check_failures == 1
+    # The owner leasing the unhealthy client may still be using it.
+    close.assert_not_called()
+
+    del owner
+    gc.collect()
+
+    close.assert_called_once_with(unhealthy)
+
+
+def test_disabled_registry_creates_client_per_owner_and_closes_it():
+    registry = _registry(enabled=False)
+    close = MagicMock()
+    owner = _Owner()
+
+    client = registry.acquire(owner, "weaviate", _Config(endpoint="a"), object, close=close)
+    assert registry.acquire(_Owner(), "weaviate", _Config(endpoint="a"), object) is not client
+
+    del owner
+    gc.collect()
+
+    close.assert_called_once_with(client)
@@ -0,0 +1,87 @@
+import pickle
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core.rag.embedding.embedding_cache_store import EmbeddingCacheStore, partition_month
+from services.embedding_cache_partition_service import next_month
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def _row(row_id: str, hash: str, month: int, embedding: list[float], last_hit_at: datetime | None = None):
+    return SimpleNamespace(
+        id=row_id,
+        hash=hash,
+        partition_month=month,
+        last_hit_at=last_hit_at,
+        embedding=pickle.dumps(embedding),
+    )
+
+
+def _store(**kwargs) -> EmbeddingCacheStore:
+    options = {"hit_tracking_enabled": True, "hit_flush_interval": 300, "legacy_lookup_enabled": False}
+    options.update(kwargs)
+    return EmbeddingCacheStore(**options)
+
+
+def test_partition_month_and_next_month():
+    assert partition_month(NOW) == 202610
+    assert next_month(202610) == 202611
+    assert next_month(202612) == 202701
+
+
+@patch("core.rag.embedding.embedding_cache_store.naive_utc_now", return_value=NOW)
+def test_get_prefers_latest_partition_and_records_stale_hits(mock_now):
+    session = MagicMock()
+    session.execute.return_value.all.return_value = [
+        _row("current", "a", 202610, [1.0]),
+        _row("old-a", "a", 202609, [0.5]),
+        _row("old-b", "b", 202609, [2.0]),
+        _row("recent-hit", "c", 202608, [3.0], last_hit_at=NOW - timedelta(hours=1)),
+    ]
+    store = _store()
+
+    embeddings = store.get(session, "openai", "text-embedding-3-small", ["a", "b", "c", "d"])
+
+    assert embeddings == {"a": [1.0], "b": [2.0], "c": [3.0]}
+    # Only the row of a previous month that wasn't hit within the last day is recorded
+    assert dict(store._pending_hits) == {202609: {"old-b"}}
+
+
+@patch("core.rag.embedding.embedding_cache_store.naive_utc_now", return_value=NOW)
+def test_get_falls_back_to_legacy_table(mock_now):
+    session = MagicMock()
+    session.execute.return_value.all.return_value = [_row("current", "a", 202610, [1.0])]
+    legacy_row = MagicMock(hash="b")
+    legacy_row.get_embedding.return_value = [2.0]
+    session.scalars.return_value.all.return_value = [legacy_row]
+    store = _store(legacy_lookup_enabled=True)
+
+    embeddings = store.get(session, "openai", "text-embedding-3-small", ["a", "b"])
+
+    assert embeddings == {"a": [1.0], "b": [2.0]}
+    session.scalars.assert_called_once()
+
+
+@patch("core.rag.embedding.embedding_cache_store.naive_utc_now", return_value=NOW)
+def test_add_writes_rows_of_current_month(mock_now):
+    session = MagicMock()
+
+    _store().add(session, "openai", "text-embedding-3-small", {"a": [1.0], "b": [2.0]})
+
+    rows = [call.args[0] for call in session.add.call_args_list]
+    assert [(row.hash, row.partition_month) for row in rows] == [("a", 202610), ("b", 202610)]
+    assert rows[0].get_embedding() == [1.0]
+
+
+def test_flush_hits_updates_pending_rows():
+    store = _store(hit_flush_interval=0)
+    session = MagicMock()
+    with patch("core.rag.embedding.embedding_cache_store.session_factory") as mock_session_factory:
+        mock_session_factory.create_session.return_value.__enter__.return_value = session
+
+        store._record_hits([(202609, "old-a"), (202608, "old-b")])
+
+    assert session.execute.call_count == 2
+    assert not store._pending_hits
@@ -43,7 +43,9 @@ All tests use mocking to avoid external dependencies and ensure fast, reliable e
 Tests follow the Arrange-Act-Assert pattern for clarity.
 """
 
-import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
@@ -60,7 +62,14 @@ from core.model_runtime.errors.invoke import (
     InvokeRateLimitError,
 )
 from core.rag.embedding.cached_embedding import CacheEmbedding
-from models.dataset import Embedding
+from core.rag.embedding.query_embedding_cache import query_embedding_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_query_embedding_cache():
+    query_embedding_cache.clear_local()
+    yield
+    query_embedding_cache.clear_local()
 
 
 class TestCacheEmbeddingDocuments:
@@ -236,12 +245,14 @@ class TestCacheEmbeddingDocuments:
         cached_vector = np.random.randn(1536)
         normalized_cached = (cached_vector / np.linalg.norm(cached_vector)).tolist()
 
-        mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized_cached
-
-        with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            # Mock database to return cached embedding (cache hit)
-            mock_session.query.return_value.filter_by.return_value.first.return_value = mock_cached_embedding
+        with (
+            patch("core.rag.embedding.cached_embedding.db.session") as mock_session,
+            patch("core.rag.embedding.cached_embedding.embedding_cache_store") as mock_store,
+        ):
+            # Mock the cache store to return the cached embedding (cache hit)
+            mock_store.get.side_effect = lambda session, provider, model, hashes: dict.fromkeys(
+                hashes, normalized_cached
+            )
 
             # Act
             result = cache_embedding.embed_documents(texts)
@@ -255,6 +266,7 @@ class TestCacheEmbeddingDocuments:
 
             # Verify no new cache entries were added
             mock_session.add.assert_not_called()
+            mock_store.add.assert_not_called()
 
     def test_embed_documents_partial_cache_hit(self, mock_model_instance):
         """Test embedding documents with mixed cache hits and misses.
@@ -276,9 +288,6 @@ class TestCacheEmbeddingDocuments:
         cached_vector = np.random.randn(1536)
         normalized_cached = (cached_vector / np.linalg.norm(cached_vector)).tolist()
 
-        mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized_cached
-
         # Create new embeddings for non-cached texts
         new_embeddings = []
         for _ in range(2):
@@ -302,8 +311,11 @@ class TestCacheEmbeddingDocuments:
             usage=usage,
         )
 
-        with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
-            with patch("core.rag.embedding.cached_embedding.helper.generate_text_hash") as mock_hash:
+        with patch("core.rag.embedding.cached_embedding.db.session"):
+            with (
+                patch("core.rag.embedding.cached_embedding.embedding_cache_store") as mock_store,
+                patch("core.rag.embedding.cached_embedding.helper.generate_text_hash") as mock_hash,
+            ):
                 # Mock hash generation to return predictable values
                 hash_counter = [0]
 
@@ -313,20 +325,8 @@ class TestCacheEmbeddingDocuments:
 
                 mock_hash.side_effect = generate_hash
 
-                # Mock database to return cached embedding only for first text (hash_1)
-                call_count = [0]
-
-                def mock_filter_by(**kwargs):
-                    call_count[0] += 1
-                    mock_query = Mock()
-                    # First call (hash_1) returns cached, others return None
-                    if call_count[0] == 1:
-                        mock_query.first.return_value = mock_cached_embedding
-                    else:
-                        mock_query.first.return_value = None
-                    return mock_query
-
-                mock_session.query.return_value.filter_by = mock_filter_by
+                # Mock the cache store to return a cached embedding only for the first text (hash_1)
+                mock_store.get.return_value = {"hash_1": normalized_cached}
                 mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
                 # Act
@@ -635,7 +635,7 @@ class TestCacheEmbeddingQuery:
             usage=usage,
         )
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             # Mock Redis cache miss
             mock_redis.get.return_value = None
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
@@ -671,7 +671,7 @@ class TestCacheEmbeddingQuery:
         Verifies:
         - Cached embedding is retrieved from Redis
         - Model is not invoked
-        - Cache TTL is extended
+        - Repeated lookups don't go to Redis
         """
         # Arrange
         cache_embedding = CacheEmbedding(mock_model_instance)
@@ -681,27 +681,29 @@ class TestCacheEmbeddingQuery:
         vector = np.random.randn(1536)
         normalized = vector / np.linalg.norm(vector)
 
-        # Encode to base64 (as stored in Redis)
-        vector_bytes = normalized.tobytes()
-        encoded_vector = base64.b64encode(vector_bytes).decode("utf-8")
+        # Raw float32 bytes (as stored in Redis)
+        vector_bytes = normalized.astype(np.float32).tobytes()
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             # Mock Redis cache hit
-            mock_redis.get.return_value = encoded_vector
+            mock_redis.get.return_value = vector_bytes
 
             # Act
             result = cache_embedding.embed_query(query)
+            second_result = cache_embedding.embed_query(query)
 
             # Assert
             assert isinstance(result, list)
             assert len(result) == 1536
+            assert np.allclose(result, normalized, atol=1e-6)
 
             # Verify model was NOT invoked (cache hit)
             mock_model_instance.invoke_text_embedding.assert_not_called()
 
-            # Verify cache TTL was extended
-            mock_redis.expire.assert_called_once()
-            assert mock_redis.expire.call_args[0][1] == 600
+            # Verify the second lookup was served by the in-process cache
+            assert second_result == result
+            mock_redis.get.assert_called_once()
+            mock_redis.expire.assert_not_called()
 
     def test_embed_query_nan_handling(self, mock_model_instance):
         """Test handling of NaN values in query embeddings.
@@ -734,7 +736,7 @@ class TestCacheEmbeddingQuery:
             usage=usage,
         )
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             mock_redis.get.return_value = None
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
@@ -755,7 +757,7 @@ class TestCacheEmbeddingQuery:
         cache_embedding = CacheEmbedding(mock_model_instance)
         query = "Test query"
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             mock_redis.get.return_value = None
 
             # Mock model to raise connection error
@@ -799,7 +801,7 @@ class TestCacheEmbeddingQuery:
             usage=usage,
         )
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             mock_redis.get.return_value = None
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
@@ -812,6 +814,44 @@ class TestCacheEmbeddingQuery:
 
             assert "Redis connection failed" in str(exc_info.value)
 
+    def test_embed_query_coalesces_concurrent_requests(self, mock_model_instance):
+        """Test that concurrent identical queries invoke the model once.
+
+        Verifies:
+        - Only the first request invokes the model
+        - Concurrent requests for the same query wait for its result
+        """
+        # Arrange
+        cache_embedding = CacheEmbedding(mock_model_instance)
+        query = "Shared query"
+        normalized = (np.ones(8) / np.linalg.norm(np.ones(8))).tolist()
+        started = threading.Event()
+        release = threading.Event()
+
+        def invoke_text_embedding(**kwargs):
+            started.set()
+            release.wait(timeout=5)
+            return Mock(embeddings=[normalized])
+
+        mock_model_instance.invoke_text_embedding.side_effect = invoke_text_embedding
+
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
+            mock_redis.get.return_value = None
+
+            # Act
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                first = executor.submit(cache_embedding.embed_query, query)
+                started.wait(timeout=5)
+                others = [executor.submit(cache_embedding.embed_query, query) for _ in range(3)]
+                time.sleep(0.05)
+                release.set()
+                results = [first.result()] + [future.result() for future in others]
+
+            # Assert
+            mock_model_instance.invoke_text_embedding.assert_called_once()
+            mock_redis.setex.assert_called_once()
+            assert all(result == results[0] for result in results)
+
 
 class TestEmbeddingModelSwitching:
     """Test suite for embedding model switching functionality.
@@ -965,7 +1005,7 @@ class TestEmbeddingModelSwitching:
             usage=usage_cohere,
         )
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             mock_redis.get.return_value = None
 
             model_instance_openai.invoke_text_embedding.return_value = result_openai
@@ -1609,7 +1649,7 @@ class TestEmbeddingEdgeCases:
             usage=usage,
         )
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             mock_redis.get.return_value = None
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
 
@@ -1740,12 +1780,12 @@ class TestEmbeddingCachePerformance:
         vector = np.random.randn(1536)
         normalized = (vector / np.linalg.norm(vector)).tolist()
 
-        mock_cached_embedding = Mock(spec=Embedding)
-        mock_cached_embedding.get_embedding.return_value = normalized
-
-        with patch("core.rag.embedding.cached_embedding.db.session") as mock_session:
+        with (
+            patch("core.rag.embedding.cached_embedding.db.session"),
+            patch("core.rag.embedding.cached_embedding.embedding_cache_store") as mock_store,
+        ):
             # First call: cache miss
-            mock_session.query.return_value.filter_by.return_value.first.return_value = None
+            mock_store.get.return_value = {}
 
             usage = EmbeddingUsage(
                 tokens=5,
@@ -1773,7 +1813,7 @@ class TestEmbeddingCachePerformance:
             assert len(result1) == 1
 
             # Arrange - Second call: cache hit
-            mock_session.query.return_value.filter_by.return_value.first.return_value = mock_cached_embedding
+            mock_store.get.side_effect = lambda session, provider, model, hashes: dict.fromkeys(hashes, normalized)
 
             # Act - Second call (cache hit)
             result2 = cache_embedding.embed_documents([text])
@@ -1860,7 +1900,7 @@ class TestEmbeddingCachePerformance:
 
         Verifies:
         - Cache entries have appropriate TTL (600 seconds)
-        - TTL is extended on cache hits
+        - Cache hits don't extend the TTL
         - Expired entries are regenerated
 
         Context:
@@ -1894,7 +1934,7 @@ class TestEmbeddingCachePerformance:
             usage=usage,
         )
 
-        with patch("core.rag.embedding.cached_embedding.redis_client") as mock_redis:
+        with patch("core.rag.embedding.query_embedding_cache.redis_client") as mock_redis:
             # Test cache miss - sets TTL
             mock_redis.get.return_value = None
             mock_model_instance.invoke_text_embedding.return_value = embedding_result
@@ -1907,15 +1947,15 @@ class TestEmbeddingCachePerformance:
             call_args = mock_redis.setex.call_args
             assert call_args[0][1] == 600  # TTL in seconds
 
-            # Test cache hit - extends TTL
+            # Test cache hit in Redis once the in-process entry is gone - TTL is left alone
+            query_embedding_cache.clear_local()
             mock_redis.reset_mock()
-            vector_bytes = np.array(normalized).tobytes()
-            encoded_vector = base64.b64encode(vector_bytes).decode("utf-8")
-            mock_redis.get.return_value = encoded_vector
+            mock_redis.get.return_value = np.array(normalized, dtype=np.float32).tobytes()
 
             # Act
             cache_embedding.embed_query(query)
 
-            # Assert - TTL was extended
-            mock_redis.expire.assert_called_once()
-            assert mock_redis.expire.call_args[0][1] == 600
+            # Assert - served from Redis without touching the TTL
+            mock_redis.get.assert_called_once()
+            mock_redis.expire.assert_not_called()
+            mock_redis.setex.assert_not_called()
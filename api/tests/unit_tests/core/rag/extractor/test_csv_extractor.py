@@ -0,0 +1,63 @@
+from types import GeneratorType
+
+from core.rag.extractor.csv_extractor import CSVExtractor
+from core.rag.extractor.entity.datasource_type import DatasourceType
+from core.rag.extractor.entity.extract_setting import ExtractSetting
+from core.rag.extractor.extract_processor import ExtractProcessor
+
+
+def _write_csv(tmp_path, content: str, encoding: str = "utf-8") -> str:
+    file_path = tmp_path / "data.csv"
+    file_path.write_bytes(content.encode(encoding))
+    return str(file_path)
+
+
+def test_extract_returns_one_document_per_row(tmp_path):
+    file_path = _write_csv(tmp_path, "name,age\nalice,30\nbob,40\n")
+
+    docs = CSVExtractor(file_path).extract()
+
+    assert [doc.page_content for doc in docs] == ["name: alice;age: 30", "name: bob;age: 40"]
+    assert [doc.metadata["row"] for doc in docs] == [0, 1]
+
+
+def test_extract_iter_streams_rows_across_chunks(tmp_path):
+    rows = "\n".join(f"row{i},{i}" for i in range(25))
+    file_path = _write_csv(tmp_path, "name,value\n" + rows + "\n")
+
+    extractor = CSVExtractor(file_path, chunk_size=10)
+    docs = extractor.extract_iter()
+
+    assert isinstance(docs, GeneratorType)
+    docs = list(docs)
+    assert len(docs) == 25
+    assert docs[-1].page_content == "name: row24;value: 24"
+    # Row numbers keep increasing across chunks.
+    assert [doc.metadata["row"] for doc in docs] == list(range(25))
+
+
+def test_extract_iter_with_source_column(tmp_path):
+    file_path = _write_csv(tmp_path, "url,title\nhttps://a,A\n")
+
+    docs = list(CSVExtractor(file_path, source_column="url").extract_iter())
+
+    assert docs[0].metadata["source"] == "https://a"
+
+
+def test_extract_autodetects_encoding(tmp_path):
+    file_path = _write_csv(tmp_path, "name,city\nZoë,Zürich\n", encoding="latin-1")
+
+    docs = CSVExtractor(file_path, encoding="utf-8", autodetect_encoding=True).extract()
+
+    assert len(docs) == 1
+    assert "Zürich" in docs[0].page_content
+
+
+def test_extract_processor_streams_csv_rows(tmp_path):
+    file_path = _write_csv(tmp_path, "name,age\nalice,30\nbob,40\n")
+    extract_setting = ExtractSetting(datasource_type=DatasourceType.FILE, document_model="text_model")
+
+    docs = ExtractProcessor.extract_iter(extract_setting, file_path=file_path)
+
+    assert isinstance(docs, GeneratorType)
+    assert [doc.page_content for doc in docs] == ["name: alice;age: 30", "name: bob;age: 40"]
@@ -60,6 +60,7 @@ from core.indexing_runner import (
     DocumentIsDeletedPausedError,
     DocumentIsPausedError,
     IndexingRunner,
+    _IndexingJob,
 )
 from core.model_runtime.entities.model_entities import ModelType
 from core.rag.index_processor.constant.index_type import IndexStructureType
@@ -428,6 +429,46 @@ class TestIndexingRunnerExtract:
         # Assert
         assert result == []
 
+    def test_extract_lazily_streams_csv_rows(self, mock_dependencies, sample_dataset_document, sample_process_rule):
+        """Test rows of an uploaded CSV file are yielded while it is parsed, then the status is updated."""
+        runner = IndexingRunner()
+        mock_dependencies["db"].session.scalars.return_value.one_or_none.return_value.extension = "csv"
+        mock_processor = MagicMock()
+        mock_processor.extract_iter.return_value = iter(
+            [Document(page_content=f"row {i}", metadata={"row": i}) for i in range(3)]
+        )
+
+        with (
+            patch.object(runner, "_update_document_index_status") as mock_update_status,
+            patch("core.indexing_runner.select"),
+            patch("core.indexing_runner.ExtractSetting"),
+        ):
+            rows = runner._extract_lazily(mock_processor, sample_dataset_document, sample_process_rule)
+            first = next(iter(rows))
+            mock_update_status.assert_not_called()
+            result = [first, *rows]
+
+        assert [doc.page_content for doc in result] == ["row 0", "row 1", "row 2"]
+        assert all(doc.metadata["document_id"] == sample_dataset_document.id for doc in result)
+        mock_update_status.assert_called_once()
+        mock_processor.extract.assert_not_called()
+
+    def test_extract_lazily_loads_full_doc_parent_child_documents(
+        self, mock_dependencies, sample_dataset_document, sample_process_rule
+    ):
+        """Test the full-doc parent-child index extracts all rows at once, they become one parent chunk."""
+        runner = IndexingRunner()
+        mock_dependencies["db"].session.scalars.return_value.one_or_none.return_value.extension = "csv"
+        sample_process_rule["rules"]["parent_mode"] = "full-doc"
+        mock_processor = MagicMock()
+
+        with patch.object(runner, "_extract", return_value=[]) as mock_extract:
+            result = runner._extract_lazily(mock_processor, sample_dataset_document, sample_process_rule)
+
+        assert result == []
+        mock_extract.assert_called_once()
+        mock_processor.extract_iter.assert_not_called()
+
 
 class TestIndexingRunnerTransform:
     """Unit tests for IndexingRunner._transform method.
@@ -517,6 +558,22 @@ class TestIndexingRunnerTransform:
         )
         mock_processor.transform.assert_called_once()
 
+    def test_transform_splits_lazily_extracted_rows_in_batches(self, mock_dependencies, sample_dataset):
+        """Test lazily extracted rows are transformed in batches, keeping their order."""
+        runner = IndexingRunner()
+        sample_dataset.indexing_technique = "economy"
+        mock_processor = MagicMock()
+        mock_processor.transform.side_effect = lambda docs, *args, **kwargs: [
+            Document(page_content=doc.page_content.upper(), metadata={}) for doc in docs
+        ]
+        rows = (Document(page_content=f"row {i}", metadata={}) for i in range(5))
+
+        with patch("core.indexing_runner._TRANSFORM_BATCH_SIZE", 2):
+            result = runner._transform(mock_processor, sample_dataset, rows, "English", {"mode": "automatic"})
+
+        assert [doc.page_content for doc in result] == ["ROW 0", "ROW 1", "ROW 2", "ROW 3", "ROW 4"]
+        assert [len(call.args[0]) for call in mock_processor.transform.call_args_list] == [2, 2, 1]
+
     def test_transform_with_economy_indexing(self, mock_dependencies, sample_dataset, sample_text_docs):
         """Test transformation with economy indexing (no embeddings)."""
         # Arrange
@@ -982,6 +1039,130 @@ class TestIndexingRunnerRun:
         assert mock_extract.call_count == len(docs)
 
 
+class TestIndexingRunnerPipelinedRun:
+    """Unit tests for the concurrent indexing pipeline used for batches of documents.
+
+    Tests cover:
+    - Every document passing extract, split and load
+    - Per-document error handling without stopping other documents
+    - Pause detection aborting the batch
+    - Cross-document embedding batches
+    """
+
+    @pytest.fixture
+    def dataset(self):
+        return create_mock_dataset(indexing_technique="economy")
+
+    @pytest.fixture
+    def dataset_documents(self, dataset):
+        return [create_mock_dataset_document(dataset_id=dataset.id, tenant_id=dataset.tenant_id) for _ in range(5)]
+
+    @pytest.fixture
+    def mock_dependencies(self, dataset, dataset_documents):
+        """Mock database lookups and the per-document steps shared with the sequential run."""
+        documents_by_id = {document.id: document for document in dataset_documents}
+
+        def get_side_effect(model_class, object_id):
+            if model_class is Dataset:
+                return dataset
+            return documents_by_id.get(object_id)
+
+        with (
+            patch("core.indexing_runner.db") as mock_db,
+            patch("core.indexing_runner.IndexProcessorFactory"),
+            patch("core.indexing_runner.ModelManager"),
+            patch("core.indexing_runner.dify_config") as mock_config,
+        ):
+            mock_config.INDEXING_PIPELINE_ENABLED = True
+            mock_config.INDEXING_PIPELINE_MIN_DOCUMENTS = 2
+            mock_config.INDEXING_PIPELINE_QUEUE_SIZE = 2
+            mock_config.INDEXING_PIPELINE_EXTRACT_WORKERS = 2
+            mock_config.INDEXING_PIPELINE_SPLIT_WORKERS = 2
+            mock_config.INDEXING_PIPELINE_LOAD_WORKERS = 2
+            mock_db.session.get.side_effect = get_side_effect
+
+            def query_side_effect(model):
+                query = MagicMock()
+                query.filter_by.return_value.first.return_value = dataset if model is Dataset else MagicMock()
+                return query
+
+            mock_db.session.query.side_effect = query_side_effect
+            mock_process_rule = Mock(spec=DatasetProcessRule)
+            mock_process_rule.to_dict.return_value = create_mock_process_rule()
+            mock_db.session.scalar.return_value = mock_process_rule
+            yield {"db": mock_db}
+
+    def _patch_steps(self, runner: IndexingRunner, **overrides):
+        steps = {
+            "_extract": MagicMock(return_value=[Document(page_content="Text", metadata={})]),
+            "_transform": MagicMock(
+                return_value=[Document(page_content="Chunk", metadata={"doc_id": "c1", "doc_hash": "h1"})]
+            ),
+            "_load_segments": MagicMock(),
+            "_load": MagicMock(),
+            "_handle_indexing_error": MagicMock(),
+        }
+        steps.update(overrides)
+        for name, mock in steps.items():
+            setattr(runner, name, mock)
+        return steps
+
+    def test_pipelined_run_indexes_all_documents(self, mock_dependencies, dataset_documents):
+        runner = IndexingRunner()
+        steps = self._patch_steps(runner)
+
+        runner.run(dataset_documents)
+
+        assert steps["_extract"].call_count == len(dataset_documents)
+        assert steps["_load_segments"].call_count == len(dataset_documents)
+        loaded_ids = {call.kwargs["dataset_document"].id for call in steps["_load"].call_args_list}
+        assert loaded_ids == {document.id for document in dataset_documents}
+        assert [metric.name for metric in runner.pipeline_metrics] == ["extract", "split", "embed", "load"]
+        assert all(metric.items == len(dataset_documents) for metric in runner.pipeline_metrics)
+
+    def test_pipelined_run_isolates_document_errors(self, mock_dependencies, dataset_documents):
+        runner = IndexingRunner()
+        failing_id = dataset_documents[2].id
+
+        def extract(index_processor, dataset_document, process_rule):
+            if dataset_document.id == failing_id:
+                raise ValueError("broken file")
+            return [Document(page_content="Text", metadata={})]
+
+        steps = self._patch_steps(runner, _extract=MagicMock(side_effect=extract))
+
+        runner.run(dataset_documents)
+
+        steps["_handle_indexing_error"].assert_called_once()
+        assert steps["_handle_indexing_error"].call_args.args[0] == failing_id
+        assert steps["_load"].call_count == len(dataset_documents) - 1
+
+    def test_pipelined_run_raises_when_document_paused(self, mock_dependencies, dataset_documents):
+        runner = IndexingRunner()
+        self._patch_steps(runner, _load_segments=MagicMock(side_effect=DocumentIsPausedError()))
+
+        with pytest.raises(DocumentIsPausedError):
+            runner.run(dataset_documents)
+
+    def test_embed_stage_batches_texts_across_documents(self):
+        runner = IndexingRunner()
+        model_instance = MagicMock(provider="openai", model="text-embedding-3-small")
+        jobs = [
+            _IndexingJob(
+                document_id=str(i),
+                doc_form=IndexStructureType.PARAGRAPH_INDEX,
+                documents=[Document(page_content=f"chunk {i}", metadata={})],
+                embedding_model_instance=model_instance,
+            )
+            for i in range(3)
+        ]
+
+        with patch("core.indexing_runner.CacheEmbedding") as mock_cache_embedding:
+            assert runner._pipeline_embed(jobs) == jobs
+
+        mock_cache_embedding.return_value.embed_documents.assert_called_once_with(["chunk 0", "chunk 1", "chunk 2"])
+
+
 class TestIndexingRunnerRetryLogic:
     """Unit tests for retry logic and error handling.
 
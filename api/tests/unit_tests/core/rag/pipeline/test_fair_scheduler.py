@@ -0,0 +1,277 @@
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from operator import itemgetter
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import LockError
+
+from core.rag.pipeline.fair_scheduler import ScheduledTask, TenantFairScheduler
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self._values: dict[str, str] = {}
+        self._lists: dict[str, list[str]] = {}
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._zsets: dict[str, dict[str, float]] = {}
+
+    def get(self, key: str) -> str | None:
+        return self._values.get(key)
+
+    def set(self, key: str, value: object) -> None:
+        self._values[key] = str(value)
+
+    def rpush(self, key: str, *values: str) -> None:
+        self._lists.setdefault(key, []).extend(values)
+
+    def lpush(self, key: str, *values: str) -> None:
+        for value in values:
+            self._lists.setdefault(key, []).insert(0, value)
+
+    def lpop(self, key: str) -> str | None:
+        values = self._lists.get(key)
+        return values.pop(0) if values else None
+
+    def llen(self, key: str) -> int:
+        return len(self._lists.get(key, []))
+
+    def hset(self, key: str, field: str, value: object) -> None:
+        self._hashes.setdefault(key, {})[field] = str(value)
+
+    def hget(self, key: str, field: str) -> str | None:
+        return self._hashes.get(key, {}).get(field)
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self._hashes.get(key, {}))
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        values = self._hashes.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+
+    def zadd(self, key: str, mapping: dict[str, float], nx: bool = False, xx: bool = False, ch: bool = False) -> int:
+        zset = self._zsets.setdefault(key, {})
+        changed = 0
+        for member, score in mapping.items():
+            if (nx and member in zset) or (xx and member not in zset):
+                continue
+            changed += zset.get(member) != float(score)
+            zset[member] = float(score)
+        return changed
+
+    def zrem(self, key: str, member: str) -> None:
+        self._zsets.get(key, {}).pop(member, None)
+
+    def zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list:
+        items = sorted(self._zsets.get(key, {}).items(), key=itemgetter(1, 0))
+        return items if withscores else [member for member, _ in items]
+
+    def zremrangebyscore(self, key: str, min_score: str, max_score: float) -> None:
+        zset = self._zsets.get(key, {})
+        for member in [member for member, score in zset.items() if score <= max_score]:
+            del zset[member]
+
+    def eval(self, script: str, numkeys: int, *args: str) -> int:
+        # Only the script removing idle tenants is used, run atomically like Redis does
+        queue_key, pending_key, tenant_id = args
+        if self.llen(queue_key):
+            return 0
+        return int(self._zsets.get(pending_key, {}).pop(tenant_id, None) is not None)
+
+    def lock(self, name: str, timeout: int, blocking: bool):
+        return nullcontext()
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("core.rag.pipeline.fair_scheduler.redis_client", redis):
+        yield redis
+
+
+def _scheduler(tenant_concurrency: int = 1, global_concurrency: int = 0) -> TenantFairScheduler:
+    return TenantFairScheduler(
+        name="test", tenant_concurrency=tenant_concurrency, global_concurrency=global_concurrency, lease_ttl=60
+    )
+
+
+def _run(scheduler: TenantFairScheduler, rounds: int) -> list[str]:
+    """Dispatch and immediately complete tasks, returning the tenants in dispatch order."""
+    order: list[str] = []
+    for _ in range(rounds):
+        sent: list[ScheduledTask] = []
+        scheduler.dispatch(sent.append)
+        for task in sent:
+            order.append(task.tenant_id)
+            scheduler.complete(task.tenant_id, task.lease_id)
+    return order
+
+
+def test_tenants_are_served_in_proportion_to_weight(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=1, global_concurrency=1)
+    for index in range(30):
+        scheduler.enqueue("tenant-a", {"index": index}, weight=1)
+        scheduler.enqueue("tenant-b", {"index": index}, weight=2)
+
+    counts = Counter(_run(scheduler, rounds=30))
+
+    assert counts == {"tenant-a": 10, "tenant-b": 20}
+
+
+def test_large_backlog_does_not_starve_new_tenant(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=2, global_concurrency=2)
+    for index in range(100):
+        scheduler.enqueue("bulk-tenant", {"index": index})
+    _run(scheduler, rounds=10)
+
+    scheduler.enqueue("small-tenant", {"index": 0})
+
+    assert "small-tenant" in _run(scheduler, rounds=1)
+
+
+def test_task_cost_advances_virtual_time(fake_redis):
+    scheduler = _scheduler(global_concurrency=1)
+    scheduler.enqueue("tenant-a", {"documents": 10}, cost=10)
+    scheduler.enqueue("tenant-a", {"documents": 10}, cost=10)
+    for index in range(5):
+        scheduler.enqueue("tenant-b", {"index": index})
+
+    assert _run(scheduler, rounds=7) == [
+        "tenant-a",
+        "tenant-b",
+        "tenant-b",
+        "tenant-b",
+        "tenant-b",
+        "tenant-b",
+        "tenant-a",
+    ]
+
+
+def test_concurrency_caps_hold_tasks_back_until_completed(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=1, global_concurrency=2)
+    for tenant_id in ["tenant-a", "tenant-a", "tenant-b", "tenant-c"]:
+        scheduler.enqueue(tenant_id, {})
+
+    sent: list[ScheduledTask] = []
+    assert scheduler.dispatch(sent.append) == 2
+    assert sorted(task.tenant_id for task in sent) == ["tenant-a", "tenant-b"]
+    assert scheduler.dispatch(sent.append) == 0
+
+    scheduler.complete(sent[0].tenant_id, sent[0].lease_id)
+    assert scheduler.dispatch(sent.append) == 1
+    assert sent[-1].tenant_id == "tenant-c"
+
+
+def test_expired_leases_free_their_slot(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=1)
+    scheduler.enqueue("tenant-a", {"index": 0})
+    scheduler.enqueue("tenant-a", {"index": 1})
+
+    with patch("core.rag.pipeline.fair_scheduler.time.time", return_value=1000.0):
+        assert scheduler.dispatch(lambda task: None) == 1
+        assert scheduler.dispatch(lambda task: None) == 0
+    with patch("core.rag.pipeline.fair_scheduler.time.time", return_value=1061.0):
+        assert scheduler.dispatch(lambda task: None) == 1
+
+
+def test_renewed_leases_keep_holding_their_slot(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=1)
+    scheduler.enqueue("tenant-a", {"index": 0})
+    scheduler.enqueue("tenant-a", {"index": 1})
+
+    sent: list[ScheduledTask] = []
+    with patch("core.rag.pipeline.fair_scheduler.time.time", return_value=1000.0):
+        assert scheduler.dispatch(sent.append) == 1
+    with patch("core.rag.pipeline.fair_scheduler.time.time", return_value=1050.0):
+        assert scheduler.renew("tenant-a", sent[0].lease_id)
+    with patch("core.rag.pipeline.fair_scheduler.time.time", return_value=1061.0):
+        assert scheduler.dispatch(lambda task: None) == 0
+    with patch("core.rag.pipeline.fair_scheduler.time.time", return_value=1111.0):
+        assert scheduler.dispatch(lambda task: None) == 1
+        # An expired lease isn't brought back by a late renewal
+        assert not scheduler.renew("tenant-a", sent[0].lease_id)
+
+
+def test_hold_lease_renews_in_the_background(fake_redis):
+    scheduler = TenantFairScheduler(name="test", tenant_concurrency=1, global_concurrency=0, lease_ttl=1)
+    scheduler.enqueue("tenant-a", {})
+    sent: list[ScheduledTask] = []
+    scheduler.dispatch(sent.append)
+    renewed = threading.Event()
+
+    def renew(tenant_id: str, lease_id: str) -> bool:
+        renewed.set()
+        return True
+
+    with patch.object(scheduler, "renew", side_effect=renew) as mock_renew:
+        with scheduler.hold_lease("tenant-a", sent[0].lease_id):
+            assert renewed.wait(timeout=5)
+        mock_renew.assert_called_with("tenant-a", sent[0].lease_id)
+
+
+def test_dispatch_does_not_wait_for_a_busy_scheduler(fake_redis):
+    scheduler = _scheduler()
+    scheduler.enqueue("tenant-a", {"index": 0})
+    busy_lock = MagicMock()
+    busy_lock.__enter__.side_effect = LockError("Unable to acquire lock")
+
+    with patch.object(fake_redis, "lock", return_value=busy_lock) as mock_lock:
+        assert scheduler.dispatch(lambda task: None) == 0
+    assert mock_lock.call_args.kwargs["blocking"] is False
+
+
+def test_failed_send_puts_task_back(fake_redis):
+    scheduler = _scheduler()
+    scheduler.enqueue("tenant-a", {"index": 0})
+
+    def fail(task: ScheduledTask):
+        raise ConnectionError("broker down")
+
+    assert scheduler.dispatch(fail) == 0
+
+    sent: list[ScheduledTask] = []
+    assert scheduler.dispatch(sent.append) == 1
+    assert sent[0].data == {"index": 0}
+
+
+def test_snapshot_reports_queue_depth_and_running_tasks(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=1, global_concurrency=4)
+    scheduler.enqueue("tenant-a", {}, weight=2)
+    scheduler.enqueue("tenant-a", {}, weight=2)
+    scheduler.dispatch(lambda task: None)
+
+    snapshot = scheduler.snapshot()
+
+    assert snapshot.running == 1
+    assert snapshot.global_concurrency == 4
+    [tenant] = snapshot.tenants
+    assert (tenant.tenant_id, tenant.queued, tenant.running, tenant.weight, tenant.dispatched) == (
+        "tenant-a",
+        1,
+        1,
+        2.0,
+        1,
+    )
+
+
+def test_task_enqueued_while_its_tenant_is_seen_idle_is_dispatched(fake_redis):
+    scheduler = _scheduler(tenant_concurrency=2)
+    scheduler.enqueue("tenant-a", {"index": 0})
+    llen = fake_redis.llen
+
+    def llen_racing_enqueue(key: str) -> int:
+        length = llen(key)
+        if length == 0 and fake_redis.llen is llen_racing_enqueue:
+            fake_redis.llen = llen
+            # Enqueued between the emptiness check and the removal of the tenant from the pending set
+            scheduler.enqueue("tenant-a", {"index": 1})
+        return length
+
+    fake_redis.llen = llen_racing_enqueue
+    first: list[ScheduledTask] = []
+    scheduler.dispatch(first.append)
+    second: list[ScheduledTask] = []
+    scheduler.dispatch(second.append)
+
+    assert [task.data for task in first + second] == [{"index": 0}, {"index": 1}]
@@ -0,0 +1,105 @@
+import threading
+import time
+
+from core.rag.pipeline.staged_pipeline import PipelineStage, StagedPipeline
+
+
+def test_items_flow_through_all_stages():
+    results: list[int] = []
+    lock = threading.Lock()
+
+    def collect(batch: list[int]) -> list[int]:
+        with lock:
+            results.extend(batch)
+        return batch
+
+    pipeline = StagedPipeline(
+        stages=[
+            PipelineStage(name="double", process=lambda batch: [item * 2 for item in batch], workers=3),
+            PipelineStage(name="increment", process=lambda batch: [item + 1 for item in batch]),
+            PipelineStage(name="collect", process=collect, workers=2),
+        ],
+        queue_size=2,
+    )
+
+    metrics = pipeline.run(range(20))
+
+    assert sorted(results) == [item * 2 + 1 for item in range(20)]
+    assert [metric.name for metric in metrics] == ["double", "increment", "collect"]
+    assert all(metric.items == 20 for metric in metrics)
+
+
+def test_batching_stage_groups_queued_items_up_to_limit():
+    all_forwarded = threading.Event()
+    forwarded: list[int] = []
+    batches: list[list[int]] = []
+
+    def forward(batch: list[int]) -> list[int]:
+        forwarded.extend(batch)
+        if len(forwarded) == 7:
+            all_forwarded.set()
+        return batch
+
+    def record(batch: list[int]) -> list[int]:
+        if not batches:
+            # Hold the first batch until the remaining items are queued behind it.
+            all_forwarded.wait(timeout=5)
+            time.sleep(0.05)
+        batches.append(batch)
+        return batch
+
+    pipeline = StagedPipeline(
+        stages=[
+            PipelineStage(name="forward", process=forward),
+            PipelineStage(name="batch", process=record, batch_limit=lambda _: 4, batch_weight=lambda item: item),
+        ],
+        queue_size=10,
+    )
+
+    metrics = pipeline.run([1, 1, 1, 1, 1, 3, 5])
+
+    assert sorted(item for batch in batches for item in batch) == [1, 1, 1, 1, 1, 3, 5]
+    assert any(len(batch) > 1 for batch in batches)
+    # A batch only takes another item while its weight is below the limit.
+    assert all(sum(batch[:-1]) < 4 for batch in batches)
+    assert metrics[1].items == 7
+
+
+def test_failing_batch_is_dropped_and_counted():
+    loaded: list[int] = []
+
+    def fail_on_odd(batch: list[int]) -> list[int]:
+        if batch[0] % 2:
+            raise ValueError("odd")
+        return batch
+
+    pipeline = StagedPipeline(
+        stages=[
+            PipelineStage(name="check", process=fail_on_odd),
+            PipelineStage(name="load", process=lambda batch: loaded.extend(batch) or []),
+        ],
+        queue_size=4,
+    )
+
+    metrics = pipeline.run(range(6))
+
+    assert sorted(loaded) == [0, 2, 4]
+    assert metrics[0].errors == 3
+
+
+def test_abort_drops_remaining_work():
+    processed: list[int] = []
+    pipeline: StagedPipeline
+
+    def process(batch: list[int]) -> list[int]:
+        processed.extend(batch)
+        if batch[0] == 2:
+            pipeline.abort()
+        return batch
+
+    pipeline = StagedPipeline(stages=[PipelineStage(name="process", process=process)], queue_size=1)
+    pipeline.run(range(100))
+
+    assert pipeline.aborted
+    assert 2 in processed
+    assert len(processed) < 100
@@ -39,7 +39,7 @@ Test Architecture:
 ==================
 - **Fixtures**: Provide reusable mock objects (datasets, documents, Flask app)
 - **Mocking Strategy**: Mock at the method level (embedding_search, keyword_search, etc.)
-  rather than at the class level to properly simulate the ThreadPoolExecutor behavior
+  rather than at the class level to properly simulate the shared retrieval executor
 - **Pattern**: All tests follow Arrange-Act-Assert (AAA) pattern
 - **Isolation**: Each test is independent and doesn't rely on external state
 
@@ -60,7 +60,7 @@ TestRetrievalService::test_vector_search_basic -v
 
 Notes:
 ======
-- The RetrievalService uses ThreadPoolExecutor for concurrent search operations
+- The RetrievalService runs its search operations concurrently on the shared retrieval executor
 - Tests mock the individual search methods to avoid threading complexity
 - All mocked search methods modify the all_documents list in-place
 - Score thresholds and top-k limits are enforced by the search methods
@@ -143,7 +143,7 @@ def create_side_effect_for_search(documents: list[Document]):
         >>> mock_search.side_effect = create_side_effect_for_search([doc1, doc2])
 
     Note:
-        The RetrievalService uses ThreadPoolExecutor which submits tasks that
+        The RetrievalService runs search tasks on the shared retrieval executor that
         modify a shared all_documents list. This pattern simulates that behavior.
     """
 
@@ -242,7 +242,7 @@ class TestRetrievalService:
     =================
     Tests mock at the method level (embedding_search, keyword_search, etc.)
     rather than the underlying Vector/Keyword classes. This approach:
-    - Avoids complexity of mocking ThreadPoolExecutor behavior
+    - Avoids complexity of mocking the shared retrieval executor
     - Provides clearer test intent
     - Makes tests more maintainable
     - Properly simulates the in-place list modification pattern
@@ -349,91 +349,32 @@ class TestRetrievalService:
     @pytest.fixture(autouse=True)
     def mock_thread_pool(self):
         """
-        Mock ThreadPoolExecutor to run tasks synchronously in tests.
+        Run the tasks of the shared retrieval executor synchronously in tests.
 
-        The RetrievalService uses ThreadPoolExecutor to run search operations
-        concurrently (embedding_search, keyword_search, full_text_index_search).
-        In tests, we want synchronous execution for:
+        The RetrievalService runs its search operations (embedding_search, keyword_search,
+        full_text_index_search) as tasks of the shared retrieval executor. In tests, we want
+        synchronous execution for:
         - Deterministic behavior
         - Easier debugging
         - Avoiding race conditions
         - Simpler assertions
 
-        How it works:
-        -------------
-        1. Intercepts ThreadPoolExecutor creation
-        2. Replaces submit() to execute functions immediately (synchronously)
-        3. Functions modify shared all_documents list in-place
-        4. Mocks concurrent.futures.wait() since tasks are already done
-
-        Why this approach:
-        ------------------
-        - RetrievalService.retrieve() creates a ThreadPoolExecutor context
-        - It submits search tasks that modify all_documents list
-        - concurrent.futures.wait() waits for all tasks to complete
-        - By executing synchronously, we avoid threading complexity in tests
+        Tasks modify the shared all_documents list in-place, and the remaining tasks are skipped
+        once ``should_stop`` returns true, as they are by the real executor.
 
         Returns:
-            Mock: Mocked ThreadPoolExecutor that executes tasks synchronously
-        """
-        with patch("core.rag.datasource.retrieval_service.ThreadPoolExecutor") as mock_executor:
-            # Store futures to track submitted tasks (for debugging if needed)
-            futures_list = []
-
-            def sync_submit(fn, *args, **kwargs):
-                """
-                Synchronous replacement for ThreadPoolExecutor.submit().
-
-                Instead of scheduling the function for async execution,
-                we execute it immediately in the current thread.
-
-                Args:
-                    fn: The function to execute (e.g., embedding_search)
-                    *args, **kwargs: Arguments to pass to the function
-
-                Returns:
-                    Mock: A mock Future object
-                """
-                future = Mock()
-                try:
-                    # Execute immediately - this modifies all_documents in place
-                    # The function signature is: fn(flask_app, dataset_id, query,
-                    #                             top_k, all_documents, exceptions, ...)
-                    fn(*args, **kwargs)
-                    future.result.return_value = None
-                    future.exception.return_value = None
-                except Exception as e:
-                    # If function raises, store exception in future
-                    future.result.return_value = None
-                    future.exception.return_value = e
-
-                futures_list.append(future)
-                return future
-
-            # Set up the mock executor instance
-            mock_executor_instance = Mock()
-            mock_executor_instance.submit = sync_submit
-
-            # Configure context manager behavior (__enter__ and __exit__)
-            mock_executor.return_value.__enter__.return_value = mock_executor_instance
-            mock_executor.return_value.__exit__.return_value = None
-
-            # Mock concurrent.futures.wait to do nothing since tasks are already done
-            # In real code, this waits for all futures to complete
-            # In tests, futures complete immediately, so wait is a no-op
-            with patch("core.rag.datasource.retrieval_service.concurrent.futures.wait"):
-                # Mock concurrent.futures.as_completed for early error propagation
-                # In real code, this yields futures as they complete
-                # In tests, we yield all futures immediately since they're already done
-                def mock_as_completed(futures_list, timeout=None):
-                    """Mock as_completed that yields futures immediately."""
-                    yield from futures_list
-
-                with patch(
-                    "core.rag.datasource.retrieval_service.concurrent.futures.as_completed",
-                    side_effect=mock_as_completed,
-                ):
-                    yield mock_executor
+            Mock: Mocked retrieval executor that executes tasks synchronously
+        """
+        with patch("core.rag.datasource.retrieval_service.retrieval_executor") as mock_executor:
+
+            def sync_run(tasks, should_stop=None, timeout=None):
+                for task in tasks:
+                    task()
+                    if should_stop and should_stop():
+                        break
+
+            mock_executor.run.side_effect = sync_run
+            yield mock_executor
 
     # ==================== Vector Search Tests ====================
 
@@ -445,7 +386,7 @@ class TestRetrievalService:
 
         This test validates the core vector search flow:
         1. Dataset is retrieved from database
-        2. _retrieve is called via ThreadPoolExecutor
+        2. _retrieve is called via the shared retrieval executor
         3. Documents are added to shared all_documents list
         4. Results are returned to caller
 
@@ -492,7 +433,7 @@ class TestRetrievalService:
         # This will:
         # 1. Check if query is empty (early return if so)
         # 2. Get the dataset using _get_dataset
-        # 3. Create ThreadPoolExecutor
+        # 3. Run the retrieval tasks
         # 4. Submit _retrieve task
         # 5. Wait for completion
         # 6. Return all_documents list
@@ -515,7 +456,7 @@ class TestRetrievalService:
         assert results[0].metadata["score"] == 0.95, "First document should have highest score from sample_documents"
 
         # Verify _retrieve was called exactly once
-        # This confirms the search method was invoked by ThreadPoolExecutor
+        # This confirms the search method was invoked by the retrieval executor
         mock_retrieve.assert_called_once()
 
     @patch("core.rag.datasource.retrieval_service.RetrievalService._retrieve")
@@ -753,6 +694,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            query_type=None,
         ):
             all_documents.extend(sample_documents[:2])
 
@@ -873,6 +815,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            query_type=None,
         ):
             """Vector search finds 2 documents including high-score duplicate."""
             all_documents.extend([doc1_high, doc2])
@@ -963,6 +906,7 @@ class TestRetrievalService:
             retrieval_method,
             exceptions,
             document_ids_filter=None,
+            query_type=None,
         ):
             all_documents.extend(sample_documents[:2])
 
@@ -1795,6 +1739,20 @@ class TestRetrievalService:
         assert len(all_documents) == 1
         assert all_documents[0].page_content == "Test content 1"
 
+    @patch("core.rag.retrieval.dataset_retrieval.dify_config")
+    def test_limit_rerank_candidates_keeps_highest_scored_documents(self, mock_config):
+        """Test that only the highest scored documents are reranked when candidates are limited."""
+        documents = [
+            Document(page_content=f"content {score}", metadata={"score": score}, provider="dify")
+            for score in (0.2, 0.9, None, 0.5)
+        ]
+
+        mock_config.DATASET_RETRIEVAL_RERANK_CANDIDATES = 2
+        assert [doc.metadata["score"] for doc in DatasetRetrieval._limit_rerank_candidates(documents)] == [0.9, 0.5]
+
+        mock_config.DATASET_RETRIEVAL_RERANK_CANDIDATES = 0
+        assert DatasetRetrieval._limit_rerank_candidates(documents) == documents
+
 
 class TestRetrievalMethods:
     """
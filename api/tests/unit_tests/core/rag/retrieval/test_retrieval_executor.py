@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from core.rag.retrieval.retrieval_executor import RetrievalExecutor
+
+
+def test_run_runs_all_tasks():
+    executor = RetrievalExecutor(max_workers=2)
+    results: list[int] = []
+
+    executor.run([lambda i=i: results.append(i) for i in range(5)])
+
+    assert sorted(results) == [0, 1, 2, 3, 4]
+
+
+def test_nested_tasks_do_not_deadlock_on_a_saturated_pool():
+    executor = RetrievalExecutor(max_workers=1)
+    results: list[str] = []
+
+    def dataset_task(name: str):
+        executor.run([lambda: results.append(f"{name}-vector"), lambda: results.append(f"{name}-full-text")])
+
+    done = threading.Event()
+
+    def retrieve():
+        executor.run([lambda: dataset_task("a"), lambda: dataset_task("b"), lambda: dataset_task("c")])
+        done.set()
+
+    threading.Thread(target=retrieve, daemon=True).start()
+
+    assert done.wait(timeout=5)
+    assert len(results) == 6
+
+
+def test_run_raises_the_exception_of_a_task():
+    executor = RetrievalExecutor(max_workers=2)
+
+    def fail():
+        raise ValueError("search failed")
+
+    with pytest.raises(ValueError, match="search failed"):
+        executor.run([lambda: None, fail])
+
+
+def test_run_skips_tasks_not_started_once_stopped():
+    executor = RetrievalExecutor(max_workers=1)
+    blocker = threading.Event()
+    ran: list[int] = []
+    # Keeps the only worker busy, so the tasks queued behind it haven't started when the first one stops the run
+    executor._executor.submit(blocker.wait)
+
+    executor.run([lambda: ran.append(0), lambda: ran.append(1), lambda: ran.append(2)], should_stop=lambda: bool(ran))
+    blocker.set()
+
+    assert ran == [0]
+
+
+def test_run_times_out_waiting_for_the_pool():
+    executor = RetrievalExecutor(max_workers=1)
+    blocker = threading.Event()
+
+    with pytest.raises(TimeoutError):
+        executor.run([lambda: None, blocker.wait], timeout=0.1)
+    blocker.set()
@@ -3,9 +3,12 @@ from time import time
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import TypeAdapter
 
 from core.model_runtime.entities.llm_entities import LLMUsage
+from core.variables.variables import StringVariable, Variable
 from core.workflow.runtime import GraphRuntimeState, ReadOnlyGraphRuntimeStateWrapper, VariablePool
+from core.workflow.system_variable import SystemVariable
 
 
 class StubCoordinator:
@@ -278,3 +281,72 @@ class TestGraphRuntimeState:
         assert restored_execution.started is True
 
         assert new_stub.state == "configured"
+
+    @staticmethod
+    def _create_state_with_variables() -> GraphRuntimeState:
+        variable_pool = VariablePool(
+            system_variables=SystemVariable(user_id="user-1", workflow_execution_id="run-1"),
+            conversation_variables=[StringVariable(name="topic", value="pause")],
+        )
+        variable_pool.add(("node1", "text"), "payload")
+        variable_pool.add(("node1", "items"), [1, 2, 3])
+        variable_pool.add(("node2", "copy"), "payload")
+
+        state = GraphRuntimeState(variable_pool=variable_pool, start_at=time())
+        state.total_tokens = 3
+        state.set_output("answer", {"text": "payload"})
+        state.ready_queue.put("node-3")
+        state.register_paused_node("node-2")
+        return state
+
+    def test_binary_snapshot_roundtrip_matches_json_snapshot(self):
+        state = self._create_state_with_variables()
+
+        restored = GraphRuntimeState.from_snapshot(state.dumps_binary())
+
+        assert json.loads(restored.dumps()) == json.loads(state.dumps())
+        assert restored.get_paused_nodes() == ["node-2"]
+        assert restored.ready_queue.get(timeout=0.01) == "node-3"
+
+    def test_binary_snapshot_stores_identical_variables_once(self):
+        state = self._create_state_with_variables()
+
+        snapshot = state.dumps_binary()
+
+        # Stored once as a chunk, the answer output holding the same text is part of the JSON header
+        assert snapshot.count(b'"payload"') == 2
+
+    def test_binary_snapshot_variables_are_loaded_when_read(self):
+        state = self._create_state_with_variables()
+
+        restored = GraphRuntimeState.from_snapshot(state.dumps_binary())
+
+        with patch("core.workflow.runtime.variable_pool._VARIABLE_ADAPTER") as adapter:
+            adapter.validate_python.side_effect = TypeAdapter(Variable).validate_python
+            segment = restored.variable_pool.get(("node1", "text"))
+
+        assert segment is not None
+        assert segment.value == "payload"
+        adapter.validate_python.assert_called_once()
+        assert restored.variable_pool.get(("node1", "items")).value == [1, 2, 3]  # type: ignore[union-attr]
+        assert restored.variable_pool.get(("sys", "user_id")).value == "user-1"  # type: ignore[union-attr]
+
+    def test_binary_snapshot_only_serializes_changed_variables(self):
+        restored = GraphRuntimeState.from_snapshot(self._create_state_with_variables().dumps_binary())
+        restored.variable_pool.get(("node1", "text"))
+        restored.variable_pool.add(("node1", "items"), [4])
+
+        with patch("core.workflow.runtime.variable_pool._VARIABLE_ADAPTER") as adapter:
+            adapter.dump_python.side_effect = TypeAdapter(Variable).dump_python
+            snapshot = restored.dumps_binary()
+
+        # Conversation variables are added again when a pool is restored, so they're serialized again too
+        assert {call.args[0].name for call in adapter.dump_python.call_args_list} == {"items", "topic"}
+        adapter.validate_python.assert_not_called()
+        resumed = GraphRuntimeState.from_snapshot(snapshot)
+        assert resumed.variable_pool.get(("node1", "items")).value == [4]  # type: ignore[union-attr]
+        assert resumed.variable_pool.get(("node2", "copy")).value == "payload"  # type: ignore[union-attr]
+
+    def test_binary_snapshot_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            GraphRuntimeState.from_snapshot(b"JSON\x00\x00\x00\x02{}")
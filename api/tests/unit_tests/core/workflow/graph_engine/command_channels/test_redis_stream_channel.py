@@ -0,0 +1,225 @@
+"""Tests for the Redis Streams command channel and its process-wide subscriber."""
+
+import gc
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+
+from core.workflow.graph_engine.command_channels.redis_stream_channel import (
+    RedisStreamChannel,
+    RedisStreamCommandSubscriber,
+)
+from core.workflow.graph_engine.entities.commands import AbortCommand, CommandType, GraphEngineCommand, PauseCommand
+
+
+class _FakeStreamRedis:
+    """Just enough of a Redis client for XADD, XDEL and blocking XREAD."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[bytes, dict[bytes, bytes]]]] = {}
+        self.xread_calls: list[dict[str, str]] = []
+        self.failures = 0
+        self._sequence = 0
+        self._condition = threading.Condition()
+
+    def xadd(self, key: str, fields: dict[str, str], **kwargs) -> None:
+        with self._condition:
+            self._sequence += 1
+            entry_id = f"1-{self._sequence}".encode()
+            self.streams.setdefault(key, []).append((entry_id, {k.encode(): v.encode() for k, v in fields.items()}))
+            self._condition.notify_all()
+
+    def xdel(self, key: str, *entry_ids: str) -> None:
+        with self._condition:
+            deleted = {entry_id.encode() for entry_id in entry_ids}
+            self.streams[key] = [entry for entry in self.streams.get(key, []) if entry[0] not in deleted]
+
+    def expire(self, key: str, ttl: int) -> None:
+        pass
+
+    def pipeline(self):
+        pipe = MagicMock()
+        pipe.xadd.side_effect = self.xadd
+        pipe.xdel.side_effect = self.xdel
+        context = MagicMock()
+        context.__enter__.return_value = pipe
+        return context
+
+    def xread(self, streams: dict[str, str], count: int, block: int):
+        self.xread_calls.append(dict(streams))
+        if self.failures:
+            self.failures -= 1
+            raise redis.ConnectionError("Redis connection failed")
+
+        def read():
+            response = []
+            for key, last_id in streams.items():
+                last = tuple(int(part) for part in last_id.split("-"))
+                entries = [
+                    entry
+                    for entry in self.streams.get(key, [])
+                    if tuple(int(part) for part in entry[0].decode().split("-")) > last
+                ]
+                if entries:
+                    response.append([key.encode(), entries[:count]])
+            return response
+
+        with self._condition:
+            self._condition.wait_for(read, timeout=block / 1000)
+            return read()
+
+
+@pytest.fixture
+def make_subscriber():
+    subscribers: list[RedisStreamCommandSubscriber] = []
+
+    def make(redis_client, **kwargs) -> RedisStreamCommandSubscriber:
+        subscriber = RedisStreamCommandSubscriber(redis_client, **kwargs)
+        subscribers.append(subscriber)
+        return subscriber
+
+    yield make
+    for subscriber in subscribers:
+        subscriber.stop(timeout=5)
+
+
+def _wait_for_commands(channel: RedisStreamChannel, count: int) -> list[GraphEngineCommand]:
+    commands: list[GraphEngineCommand] = []
+    deadline = time.monotonic() + 5
+    while len(commands) < count and time.monotonic() < deadline:
+        commands.extend(channel.fetch_commands())
+        time.sleep(0.01)
+    return commands
+
+
+def test_send_command_appends_to_the_stream():
+    mock_redis = MagicMock()
+    mock_pipe = MagicMock()
+    mock_redis.pipeline.return_value.__enter__.return_value = mock_pipe
+
+    channel = RedisStreamChannel(mock_redis, "workflow:task:commands", command_ttl=600)
+    channel.send_command(AbortCommand(reason="stop"))
+
+    key = "{graph_engine_commands}:workflow:task:commands"
+    mock_pipe.xadd.assert_called_once_with(
+        key,
+        {"command": json.dumps(AbortCommand(reason="stop").model_dump())},
+        maxlen=100,
+        approximate=True,
+    )
+    mock_pipe.expire.assert_called_once_with(key, 600)
+    mock_pipe.execute.assert_called_once()
+
+
+def test_commands_sent_before_subscribing_are_delivered(make_subscriber):
+    fake_redis = _FakeStreamRedis()
+    subscriber = make_subscriber(fake_redis, block_ms=50)
+    RedisStreamChannel(fake_redis, "workflow:a:commands").send_command(PauseCommand(reason="wait"))
+
+    channel = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=subscriber)
+    commands = _wait_for_commands(channel, 1)
+
+    assert len(commands) == 1
+    assert isinstance(commands[0], PauseCommand)
+    assert commands[0].reason == "wait"
+
+
+def test_one_read_serves_all_running_workflows(make_subscriber):
+    fake_redis = _FakeStreamRedis()
+    subscriber = make_subscriber(fake_redis, block_ms=50)
+    channels = [
+        RedisStreamChannel(fake_redis, f"workflow:{index}:commands", subscriber=subscriber) for index in range(5)
+    ]
+    for channel in channels:
+        channel.fetch_commands()
+    time.sleep(0.1)
+
+    channels[3].send_command(AbortCommand())
+
+    assert [type(command) for command in _wait_for_commands(channels[3], 1)] == [AbortCommand]
+    assert all(not channel.fetch_commands() for channel in channels)
+    # The subscriber issues one read for all the streams instead of one per workflow
+    assert len(fake_redis.xread_calls[-1]) == 5
+
+
+def test_commands_are_delivered_after_a_read_error(make_subscriber):
+    fake_redis = _FakeStreamRedis()
+    fake_redis.failures = 2
+    subscriber = make_subscriber(fake_redis, block_ms=50, retry_interval=0.01)
+    channel = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=subscriber)
+    channel.fetch_commands()
+
+    channel.send_command(AbortCommand(reason="stop"))
+
+    commands = _wait_for_commands(channel, 1)
+    assert len(commands) == 1
+    assert commands[0].command_type == CommandType.ABORT
+
+
+def test_deliver_skips_entries_already_delivered_and_invalid_commands():
+    channel = RedisStreamChannel(MagicMock(), "workflow:a:commands", subscriber=MagicMock())
+    command = json.dumps(AbortCommand().model_dump()).encode()
+
+    channel.deliver("1-1", {b"command": command})
+    channel.deliver("1-1", {b"command": command})
+    channel.deliver("1-2", {b"command": b"invalid json"})
+    channel.deliver("1-3", {b"command": json.dumps({"command_type": "unknown"}).encode()})
+
+    assert channel.last_entry_id == "1-3"
+    assert [type(command) for command in channel.fetch_commands()] == [AbortCommand]
+
+
+def test_resp3_replies_are_delivered():
+    fake_redis = _FakeStreamRedis()
+    subscriber = RedisStreamCommandSubscriber(fake_redis)
+    channel = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=MagicMock())
+    subscriber._channels.add(channel)
+
+    entries = [(b"1-1", {b"command": json.dumps(PauseCommand().model_dump()).encode()})]
+    subscriber._deliver({channel.stream_key.encode(): [entries]})
+
+    assert [type(command) for command in channel.fetch_commands()] == [PauseCommand]
+
+
+def test_delivered_commands_are_not_delivered_to_a_new_channel(make_subscriber):
+    fake_redis = _FakeStreamRedis()
+    channel = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=make_subscriber(fake_redis, block_ms=50))
+    channel.send_command(PauseCommand(reason="wait"))
+    assert len(_wait_for_commands(channel, 1)) == 1
+
+    # Like a resumed run, which creates its channel again with the same key
+    resumed = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=make_subscriber(fake_redis, block_ms=50))
+    resumed.fetch_commands()
+    time.sleep(0.2)
+
+    assert resumed.fetch_commands() == []
+    assert fake_redis.streams[channel.stream_key] == []
+
+
+def test_stop_ends_the_read_thread():
+    fake_redis = _FakeStreamRedis()
+    subscriber = RedisStreamCommandSubscriber(fake_redis, block_ms=50)
+    channel = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=subscriber)
+    channel.fetch_commands()
+
+    subscriber.stop(timeout=5)
+
+    assert subscriber._thread is not None
+    assert not subscriber._thread.is_alive()
+
+
+def test_channels_are_unsubscribed_once_released(make_subscriber):
+    fake_redis = _FakeStreamRedis()
+    subscriber = make_subscriber(fake_redis, block_ms=50)
+    channel = RedisStreamChannel(fake_redis, "workflow:a:commands", subscriber=subscriber)
+    channel.fetch_commands()
+    assert subscriber.get_subscribed_count() == 1
+
+    del channel
+    gc.collect()
+
+    assert subscriber.get_subscribed_count() == 0
@@ -0,0 +1,22 @@
+"""Shared fixtures for GraphEngine tests."""
+
+from unittest.mock import patch
+
+import pytest
+
+from core.workflow.graph_engine.worker_management import SharedWorkerPool
+
+
+@pytest.fixture(params=["dedicated_workers", "shared_worker_pool"])
+def engine_worker_pool(request):
+    """
+    Run the test once with the nodes executed by workers dedicated to each run, and once with
+    them executed by a shared worker pool, as the engines of the workflow entry do by default.
+    """
+    if request.param == "dedicated_workers":
+        yield None
+        return
+    pool = SharedWorkerPool(min_workers=0, max_workers=2, idle_timeout=0.1)
+    # Engines created without a pool pick up the pool executing the current node
+    with patch.object(SharedWorkerPool, "current", return_value=pool):
+        yield pool
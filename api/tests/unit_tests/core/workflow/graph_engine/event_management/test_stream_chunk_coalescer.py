@@ -0,0 +1,109 @@
+"""Tests for stream chunk coalescing."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from core.workflow.enums import NodeType
+from core.workflow.graph_engine.event_management.event_manager import EventManager
+from core.workflow.graph_engine.event_management.stream_chunk_coalescer import StreamChunkCoalescer
+from core.workflow.graph_events import GraphEngineEvent, NodeRunStreamChunkEvent, NodeRunSucceededEvent
+from core.workflow.node_events import NodeRunResult
+from libs.datetime_utils import naive_utc_now
+
+
+def _chunk(text: str, *, selector: list[str] | None = None, is_final: bool = False) -> NodeRunStreamChunkEvent:
+    return NodeRunStreamChunkEvent(
+        id="exec-1",
+        node_id="llm",
+        node_type=NodeType.LLM,
+        selector=selector or ["llm", "text"],
+        chunk=text,
+        is_final=is_final,
+    )
+
+
+def _succeeded() -> NodeRunSucceededEvent:
+    return NodeRunSucceededEvent(
+        id="exec-1",
+        node_id="llm",
+        node_type=NodeType.LLM,
+        start_at=naive_utc_now(),
+        node_run_result=NodeRunResult(),
+    )
+
+
+def _texts(events: list[GraphEngineEvent]) -> list[str]:
+    return [event.chunk for event in events if isinstance(event, NodeRunStreamChunkEvent)]
+
+
+def test_first_chunk_is_emitted_immediately() -> None:
+    coalescer = StreamChunkCoalescer(window=10.0, max_bytes=1024)
+
+    assert _texts(coalescer.push(_chunk("Hel"))) == ["Hel"]
+    assert coalescer.push(_chunk("lo")) == []
+    assert coalescer.push(_chunk(" world")) == []
+    assert _texts(coalescer.flush()) == ["lo world"]
+
+
+def test_flushes_before_other_events_to_preserve_order() -> None:
+    coalescer = StreamChunkCoalescer(window=10.0, max_bytes=1024)
+    coalescer.push(_chunk("a"))
+    coalescer.push(_chunk("b"))
+    succeeded = _succeeded()
+
+    events = coalescer.push(succeeded)
+
+    assert _texts(events) == ["b"]
+    assert events[-1] is succeeded
+
+
+def test_flushes_on_selector_change_size_and_final_chunk() -> None:
+    coalescer = StreamChunkCoalescer(window=10.0, max_bytes=4)
+    coalescer.push(_chunk("a"))
+    coalescer.push(_chunk("b"))
+
+    assert _texts(coalescer.push(_chunk("x", selector=["other", "text"]))) == ["b", "x"]
+    coalescer.push(_chunk("cd"))
+    assert _texts(coalescer.push(_chunk("ef"))) == ["cdef"]
+
+    coalescer.push(_chunk("g"))
+    events = coalescer.push(_chunk("", is_final=True))
+    assert _texts(events) == ["g"]
+    assert isinstance(events[0], NodeRunStreamChunkEvent)
+    assert events[0].is_final
+
+
+def test_poll_flushes_after_window() -> None:
+    coalescer = StreamChunkCoalescer(window=0.02, max_bytes=1024)
+    with patch("core.workflow.graph_engine.event_management.stream_chunk_coalescer.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        coalescer.push(_chunk("a"))
+        coalescer.push(_chunk("b"))
+        assert coalescer.poll() == []
+
+        monotonic.return_value = 100.05
+        assert _texts(coalescer.poll()) == ["b"]
+
+
+def test_event_manager_coalesces_emitted_chunks() -> None:
+    event_manager = EventManager(stream_chunk_coalesce_window=10.0, stream_chunk_coalesce_max_bytes=1024)
+    for text in ["a", "b", "c"]:
+        event_manager.collect(_chunk(text))
+    event_manager.collect(_chunk("d", is_final=True))
+    event_manager.collect(_succeeded())
+    event_manager.mark_complete()
+
+    events = list(event_manager.emit_events())
+
+    assert _texts(events) == ["a", "bcd"]
+    assert isinstance(events[-1], NodeRunSucceededEvent)
+
+
+def test_event_manager_without_coalescing_emits_every_chunk() -> None:
+    event_manager = EventManager()
+    for text in ["a", "b", "c"]:
+        event_manager.collect(_chunk(text))
+    event_manager.mark_complete()
+
+    assert _texts(list(event_manager.emit_events())) == ["a", "b", "c"]
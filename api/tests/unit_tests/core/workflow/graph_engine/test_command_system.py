@@ -3,6 +3,8 @@
 import time
 from unittest.mock import MagicMock
 
+import pytest
+
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.variables import IntegerVariable, StringVariable
 from core.workflow.entities.graph_init_params import GraphInitParams
@@ -23,6 +25,7 @@ from core.workflow.runtime import GraphRuntimeState, VariablePool
 from models.enums import UserFrom
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_abort_command():
     """Test that GraphEngine properly handles abort commands."""
 
@@ -136,6 +139,7 @@ def test_redis_channel_serialization():
     assert pause_command_data["reason"] == "User requested pause"
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_pause_command():
     """Test that GraphEngine properly handles pause commands."""
 
@@ -191,6 +195,7 @@ def test_pause_command():
     assert graph_execution.pause_reasons == [SchedulingPause(message="User requested pause")]
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_update_variables_command_updates_pool():
     """Test that GraphEngine updates variable pool via update variables command."""
 
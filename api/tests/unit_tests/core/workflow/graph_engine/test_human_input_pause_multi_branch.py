@@ -3,6 +3,8 @@ import time
 from collections.abc import Iterable
 from unittest.mock import MagicMock
 
+import pytest
+
 from core.model_runtime.entities.llm_entities import LLMMode
 from core.model_runtime.entities.message_entities import PromptMessageRole
 from core.workflow.entities import GraphInitParams
@@ -204,6 +206,7 @@ def _assert_stream_chunk_sequence(
     assert actual_chunks == expected_chunks
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_human_input_llm_streaming_across_multiple_branches() -> None:
     mock_config = MockConfig()
     mock_config.set_node_outputs("llm_initial", {"text": "Initial stream"})
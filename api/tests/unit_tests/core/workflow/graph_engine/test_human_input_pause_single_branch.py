@@ -2,6 +2,8 @@ import datetime
 import time
 from unittest.mock import MagicMock
 
+import pytest
+
 from core.model_runtime.entities.llm_entities import LLMMode
 from core.model_runtime.entities.message_entities import PromptMessageRole
 from core.workflow.entities import GraphInitParams
@@ -164,6 +166,7 @@ def _expected_mock_llm_chunks(text: str) -> list[str]:
     return chunks
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_human_input_llm_streaming_order_across_pause() -> None:
     runner = TableTestRunner()
 
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Protocol
 
+import pytest
+
 from core.workflow.entities import GraphInitParams
 from core.workflow.entities.workflow_start_reason import WorkflowStartReason
 from core.workflow.graph import Graph
@@ -223,6 +225,7 @@ def _form(submitted: bool, action_id: str | None) -> StaticForm:
     )
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_parallel_human_input_join_completes_after_second_resume() -> None:
     pause_store: PauseStateStore = InMemoryPauseStore()
 
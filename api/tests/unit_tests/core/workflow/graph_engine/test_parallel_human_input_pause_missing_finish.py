@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+import pytest
+
 from core.model_runtime.entities.llm_entities import LLMMode
 from core.model_runtime.entities.message_entities import PromptMessageRole
 from core.workflow.entities import GraphInitParams
@@ -208,6 +210,7 @@ def _build_graph(runtime_state: GraphRuntimeState, repo: HumanInputFormRepositor
     )
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_parallel_human_input_pause_preserves_node_finished() -> None:
     runtime_state = _build_runtime_state()
 
@@ -269,6 +272,7 @@ def test_parallel_human_input_pause_preserves_node_finished() -> None:
     assert llm_succeeded
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_parallel_human_input_pause_preserves_node_finished_after_snapshot_resume() -> None:
     base_state = _build_runtime_state()
     base_state.graph_execution.start()
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+import pytest
+
 from core.model_runtime.entities.llm_entities import LLMMode
 from core.model_runtime.entities.message_entities import PromptMessageRole
 from core.workflow.entities import GraphInitParams
@@ -230,6 +232,7 @@ def _get_node_started_event(events: list[object], node_id: str) -> NodeRunStarte
     return None
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_pause_defers_ready_nodes_until_resume() -> None:
     runtime_state = _build_runtime_state()
 
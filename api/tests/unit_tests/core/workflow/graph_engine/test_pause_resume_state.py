@@ -3,6 +3,8 @@ import time
 from typing import Any
 from unittest.mock import MagicMock
 
+import pytest
+
 from core.workflow.entities import GraphInitParams
 from core.workflow.entities.workflow_start_reason import WorkflowStartReason
 from core.workflow.graph import Graph
@@ -164,6 +166,7 @@ def _segment_value(variable_pool: VariablePool, selector: tuple[str, str]) -> An
     return getattr(segment, "value", segment)
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 def test_engine_resume_restores_state_and_completion():
     # Baseline run without pausing
     baseline_state = _build_runtime_state()
@@ -36,8 +36,12 @@ class TestRedisStopIntegration:
             # Execute
             GraphEngineManager.send_stop_command(task_id, reason="Test stop")
 
-            # Verify
-            mock_redis.pipeline.assert_called_once()
+            # Verify the command was sent through both the stream and the list channels
+            assert mock_redis.pipeline.call_count == 2
+            xadd_calls = mock_pipeline.xadd.call_args_list
+            assert len(xadd_calls) == 1
+            assert xadd_calls[0][0][0] == f"{{graph_engine_commands}}:{expected_channel_key}"
+            assert json.loads(xadd_calls[0][0][1]["command"])["command_type"] == CommandType.ABORT
 
             # Check that rpush was called with correct arguments
             calls = mock_pipeline.rpush.call_args_list
@@ -65,7 +69,7 @@ class TestRedisStopIntegration:
         with patch("core.workflow.graph_engine.manager.redis_client", mock_redis):
             GraphEngineManager.send_pause_command(task_id, reason="Awaiting resources")
 
-            mock_redis.pipeline.assert_called_once()
+            assert mock_redis.pipeline.call_count == 2
             calls = mock_pipeline.rpush.call_args_list
             assert len(calls) == 1
             assert calls[0][0][0] == expected_channel_key
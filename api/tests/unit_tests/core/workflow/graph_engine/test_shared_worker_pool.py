@@ -0,0 +1,219 @@
+"""
+Unit tests for the process-wide worker pool shared by GraphEngine runs.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from core.workflow.context import blocking_wait
+from core.workflow.enums import NodeExecutionType
+from core.workflow.graph_engine.ready_queue import InMemoryReadyQueue
+from core.workflow.graph_engine.worker_management import SharedWorkerPool
+from core.workflow.graph_engine.worker_management.shared_worker_pool import RunQueue
+
+from .test_table_runner import TableTestRunner, WorkflowTestCase
+
+
+class _Run:
+    """A registered run whose nodes record how many of them execute at once."""
+
+    def __init__(self, name: str, node_count: int, max_concurrency: int, duration: float = 0.02) -> None:
+        self.name = name
+        self.executed: list[str] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._duration = duration
+        self.done = threading.Semaphore(0)
+
+        ready_queue = InMemoryReadyQueue()
+        graph = MagicMock()
+        graph.nodes = {}
+        for index in range(node_count):
+            node_id = f"{name}-{index}"
+            node = MagicMock()
+            node.execution_type = NodeExecutionType.EXECUTABLE
+            graph.nodes[node_id] = node
+            ready_queue.put(node_id)
+
+        runner = MagicMock()
+        runner.execute.side_effect = self._execute
+        self.run_queue = RunQueue(
+            ready_queue=ready_queue,
+            graph=graph,
+            runner=runner,
+            stop_event=threading.Event(),
+            max_concurrency=max_concurrency,
+        )
+        self._node_ids = {id(node): node_id for node_id, node in graph.nodes.items()}
+
+    def _execute(self, node) -> bool:
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        time.sleep(self._duration)
+        with self._lock:
+            self._in_flight -= 1
+            self.executed.append(self._node_ids[id(node)])
+        self.done.release()
+        return True
+
+    def wait(self, count: int) -> None:
+        for _ in range(count):
+            assert self.done.acquire(timeout=5)
+
+
+def test_per_run_concurrency_cap_is_honored():
+    pool = SharedWorkerPool(min_workers=0, max_workers=8, idle_timeout=0.1)
+    run = _Run("a", node_count=6, max_concurrency=2)
+
+    pool.register(run.run_queue)
+    run.wait(6)
+
+    assert run.max_in_flight <= 2
+    assert len(run.executed) == 6
+
+
+def test_runs_are_served_fairly():
+    pool = SharedWorkerPool(min_workers=0, max_workers=1, idle_timeout=0.1)
+    busy = _Run("busy", node_count=10, max_concurrency=10)
+    other = _Run("other", node_count=1, max_concurrency=10)
+    order: list[str] = []
+    registered = threading.Event()
+    for run in (busy, other):
+        # The nodes wait until both runs are registered, so the busy one can't finish before the other one registers
+        run.run_queue.runner.execute.side_effect = lambda node, run=run: (
+            registered.wait(timeout=5) and order.append(run.name) or True
+        )
+
+    pool.register(busy.run_queue)
+    pool.register(other.run_queue)
+    registered.set()
+    deadline = time.monotonic() + 5
+    while len(order) < 11 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The single node of the run registered last isn't left waiting behind all the nodes of the busy one
+    assert order.index("other") <= 2
+
+
+def test_thread_count_is_bounded_across_runs():
+    pool = SharedWorkerPool(min_workers=0, max_workers=3, idle_timeout=0.1)
+    runs = [_Run(f"run{index}", node_count=4, max_concurrency=4) for index in range(5)]
+    peak = 0
+
+    for run in runs:
+        pool.register(run.run_queue)
+    for run in runs:
+        for _ in range(4):
+            peak = max(peak, pool.get_worker_count())
+            run.wait(1)
+
+    assert peak <= 3
+    status = pool.get_status()
+    assert status["executed_nodes"] == 20
+    assert status["started_workers"] <= 3
+
+
+def test_idle_workers_retire_down_to_min_workers():
+    pool = SharedWorkerPool(min_workers=1, max_workers=4, idle_timeout=0.05)
+    run = _Run("a", node_count=8, max_concurrency=4)
+
+    pool.register(run.run_queue)
+    run.wait(8)
+    pool.unregister(run.run_queue, timeout=1.0)
+    deadline = time.monotonic() + 5
+    while pool.get_worker_count() > 1 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert pool.get_worker_count() == 1
+
+
+def test_unregister_waits_for_nodes_in_flight_and_skips_the_rest():
+    pool = SharedWorkerPool(min_workers=0, max_workers=1, idle_timeout=0.1)
+    run = _Run("a", node_count=3, max_concurrency=1, duration=0.1)
+
+    pool.register(run.run_queue)
+    time.sleep(0.02)
+    run.run_queue.stop_event.set()
+    pool.unregister(run.run_queue, timeout=2.0)
+
+    assert run.run_queue.in_flight == 0
+    assert len(run.executed) == 1
+    try:
+        run.run_queue.ready_queue.get(timeout=0)
+    except queue.Empty:
+        raise AssertionError("nodes not started yet should stay queued")
+
+
+def test_container_nodes_do_not_block_the_pool():
+    pool = SharedWorkerPool(min_workers=0, max_workers=1, idle_timeout=0.1)
+    child = _Run("child", node_count=1, max_concurrency=1)
+    parent = _Run("parent", node_count=1, max_concurrency=1)
+    parent.run_queue.graph.nodes["parent-0"].execution_type = NodeExecutionType.CONTAINER
+
+    def run_sub_graph(node) -> bool:
+        # Like an iteration node, wait on a sub-graph whose nodes are executed by the same pool
+        pool.register(child.run_queue)
+        child.wait(1)
+        pool.unregister(child.run_queue, timeout=1.0)
+        parent.done.release()
+        return True
+
+    parent.run_queue.runner.execute.side_effect = run_sub_graph
+    pool.register(parent.run_queue)
+
+    parent.wait(1)
+    assert child.executed == ["child-0"]
+
+
+def test_nodes_waiting_on_a_nested_run_do_not_block_the_pool():
+    pool = SharedWorkerPool(min_workers=0, max_workers=1, idle_timeout=0.1)
+    nested = _Run("nested", node_count=1, max_concurrency=1)
+    caller = _Run("caller", node_count=1, max_concurrency=1)
+
+    def run_nested_workflow(node) -> bool:
+        # Like a workflow called as a tool, wait on a separate run whose nodes are executed by the same pool
+        with blocking_wait():
+            pool.register(nested.run_queue)
+            nested.wait(1)
+            pool.unregister(nested.run_queue, timeout=1.0)
+        caller.done.release()
+        return True
+
+    caller.run_queue.runner.execute.side_effect = run_nested_workflow
+    pool.register(caller.run_queue)
+
+    caller.wait(1)
+    assert nested.executed == ["nested-0"]
+    assert pool.get_status()["blocked_workers"] == 0
+
+
+def test_blocking_wait_outside_the_pool_workers_is_ignored():
+    pool = SharedWorkerPool(min_workers=0, max_workers=1, idle_timeout=0.1)
+
+    with pool._blocking():
+        assert pool.get_status()["blocked_workers"] == 0
+
+
+def test_workflows_with_iterations_run_on_a_single_worker():
+    pool = SharedWorkerPool(min_workers=0, max_workers=1, idle_timeout=0.1)
+    runner = TableTestRunner(shared_worker_pool=pool)
+    test_case = WorkflowTestCase(
+        fixture_path="array_iteration_formatting_workflow",
+        inputs={},
+        expected_outputs={"output": ["output: 1", "output: 2", "output: 3"]},
+        description="Iteration formats numbers into strings",
+        use_auto_mock=True,
+    )
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda _: runner.run_test_case(test_case), range(3)))
+
+    for result in results:
+        assert result.success, f"Iteration workflow failed: {result.error}"
+        assert result.actual_outputs == test_case.expected_outputs
+    assert pool.get_status()["blocked_workers"] == 0
@@ -9,6 +9,8 @@ import threading
 import time
 from unittest.mock import MagicMock, Mock, patch
 
+import pytest
+
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.workflow.entities.graph_init_params import GraphInitParams
 from core.workflow.graph import Graph
@@ -25,6 +27,7 @@ from core.workflow.runtime import GraphRuntimeState, VariablePool
 from models.enums import UserFrom
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 class TestStopEventPropagation:
     """Test suite for stop_event propagation through GraphEngine components."""
 
@@ -260,6 +263,7 @@ class TestNodeStopCheck:
         assert answer_node._should_stop()
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 class TestStopEventIntegration:
     """Integration tests for stop_event in workflow execution."""
 
@@ -433,6 +437,7 @@ class TestStopEventTimeoutBehavior:
         mock_worker_instance.join.assert_called_once_with(timeout=2.0)
 
 
+@pytest.mark.usefixtures("engine_worker_pool")
 class TestStopEventResumeBehavior:
     """Test stop_event behavior during workflow resume."""
 
@@ -34,6 +34,7 @@ from core.workflow.entities.graph_init_params import GraphInitParams
 from core.workflow.graph import Graph
 from core.workflow.graph_engine import GraphEngine, GraphEngineConfig
 from core.workflow.graph_engine.command_channels import InMemoryChannel
+from core.workflow.graph_engine.worker_management import SharedWorkerPool
 from core.workflow.graph_events import (
     GraphEngineEvent,
     GraphRunStartedEvent,
@@ -238,6 +239,7 @@ class TableTestRunner:
         graph_engine_max_workers: int = 1,
         graph_engine_scale_up_threshold: int = 5,
         graph_engine_scale_down_idle_time: float = 30.0,
+        shared_worker_pool: SharedWorkerPool | None = None,
     ):
         """
         Initialize the table test runner.
@@ -251,6 +253,7 @@ class TableTestRunner:
             graph_engine_max_workers: Maximum workers for GraphEngine (default: 1)
             graph_engine_scale_up_threshold: Queue depth to trigger scale up
             graph_engine_scale_down_idle_time: Idle time before scaling down
+            shared_worker_pool: Optional shared pool executing the nodes instead of dedicated workers
         """
         self.workflow_runner = WorkflowRunner(fixtures_dir)
         self.max_workers = max_workers
@@ -260,6 +263,7 @@ class TableTestRunner:
         self.graph_engine_max_workers = graph_engine_max_workers
         self.graph_engine_scale_up_threshold = graph_engine_scale_up_threshold
         self.graph_engine_scale_down_idle_time = graph_engine_scale_down_idle_time
+        self.shared_worker_pool = shared_worker_pool
 
         if enable_logging:
             logging.basicConfig(
@@ -315,6 +319,7 @@ class TableTestRunner:
                     scale_up_threshold=self.graph_engine_scale_up_threshold,
                     scale_down_idle_time=self.graph_engine_scale_down_idle_time,
                 ),
+                shared_worker_pool=self.shared_worker_pool,
             )
 
             # Execute and collect events
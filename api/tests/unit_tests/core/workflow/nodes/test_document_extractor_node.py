@@ -14,15 +14,26 @@ from core.workflow.entities import GraphInitParams
 from core.workflow.enums import NodeType, WorkflowNodeExecutionStatus
 from core.workflow.node_events import NodeRunResult
 from core.workflow.nodes.document_extractor import DocumentExtractorNode, DocumentExtractorNodeData
+from core.workflow.nodes.document_extractor.exc import TextExtractionError
+from core.workflow.nodes.document_extractor.execution import ExtractedTextCache, ExtractionProcessPool
 from core.workflow.nodes.document_extractor.node import (
     _extract_text_from_docx,
     _extract_text_from_excel,
+    _extract_text_from_file,
     _extract_text_from_pdf,
     _extract_text_from_plain_text,
+    _extracted_text_cache,
 )
 from models.enums import UserFrom
 
 
+@pytest.fixture(autouse=True)
+def _clear_extracted_text_cache():
+    _extracted_text_cache.clear()
+    yield
+    _extracted_text_cache.clear()
+
+
 @pytest.fixture
 def graph_init_params() -> GraphInitParams:
     return GraphInitParams(
@@ -382,3 +393,134 @@ def test_extract_text_from_excel_numeric_type_column(mock_excel_file):
     expected_manual = "| 1.0 | 1.1 |\n| --- | --- |\n| Test | Test |\n\n"
 
     assert expected_manual == result
+
+
+def _make_local_file(extension: str, storage_key: str = "upload_files/tenant/file") -> Mock:
+    mock_file = Mock(spec=File)
+    mock_file.mime_type = None
+    mock_file.transfer_method = FileTransferMethod.LOCAL_FILE
+    mock_file.extension = extension
+    mock_file.storage_key = storage_key
+    return mock_file
+
+
+def test_extract_text_from_file_uses_result_cache(monkeypatch):
+    mock_file = _make_local_file(".pdf")
+    monkeypatch.setattr("core.file.file_manager.download", Mock(return_value=b"%PDF-1.4"))
+    mock_pdf_extract = Mock(return_value="pdf text")
+    monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extract_text_from_pdf", mock_pdf_extract)
+
+    assert _extract_text_from_file(mock_file) == "pdf text"
+    assert _extract_text_from_file(mock_file) == "pdf text"
+
+    mock_pdf_extract.assert_called_once_with(b"%PDF-1.4")
+
+
+def test_extract_text_from_file_cache_keyed_by_content(monkeypatch):
+    mock_file = _make_local_file(".txt")
+    monkeypatch.setattr("core.file.file_manager.download", Mock(side_effect=[b"first", b"second"]))
+
+    assert _extract_text_from_file(mock_file) == "first"
+    assert _extract_text_from_file(mock_file) == "second"
+
+
+def test_extract_text_from_file_process_mode_offloads_cpu_bound_types(monkeypatch):
+    from configs import dify_config
+
+    monkeypatch.setattr(dify_config, "DOCUMENT_EXTRACTOR_EXECUTION_MODE", "process")
+    monkeypatch.setattr("core.file.file_manager.download", Mock(return_value=b"content"))
+    mock_run = Mock(return_value="from pool")
+    monkeypatch.setattr("core.workflow.nodes.document_extractor.node._extraction_process_pool.run", mock_run)
+
+    assert _extract_text_from_file(_make_local_file(".pdf", "upload_files/a.pdf")) == "from pool"
+    assert _extract_text_from_file(_make_local_file(".txt", "upload_files/a.txt")) == "content"
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args.args[1:] == (b"content", ".pdf", None)
+    assert mock_run.call_args.kwargs == {"timeout": dify_config.DOCUMENT_EXTRACTOR_TIMEOUT}
+
+
+def test_extracted_text_cache_is_bounded_by_size():
+    cache = ExtractedTextCache(max_size=10)
+    first = ExtractedTextCache.build_key("a", b"1")
+    second = ExtractedTextCache.build_key("b", b"2")
+    cache.set(first, "123456")
+    cache.set(second, "123456")
+    cache.set(ExtractedTextCache.build_key("c", b"3"), "x" * 11)
+
+    assert cache.get(first) is None
+    assert cache.get(second) == "123456"
+
+
+def test_extraction_process_pool_runs_and_times_out():
+    import operator
+    import time
+
+    pool = ExtractionProcessPool(processes=1)
+    try:
+        assert pool.run(operator.add, "a", "b", timeout=30) == "ab"
+        with pytest.raises(TextExtractionError):
+            pool.run(time.sleep, 10, timeout=0.5)
+        # The pool is recreated after a timeout.
+        assert pool.run(operator.add, "c", "d", timeout=30) == "cd"
+    finally:
+        pool.shutdown()
+
+
+def test_extraction_process_pool_waits_on_the_gevent_threadpool_when_patched(monkeypatch):
+    import operator
+
+    from core.workflow.nodes.document_extractor import execution
+
+    monkeypatch.setattr(execution.monkey, "is_module_patched", lambda module: module == "threading")
+    hub = Mock()
+    hub.threadpool.apply.side_effect = lambda func, args: func(*args)
+    monkeypatch.setattr(execution, "get_hub", lambda: hub)
+
+    pool = ExtractionProcessPool(processes=1)
+    try:
+        assert pool.run(operator.add, "a", "b", timeout=30) == "ab"
+    finally:
+        pool.shutdown()
+
+    hub.threadpool.apply.assert_called_once()
+
+
+def test_extract_text_from_csv_stops_at_row_cap(monkeypatch):
+    from configs import dify_config
+    from core.workflow.nodes.document_extractor.node import _extract_text_from_csv
+
+    monkeypatch.setattr(dify_config, "DOCUMENT_EXTRACTOR_TABLE_MAX_ROWS", 2)
+    file_content = b"a,b\n1,2\n3,4\n5,6\n"
+
+    result = _extract_text_from_csv(file_content)
+
+    assert result == "| a | b |\n| - | - |\n| 1 | 2 |\n| 3 | 4 |\n"
+
+
+def test_extract_text_from_csv_stops_at_byte_cap(monkeypatch):
+    from configs import dify_config
+    from core.workflow.nodes.document_extractor.node import _extract_text_from_csv
+
+    monkeypatch.setattr(dify_config, "DOCUMENT_EXTRACTOR_TABLE_MAX_BYTES", 30)
+    file_content = b"a,b\n1,2\n3,4\n5,6\n"
+
+    result = _extract_text_from_csv(file_content)
+
+    assert result == "| a | b |\n| - | - |\n| 1 | 2 |\n"
+
+
+@patch("pandas.ExcelFile")
+def test_extract_text_from_excel_stops_at_row_cap(mock_excel_file, monkeypatch):
+    from configs import dify_config
+
+    monkeypatch.setattr(dify_config, "DOCUMENT_EXTRACTOR_TABLE_MAX_ROWS", 1)
+    mock_excel_instance = Mock()
+    mock_excel_instance.sheet_names = ["Sheet1", "Sheet2"]
+    mock_excel_instance.parse.return_value = pd.DataFrame({"Name": ["John"]})
+    mock_excel_file.return_value = mock_excel_instance
+
+    result = _extract_text_from_excel(b"fake_excel_content")
+
+    assert result == "| Name |\n| ---- |\n| John |\n\n"
+    mock_excel_instance.parse.assert_any_call(sheet_name="Sheet1", nrows=1)
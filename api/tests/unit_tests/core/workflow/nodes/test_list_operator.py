@@ -4,7 +4,7 @@ import pytest
 
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.file import File, FileTransferMethod, FileType
-from core.variables import ArrayFileSegment
+from core.variables import ArrayFileSegment, ArrayNumberSegment, ArrayStringSegment
 from core.workflow.enums import WorkflowNodeExecutionStatus
 from core.workflow.nodes.list_operator.entities import (
     ExtractConfig,
@@ -180,3 +180,73 @@ def test_get_file_extract_string_func():
     # Test invalid key
     with pytest.raises(InvalidKeyError):
         _get_file_extract_string_func(key="invalid_key")
+
+
+def _create_node(**config) -> ListOperatorNode:
+    node_data = ListOperatorNodeData.model_validate(
+        {
+            "variable": ["test_variable"],
+            "filter_by": FilterBy(enabled=False),
+            "order_by": OrderByConfig(enabled=False),
+            "limit": Limit(enabled=False),
+            "title": "Test Title",
+            **config,
+        }
+    )
+    graph_init_params = MagicMock()
+    graph_init_params.user_from = UserFrom.ACCOUNT
+    graph_init_params.invoke_from = InvokeFrom.SERVICE_API
+    node = ListOperatorNode(
+        id="test_node_id",
+        config={"id": "test_node_id", "data": node_data.model_dump()},
+        graph_init_params=graph_init_params,
+        graph_runtime_state=MagicMock(),
+    )
+    node.graph_runtime_state = MagicMock()
+    node.graph_runtime_state.variable_pool.convert_template.side_effect = lambda template: MagicMock(text=template)
+    return node
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [(i * 37) % 5000 for i in range(5000)],
+        [((i * 37) % 5000) / 10 for i in range(5000)],
+        # Integers that float64 can't represent exactly are compared without vectorization
+        [2**60 + i for i in range(2000)] + [1500],
+    ],
+)
+def test_filter_numbers_with_all_conditions(values):
+    node = _create_node(
+        filter_by=FilterBy(
+            enabled=True,
+            conditions=[
+                FilterCondition(comparison_operator=">", value="100"),
+                FilterCondition(comparison_operator="≤", value="2000"),
+                FilterCondition(comparison_operator="≠", value="1500"),
+            ],
+        ),
+    )
+    node.graph_runtime_state.variable_pool.get.return_value = ArrayNumberSegment(value=values)
+
+    result = node._run()
+
+    assert result.status == WorkflowNodeExecutionStatus.SUCCEEDED
+    assert result.outputs["result"].value == [value for value in values if 100 < value <= 2000 and value != 1500]
+    assert result.process_data["variable"] == {"type": "array[number]", "size": len(values)}
+
+
+@pytest.mark.parametrize("order", [Order.ASC, Order.DESC])
+@pytest.mark.parametrize("size", [0, 3, 50])
+def test_order_with_limit_matches_full_sort(order, size):
+    words = [f"word-{(i * 7) % 20}" for i in range(100)]
+    node = _create_node(
+        order_by=OrderByConfig(enabled=True, value=order),
+        limit=Limit(enabled=True, size=size),
+    )
+    node.graph_runtime_state.variable_pool.get.return_value = ArrayStringSegment(value=words)
+
+    result = node._run()
+
+    assert result.outputs["result"].value == sorted(words, reverse=order == Order.DESC)[:size]
+    assert result.outputs["first_record"] == (result.outputs["result"].value or [None])[0]
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from core.workflow.runtime import VariablePool
 from core.workflow.utils.condition.entities import Condition
 from core.workflow.utils.condition.processor import ConditionProcessor
@@ -50,3 +52,43 @@ def test_number_formatting():
         ).final_result
         == True
     )
+
+
+def test_variables_and_templates_shared_by_conditions_are_resolved_once():
+    condition_processor = ConditionProcessor()
+    variable_pool = VariablePool()
+    variable_pool.add(["test_node_id", "tags"], [f"tag-{i}" for i in range(1000)])
+    variable_pool.add(["test_node_id", "wanted"], "tag-10")
+
+    conditions = [
+        Condition(
+            variable_selector=["test_node_id", "tags"],
+            comparison_operator="contains",
+            value="{{#test_node_id.wanted#}}",
+        ),
+        Condition(
+            variable_selector=["test_node_id", "tags"],
+            comparison_operator="all of",
+            value=["tag-1", "tag-999"],
+        ),
+        Condition(
+            variable_selector=["test_node_id", "tags"],
+            comparison_operator="not contains",
+            value="{{#test_node_id.wanted#}}",
+        ),
+    ]
+    with (
+        patch.object(VariablePool, "get", autospec=True, side_effect=VariablePool.get) as mock_get,
+        patch.object(
+            VariablePool, "convert_template", autospec=True, side_effect=VariablePool.convert_template
+        ) as mock_convert_template,
+    ):
+        result = condition_processor.process_conditions(
+            variable_pool=variable_pool, conditions=conditions, operator="and"
+        )
+
+    assert result.group_results == [True, True, False]
+    assert result.final_result is False
+    # Once for the array and once for the variable referenced by the template
+    assert mock_get.call_count == 2
+    assert mock_convert_template.call_count == 1
@@ -0,0 +1,179 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from extensions.storage.base_storage import BaseStorage
+from extensions.storage.cached_storage import CachedStorage, LocalDiskCache
+
+
+class InMemoryStorage(BaseStorage):
+    def __init__(self):
+        super().__init__()
+        self.files: dict[str, bytes] = {}
+        self.load_count = 0
+
+    def save(self, filename, data):
+        self.files[filename] = data
+
+    def load_once(self, filename: str) -> bytes:
+        self.load_count += 1
+        if filename not in self.files:
+            raise FileNotFoundError("File not found")
+        return self.files[filename]
+
+    def load_stream(self, filename: str) -> Generator:
+        self.load_count += 1
+        if filename not in self.files:
+            raise FileNotFoundError("File not found")
+        data = self.files[filename]
+        for i in range(0, len(data), 3):
+            yield data[i : i + 3]
+
+    def download(self, filename, target_filepath):
+        Path(target_filepath).write_bytes(self.files[filename])
+
+    def exists(self, filename):
+        return filename in self.files
+
+    def delete(self, filename):
+        self.files.pop(filename, None)
+
+
+@pytest.fixture
+def backend() -> InMemoryStorage:
+    return InMemoryStorage()
+
+
+@pytest.fixture
+def cached_storage(backend, tmp_path) -> CachedStorage:
+    return CachedStorage(
+        storage=backend,
+        cache=LocalDiskCache(directory=str(tmp_path / "cache"), max_size_bytes=32),
+        key_prefixes=["upload_files/"],
+        max_file_size=16,
+    )
+
+
+def test_load_once_reads_through_cache(cached_storage, backend):
+    backend.save("upload_files/a.txt", b"hello")
+
+    assert cached_storage.load_once("upload_files/a.txt") == b"hello"
+    assert cached_storage.load_once("upload_files/a.txt") == b"hello"
+
+    assert backend.load_count == 1
+    stats = cached_storage.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+    assert stats.size_bytes == 5
+
+
+def test_keys_outside_prefixes_are_not_cached(cached_storage, backend):
+    backend.save("privkeys/tenant/private.pem", b"secret")
+
+    cached_storage.load_once("privkeys/tenant/private.pem")
+    cached_storage.load_once("privkeys/tenant/private.pem")
+
+    assert backend.load_count == 2
+    assert cached_storage.stats().entries == 0
+
+
+def test_oversized_files_are_not_cached(cached_storage, backend):
+    backend.save("upload_files/big.bin", b"x" * 20)
+
+    cached_storage.load_once("upload_files/big.bin")
+    cached_storage.load_once("upload_files/big.bin")
+
+    assert backend.load_count == 2
+
+
+def test_load_stream_fills_cache_when_fully_consumed(cached_storage, backend):
+    backend.save("upload_files/a.txt", b"0123456789")
+
+    assert b"".join(cached_storage.load_stream("upload_files/a.txt")) == b"0123456789"
+    assert b"".join(cached_storage.load_stream("upload_files/a.txt")) == b"0123456789"
+
+    assert backend.load_count == 1
+
+
+def test_partially_consumed_stream_is_not_cached(cached_storage, backend):
+    backend.save("upload_files/a.txt", b"0123456789")
+
+    stream = cached_storage.load_stream("upload_files/a.txt")
+    next(stream)
+    stream.close()
+
+    assert cached_storage.stats().entries == 0
+
+
+def test_load_range_served_from_cache(cached_storage, backend):
+    backend.save("upload_files/a.txt", b"0123456789")
+    cached_storage.load_once("upload_files/a.txt")
+
+    assert cached_storage.load_range("upload_files/a.txt", 2, 5) == b"234"
+    assert backend.load_count == 1
+
+
+def test_load_range_falls_back_to_backend(cached_storage, backend):
+    backend.save("privkeys/a.txt", b"0123456789")
+
+    assert cached_storage.load_range("privkeys/a.txt", 2, 8) == b"234567"
+
+
+def test_save_and_delete_invalidate_cache(cached_storage, backend):
+    cached_storage.save("upload_files/a.txt", b"old")
+    assert cached_storage.load_once("upload_files/a.txt") == b"old"
+
+    cached_storage.save("upload_files/a.txt", b"new")
+    assert cached_storage.load_once("upload_files/a.txt") == b"new"
+
+    cached_storage.delete("upload_files/a.txt")
+    with pytest.raises(FileNotFoundError):
+        cached_storage.load_once("upload_files/a.txt")
+
+
+def test_download_copies_cached_file(cached_storage, backend, tmp_path):
+    backend.save("upload_files/a.txt", b"hello")
+    cached_storage.load_once("upload_files/a.txt")
+
+    target = tmp_path / "target.txt"
+    cached_storage.download("upload_files/a.txt", str(target))
+
+    assert target.read_bytes() == b"hello"
+    assert backend.load_count == 1
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = LocalDiskCache(directory=str(tmp_path), max_size_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    assert cache.stats().evictions == 1
+
+
+def test_disk_cache_restores_index_on_restart(tmp_path):
+    cache = LocalDiskCache(directory=str(tmp_path), max_size_bytes=10)
+    cache.put("a", b"aaaa")
+
+    restarted = LocalDiskCache(directory=str(tmp_path), max_size_bytes=10)
+
+    assert restarted.get("a") == b"aaaa"
+    assert restarted.stats().size_bytes == 4
+
+
+def test_default_load_range_streams_backend(backend):
+    backend.save("a.txt", b"0123456789")
+
+    assert backend.load_range("a.txt", 0, 4) == b"0123"
+    assert backend.load_range("a.txt", 4, 9) == b"45678"
+    assert backend.load_range("a.txt", 8, 100) == b"89"
+    assert backend.load_range("a.txt", 3, 3) == b""
+    with pytest.raises(ValueError):
+        backend.load_range("a.txt", 5, 2)
@@ -135,6 +135,8 @@ class TestCelerySSLConfiguration:
         mock_config.TRIGGER_PROVIDER_REFRESH_INTERVAL = 15
         mock_config.ENABLE_API_TOKEN_LAST_USED_UPDATE_TASK = False
         mock_config.API_TOKEN_LAST_USED_UPDATE_INTERVAL = 30
+        mock_config.TENANT_FAIR_SCHEDULER_ENABLED = False
+        mock_config.TENANT_FAIR_SCHEDULER_DISPATCH_INTERVAL = 60
 
         with patch("extensions.ext_celery.dify_config", mock_config):
             from dify_app import DifyApp
@@ -6,6 +6,7 @@ from uuid import uuid4
 import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
+from pydantic import ValidationError
 
 from core.file import File, FileTransferMethod, FileType
 from core.variables import (
@@ -330,6 +331,38 @@ def test_build_segment_array_any_all_none_values():
     assert segment.value_type == SegmentType.ARRAY_ANY
 
 
+def test_build_segment_array_numbers_mixing_ints_and_floats():
+    """Test building ArrayNumberSegment from a list of integers and floats."""
+    values = [1, 2.5, 3]
+    segment = variable_factory.build_segment(values)
+    assert isinstance(segment, ArrayNumberSegment)
+    assert segment.value_type == SegmentType.ARRAY_NUMBER
+
+
+def test_build_segment_array_keeps_the_list():
+    """Test that array segments wrap the list instead of copying it."""
+    values = [{"id": index} for index in range(1000)]
+    segment = variable_factory.build_segment(values)
+    assert isinstance(segment, ArrayObjectSegment)
+    assert segment.value is values
+    assert segment.model_dump()["value_type"] == SegmentType.ARRAY_OBJECT
+
+
+def test_build_segment_array_with_segment_elements():
+    """Test that segment elements are validated like any other array element."""
+    with pytest.raises(ValidationError):
+        variable_factory.build_segment([StringSegment(value="a"), "b"])
+
+    segment = variable_factory.build_segment([ArrayStringSegment(value=["a"]), ArrayNumberSegment(value=[1])])
+    assert isinstance(segment, ArrayAnySegment)
+
+
+def test_build_segment_nested_array_with_unsupported_value():
+    """Test that unsupported values nested in lists are still rejected."""
+    with pytest.raises(ValueError, match="not supported value"):
+        variable_factory.build_segment([["a"], [object()]])
+
+
 def test_build_segment_array_file_properties():
     """Test ArrayFileSegment properties and methods."""
     file1 = File(
@@ -67,6 +67,17 @@ class TestOpenDAL:
         with pytest.raises(StopIteration):
             next(generator)
 
+    def test_load_range(self):
+        """Test loading a byte range of a file."""
+        filename = get_example_filename()
+        data = get_example_data(length=4096 * 3)
+
+        self.storage.save(filename, data)
+        assert self.storage.load_range(filename, 0, 4) == data[0:4]
+        assert self.storage.load_range(filename, 4000, 8200) == data[4000:8200]
+        assert self.storage.load_range(filename, 10, 10) == b""
+        assert self.storage.load_range(filename, 4096 * 3 - 2, 4096 * 4) == data[-2:]
+
     def test_download(self):
         """Test downloading data to a file."""
         filename = get_example_filename()
@@ -358,6 +358,7 @@ class TestAccountService:
         """Test successful password update with correct current password and valid new password."""
         # Setup test data
         mock_account = TestAccountAssociatedDataFactory.create_account_mock()
+        mock_db_dependencies["db"].session.execute.return_value.one.return_value = ("hashed_password", "salt")
         mock_password_dependencies["compare_password"].return_value = True
         mock_password_dependencies["valid_password"].return_value = None
         mock_password_dependencies["hash_password"].return_value = b"new_hashed_password"
@@ -379,10 +380,11 @@ class TestAccountService:
         # Verify database operations
         self._assert_database_operations_called(mock_db_dependencies["db"])
 
-    def test_update_account_password_current_password_incorrect(self, mock_password_dependencies):
+    def test_update_account_password_current_password_incorrect(self, mock_db_dependencies, mock_password_dependencies):
         """Test password update with incorrect current password."""
         # Setup test data
         mock_account = TestAccountAssociatedDataFactory.create_account_mock()
+        mock_db_dependencies["db"].session.execute.return_value.one.return_value = ("hashed_password", "salt")
         mock_password_dependencies["compare_password"].return_value = False
 
         # Execute test and verify exception
@@ -399,10 +401,11 @@ class TestAccountService:
             "wrong_password", "hashed_password", "salt"
         )
 
-    def test_update_account_password_invalid_new_password(self, mock_password_dependencies):
+    def test_update_account_password_invalid_new_password(self, mock_db_dependencies, mock_password_dependencies):
         """Test password update with invalid new password."""
         # Setup test data
         mock_account = TestAccountAssociatedDataFactory.create_account_mock()
+        mock_db_dependencies["db"].session.execute.return_value.one.return_value = ("hashed_password", "salt")
         mock_password_dependencies["compare_password"].return_value = True
         mock_password_dependencies["valid_password"].side_effect = ValueError("Password too short")
 
@@ -646,8 +646,9 @@ class TestDatasetServiceGetDatasetQueries:
     @pytest.fixture
     def mock_dependencies(self):
         """Common mock setup for get_dataset_queries tests."""
-        with patch("services.dataset_service.db.paginate") as mock_paginate:
-            yield {"paginate": mock_paginate}
+        with patch("services.dataset_service.session_factory") as mock_session_factory:
+            mock_session = mock_session_factory.create_read_only_session.return_value.__enter__.return_value
+            yield {"session": mock_session}
 
     def test_get_dataset_queries_success(self, mock_dependencies):
         """Test successful retrieval of dataset queries."""
@@ -656,14 +657,12 @@ class TestDatasetServiceGetDatasetQueries:
         page = 1
         per_page = 20
 
-        # Mock pagination result
-        mock_paginate_result = Mock()
-        mock_paginate_result.items = [
+        # Mock the count and page queries
+        mock_dependencies["session"].scalar.return_value = 3
+        mock_dependencies["session"].scalars.return_value.all.return_value = [
             DatasetRetrievalTestDataFactory.create_dataset_query_mock(dataset_id=dataset_id, query_id=f"query-{i}")
             for i in range(3)
         ]
-        mock_paginate_result.total = 3
-        mock_dependencies["paginate"].return_value = mock_paginate_result
 
         # Act
         queries, total = DatasetService.get_dataset_queries(dataset_id, page, per_page)
@@ -672,7 +671,7 @@ class TestDatasetServiceGetDatasetQueries:
         assert len(queries) == 3
         assert total == 3
         assert all(query.dataset_id == dataset_id for query in queries)
-        mock_dependencies["paginate"].assert_called_once()
+        mock_dependencies["session"].scalars.assert_called_once()
 
     def test_get_dataset_queries_empty_result(self, mock_dependencies):
         """Test retrieval when no queries exist."""
@@ -681,11 +680,9 @@ class TestDatasetServiceGetDatasetQueries:
         page = 1
         per_page = 20
 
-        # Mock pagination result (empty)
-        mock_paginate_result = Mock()
-        mock_paginate_result.items = []
-        mock_paginate_result.total = 0
-        mock_dependencies["paginate"].return_value = mock_paginate_result
+        # Mock the count and page queries (empty)
+        mock_dependencies["session"].scalar.return_value = 0
+        mock_dependencies["session"].scalars.return_value.all.return_value = []
 
         # Act
         queries, total = DatasetService.get_dataset_queries(dataset_id, page, per_page)
@@ -135,6 +135,37 @@ class TestDocumentIndexingTaskProxy:
         )
         proxy._tenant_isolated_task_queue.push_tasks.assert_not_called()
 
+    @patch("services.document_indexing_proxy.batch_indexing_base.TenantFairScheduler")
+    @patch("services.document_indexing_proxy.batch_indexing_base.dify_config")
+    @patch("services.document_indexing_proxy.document_indexing_task_proxy.priority_document_indexing_task")
+    def test_send_to_tenant_queue_with_fair_scheduler(self, mock_task, mock_config, mock_scheduler_cls):
+        """Test _send_to_tenant_queue enqueues in the fair scheduler with the plan weight when enabled."""
+        # Arrange
+        mock_config.TENANT_FAIR_SCHEDULER_ENABLED = True
+        mock_config.TENANT_FAIR_SCHEDULER_PLAN_WEIGHTS = {"team": 4.0}
+        proxy = DocumentIndexingTaskProxyTestDataFactory.create_document_task_proxy()
+        proxy._tenant_isolated_task_queue = DocumentIndexingTaskProxyTestDataFactory.create_mock_tenant_queue()
+        proxy.__dict__["features"] = DocumentIndexingTaskProxyTestDataFactory.create_mock_features(
+            billing_enabled=True, plan=CloudPlan.TEAM
+        )
+        scheduler = mock_scheduler_cls.from_config.return_value
+
+        with patch.object(DocumentIndexingTaskProxy, "PRIORITY_TASK_FUNC", mock_task):
+            # Act
+            proxy._send_to_tenant_queue(mock_task)
+
+        # Assert
+        mock_scheduler_cls.from_config.assert_called_once_with("document_indexing:priority")
+        scheduler.enqueue.assert_called_once_with(
+            "tenant-123",
+            {"tenant_id": "tenant-123", "dataset_id": "dataset-456", "document_ids": ["doc-1", "doc-2", "doc-3"]},
+            weight=4.0,
+            cost=3,
+        )
+        scheduler.dispatch.assert_called_once()
+        proxy._tenant_isolated_task_queue.get_task_key.assert_not_called()
+        mock_task.delay.assert_not_called()
+
     def test_send_to_default_tenant_queue(self):
         """Test _send_to_default_tenant_queue method."""
         # Arrange
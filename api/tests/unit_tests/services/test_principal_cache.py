@@ -0,0 +1,166 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+
+from models import Account, Tenant
+from models.account import TenantAccountRole
+from models.model import EndUser
+from services.principal_cache import PrincipalCache
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._commands: list = []
+
+    def incr(self, key: str) -> None:
+        self._commands.append(lambda: self._redis.incr(key))
+
+    def expire(self, key: str, ttl: int) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        self._commands.append(lambda: self._redis.values.pop(key, None))
+
+    def execute(self) -> None:
+        for command in self._commands:
+            command()
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.values[key] = value
+
+    def incr(self, key: str) -> None:
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("services.principal_cache.redis_client", redis):
+        yield redis
+
+
+def _cache() -> PrincipalCache:
+    return PrincipalCache(enabled=True, local_max_size=100, ttl=60)
+
+
+def _account() -> Account:
+    account = Account(name="Alice", email="alice@example.com", status="active")
+    account.id = "account-1"
+    account.last_active_at = datetime(2025, 1, 1, 12, 30)
+    tenant = Tenant(name="Workspace")
+    tenant.id = "tenant-1"
+    account.set_loaded_tenant(tenant, TenantAccountRole.ADMIN)
+    return account
+
+
+def _end_user() -> EndUser:
+    return EndUser(id="end-user-1", tenant_id="tenant-1", app_id="app-1", type="browser", session_id="session-1")
+
+
+def test_cached_account_keeps_tenant_and_role(fake_redis):
+    cache = _cache()
+    load = MagicMock(return_value=_account())
+
+    cache.get_account("account-1", load)
+    account = cache.get_account("account-1", load)
+
+    load.assert_called_once()
+    assert account is not None
+    assert (account.id, account.email, account.last_active_at) == (
+        "account-1",
+        "alice@example.com",
+        datetime(2025, 1, 1, 12, 30),
+    )
+    assert account.current_tenant_id == "tenant-1"
+    assert account.current_role == TenantAccountRole.ADMIN
+    assert sa.inspect(account).detached
+    assert cache.stats().hits == 1
+
+
+def test_account_credentials_are_not_cached(fake_redis):
+    account = _account()
+    account.password = "hashed-password"
+    account.password_salt = "salt"
+    load = MagicMock(return_value=account)
+
+    _cache().get_account("account-1", load)
+    restored = _cache().get_account("account-1", load)
+
+    assert restored is not None
+    assert all("hashed-password" not in value and "salt" not in value for value in fake_redis.values.values())
+    assert "password" in sa.inspect(restored).unloaded
+    assert restored.is_password_set is True
+    load.assert_called_once()
+
+
+def test_invalidated_account_is_loaded_again(fake_redis):
+    cache = _cache()
+    load = MagicMock(return_value=_account())
+    cache.get_account("account-1", load)
+
+    cache.invalidate_accounts("account-1")
+    cache.get_account("account-1", load)
+
+    assert load.call_count == 2
+
+
+def test_invalidation_reaches_other_processes(fake_redis):
+    load = MagicMock(return_value=_account())
+    first, second = _cache(), _cache()
+    first.get_account("account-1", load)
+    second.get_account("account-1", load)
+
+    first.invalidate_accounts("account-1")
+    second.get_account("account-1", load)
+
+    assert load.call_count == 2
+
+
+def test_end_users_are_cached_by_id_and_server_code(fake_redis):
+    cache = _cache()
+    load = MagicMock(return_value=_end_user())
+
+    cache.get_end_user("end-user-1", load)
+    end_user = cache.get_end_user("end-user-1", load)
+    cache.get_mcp_end_user("server-code", load)
+    cache.invalidate_mcp_server("server-code")
+    cache.get_mcp_end_user("server-code", load)
+
+    assert end_user is not None
+    assert (end_user.id, end_user.session_id, end_user.type) == ("end-user-1", "session-1", "browser")
+    assert load.call_count == 3
+
+
+def test_missing_principals_are_not_cached(fake_redis):
+    cache = _cache()
+    load = MagicMock(return_value=None)
+
+    assert cache.get_account("account-1", load) is None
+    assert cache.get_account("account-1", load) is None
+    assert load.call_count == 2
+
+
+def test_redis_failure_falls_back_to_loading():
+    cache = _cache()
+    load = MagicMock(return_value=_account())
+
+    with patch("services.principal_cache.redis_client") as redis_client:
+        redis_client.mget.side_effect = ConnectionError("redis down")
+        cache.get_account("account-1", load)
+        cache.get_account("account-1", load)
+
+    assert load.call_count == 2
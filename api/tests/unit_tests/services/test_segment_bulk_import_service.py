@@ -0,0 +1,202 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import LockNotOwnedError
+
+from services.segment_bulk_import_service import SegmentBulkImporter, SegmentImportInProgressError
+
+
+@pytest.fixture
+def redis_client():
+    with patch("services.segment_bulk_import_service.redis_client") as redis_client:
+        redis_client.lock.return_value.acquire.return_value = True
+        yield redis_client
+
+
+@pytest.fixture
+def redis_store(redis_client):
+    store: dict[str, str] = {}
+    redis_client.get.side_effect = store.get
+    redis_client.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+    redis_client.delete.side_effect = lambda key: store.pop(key, None)
+    return store
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.scalar.return_value = 3
+    session.execute.return_value.all.return_value = []
+    session.scalars.return_value.all.return_value = []
+    with patch("services.segment_bulk_import_service.session_factory") as session_factory:
+        session_factory.create_session.return_value.__enter__.return_value = session
+        yield session
+
+
+@pytest.fixture
+def vector_service():
+    with patch("services.segment_bulk_import_service.VectorService") as vector_service:
+        yield vector_service
+
+
+def _importer(doc_form: str = "text_model", embedding_model: MagicMock | None = None) -> SegmentBulkImporter:
+    return SegmentBulkImporter(
+        job_id="job-1",
+        tenant_id="tenant-1",
+        dataset_id="dataset-1",
+        document_id="document-1",
+        user_id="user-1",
+        doc_form=doc_form,
+        embedding_model=embedding_model,
+        block_size=2,
+    )
+
+
+def _inserted_rows(session: MagicMock) -> list[list[dict]]:
+    return [call.args[1] for call in session.execute.call_args_list if len(call.args) == 2]
+
+
+def _write_csv(tmp_path: Path, text: str) -> str:
+    file_path = tmp_path / "segments.csv"
+    file_path.write_text(text, encoding="utf-8")
+    return str(file_path)
+
+
+def test_imports_csv_in_blocks(tmp_path, redis_store, session, vector_service):
+    embedding_model = MagicMock()
+    embedding_model.get_text_embedding_num_tokens.side_effect = lambda texts: [len(text) for text in texts]
+    file_path = _write_csv(tmp_path, "content\na\nbb\nccc\ndddd\neeeee\n")
+
+    rows = _importer(embedding_model=embedding_model).run(file_path)
+
+    assert rows == 5
+    blocks = _inserted_rows(session)
+    assert [[row["content"] for row in block] for block in blocks] == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert [row["position"] for block in blocks for row in block] == [4, 5, 6, 7, 8]
+    assert [row["tokens"] for block in blocks for row in block] == [1, 2, 3, 4, 5]
+    assert embedding_model.get_text_embedding_num_tokens.call_count == 3
+    assert vector_service.create_segments_vector.call_count == 3
+    assert "segment_batch_import_job-1_checkpoint" not in redis_store
+
+
+def test_imports_question_and_answer_rows(tmp_path, redis_store, session, vector_service):
+    file_path = _write_csv(tmp_path, "question,answer\nq1,a1\n")
+
+    _importer(doc_form="qa_model").run(file_path)
+
+    [[row]] = _inserted_rows(session)
+    assert (row["content"], row["answer"], row["word_count"]) == ("q1", "a1", 4)
+
+
+def test_resumes_after_checkpoint(tmp_path, redis_store, session, vector_service):
+    redis_store["segment_batch_import_job-1_checkpoint"] = json.dumps({"rows": 2, "position": 5, "block_size": 2})
+    file_path = _write_csv(tmp_path, "content\na\nbb\nccc\n")
+
+    _importer().run(file_path)
+
+    [block] = _inserted_rows(session)
+    assert [(row["content"], row["position"]) for row in block] == [("ccc", 6)]
+    session.scalar.assert_not_called()
+
+
+def test_row_ids_are_stable_across_runs(tmp_path, redis_store, session, vector_service):
+    file_path = _write_csv(tmp_path, "content\na\n")
+
+    _importer().run(file_path)
+    _importer().run(file_path)
+
+    first, second = _inserted_rows(session)
+    assert first[0]["id"] == second[0]["id"]
+    assert first[0]["index_node_id"] == second[0]["index_node_id"]
+
+
+def test_checkpoint_is_saved_before_the_first_block_is_written(tmp_path, redis_store, session, vector_service):
+    file_path = _write_csv(tmp_path, "content\na\nbb\n")
+    checkpoints_at_insert: list[str | None] = []
+
+    def execute(statement, *args):
+        if args:
+            checkpoints_at_insert.append(redis_store.get("segment_batch_import_job-1_checkpoint"))
+        return MagicMock()
+
+    session.execute.side_effect = execute
+    _importer().run(file_path)
+
+    # A crash right after the first INSERT leaves a checkpoint behind, so the redelivery discards the block
+    assert checkpoints_at_insert == [json.dumps({"rows": 0, "position": 3, "block_size": 2})]
+
+
+def test_redelivery_after_interrupted_first_block_discards_it(tmp_path, redis_store, session, vector_service):
+    redis_store["segment_batch_import_job-1_checkpoint"] = json.dumps({"rows": 0, "position": 3, "block_size": 2})
+    session.execute.return_value.all.return_value = [MagicMock(index_node_id="node-1", word_count=1)]
+    file_path = _write_csv(tmp_path, "content\na\nbb\n")
+
+    with patch("services.segment_bulk_import_service.IndexProcessorFactory") as index_processor_factory:
+        _importer().run(file_path)
+
+    index_processor_factory.return_value.init_index_processor.return_value.clean.assert_called_once()
+    [block] = _inserted_rows(session)
+    assert [(row["content"], row["position"]) for row in block] == [("a", 4), ("bb", 5)]
+
+
+def test_redelivery_after_completion_skips_existing_segments(tmp_path, redis_store, session, vector_service):
+    file_path = _write_csv(tmp_path, "content\na\nbb\nccc\n")
+    _importer().run(file_path)
+    imported_ids = [row["id"] for block in _inserted_rows(session) for row in block]
+    session.reset_mock()
+    vector_service.reset_mock()
+    session.scalars.return_value.all.return_value = imported_ids
+
+    rows = _importer().run(file_path)
+
+    assert rows == 3
+    assert _inserted_rows(session) == []
+    vector_service.create_segments_vector.assert_not_called()
+
+
+def test_empty_csv_raises(tmp_path, redis_store, session, vector_service):
+    file_path = _write_csv(tmp_path, "content\n")
+
+    with pytest.raises(ValueError, match="The CSV file is empty"):
+        _importer().run(file_path)
+
+    assert _inserted_rows(session) == []
+
+
+def test_run_holds_a_lease_renewed_after_every_block(tmp_path, redis_client, redis_store, session, vector_service):
+    file_path = _write_csv(tmp_path, "content\na\nbb\nccc\n")
+
+    _importer().run(file_path)
+
+    redis_client.lock.assert_called_once_with("segment_batch_import_job-1_lease", timeout=600, blocking=False)
+    lease = redis_client.lock.return_value
+    assert lease.extend.call_count == 2
+    lease.release.assert_called_once()
+
+
+def test_delivery_while_the_job_is_running_leaves_it_alone(
+    tmp_path, redis_client, redis_store, session, vector_service
+):
+    redis_client.lock.return_value.acquire.return_value = False
+    redis_store["segment_batch_import_job-1_checkpoint"] = json.dumps({"rows": 2, "position": 5, "block_size": 2})
+    file_path = _write_csv(tmp_path, "content\na\nbb\nccc\n")
+
+    with pytest.raises(SegmentImportInProgressError):
+        _importer().run(file_path)
+
+    session.execute.assert_not_called()
+    assert "segment_batch_import_job-1_checkpoint" in redis_store
+
+
+def test_run_stops_once_its_lease_is_lost(tmp_path, redis_client, redis_store, session, vector_service):
+    lease = redis_client.lock.return_value
+    lease.extend.side_effect = LockNotOwnedError("lease expired")
+    lease.release.side_effect = LockNotOwnedError("lease expired")
+    file_path = _write_csv(tmp_path, "content\na\nbb\nccc\n")
+
+    with pytest.raises(LockNotOwnedError):
+        _importer().run(file_path)
+
+    assert len(_inserted_rows(session)) == 1
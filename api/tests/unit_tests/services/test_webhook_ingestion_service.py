@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.errors.app import QuotaExceededError
+from services.trigger.webhook_ingestion_service import WebhookIngestionService
+from services.workflow.entities import WebhookTriggerData
+
+
+def _raw_entry(entry_id: bytes, app_id: str) -> tuple[bytes, dict[bytes, bytes]]:
+    trigger_data = WebhookTriggerData(
+        app_id=app_id, tenant_id="tenant-1", workflow_id="workflow-1", root_node_id="node-1", inputs={}
+    )
+    return entry_id, {b"trigger_data": trigger_data.model_dump_json().encode()}
+
+
+@pytest.fixture
+def redis_client():
+    with patch("services.trigger.webhook_ingestion_service.redis_client") as redis_client:
+        redis_client.xautoclaim.return_value = [b"0-0", [], []]
+        redis_client.xlen.return_value = 0
+        counts: dict[str, int] = {}
+
+        def incrby(key: str, amount: int) -> int:
+            counts[key] = counts.get(key, 0) + amount
+            return counts[key]
+
+        redis_client.incrby.side_effect = incrby
+        yield redis_client
+
+
+@pytest.fixture
+def dependencies():
+    with (
+        patch("services.trigger.webhook_ingestion_service.Session"),
+        patch("services.trigger.webhook_ingestion_service.db"),
+        patch("services.trigger.webhook_ingestion_service.EndUserService") as end_user_service,
+        patch("services.trigger.webhook_ingestion_service.QuotaType") as quota_type,
+        patch("services.trigger.webhook_ingestion_service.AppTriggerService") as app_trigger_service,
+        patch("services.trigger.webhook_ingestion_service.AsyncWorkflowService") as async_workflow_service,
+        patch.object(WebhookIngestionService, "_schedule_dispatch") as schedule_dispatch,
+    ):
+        yield MagicMock(
+            end_user_service=end_user_service,
+            quota_type=quota_type,
+            app_trigger_service=app_trigger_service,
+            async_workflow_service=async_workflow_service,
+            schedule_dispatch=schedule_dispatch,
+        )
+
+
+def test_dispatches_batch_and_resolves_end_user_once_per_app(redis_client, dependencies):
+    redis_client.xreadgroup.return_value = [
+        [b"webhook_ingestion", [_raw_entry(b"1-0", "app-1"), _raw_entry(b"2-0", "app-1"), _raw_entry(b"3-0", "app-2")]]
+    ]
+
+    assert WebhookIngestionService.dispatch() == 3
+
+    assert dependencies.end_user_service.get_or_create_end_user_by_type.call_count == 2
+    assert dependencies.async_workflow_service.trigger_workflow_async.call_count == 3
+    pipeline = redis_client.pipeline.return_value
+    pipeline.xack.assert_called_once_with("webhook_ingestion", "webhook_ingestion_dispatchers", b"1-0", b"2-0", b"3-0")
+    pipeline.xadd.assert_not_called()
+    dependencies.schedule_dispatch.assert_not_called()
+
+
+def test_defers_runs_over_the_app_rate_limit(redis_client, dependencies):
+    redis_client.xreadgroup.return_value = [
+        [b"webhook_ingestion", [_raw_entry(f"{i}-0".encode(), "app-1") for i in range(5)]]
+    ]
+
+    with patch("services.trigger.webhook_ingestion_service.dify_config") as config:
+        config.WEBHOOK_INGESTION_BATCH_SIZE = 10
+        config.WEBHOOK_INGESTION_APP_RATE_LIMIT = 3
+        assert WebhookIngestionService.dispatch() == 3
+
+    assert redis_client.pipeline.return_value.xadd.call_count == 2
+    dependencies.schedule_dispatch.assert_called_once()
+
+
+def test_stops_dispatching_when_quota_is_exceeded(redis_client, dependencies):
+    redis_client.xreadgroup.return_value = [
+        [b"webhook_ingestion", [_raw_entry(b"1-0", "app-1"), _raw_entry(b"2-0", "app-1")]]
+    ]
+    dependencies.quota_type.TRIGGER.consume.side_effect = [None, QuotaExceededError("trigger_event", "tenant-1", 1)]
+
+    assert WebhookIngestionService.dispatch() == 1
+
+    dependencies.app_trigger_service.mark_tenant_triggers_rate_limited.assert_called_once_with("tenant-1")
+    redis_client.pipeline.return_value.xdel.assert_called_once_with("webhook_ingestion", b"1-0", b"2-0")
+
+
+def test_failed_dispatch_schedules_the_next_one(redis_client, dependencies):
+    redis_client.xreadgroup.return_value = [[b"webhook_ingestion", [_raw_entry(b"1-0", "app-1")]]]
+    dependencies.end_user_service.get_or_create_end_user_by_type.side_effect = RuntimeError("database is down")
+
+    with pytest.raises(RuntimeError):
+        WebhookIngestionService.dispatch()
+
+    # The entry stays pending for the next dispatch to claim
+    redis_client.pipeline.return_value.xack.assert_not_called()
+    dependencies.schedule_dispatch.assert_called_once()
+
+
+def test_empty_stream_dispatches_nothing(redis_client, dependencies):
+    redis_client.xreadgroup.return_value = []
+
+    assert WebhookIngestionService.dispatch() == 0
+
+    dependencies.async_workflow_service.trigger_workflow_async.assert_not_called()
@@ -0,0 +1,129 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from models.trigger import WorkflowWebhookTrigger
+from models.workflow import Workflow
+from services.trigger.webhook_routing_cache import WebhookRoutingCache
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def mget(self, keys: list[str]) -> list[str | None]:
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.values[key] = value
+
+    def incr(self, key: str) -> None:
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("services.trigger.webhook_routing_cache.redis_client", redis):
+        yield redis
+
+
+def _cache() -> WebhookRoutingCache:
+    return WebhookRoutingCache(enabled=True, local_max_size=100, ttl=60)
+
+
+def _webhook_trigger() -> WorkflowWebhookTrigger:
+    return WorkflowWebhookTrigger(
+        app_id="app-1", node_id="node-1", tenant_id="tenant-1", webhook_id="webhook-1", created_by="account-1"
+    )
+
+
+def _loaders():
+    workflow = Workflow(
+        tenant_id="tenant-1",
+        app_id="app-1",
+        type="workflow",
+        version="2025-01-01 00:00:00",
+        graph="{}",
+        features="{}",
+        created_by="account-1",
+        environment_variables=[],
+        conversation_variables=[],
+    )
+    workflow.id = "workflow-1"
+    load_trigger = MagicMock(return_value=_webhook_trigger())
+    load_route = MagicMock(return_value=(workflow, {"id": "node-1", "data": {"status_code": 202}}))
+    return load_trigger, load_route
+
+
+def test_cached_route_is_restored(fake_redis):
+    cache = _cache()
+    load_trigger, load_route = _loaders()
+
+    cache.get("webhook-1", load_trigger, load_route)
+    webhook_trigger, workflow, node_config = cache.get("webhook-1", load_trigger, load_route)
+
+    load_trigger.assert_called_once()
+    load_route.assert_called_once()
+    assert (webhook_trigger.app_id, webhook_trigger.node_id, webhook_trigger.tenant_id) == (
+        "app-1",
+        "node-1",
+        "tenant-1",
+    )
+    assert (workflow.id, workflow.app_id) == ("workflow-1", "app-1")
+    assert node_config == {"id": "node-1", "data": {"status_code": 202}}
+    assert cache.stats().hits == 1
+
+
+def test_route_is_shared_through_redis(fake_redis):
+    load_trigger, load_route = _loaders()
+    _cache().get("webhook-1", load_trigger, load_route)
+
+    webhook_trigger, _, _ = _cache().get("webhook-1", load_trigger, load_route)
+
+    load_route.assert_called_once()
+    assert webhook_trigger.webhook_id == "webhook-1"
+
+
+@pytest.mark.parametrize("invalidate", ["app", "tenant"])
+def test_invalidated_route_is_loaded_again(fake_redis, invalidate):
+    first, second = _cache(), _cache()
+    load_trigger, load_route = _loaders()
+    first.get("webhook-1", load_trigger, load_route)
+    second.get("webhook-1", load_trigger, load_route)
+
+    if invalidate == "app":
+        first.invalidate_app("app-1")
+    else:
+        first.invalidate_tenant("tenant-1")
+    second.get("webhook-1", load_trigger, load_route)
+    second.get("webhook-1", load_trigger, load_route)
+
+    assert load_route.call_count == 2
+
+
+def test_loader_errors_are_not_cached(fake_redis):
+    cache = _cache()
+    load_trigger, _ = _loaders()
+    load_route = MagicMock(side_effect=ValueError("Webhook trigger is disabled for webhook webhook-1"))
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="disabled"):
+            cache.get("webhook-1", load_trigger, load_route)
+
+    assert load_route.call_count == 2
+
+
+def test_redis_failure_falls_back_to_loading():
+    cache = _cache()
+    load_trigger, load_route = _loaders()
+
+    with patch("services.trigger.webhook_routing_cache.redis_client") as redis_client:
+        redis_client.get.side_effect = ConnectionError("redis down")
+        cache.get("webhook-1", load_trigger, load_route)
+        cache.get("webhook-1", load_trigger, load_route)
+
+    assert load_route.call_count == 2
@@ -10,7 +10,14 @@ from core.variables.segments import ObjectSegment, StringSegment
 from core.variables.types import SegmentType
 from models.model import UploadFile
 from models.workflow import WorkflowDraftVariable, WorkflowDraftVariableFile
-from services.workflow_draft_variable_service import DraftVarLoader
+from services.workflow_draft_variable_service import DraftVarLoader, OffloadedPayloadCache, offloaded_payload_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_offloaded_payload_cache():
+    offloaded_payload_cache.clear()
+    yield
+    offloaded_payload_cache.clear()
 
 
 class TestDraftVarLoaderSimple:
@@ -375,3 +382,68 @@ class TestDraftVarLoaderSimple:
                         # Verify ThreadPoolExecutor was used
                         mock_executor_cls.assert_called_once_with(max_workers=10)
                         mock_executor.map.assert_called_once()
+
+    def test_load_offloaded_variable_uses_payload_cache_unit(self, draft_var_loader):
+        """Test that repeated loads of the same offloaded payload only hit storage once."""
+        upload_file = Mock(spec=UploadFile)
+        upload_file.key = "storage/key/cached.txt"
+
+        variable_file = Mock(spec=WorkflowDraftVariableFile)
+        variable_file.value_type = SegmentType.STRING
+        variable_file.upload_file = upload_file
+
+        draft_var = Mock(spec=WorkflowDraftVariable)
+        draft_var.id = "draft-var-id"
+        draft_var.node_id = "test-node-id"
+        draft_var.name = "cached_variable"
+        draft_var.description = ""
+        draft_var.get_selector.return_value = ["test-node-id", "cached_variable"]
+        draft_var.variable_file = variable_file
+
+        with patch("services.workflow_draft_variable_service.storage") as mock_storage:
+            mock_storage.load.return_value = b"cached content"
+
+            _, first = draft_var_loader._load_offloaded_variable(draft_var)
+            _, second = draft_var_loader._load_offloaded_variable(draft_var)
+
+            assert first.value == "cached content"
+            assert second.value == "cached content"
+            mock_storage.load.assert_called_once_with("storage/key/cached.txt")
+
+
+class TestOffloadedPayloadCache:
+    def test_get_returns_cached_content(self):
+        cache = OffloadedPayloadCache(max_size_bytes=16)
+        cache.put("a", b"1234")
+
+        assert cache.get("a") == b"1234"
+        assert cache.get("missing") is None
+        assert cache.size_bytes == 4
+
+    def test_evicts_least_recently_used_entries(self):
+        cache = OffloadedPayloadCache(max_size_bytes=8)
+        cache.put("a", b"1234")
+        cache.put("b", b"5678")
+        # Touch `a` so that `b` becomes the least recently used entry.
+        assert cache.get("a") == b"1234"
+
+        cache.put("c", b"90")
+
+        assert cache.get("a") == b"1234"
+        assert cache.get("b") is None
+        assert cache.get("c") == b"90"
+        assert cache.size_bytes == 6
+
+    def test_skips_payloads_larger_than_capacity(self):
+        cache = OffloadedPayloadCache(max_size_bytes=4)
+        cache.put("a", b"12")
+        cache.put("big", b"123456")
+
+        assert cache.get("big") is None
+        assert cache.get("a") == b"12"
+
+    def test_zero_capacity_disables_cache(self):
+        cache = OffloadedPayloadCache(max_size_bytes=0)
+        cache.put("a", b"1")
+
+        assert cache.get("a") is None
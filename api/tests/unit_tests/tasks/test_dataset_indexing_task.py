@@ -15,6 +15,7 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from core.indexing_runner import DocumentIsPausedError, IndexingRunner
+from core.rag.pipeline.fair_scheduler import ScheduledTask
 from core.rag.pipeline.queue import TenantIsolatedTaskQueue
 from enums.cloud_plan import CloudPlan
 from extensions.ext_redis import redis_client
@@ -22,6 +23,7 @@ from models.dataset import Dataset, Document
 from services.document_indexing_proxy.document_indexing_task_proxy import DocumentIndexingTaskProxy
 from tasks.document_indexing_task import (
     _document_indexing,
+    _document_indexing_with_fair_scheduler,
     _document_indexing_with_tenant_queue,
     document_indexing_task,
     normal_document_indexing_task,
@@ -630,6 +632,50 @@ class TestProgressTracking:
                 # Task key should be set for next task
                 assert mock_redis.setex.called
 
+    def test_fair_scheduler_lease_released_and_next_task_dispatched(
+        self, tenant_id, dataset_id, document_ids, mock_redis, mock_db_session, mock_dataset, mock_indexing_runner
+    ):
+        """
+        Test that a task dispatched by the fair scheduler releases its lease and dispatches the next task.
+
+        The legacy tenant queue must not be touched for such tasks.
+        """
+        # Arrange
+        mock_db_session.query.return_value.where.return_value.first.return_value = mock_dataset
+        next_task = ScheduledTask(
+            scheduler="document_indexing:normal",
+            tenant_id="other-tenant",
+            lease_id="next-lease",
+            data={"tenant_id": "other-tenant", "dataset_id": "other-dataset", "document_ids": ["other-doc"]},
+        )
+
+        with (
+            patch("tasks.document_indexing_task.FeatureService.get_features") as mock_features,
+            patch("tasks.document_indexing_task.TenantFairScheduler") as mock_scheduler_cls,
+        ):
+            mock_features.return_value.billing.enabled = False
+            scheduler = mock_scheduler_cls.from_config.return_value
+            scheduler.dispatch.side_effect = lambda send: send(next_task)
+            mock_task = MagicMock()
+
+            # Act
+            _document_indexing_with_fair_scheduler(
+                tenant_id, dataset_id, document_ids, mock_task, "document_indexing:normal", "lease-1"
+            )
+
+            # Assert
+            mock_scheduler_cls.from_config.assert_called_once_with("document_indexing:normal")
+            scheduler.hold_lease.assert_called_once_with(tenant_id, "lease-1")
+            scheduler.complete.assert_called_once_with(tenant_id, "lease-1")
+            mock_task.delay.assert_called_once_with(
+                tenant_id="other-tenant",
+                dataset_id="other-dataset",
+                document_ids=["other-doc"],
+                fair_scheduler="document_indexing:normal",
+                lease_id="next-lease",
+            )
+            mock_redis.rpop.assert_not_called()
+
     def test_tenant_queue_clears_flag_when_no_more_tasks(
         self, tenant_id, dataset_id, document_ids, mock_redis, mock_db_session, mock_dataset, mock_indexing_runner
     ):